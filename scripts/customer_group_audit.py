@@ -9,17 +9,34 @@ team members are present.
 import asyncio
 import json
 import os
+import sys
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from pathlib import Path
 
 import aiohttp
 import pandas as pd
 from dotenv import load_dotenv
 from telethon import TelegramClient
-from telethon.tl.functions.channels import GetFullChannelRequest
-from telethon.tl.functions.messages import (GetCommonChatsRequest,
-                                            GetFullChatRequest)
+from telethon.errors import FloodWaitError, UserNotParticipantError
+from telethon.tl.functions.channels import GetFullChannelRequest, GetParticipantRequest
+from telethon.tl.functions.messages import GetCommonChatsRequest, GetFullChatRequest
 from telethon.tl.types import Channel, Chat
 
+# Add the project root to the Python path for the shared Slack client
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scripts.audit_snapshots import (
+    DEFAULT_BASELINE_TTL_HOURS,
+    AuditBaseline,
+    GroupSnapshot,
+    diff_results,
+    team_fingerprint,
+)
+from src.scripts.progress_reporter import ProgressReporter
+from src.scripts.slack_client import SlackAPIError, SlackClient
+
 # Load environment variables
 load_dotenv()
 
@@ -78,6 +95,8 @@ SLACK_TOKEN = os.getenv(
     "SLACK_USER_TOKEN"
 )  # Use user token with groups:read/history scopes
 BD_CHANNEL_ID = "C094Q9TUVUL"  # #business-development
+# Channels whose members are fetched at the same time
+SLACK_AUDIT_CONCURRENCY = 8
 
 if not SLACK_TOKEN:
     print("❌ SLACK_USER_TOKEN not found in .env file")
@@ -93,6 +112,17 @@ except (ValueError, TypeError):
     TELEGRAM_API_HASH = ""
     TELEGRAM_ENABLED = False
 
+# Telegram requests in flight at the same time across all group probes
+TELEGRAM_AUDIT_CONCURRENCY = 8
+# Retries of a Telegram request after FloodWaitErrors
+MAX_FLOOD_RETRIES = 3
+# Supergroups smaller than this have their members listed in one request
+# (Telegram pages 200 members) instead of one GetParticipant per team member
+PARTICIPANT_LIST_LIMIT = 200
+
+# Completed audits searched for each platform's baseline snapshots
+BASELINE_AUDIT_RUNS = 10
+
 # Team members for SLACK (all should be in Slack channels)
 REQUIRED_SLACK_MEMBERS = {
     "akibalogh": "Aki Balogh (CEO)",
@@ -193,98 +223,148 @@ def needs_rename(group_name):
     return "iBTC" in group_name
 
 
+class TelegramRequestLimiter:
+    """Shared limit on concurrent Telegram requests.
+
+    A FloodWaitError holds back only the class of request that hit it (e.g.
+    "participant" lookups) for the wait Telegram asks for, and the request
+    is retried; other request classes keep going.
+    """
+
+    def __init__(
+        self, max_concurrent=TELEGRAM_AUDIT_CONCURRENCY, max_retries=MAX_FLOOD_RETRIES
+    ):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_retries = max_retries
+        self.resume_at = {}  # Request class -> monotonic time it may resume
+        self.flood_waits = {}  # Request class -> FloodWaitErrors received
+
+    async def request(self, request_class, make_request):
+        """Run ``make_request()`` once its request class may send again"""
+        for attempt in range(self.max_retries + 1):
+            while (
+                delay := self.resume_at.get(request_class, 0) - time.monotonic()
+            ) > 0:
+                await asyncio.sleep(delay)
+
+            async with self.semaphore:
+                try:
+                    return await make_request()
+                except FloodWaitError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    self.flood_waits[request_class] = (
+                        self.flood_waits.get(request_class, 0) + 1
+                    )
+                    self.resume_at[request_class] = max(
+                        self.resume_at.get(request_class, 0),
+                        time.monotonic() + e.seconds,
+                    )
+
+
 class CustomerGroupAuditor:
-    def __init__(self, audit_id=None):
+    def __init__(
+        self,
+        audit_id=None,
+        max_concurrent_channels=SLACK_AUDIT_CONCURRENCY,
+        max_concurrent_groups=TELEGRAM_AUDIT_CONCURRENCY,
+        baseline=None,
+    ):
         self.slack_user_map = {}  # Maps Slack username -> user_id
         self.required_slack_ids = {}
         self.optional_slack_ids = {}
         self.audit_results = []
         self.audit_id = audit_id
+        self.progress = ProgressReporter(audit_id)
+        self.max_concurrent_channels = max_concurrent_channels
+        self.max_concurrent_groups = max_concurrent_groups
+        # Shared Slack client of the running audit, see slack_session
+        self.slack = None
+        # Previous audits' snapshots; unchanged groups are carried forward
+        self.baseline = baseline or AuditBaseline.empty()
+        self.group_snapshots = []
+        self.audited_platforms = set()
+        self.carried_forward = {}  # Platform -> groups carried forward
+        # Snapshots of groups listed but not probed, e.g. on access errors
+        self.unavailable_groups = []
+
+    @asynccontextmanager
+    async def slack_session(self):
+        """The shared Slack client of the running audit, or a new one"""
+        if self.slack is not None:
+            yield self.slack
+        else:
+            async with SlackClient(SLACK_TOKEN) as client:
+                yield client
 
     async def get_slack_bd_members(self):
         """Get all workspace users and map team members"""
         print(f"📋 Fetching workspace users to map team members...")
 
-        headers = {"Authorization": f"Bearer {SLACK_TOKEN}"}
         team_id = None
 
-        async with aiohttp.ClientSession() as session:
+        async with self.slack_session() as client:
             # First get team_id for Enterprise Grid
-            async with session.get(
-                "https://slack.com/api/auth.test", headers=headers
-            ) as resp:
-                auth_data = await resp.json()
-                if auth_data.get("ok"):
-                    team_id = auth_data.get("team_id")
-                    print(f"   Team ID: {team_id}")
+            try:
+                auth_data = await client.call("auth.test")
+                team_id = auth_data.get("team_id")
+                print(f"   Team ID: {team_id}")
+            except (SlackAPIError, aiohttp.ClientError):
+                pass
 
             # Get ALL workspace users
-            cursor = None
-            user_count = 0
+            params = {"limit": 200}
+            if team_id:
+                params["team_id"] = team_id
+            try:
+                users = await client.paginate("users.list", "members", params)
+            except (SlackAPIError, aiohttp.ClientError) as e:
+                print(f"❌ Error getting users: {e}")
+                users = []
+
+        user_count = 0
+        for user in users:
+            if user.get("deleted") or user.get("is_bot"):
+                continue
+
+            user_id = user["id"]
+            username = user.get("name", "").lower()
+            real_name = user.get("real_name", "").lower()
+            display_name = user.get("profile", {}).get("display_name", "").lower()
+
+            self.slack_user_map[user_id] = {
+                "username": user.get("name", ""),
+                "real_name": user.get("real_name", ""),
+            }
 
-            while True:
-                params = {"limit": 200}
-                if team_id:
-                    params["team_id"] = team_id
-                if cursor:
-                    params["cursor"] = cursor
-
-                async with session.get(
-                    "https://slack.com/api/users.list", headers=headers, params=params
-                ) as resp:
-                    data = await resp.json()
-                    if not data.get("ok"):
-                        print(f"❌ Error getting users: {data.get('error')}")
-                        break
-
-                    for user in data.get("members", []):
-                        if user.get("deleted") or user.get("is_bot"):
-                            continue
-
-                        user_id = user["id"]
-                        username = user.get("name", "").lower()
-                        real_name = user.get("real_name", "").lower()
-                        display_name = (
-                            user.get("profile", {}).get("display_name", "").lower()
-                        )
+            user_count += 1
 
-                        self.slack_user_map[user_id] = {
-                            "username": user.get("name", ""),
-                            "real_name": user.get("real_name", ""),
-                        }
-
-                        user_count += 1
-
-                        # Check direct username mapping first
-                        actual_username = user.get("name", "").lower()
-                        if actual_username in SLACK_USERNAME_MAP:
-                            mapped_handle = SLACK_USERNAME_MAP[actual_username]
-
-                            # Is it a required member?
-                            if (
-                                mapped_handle in REQUIRED_SLACK_MEMBERS
-                                and mapped_handle not in self.required_slack_ids
-                            ):
-                                self.required_slack_ids[mapped_handle] = user_id
-                                print(
-                                    f"   ✓ Found required: "
-                                    f"{REQUIRED_SLACK_MEMBERS[mapped_handle]} "
-                                    f"(@{user.get('name')})"
-                                )
-
-                            # Is it an optional member?
-                            elif (
-                                mapped_handle in OPTIONAL_MEMBERS
-                                and mapped_handle not in self.optional_slack_ids
-                            ):
-                                self.optional_slack_ids[mapped_handle] = user_id
-                                print(
-                                    f"   ✓ Found optional: {OPTIONAL_MEMBERS[mapped_handle]} (@{user.get('name')})"
-                                )
-
-                    cursor = data.get("response_metadata", {}).get("next_cursor")
-                    if not cursor:
-                        break
+            # Check direct username mapping first
+            actual_username = user.get("name", "").lower()
+            if actual_username in SLACK_USERNAME_MAP:
+                mapped_handle = SLACK_USERNAME_MAP[actual_username]
+
+                # Is it a required member?
+                if (
+                    mapped_handle in REQUIRED_SLACK_MEMBERS
+                    and mapped_handle not in self.required_slack_ids
+                ):
+                    self.required_slack_ids[mapped_handle] = user_id
+                    print(
+                        f"   ✓ Found required: "
+                        f"{REQUIRED_SLACK_MEMBERS[mapped_handle]} "
+                        f"(@{user.get('name')})"
+                    )
+
+                # Is it an optional member?
+                elif (
+                    mapped_handle in OPTIONAL_MEMBERS
+                    and mapped_handle not in self.optional_slack_ids
+                ):
+                    self.optional_slack_ids[mapped_handle] = user_id
+                    print(
+                        f"   ✓ Found optional: {OPTIONAL_MEMBERS[mapped_handle]} (@{user.get('name')})"
+                    )
 
         print(f"\n   Scanned {user_count} workspace users")
         print(
@@ -311,135 +391,188 @@ class CustomerGroupAuditor:
         """Audit all Slack channels with 'bitsafe' in the name - always uses live API"""
         print(f"\n🔍 Auditing Slack channels...")
 
-        headers = {"Authorization": f"Bearer {SLACK_TOKEN}"}
-
         # Always use live API to ensure we have the latest channels (including newly created ones)
-        bitsafe_channels = []
-
         print(f"   Fetching channels from Slack API...")
 
-        async with aiohttp.ClientSession() as session:
-            params = {
-                "limit": 200,
-                "exclude_archived": "true",  # Skip archived channels (inactive)
-                "types": "public_channel,private_channel",
-            }
-            async with session.get(
-                "https://slack.com/api/conversations.list",
-                headers=headers,
-                params=params,
-            ) as resp:
-                data = await resp.json()
-                if data.get("ok"):
-                    all_channels = data.get("channels", [])
-                    bitsafe_channels = [
-                        ch
-                        for ch in all_channels
-                        if "bitsafe" in ch.get("name", "").lower()
-                    ]
-
-        print(f"   Found {len(bitsafe_channels)} BitSafe channels via API")
-
-        # Audit each channel (whether from file or API)
-        async with aiohttp.ClientSession() as session:
-            for channel in bitsafe_channels:
-                channel_id = channel["id"]
-                channel_name = channel["name"]
+        async with self.slack_session() as client:
+            try:
+                all_channels = await client.paginate(
+                    "conversations.list",
+                    "channels",
+                    {
+                        "limit": 200,
+                        "exclude_archived": "true",  # Skip archived channels (inactive)
+                        "types": "public_channel,private_channel",
+                    },
+                )
+                self.audited_platforms.add("Slack")
+            except (SlackAPIError, aiohttp.ClientError) as e:
+                print(f"❌ Error listing channels: {e}")
+                all_channels = []
+
+            bitsafe_channels = [
+                ch for ch in all_channels if "bitsafe" in ch.get("name", "").lower()
+            ]
+            print(f"   Found {len(bitsafe_channels)} BitSafe channels via API")
 
+            audited_channels = []
+            for channel in bitsafe_channels:
                 # Skip internal IEU alert channels
-                if "bitsafe-ieu" in channel_name.lower():
-                    print(f"   Skipping internal channel: {channel_name}")
+                if "bitsafe-ieu" in channel["name"].lower():
+                    print(f"   Skipping internal channel: {channel['name']}")
                     continue
-
-                is_private = channel.get(
-                    "is_private", True
-                )  # Default to private for safety
-
-                # Get channel members
-                async with session.get(
-                    "https://slack.com/api/conversations.members",
-                    headers=headers,
-                    params={"channel": channel_id},
-                ) as resp:
-                    data = await resp.json()
-                    if not data.get("ok"):
-                        print(
-                            f"   ⚠️  Couldn't access {channel_name}: {data.get('error')}"
+                audited_channels.append(channel)
+
+            # Channels unchanged since the last audit keep their results
+            team = team_fingerprint(
+                REQUIRED_SLACK_MEMBERS,
+                OPTIONAL_MEMBERS,
+                self.required_slack_ids,
+                self.optional_slack_ids,
+            )
+            snapshots = [
+                self.slack_snapshot(channel, team) for channel in audited_channels
+            ]
+            carried = [self.baseline.carry_forward(s) for s in snapshots]
+
+            # Fetch the member lists of the other channels concurrently
+            semaphore = asyncio.Semaphore(self.max_concurrent_channels)
+
+            async def channel_members(channel):
+                async with semaphore:
+                    try:
+                        return await client.paginate(
+                            "conversations.members",
+                            "members",
+                            {"channel": channel["id"], "limit": 1000},
                         )
-                        continue
-
-                    members = data.get("members", [])
-
-                # Check which required/optional members are present
-                required_present = []
-                required_missing = []
-                optional_present = []
-                optional_missing = []
-
-                for username, user_id in self.required_slack_ids.items():
-                    if user_id in members:
-                        required_present.append(REQUIRED_SLACK_MEMBERS[username])
-                    else:
-                        required_missing.append(REQUIRED_SLACK_MEMBERS[username])
-
-                for username, user_id in self.optional_slack_ids.items():
-                    if user_id in members:
-                        optional_present.append(OPTIONAL_MEMBERS[username])
-                    else:
-                        optional_missing.append(OPTIONAL_MEMBERS[username])
-
-                # Categorize the group
-                category, requires_full_team = categorize_group(channel_name)
-                rename_flag = "⚠️ YES" if needs_rename(channel_name) else "No"
-
-                # Add to results
-                self.audit_results.append(
-                    {
-                        "Platform": "Slack",
-                        "Group Name": channel_name,
-                        "Category": category,
-                        "Requires Full Team": "Yes" if requires_full_team else "No",
-                        "Needs Rename (iBTC)": rename_flag,
-                        "Privacy Status": "Private" if is_private else "⚠️ PUBLIC",
-                        "History Visibility": "N/A",  # Slack-specific, not applicable
-                        "Admin Status": "N/A",  # Slack channels managed via workspace admin
-                        "Total Members": len(members),
-                        "Required Present": (
-                            ", ".join(required_present) if required_present else "NONE"
-                        ),
-                        "Required Missing": (
-                            ", ".join(required_missing) if required_missing else "-"
-                        ),
-                        "Optional Present": (
-                            ", ".join(optional_present) if optional_present else "-"
-                        ),
-                        "Optional Missing": (
-                            ", ".join(optional_missing) if optional_missing else "-"
-                        ),
-                        "Completeness": f"{len(required_present)}/{len(REQUIRED_SLACK_MEMBERS)} required",
-                    }
+                    except (SlackAPIError, aiohttp.ClientError) as e:
+                        print(f"   ⚠️  Couldn't access {channel['name']}: {e}")
+                        return None
+
+            member_lists = iter(
+                await asyncio.gather(
+                    *(
+                        channel_members(channel)
+                        for channel, previous in zip(audited_channels, carried)
+                        if previous is None
+                    )
                 )
+            )
 
-                warning = (
-                    "" if requires_full_team or len(required_present) >= 3 else " ⚠️"
-                )
-                print(
-                    f"   ✓ {channel_name}: "
-                    f"{len(required_present)}/{len(REQUIRED_SLACK_MEMBERS)} "
-                    f"required [{category}]{warning}"
-                )
+        # Audit each channel in listing order
+        for channel, snapshot, previous in zip(audited_channels, snapshots, carried):
+            if previous is not None:
+                self.add_carried_result(*previous)
+                continue
+            members = next(member_lists)
+            if members is not None:
+                self.add_slack_result(channel, members)
+                self.group_snapshots.append(snapshot)
+            else:
+                self.unavailable_groups.append(snapshot)
+
+    def slack_snapshot(self, channel, team):
+        """Change markers of a Slack channel, as listed now"""
+        updated = channel.get("updated")
+        return GroupSnapshot(
+            platform="Slack",
+            group_id=channel["id"],
+            title=channel["name"],
+            member_count=channel.get("num_members"),
+            last_activity=str(updated) if updated is not None else None,
+            team=team,
+            audited_at=datetime.now().isoformat(timespec="seconds"),
+        )
+
+    def add_carried_result(self, result, snapshot):
+        """Record the previous result of a group unchanged since the last
+        audit"""
+        self.audit_results.append(result)
+        self.group_snapshots.append(snapshot)
+        self.carried_forward[snapshot.platform] = (
+            self.carried_forward.get(snapshot.platform, 0) + 1
+        )
+        print(f"   ↺ {result['Group Name']}: unchanged since {snapshot.audited_at}")
+
+    def add_slack_result(self, channel, members):
+        """Record which team members are in a Slack channel"""
+        channel_name = channel["name"]
+        is_private = channel.get("is_private", True)  # Default to private for safety
+        member_ids = set(members)
+
+        # Check which required/optional members are present
+        required_present = []
+        required_missing = []
+        optional_present = []
+        optional_missing = []
+
+        for username, user_id in self.required_slack_ids.items():
+            if user_id in member_ids:
+                required_present.append(REQUIRED_SLACK_MEMBERS[username])
+            else:
+                required_missing.append(REQUIRED_SLACK_MEMBERS[username])
+
+        for username, user_id in self.optional_slack_ids.items():
+            if user_id in member_ids:
+                optional_present.append(OPTIONAL_MEMBERS[username])
+            else:
+                optional_missing.append(OPTIONAL_MEMBERS[username])
+
+        # Categorize the group
+        category, requires_full_team = categorize_group(channel_name)
+        rename_flag = "⚠️ YES" if needs_rename(channel_name) else "No"
+
+        # Add to results
+        self.audit_results.append(
+            {
+                "Platform": "Slack",
+                "Group ID": channel["id"],
+                "Group Name": channel_name,
+                "Category": category,
+                "Requires Full Team": "Yes" if requires_full_team else "No",
+                "Needs Rename (iBTC)": rename_flag,
+                "Privacy Status": "Private" if is_private else "⚠️ PUBLIC",
+                "History Visibility": "N/A",  # Slack-specific, not applicable
+                "Admin Status": "N/A",  # Slack channels managed via workspace admin
+                "Total Members": len(members),
+                "Required Present": (
+                    ", ".join(required_present) if required_present else "NONE"
+                ),
+                "Required Missing": (
+                    ", ".join(required_missing) if required_missing else "-"
+                ),
+                "Optional Present": (
+                    ", ".join(optional_present) if optional_present else "-"
+                ),
+                "Optional Missing": (
+                    ", ".join(optional_missing) if optional_missing else "-"
+                ),
+                "Completeness": f"{len(required_present)}/{len(REQUIRED_SLACK_MEMBERS)} required",
+            }
+        )
 
-    async def audit_telegram_groups(self):
+        warning = "" if requires_full_team or len(required_present) >= 3 else " ⚠️"
+        print(
+            f"   ✓ {channel_name}: "
+            f"{len(required_present)}/{len(REQUIRED_SLACK_MEMBERS)} "
+            f"required [{category}]{warning}"
+        )
+
+    async def audit_telegram_groups(self, client=None):
         """Audit all Telegram groups shared with @mojo_onchain"""
         print(f"\n🔍 Auditing Telegram groups...")
 
-        telegram_phone = os.getenv("TELEGRAM_PHONE", "")
-        if not telegram_phone:
-            print("   ⚠️  TELEGRAM_PHONE not configured - skipping Telegram audit")
-            return
+        if client is None:
+            telegram_phone = os.getenv("TELEGRAM_PHONE", "")
+            if not telegram_phone:
+                print("   ⚠️  TELEGRAM_PHONE not configured - skipping Telegram audit")
+                return
 
-        client = TelegramClient("telegram_session", TELEGRAM_API_ID, TELEGRAM_API_HASH)
-        await client.start(phone=telegram_phone)
+            client = TelegramClient(
+                "telegram_session", TELEGRAM_API_ID, TELEGRAM_API_HASH
+            )
+            await client.start(phone=telegram_phone)
 
         # Find @mojo_onchain
         try:
@@ -479,8 +612,8 @@ class CustomerGroupAuditor:
             common_chat_ids = all_common_chats
             print(f"   Total common groups: {len(common_chat_ids)}")
 
-            # Get details for each group
-            for idx, chat in enumerate(common_chat_ids, 1):
+            audited_chats = []
+            for chat in common_chat_ids:
                 if not hasattr(chat, "title"):
                     continue
 
@@ -502,152 +635,292 @@ class CustomerGroupAuditor:
                     print(f"   ⚠️  Skipping hacked group: {group_name}")
                     continue
 
-                member_count = getattr(chat, "participants_count", 0)
-
-                # Update progress every 50 groups
-                if self.audit_id and idx % 50 == 0:
-                    update_audit_progress(self.audit_id, telegram_current=idx)
-                    print(
-                        f"   Progress: {idx}/{len(common_chat_ids)} groups scanned..."
-                    )
+                audited_chats.append(chat)
 
-                # Check history visibility settings
-                history_visible = "Unknown"
-                try:
-                    if isinstance(chat, Channel):
-                        full_chat = await client(GetFullChannelRequest(chat))
-                        hidden = full_chat.full_chat.hidden_prehistory
-                    elif isinstance(chat, Chat):
-                        full_chat = await client(GetFullChatRequest(chat.id))
-                        hidden = getattr(
-                            full_chat.full_chat, "hidden_prehistory", False
-                        )
-                    else:
-                        hidden = False  # Default for other chat types
+            self.audited_platforms.add("Telegram")
 
-                    history_visible = "Hidden" if hidden else "Visible"
-                except Exception as e:
-                    print(
-                        f"      Warning: Couldn't check history settings for {group_name}: {e}"
-                    )
-                    history_visible = "Unknown"
+            # Our own account and the team members are looked up once for
+            # all groups
+            limiter = TelegramRequestLimiter(self.max_concurrent_groups)
+            me = await client.get_me()
+            team_users = await self.resolve_telegram_team(client, limiter)
 
-                # Check admin status
-                admin_status = "Member"
-                try:
-                    # Get our own permissions in this chat
-                    me = await client.get_me()
-                    perms = await client.get_permissions(chat, me)
-
-                    if perms.is_creator:
-                        admin_status = "✅ Owner"
-                    elif perms.is_admin:
-                        # Check if we have change_info permission
-                        if hasattr(perms, "change_info") and perms.change_info:
-                            admin_status = "✅ Admin (can rename)"
-                        else:
-                            admin_status = "Admin (no rename)"
-                    else:
-                        admin_status = "Member"
-                except Exception as e:
-                    # If permission check fails, assume member
-                    admin_status = (
-                        f"Unknown ({str(e)[:30]}...)" if str(e) else "Unknown"
-                    )
+            # Groups unchanged since the last audit keep their results
+            team = team_fingerprint(
+                REQUIRED_TELEGRAM_MEMBERS,
+                OPTIONAL_MEMBERS,
+                {username: user.id for username, user in team_users.items()},
+            )
+            last_activity = await self.telegram_last_activity(client)
+            snapshots = [
+                self.telegram_snapshot(chat, last_activity.get(chat.id), team)
+                for chat in audited_chats
+            ]
+            carried = [self.baseline.carry_forward(s) for s in snapshots]
+            reprobed = sum(previous is None for previous in carried)
 
-                # Get participants
-                try:
-                    participants = await client.get_participants(chat)
-
-                    # Map Telegram usernames to our team list
-                    required_present = []
-                    required_missing = list(REQUIRED_TELEGRAM_MEMBERS.values())
-                    optional_present = []
-                    optional_missing = list(OPTIONAL_MEMBERS.values())
-
-                    # Check each participant
-                    for p in participants:
-                        username = getattr(p, "username", None)
-                        if not username:
-                            continue
-
-                        # Check required members
-                        if username in REQUIRED_TELEGRAM_MEMBERS:
-                            required_present.append(REQUIRED_TELEGRAM_MEMBERS[username])
-                            if REQUIRED_TELEGRAM_MEMBERS[username] in required_missing:
-                                required_missing.remove(
-                                    REQUIRED_TELEGRAM_MEMBERS[username]
-                                )
-
-                        # Check optional members
-                        if username in OPTIONAL_MEMBERS:
-                            optional_present.append(OPTIONAL_MEMBERS[username])
-                            if OPTIONAL_MEMBERS[username] in optional_missing:
-                                optional_missing.remove(OPTIONAL_MEMBERS[username])
-
-                    # Categorize the group
-                    category, requires_full_team = categorize_group(group_name)
-                    rename_flag = "⚠️ YES" if needs_rename(group_name) else "No"
-                    history_flag = (
-                        "⚠️ HIDDEN" if history_visible == "Hidden" else history_visible
-                    )
+            # Probe the other groups concurrently under the shared limiter
+            scanned = 0
 
-                    # Check if group has "BitSafe" in name (work-related groups)
-                    has_bitsafe = "bitsafe" in group_name.lower()
-                    bitsafe_flag = "✓ YES" if has_bitsafe else "No"
-
-                    # Add to results
-                    self.audit_results.append(
-                        {
-                            "Platform": "Telegram",
-                            "Group Name": group_name,
-                            "Has BitSafe Name": bitsafe_flag,
-                            "Category": category,
-                            "Requires Full Team": "Yes" if requires_full_team else "No",
-                            "Needs Rename (iBTC)": rename_flag,
-                            "Privacy Status": "Private",  # TG groups in common are always accessible
-                            "History Visibility": history_flag,
-                            "Admin Status": admin_status,
-                            "Total Members": len(participants),
-                            "Required Present": (
-                                ", ".join(required_present)
-                                if required_present
-                                else "NONE"
-                            ),
-                            "Required Missing": (
-                                ", ".join(required_missing) if required_missing else "-"
-                            ),
-                            "Optional Present": (
-                                ", ".join(optional_present) if optional_present else "-"
-                            ),
-                            "Optional Missing": (
-                                ", ".join(optional_missing) if optional_missing else "-"
-                            ),
-                            "Completeness": f"{len(required_present)}/{len(REQUIRED_TELEGRAM_MEMBERS)} required",
-                        }
-                    )
+            async def probe(chat):
+                nonlocal scanned
+                probe_result = await self.probe_telegram_group(
+                    client, limiter, chat, me, team_users
+                )
 
-                    warning = (
-                        ""
-                        if requires_full_team or len(required_present) >= 3
-                        else " ⚠️"
-                    )
-                    rename_note = " [RENAME]" if needs_rename(group_name) else ""
-                    print(
-                        f"   ✓ {group_name}: "
-                        f"{len(required_present)}/{len(REQUIRED_TELEGRAM_MEMBERS)} "
-                        f"required [{category}]{warning}{rename_note}"
+                # The reporter coalesces updates; print every 50 groups
+                scanned += 1
+                self.progress.update(telegram_current=scanned)
+                if scanned % 50 == 0:
+                    print(f"   Progress: {scanned}/{reprobed} groups scanned...")
+                return probe_result
+
+            probe_results = iter(
+                await asyncio.gather(
+                    *(
+                        probe(chat)
+                        for chat, previous in zip(audited_chats, carried)
+                        if previous is None
                     )
+                )
+            )
 
-                except Exception as e:
-                    print(f"   ⚠️  Couldn't audit {group_name}: {e}")
+            # Record the groups in listing order
+            for snapshot, previous in zip(snapshots, carried):
+                if previous is not None:
+                    self.add_carried_result(*previous)
                     continue
+                probe_result = next(probe_results)
+                if probe_result is not None:
+                    result, summary = probe_result
+                    self.audit_results.append(result)
+                    self.group_snapshots.append(snapshot)
+                    print(summary)
+                else:
+                    self.unavailable_groups.append(snapshot)
+
+            if limiter.flood_waits:
+                print(f"   Flood waits by request type: {limiter.flood_waits}")
 
         except Exception as e:
             print(f"❌ Error getting common chats: {e}")
 
         await client.disconnect()
 
+    async def telegram_last_activity(self, client):
+        """Top message ID of each dialog by chat ID, marking when the
+        groups last changed (joins and leaves post service messages)"""
+        try:
+            dialogs = await client.get_dialogs()
+        except Exception as e:
+            print(f"   ⚠️  Couldn't list dialogs: {e}")
+            return {}
+        return {
+            dialog.entity.id: str(dialog.message.id)
+            for dialog in dialogs
+            if dialog.message is not None
+        }
+
+    def telegram_snapshot(self, chat, last_activity, team):
+        """Change markers of a Telegram group, as listed now"""
+        return GroupSnapshot(
+            platform="Telegram",
+            group_id=str(chat.id),
+            title=chat.title,
+            member_count=getattr(chat, "participants_count", None),
+            last_activity=last_activity,
+            team=team,
+            audited_at=datetime.now().isoformat(timespec="seconds"),
+        )
+
+    async def resolve_telegram_team(self, client, limiter):
+        """Telegram users of the required and optional team members, by
+        username"""
+        team_users = {}
+        for username in {**REQUIRED_TELEGRAM_MEMBERS, **OPTIONAL_MEMBERS}:
+            try:
+                team_users[username] = await limiter.request(
+                    "resolve_username", lambda: client.get_entity(username)
+                )
+            except Exception as e:
+                print(f"   ⚠️  Couldn't find @{username}: {e}")
+        return team_users
+
+    async def telegram_team_present(
+        self, client, limiter, chat, team_users, member_count=None
+    ):
+        """Usernames of the team members in a group, from its member list
+        when it fits one page, otherwise checked one by one with
+        GetParticipant"""
+        if not isinstance(chat, Channel) or (
+            member_count is not None and member_count < PARTICIPANT_LIST_LIMIT
+        ):
+            participants = await limiter.request(
+                "participants", lambda: client.get_participants(chat)
+            )
+            participant_ids = {p.id for p in participants}
+            return {
+                username
+                for username, user in team_users.items()
+                if user.id in participant_ids
+            }
+
+        async def is_participant(user):
+            try:
+                await limiter.request(
+                    "participant", lambda: client(GetParticipantRequest(chat, user))
+                )
+                return True
+            except UserNotParticipantError:
+                return False
+
+        usernames = list(team_users)
+        present = await asyncio.gather(
+            *(is_participant(team_users[username]) for username in usernames)
+        )
+        return {username for username, found in zip(usernames, present) if found}
+
+    async def probe_telegram_group(self, client, limiter, chat, me, team_users):
+        """Audit result and summary line of a Telegram group, or None when
+        its members can't be checked"""
+        group_name = chat.title
+        member_count = getattr(chat, "participants_count", None)
+        participant_ids = None
+
+        # Check history visibility settings
+        history_visible = "Unknown"
+        try:
+            if isinstance(chat, Channel):
+                full_chat = await limiter.request(
+                    "full_chat", lambda: client(GetFullChannelRequest(chat))
+                )
+                hidden = full_chat.full_chat.hidden_prehistory
+                member_count = full_chat.full_chat.participants_count
+            elif isinstance(chat, Chat):
+                full_chat = await limiter.request(
+                    "full_chat", lambda: client(GetFullChatRequest(chat.id))
+                )
+                hidden = getattr(full_chat.full_chat, "hidden_prehistory", False)
+
+                # Basic groups list their members in the full chat
+                participants = getattr(
+                    full_chat.full_chat.participants, "participants", None
+                )
+                if participants is not None:
+                    participant_ids = {p.user_id for p in participants}
+                    member_count = len(participant_ids)
+            else:
+                hidden = False  # Default for other chat types
+
+            history_visible = "Hidden" if hidden else "Visible"
+        except Exception as e:
+            print(
+                f"      Warning: Couldn't check history settings for {group_name}: {e}"
+            )
+            history_visible = "Unknown"
+
+        # Check admin status
+        admin_status = "Member"
+        try:
+            # Get our own permissions in this chat
+            perms = await limiter.request(
+                "permissions", lambda: client.get_permissions(chat, me)
+            )
+
+            if perms.is_creator:
+                admin_status = "✅ Owner"
+            elif perms.is_admin:
+                # Check if we have change_info permission
+                if hasattr(perms, "change_info") and perms.change_info:
+                    admin_status = "✅ Admin (can rename)"
+                else:
+                    admin_status = "Admin (no rename)"
+            else:
+                admin_status = "Member"
+        except Exception as e:
+            # If permission check fails, assume member
+            admin_status = f"Unknown ({str(e)[:30]}...)" if str(e) else "Unknown"
+
+        # Check which team members are in the group
+        try:
+            if participant_ids is not None:
+                present = {
+                    username
+                    for username, user in team_users.items()
+                    if user.id in participant_ids
+                }
+            else:
+                present = await self.telegram_team_present(
+                    client, limiter, chat, team_users, member_count
+                )
+        except Exception as e:
+            print(f"   ⚠️  Couldn't audit {group_name}: {e}")
+            return None
+
+        required_present = [
+            name
+            for username, name in REQUIRED_TELEGRAM_MEMBERS.items()
+            if username in present
+        ]
+        required_missing = [
+            name
+            for username, name in REQUIRED_TELEGRAM_MEMBERS.items()
+            if username not in present
+        ]
+        optional_present = [
+            name for username, name in OPTIONAL_MEMBERS.items() if username in present
+        ]
+        optional_missing = [
+            name
+            for username, name in OPTIONAL_MEMBERS.items()
+            if username not in present
+        ]
+
+        # Categorize the group
+        category, requires_full_team = categorize_group(group_name)
+        rename_flag = "⚠️ YES" if needs_rename(group_name) else "No"
+        history_flag = "⚠️ HIDDEN" if history_visible == "Hidden" else history_visible
+
+        # Check if group has "BitSafe" in name (work-related groups)
+        has_bitsafe = "bitsafe" in group_name.lower()
+        bitsafe_flag = "✓ YES" if has_bitsafe else "No"
+
+        result = {
+            "Platform": "Telegram",
+            "Group ID": str(chat.id),
+            "Group Name": group_name,
+            "Has BitSafe Name": bitsafe_flag,
+            "Category": category,
+            "Requires Full Team": "Yes" if requires_full_team else "No",
+            "Needs Rename (iBTC)": rename_flag,
+            "Privacy Status": "Private",  # TG groups in common are always accessible
+            "History Visibility": history_flag,
+            "Admin Status": admin_status,
+            "Total Members": member_count or 0,
+            "Required Present": (
+                ", ".join(required_present) if required_present else "NONE"
+            ),
+            "Required Missing": (
+                ", ".join(required_missing) if required_missing else "-"
+            ),
+            "Optional Present": (
+                ", ".join(optional_present) if optional_present else "-"
+            ),
+            "Optional Missing": (
+                ", ".join(optional_missing) if optional_missing else "-"
+            ),
+            "Completeness": f"{len(required_present)}/{len(REQUIRED_TELEGRAM_MEMBERS)} required",
+        }
+
+        warning = "" if requires_full_team or len(required_present) >= 3 else " ⚠️"
+        rename_note = " [RENAME]" if needs_rename(group_name) else ""
+        summary = (
+            f"   ✓ {group_name}: "
+            f"{len(required_present)}/{len(REQUIRED_TELEGRAM_MEMBERS)} "
+            f"required [{category}]{warning}{rename_note}"
+        )
+        return result, summary
+
     def generate_report(self):
         """Generate Excel report"""
         print(f"\n📊 Generating report...")
@@ -722,40 +995,39 @@ class CustomerGroupAuditor:
             )
 
 
-def update_audit_progress(audit_id, slack_current=None, telegram_current=None):
-    """Update audit progress in database for real-time tracking"""
-    if not audit_id:
-        return
-
+def load_audit_baseline(ttl_hours=DEFAULT_BASELINE_TTL_HOURS):
+    """Group snapshots of the last completed audits, or an empty baseline
+    when they can't be loaded"""
     try:
-        import os
-
         import psycopg2
 
         database_url = os.getenv("DATABASE_URL")
         if not database_url:
-            return
+            return AuditBaseline.empty()
 
         conn = psycopg2.connect(database_url)
         cursor = conn.cursor()
-
-        if slack_current is not None:
-            cursor.execute(
-                "UPDATE audit_runs SET slack_progress_current = %s WHERE id = %s",
-                (slack_current, audit_id),
-            )
-
-        if telegram_current is not None:
-            cursor.execute(
-                "UPDATE audit_runs SET telegram_progress_current = %s WHERE id = %s",
-                (telegram_current, audit_id),
-            )
-
-        conn.commit()
+        cursor.execute(
+            """
+            SELECT id, results_json FROM audit_runs
+            WHERE status = 'completed' AND results_json IS NOT NULL
+            ORDER BY completed_at DESC
+            LIMIT %s
+            """,
+            (BASELINE_AUDIT_RUNS,),
+        )
+        rows = cursor.fetchall()
         cursor.close()
         conn.close()
     except Exception as e:
-        print(f"Warning: Could not update progress: {e}")
+        print(f"Warning: Could not load previous audit: {e}")
+        return AuditBaseline.empty()
+
+    runs = [
+        (audit_id, json.loads(data) if isinstance(data, str) else data)
+        for audit_id, data in rows
+    ]
+    return AuditBaseline.from_audit_runs(runs, ttl_hours)
 
 
 async def main():
@@ -772,20 +1044,41 @@ async def main():
     parser.add_argument(
         "--audit-id", type=int, help="Audit ID for progress tracking", default=None
     )
+    parser.add_argument(
+        "--baseline-ttl-hours",
+        type=float,
+        default=DEFAULT_BASELINE_TTL_HOURS,
+        help="Re-probe unchanged groups whose last probe is older than this",
+    )
+    parser.add_argument(
+        "--full-audit",
+        action="store_true",
+        help="Probe every group instead of reusing the previous audit",
+    )
     args = parser.parse_args()
 
-    auditor = CustomerGroupAuditor(audit_id=args.audit_id)
-
-    # Step 1: Get Slack user IDs
-    await auditor.get_slack_bd_members()
-
-    # Step 2: Audit Slack channels
-    print("\n🔍 Auditing Slack channels...")
-    await auditor.audit_slack_channels()
+    baseline = (
+        AuditBaseline.empty()
+        if args.full_audit
+        else load_audit_baseline(args.baseline_ttl_hours)
+    )
+    if baseline.audit_ids:
+        print(f"📋 Reusing unchanged groups from audits {baseline.audit_ids}")
+    auditor = CustomerGroupAuditor(audit_id=args.audit_id, baseline=baseline)
+
+    # One pooled, rate-limited Slack client for both Slack steps
+    async with SlackClient(SLACK_TOKEN) as auditor.slack:
+        # Step 1: Get Slack user IDs
+        await auditor.get_slack_bd_members()
+
+        # Step 2: Audit Slack channels
+        print("\n🔍 Auditing Slack channels...")
+        await auditor.audit_slack_channels()
+    auditor.slack = None
     slack_count = len(
         [r for r in auditor.audit_results if r.get("Platform") == "Slack"]
     )
-    update_audit_progress(args.audit_id, slack_current=slack_count)
+    auditor.progress.update(slack_current=slack_count)
     print(f"✓ Completed {slack_count} Slack channels")
 
     # Step 3: Audit Telegram groups (optional, skip for scheduled runs)
@@ -797,10 +1090,11 @@ async def main():
         telegram_count = len(
             [r for r in auditor.audit_results if r.get("Platform") == "Telegram"]
         )
-        update_audit_progress(args.audit_id, telegram_current=telegram_count)
+        auditor.progress.update(telegram_current=telegram_count)
         print(f"✓ Completed {telegram_count} Telegram groups")
     else:
         print("\n⚠️  Telegram audit skipped (credentials not configured)")
+    auditor.progress.close()
 
     # Step 4: Generate report
     auditor.generate_report()
@@ -839,8 +1133,23 @@ async def main():
         "incomplete_channels": incomplete_channels,
         "slack_channels": slack_results,
         "telegram_groups": telegram_results,
+        # Baseline of the next audit, and what changed since the last one
+        "group_snapshots": [s.to_dict() for s in auditor.group_snapshots],
+        "baseline_audit_ids": baseline.audit_ids,
+        "carried_forward": auditor.carried_forward,
+        "changes": diff_results(
+            baseline,
+            auditor.audited_platforms,
+            auditor.audit_results,
+            auditor.unavailable_groups,
+        ),
     }
 
+    changed = [c for c in json_output["changes"] if c["status"] != "unchanged"]
+    print(f"\n🔄 Changed since last audit: {len(changed)} groups")
+    for change in changed:
+        print(f"   {change['status']}: {change['name']} ({change['platform']})")
+
     # Output in parseable format for webapp
     print("\n" + "=" * 80)
     print("AUDIT_RESULTS_JSON_START")
@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 """
 Populate Stage Detections
-Processes all existing messages in the database to detect deal stages and populate the stage_detections table.
+Processes messages in the database to detect deal stages and populate the stage_detections table.
 This script should be run after slack_ingest.py to enable proper commission calculations.
+Runs are incremental: only messages added since the previous run are processed, unless
+the stage config changed or --full is given.
 """
 
 import json
 import logging
 import sqlite3
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to the Python path for the shared src.etl utilities
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.etl.utils.stage_detector import StageDetector
 
 # Set up logging
 logging.basicConfig(
@@ -19,12 +27,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Messages read and detections written per round trip
+BATCH_SIZE = 1000
+
+# stage_detection_state row tracking the Slack messages table
+STATE_SOURCE = "messages"
+
 
 class StageDetectionPopulator:
     def __init__(self, db_path: str = "repsplit.db", config_file: str = "config.json"):
         self.db_path = db_path
         self.config_file = config_file
         self.config = self.load_config()
+        self.stage_detector = StageDetector.from_config(self.config)
 
     def load_config(self) -> Dict:
         """Load configuration from config.json"""
@@ -40,28 +55,38 @@ class StageDetectionPopulator:
 
     def detect_stages_in_message(self, text: str) -> List[Tuple[str, float]]:
         """Detect deal stages in a message based on keyword patterns"""
-        detected_stages = []
-        text_lower = text.lower()
+        return self.stage_detector.detect(text)
 
-        for stage_config in self.config.get("stages", []):
-            stage_name = stage_config["name"]
-            keywords = stage_config["keywords"]
-
-            matches = 0
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    matches += 1
+    def _ensure_state_table(self, cursor):
+        """Create the table remembering how far detection has progressed"""
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stage_detection_state (
+                source TEXT PRIMARY KEY,
+                last_rowid INTEGER NOT NULL,
+                config_version TEXT NOT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
 
-            if matches > 0:
-                # Calculate confidence based on number of keyword matches
-                # Higher base confidence for multiple matches
-                confidence = min(1.0, 0.3 + (matches * 0.4))
-                detected_stages.append((stage_name, confidence))
+    def _load_state(self, cursor) -> Optional[Tuple[int, str]]:
+        """(last processed messages rowid, stage config version), if any"""
+        cursor.execute(
+            "SELECT last_rowid, config_version FROM stage_detection_state "
+            "WHERE source = ?",
+            (STATE_SOURCE,),
+        )
+        return cursor.fetchone()
 
-        return detected_stages
+    def populate_stage_detections(self, full_rebuild: bool = False):
+        """Detect stages in new messages and add them to stage_detections.
 
-    def populate_stage_detections(self):
-        """Process all messages and populate stage_detections table"""
+        Only messages added (or replaced) since the last run are processed.
+        Everything is rebuilt when the stage config changed, on the first run
+        or when ``full_rebuild`` is set. All changes are written in one
+        transaction, so readers never see a partially populated table.
+        """
         logger.info("Starting stage detection population...")
 
         conn = sqlite3.connect(self.db_path)
@@ -75,67 +100,106 @@ class StageDetectionPopulator:
             logger.error(
                 "stage_detections table not found. Please run slack_ingest.py first."
             )
+            conn.close()
             return
 
         # Check if messages table has data
-        cursor.execute("SELECT COUNT(*) FROM messages")
-        message_count = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*), MAX(rowid) FROM messages")
+        message_count, max_rowid = cursor.fetchone()
         if message_count == 0:
             logger.error(
                 "No messages found in database. Please run slack_ingest.py first."
             )
+            conn.close()
             return
 
-        logger.info(f"Found {message_count} messages to process")
-
-        # Clear existing stage detections
-        cursor.execute("DELETE FROM stage_detections")
-        logger.info("Cleared existing stage detections")
+        self._ensure_state_table(cursor)
+        config_version = self.stage_detector.version
+        state = self._load_state(cursor)
+
+        if full_rebuild or state is None or state[1] != config_version:
+            reason = (
+                "requested"
+                if full_rebuild
+                else "no previous run"
+                if state is None
+                else "stage config changed"
+            )
+            logger.info(f"Rebuilding all stage detections ({reason})")
+            last_rowid = 0
+            cursor.execute("DELETE FROM stage_detections")
+        else:
+            last_rowid = state[0]
+            # Replaced messages get a new rowid, drop their old detections
+            cursor.execute(
+                """
+                DELETE FROM stage_detections
+                WHERE message_id IN (
+                    SELECT id FROM messages WHERE rowid > ? AND rowid <= ?
+                )
+            """,
+                (last_rowid, max_rowid),
+            )
 
-        # Get all messages with conversation and user info
         cursor.execute(
+            "SELECT COUNT(*) FROM messages WHERE rowid > ? AND rowid <= ?",
+            (last_rowid, max_rowid),
+        )
+        pending_count = cursor.fetchone()[0]
+        logger.info(
+            f"Found {message_count} messages, {pending_count} new since last run"
+        )
+
+        # Stream new messages in conversation order and write in batches
+        reader = conn.cursor()
+        reader.execute(
             """
-            SELECT m.id, m.conv_id, m.author, m.timestamp, m.text, u.display_name
+            SELECT m.id, m.conv_id, m.author, m.timestamp, m.text
             FROM messages m
-            LEFT JOIN users u ON m.author = u.id
+            WHERE m.rowid > ? AND m.rowid <= ?
             ORDER BY m.conv_id, m.timestamp
-        """
+        """,
+            (last_rowid, max_rowid),
         )
 
-        messages = cursor.fetchall()
-        logger.info(f"Processing {len(messages)} messages...")
-
-        # Process each message
+        processed = 0
         stage_detections_inserted = 0
-        for i, (
-            message_id,
-            conv_id,
-            author,
-            timestamp,
-            text,
-            display_name,
-        ) in enumerate(messages):
-            if i % 100 == 0:
-                logger.info(f"Processed {i}/{len(messages)} messages...")
-
-            # Skip empty or very short messages
-            if not text or len(text.strip()) < 3:
-                continue
-
-            # Detect stages in this message
-            detected_stages = self.detect_stages_in_message(text)
-
-            # Insert stage detections
-            for stage_name, confidence in detected_stages:
-                cursor.execute(
-                    """
-                    INSERT INTO stage_detections
-                    (conv_id, stage_name, message_id, author, timestamp, confidence)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (conv_id, stage_name, message_id, author, timestamp, confidence),
-                )
-                stage_detections_inserted += 1
+        while True:
+            rows = reader.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+
+            detections = []
+            for message_id, conv_id, author, timestamp, text in rows:
+                # Skip empty or very short messages
+                if not text or len(text.strip()) < 3:
+                    continue
+
+                for stage_name, confidence in self.detect_stages_in_message(text):
+                    detections.append(
+                        (conv_id, stage_name, message_id, author, timestamp, confidence)
+                    )
+
+            cursor.executemany(
+                """
+                INSERT INTO stage_detections
+                (conv_id, stage_name, message_id, author, timestamp, confidence)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                detections,
+            )
+            stage_detections_inserted += len(detections)
+            processed += len(rows)
+            logger.info(f"Processed {processed}/{pending_count} messages...")
+
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO stage_detection_state
+            (source, last_rowid, config_version, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+            (STATE_SOURCE, max(max_rowid, last_rowid), config_version),
+        )
 
         # Commit changes
         conn.commit()
@@ -143,7 +207,7 @@ class StageDetectionPopulator:
 
         logger.info(f"Stage detection population complete!")
         logger.info(
-            f"Inserted {stage_detections_inserted} stage detections from {len(messages)} messages"
+            f"Inserted {stage_detections_inserted} stage detections from {processed} messages"
         )
 
         # Show summary by stage
@@ -180,14 +244,15 @@ class StageDetectionPopulator:
 
 def main():
     """Main entry point"""
-    import sys
-
     print("Stage Detection Populator")
     print("=========================")
 
-    # Get database path from command line or use default
-    if len(sys.argv) > 1:
-        db_path = sys.argv[1]
+    # Get database path from command line or use default; --full rebuilds
+    # every detection instead of only processing new messages
+    args = [arg for arg in sys.argv[1:] if arg != "--full"]
+    full_rebuild = "--full" in sys.argv[1:]
+    if args:
+        db_path = args[0]
     else:
         db_path = "repsplit.db"
 
@@ -211,7 +276,7 @@ def main():
 
     # Initialize and run
     populator = StageDetectionPopulator(db_path, config_path)
-    populator.populate_stage_detections()
+    populator.populate_stage_detections(full_rebuild=full_rebuild)
 
     print("\n✅ Stage detection population complete!")
     print(
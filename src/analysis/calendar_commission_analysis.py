@@ -7,14 +7,22 @@ Integrates Google Calendar data with commission analysis to show complete team i
 import datetime
 import json
 
+from calendar_snapshot import (
+    CALENDAR_SNAPSHOT_FILE,
+    CALENDAR_SNAPSHOT_TTL_SECONDS,
+    CalendarSnapshot,
+)
 from google_calendar_integration import GoogleCalendarIntegration
 
+KEY_PEOPLE_CALENDAR = "aki@dlc.link"
+
 
 class CalendarCommissionAnalysis:
     """Analyze calendar data for commission analysis"""
 
-    def __init__(self):
+    def __init__(self, snapshot: CalendarSnapshot = None):
         self.calendar = GoogleCalendarIntegration()
+        self.snapshot = snapshot
         self.team_emails = {
             "Aki": "aki@dlc.link",
             "Addie": "addie@dlc.link",
@@ -29,21 +37,89 @@ class CalendarCommissionAnalysis:
         """Authenticate with Google Calendar"""
         return self.calendar.authenticate()
 
+    def load_snapshot(
+        self,
+        days_back: int = 180,
+        cache_file: str = CALENDAR_SNAPSHOT_FILE,
+        ttl_seconds: float = CALENDAR_SNAPSHOT_TTL_SECONDS,
+    ) -> CalendarSnapshot:
+        """Fetch (or load from ``cache_file`` while younger than
+        ``ttl_seconds``) every searched calendar once, so that
+        get_company_meeting_data answers from memory afterwards"""
+        calendar_ids = list(
+            dict.fromkeys(
+                [KEY_PEOPLE_CALENDAR]
+                + list(self.team_emails.values())
+                + list(self.calendar.calendar_ids)
+            )
+        )
+        self.snapshot = CalendarSnapshot.load_or_fetch(
+            self.calendar.service, calendar_ids, days_back, cache_file, ttl_seconds
+        )
+        return self.snapshot
+
+    def _use_snapshot(self, days_back: int) -> bool:
+        return self.snapshot is not None and self.snapshot.days_back == days_back
+
+    def _snapshot_meeting(self, calendar_id: str, event: dict) -> dict:
+        """Snapshot event in the format of the calendar search methods"""
+        start = event["start"].get("dateTime", event["start"].get("date"))
+        end = event["end"].get("dateTime", event["end"].get("date"))
+        return {
+            "calendar_id": calendar_id,
+            "event_id": event["id"],
+            "title": event.get("summary", "No Title"),
+            "start": start,
+            "end": end,
+            "description": event.get("description", ""),
+            "attendees": [a.get("email", "") for a in event.get("attendees", [])],
+            "duration_minutes": self.calendar._calculate_duration(start, end),
+        }
+
+    def _snapshot_company_meetings(self, company_name: str) -> list:
+        """search_meetings_for_company answered from the snapshot"""
+        company_lower = company_name.lower()
+        meetings = []
+        for calendar_id in self.calendar.calendar_ids:
+            for event in self.snapshot.search(calendar_id, company_name):
+                if (
+                    company_lower in event.get("summary", "No Title").lower()
+                    or company_lower in event.get("description", "").lower()
+                ):
+                    meetings.append(self._snapshot_meeting(calendar_id, event))
+        return meetings
+
+    def _snapshot_user_meetings(self, user_email: str) -> list:
+        """search_meetings_for_user answered from the snapshot"""
+        return [
+            self._snapshot_meeting(calendar_id, event)
+            for calendar_id in self.calendar.calendar_ids
+            for event in self.snapshot.events_with_attendee(calendar_id, user_email)
+        ]
+
     def get_company_meeting_data(self, company_name: str, days_back: int = 180) -> dict:
         """Get comprehensive meeting data for a company"""
         if not self.calendar.service:
             print("Not authenticated")
             return {}
 
+        use_snapshot = self._use_snapshot(days_back)
+
         # Get meetings with company name
-        company_meetings = self.calendar.search_meetings_for_company(
-            company_name, days_back
-        )
+        if use_snapshot:
+            company_meetings = self._snapshot_company_meetings(company_name)
+        else:
+            company_meetings = self.calendar.search_meetings_for_company(
+                company_name, days_back
+            )
 
         # Get meetings for each team member
         team_meetings = {}
         for name, email in self.team_emails.items():
-            user_meetings = self.calendar.search_meetings_for_user(email, days_back)
+            if use_snapshot:
+                user_meetings = self._snapshot_user_meetings(email)
+            else:
+                user_meetings = self.calendar.search_meetings_for_user(email, days_back)
             team_meetings[name] = user_meetings
 
         # Also search for meetings with key people from the company
@@ -111,24 +187,32 @@ class CalendarCommissionAnalysis:
         if not key_people:
             return key_people_meetings
 
+        use_snapshot = self._use_snapshot(days_back) and self.snapshot.has_calendar(
+            KEY_PEOPLE_CALENDAR
+        )
+
         # Search for meetings with each key person
         for person in key_people:
             try:
                 # Search in Aki's calendar for meetings with this person
-                events_result = (
-                    self.calendar.service.events()
-                    .list(
-                        calendarId="aki@dlc.link",
-                        timeMin=self._get_time_min(days_back),
-                        timeMax=self._get_time_max(),
-                        q=person,
-                        singleEvents=True,
-                        orderBy="startTime",
+                if use_snapshot:
+                    events = self.snapshot.search(KEY_PEOPLE_CALENDAR, person)
+                else:
+                    events_result = (
+                        self.calendar.service.events()
+                        .list(
+                            calendarId=KEY_PEOPLE_CALENDAR,
+                            timeMin=self._get_time_min(days_back),
+                            timeMax=self._get_time_max(),
+                            q=person,
+                            singleEvents=True,
+                            orderBy="startTime",
+                        )
+                        .execute()
                     )
-                    .execute()
-                )
 
-                events = events_result.get("items", [])
+                    events = events_result.get("items", [])
+
                 for event in events:
                     # Process the event
                     meeting_data = self._process_calendar_event(event)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Calendar Snapshot
+Fetches the team's calendar event windows once and answers the attendee and
+text searches of CalendarCommissionAnalysis from memory, so analysing many
+companies does not search every calendar again for each one.
+"""
+
+import datetime
+import json
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+CALENDAR_SNAPSHOT_FILE = "data/calendar/calendar_snapshot.json"
+CALENDAR_SNAPSHOT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_DAYS_BACK = 180
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def text_tokens(text: str) -> Set[str]:
+    """Lowercased alphanumeric words of ``text``"""
+    return set(TOKEN_PATTERN.findall((text or "").lower()))
+
+
+def event_tokens(event: dict) -> Set[str]:
+    """Words of the event fields a calendar text search (``q``) looks at"""
+    tokens = text_tokens(event.get("summary", ""))
+    tokens |= text_tokens(event.get("description", ""))
+    tokens |= text_tokens(event.get("location", ""))
+    for attendee in event.get("attendees", []):
+        tokens |= text_tokens(attendee.get("email", ""))
+        tokens |= text_tokens(attendee.get("displayName", ""))
+    return tokens
+
+
+class CalendarSnapshot:
+    """Events of a set of calendars over the last ``days_back`` days.
+
+    Events keep the order the API returned them in (by start time) and are
+    indexed per calendar by attendee email and by the words of their title,
+    description, location and attendees.
+    """
+
+    def __init__(
+        self,
+        events_by_calendar: Dict[str, List[dict]],
+        days_back: int = DEFAULT_DAYS_BACK,
+        fetched_at: Optional[float] = None,
+    ):
+        self.events_by_calendar = events_by_calendar
+        self.days_back = days_back
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+        self._attendee_index: Dict[str, Dict[str, List[int]]] = {}
+        self._token_index: Dict[str, Dict[str, List[int]]] = {}
+        for calendar_id, events in events_by_calendar.items():
+            attendee_index = self._attendee_index[calendar_id] = {}
+            token_index = self._token_index[calendar_id] = {}
+            for position, event in enumerate(events):
+                for attendee in event.get("attendees", []):
+                    emails = attendee_index.setdefault(attendee.get("email", ""), [])
+                    if not emails or emails[-1] != position:
+                        emails.append(position)
+                for token in event_tokens(event):
+                    token_index.setdefault(token, []).append(position)
+
+    @classmethod
+    def fetch(
+        cls, service, calendar_ids: Iterable[str], days_back: int = DEFAULT_DAYS_BACK
+    ) -> "CalendarSnapshot":
+        """Fetch every event of each calendar in the window, one paginated
+        listing per calendar. Calendars that fail to list are left out."""
+        now = datetime.datetime.utcnow()
+        time_min = (now - datetime.timedelta(days=days_back)).isoformat() + "Z"
+        time_max = now.isoformat() + "Z"
+
+        events_by_calendar = {}
+        for calendar_id in calendar_ids:
+            try:
+                events = []
+                page_token = None
+                while True:
+                    events_result = (
+                        service.events()
+                        .list(
+                            calendarId=calendar_id,
+                            timeMin=time_min,
+                            timeMax=time_max,
+                            singleEvents=True,
+                            orderBy="startTime",
+                            pageToken=page_token,
+                        )
+                        .execute()
+                    )
+                    events.extend(events_result.get("items", []))
+                    page_token = events_result.get("nextPageToken")
+                    if not page_token:
+                        break
+                events_by_calendar[calendar_id] = events
+            except Exception as e:
+                print(f"Error fetching calendar {calendar_id}: {e}")
+
+        return cls(events_by_calendar, days_back, fetched_at=time.time())
+
+    @classmethod
+    def load(cls, path: str) -> Optional["CalendarSnapshot"]:
+        """Snapshot saved at ``path``, or None if it is missing or unreadable"""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            return cls(data["events"], data["days_back"], data["fetched_at"])
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(path):
+                print(f"Ignoring unreadable calendar snapshot {path}: {e}")
+            return None
+
+    def save(self, path: str):
+        """Write the snapshot to ``path`` as JSON"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "fetched_at": self.fetched_at,
+                    "days_back": self.days_back,
+                    "events": self.events_by_calendar,
+                },
+                f,
+            )
+
+    @classmethod
+    def load_or_fetch(
+        cls,
+        service,
+        calendar_ids: Iterable[str],
+        days_back: int = DEFAULT_DAYS_BACK,
+        cache_file: Optional[str] = CALENDAR_SNAPSHOT_FILE,
+        ttl_seconds: float = CALENDAR_SNAPSHOT_TTL_SECONDS,
+    ) -> "CalendarSnapshot":
+        """Cached snapshot when it is fresh and covers the same window and
+        calendars, otherwise a new fetch (saved when every calendar listed)"""
+        calendar_ids = list(calendar_ids)
+        if cache_file:
+            cached = cls.load(cache_file)
+            if cached and cached.is_valid_for(calendar_ids, days_back, ttl_seconds):
+                return cached
+
+        snapshot = cls.fetch(service, calendar_ids, days_back)
+        if cache_file and len(snapshot.events_by_calendar) == len(set(calendar_ids)):
+            snapshot.save(cache_file)
+        return snapshot
+
+    def is_valid_for(
+        self, calendar_ids: Iterable[str], days_back: int, ttl_seconds: float
+    ) -> bool:
+        return (
+            self.days_back == days_back
+            and time.time() - self.fetched_at < ttl_seconds
+            and set(calendar_ids) <= set(self.events_by_calendar)
+        )
+
+    def has_calendar(self, calendar_id: str) -> bool:
+        return calendar_id in self.events_by_calendar
+
+    def events_with_attendee(self, calendar_id: str, email: str) -> List[dict]:
+        """Events of ``calendar_id`` that ``email`` attends, in start order"""
+        events = self.events_by_calendar.get(calendar_id, [])
+        positions = self._attendee_index.get(calendar_id, {}).get(email, [])
+        return [events[position] for position in positions]
+
+    def search(self, calendar_id: str, query: str) -> List[dict]:
+        """Events of ``calendar_id`` containing every word of ``query``, in
+        start order (the in-memory counterpart of an events list ``q``)"""
+        events = self.events_by_calendar.get(calendar_id, [])
+        token_index = self._token_index.get(calendar_id, {})
+        query_tokens = text_tokens(query)
+        if not query_tokens:
+            return list(events)
+
+        positions: Optional[Set[int]] = None
+        for token in query_tokens:
+            matches = token_index.get(token)
+            if not matches:
+                return []
+            positions = set(matches) if positions is None else positions & set(matches)
+        return [events[position] for position in sorted(positions)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calendars": len(self.events_by_calendar),
+            "events": sum(len(events) for events in self.events_by_calendar.values()),
+        }
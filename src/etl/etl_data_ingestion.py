@@ -12,15 +12,28 @@ import sqlite3
 import threading
 import time
 import traceback
-from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
-                                as_completed)
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
-from .utils.company_matcher import CompanyMatcher
+from .utils.calendar_index import CalendarTextIndex, DomainIndex
+from .utils.company_matcher import CompanyMatcher, CompanyMatchIndex
+from .utils.message_records import (
+    ChatMessageRecord,
+    SlackMessageRecord,
+    WorkerMessageRecord,
+)
+from .utils.telegram_chat_cache import FileState, TelegramChatCache
+from .utils.telegram_html_parser import (
+    TelegramExportPage,
+    element_text,
+    resolve_backend,
+    stripped_text,
+)
 from .utils.text_formatter import ETLTextFormatter
 
 # Set up logging with better visibility
@@ -33,76 +46,218 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Multiprocessing worker function (must be at module level)
+# Telegram file formats: the multiprocessing worker reads messages.html into
+# WorkerMessageRecords, the threaded path reads every messages*.html file into
+# ChatMessageRecords
+WORKER_FORMAT = "worker"
+CHAT_FORMAT = "chat"
+RECORD_TYPES = {WORKER_FORMAT: WorkerMessageRecord, CHAT_FORMAT: ChatMessageRecord}
+
+# Chat name indicators that keep a page-header chat name as-is
+CHAT_NAME_INDICATORS = ["company", "team", "group", "channel"]
+
+
+def parse_telegram_file(
+    html_path: str, file_format: str, parser_backend: str = "auto"
+) -> Dict[str, Any]:
+    """Parse one Telegram export file into compact message records"""
+    page = TelegramExportPage(html_path, parser_backend)
+    messages = []
+
+    for message in page.iter_messages():
+        if file_format == WORKER_FORMAT:
+            text = stripped_text(message.text)
+            if text:  # Only include messages with text
+                messages.append(
+                    WorkerMessageRecord(
+                        (
+                            stripped_text(message.from_name)
+                            if message.from_name is not None
+                            else "Unknown"
+                        ),
+                        stripped_text(message.date_text),
+                        text,
+                    )
+                )
+            continue
+
+        is_service = message.is_service
+
+        # Extract author
+        author = (
+            element_text(message.from_name)
+            if message.from_name is not None
+            else "System"
+        )
+
+        # Extract text
+        text = element_text(message.text)
+
+        # For service messages, try to get text from body details
+        if is_service and not text:
+            text = element_text(message.details)
+
+        # Only include messages with meaningful content
+        if text and text not in ["", " "]:
+            messages.append(
+                ChatMessageRecord(
+                    author,
+                    text,
+                    message.date_title or "",
+                    message.message_id,
+                    is_service,
+                )
+            )
+
+    return {
+        "messages": messages,
+        "header_text": page.header_text,
+        "userpic_initials": page.userpic_initials,
+    }
+
+
+# Multiprocessing worker functions (must be at module level)
+def parse_telegram_files_worker(
+    chat_path: str, file_names: List[str], file_format: str, parser_backend: str
+) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """Parse the given files of one chat, returning (file, parsed, error) tuples"""
+    results = []
+    for file_name in file_names:
+        try:
+            parsed = parse_telegram_file(
+                os.path.join(chat_path, file_name), file_format, parser_backend
+            )
+            results.append((file_name, parsed, None))
+        except Exception as e:
+            results.append((file_name, None, str(e)))
+    return results
+
+
 def process_telegram_chat_worker(
-    chat_dir: str, chats_dir: str
+    chat_dir: str, chats_dir: str, parser_backend: str = "auto"
 ) -> Optional[Dict[str, Any]]:
     """Worker function for processing a single Telegram chat (multiprocessing compatible)"""
     try:
-        chat_path = os.path.join(chats_dir, chat_dir)
-        messages_file = os.path.join(chat_path, "messages.html")
+        messages_file = os.path.join(chats_dir, chat_dir, "messages.html")
 
         if not os.path.exists(messages_file):
             return None
 
-        with open(messages_file, "r", encoding="utf-8") as f:
-            html_content = f.read()
+        parsed = parse_telegram_file(messages_file, WORKER_FORMAT, parser_backend)
+        return build_worker_chat_result(chat_dir, parsed)
 
-        soup = BeautifulSoup(html_content, "html.parser")
+    except Exception as e:
+        return None
 
-        # Extract chat name from page header if available, otherwise use directory name
-        page_header = soup.find("div", class_="page_header")
-        if page_header:
-            header_text = page_header.get_text(strip=True)
-            if header_text and header_text != "Exported Data":
-                chat_name = header_text.replace(" ", "-").lower()
-            else:
-                chat_name = chat_dir.replace("_", " ").replace("-", " ")
-        else:
-            chat_name = chat_dir.replace("_", " ").replace("-", " ")
 
-        # Extract messages
-        messages = []
-        message_elements = soup.find_all("div", class_="message")
+def build_worker_chat_result(
+    chat_dir: str, parsed: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Assemble the worker-format chat result from its parsed messages.html"""
+    messages = parsed["messages"]
 
-        for msg_elem in message_elements:
-            try:
-                # Extract sender
-                sender_elem = msg_elem.find("div", class_="from_name")
-                sender = sender_elem.get_text(strip=True) if sender_elem else "Unknown"
+    # Extract chat name from page header if available, otherwise use directory name
+    header_text = parsed["header_text"]
+    if header_text and header_text != "Exported Data":
+        chat_name = header_text.replace(" ", "-").lower()
+    else:
+        chat_name = chat_dir.replace("_", " ").replace("-", " ")
 
-                # Extract timestamp
-                date_elem = msg_elem.find("div", class_="date")
-                timestamp = date_elem.get_text(strip=True) if date_elem else ""
+    if not messages:
+        return None
 
-                # Extract message text
-                text_elem = msg_elem.find("div", class_="text")
-                text = text_elem.get_text(strip=True) if text_elem else ""
+    # Count unique participants
+    participants = set(msg.sender for msg in messages)
 
-                if text:  # Only include messages with text
-                    messages.append(
-                        {"sender": sender, "timestamp": timestamp, "text": text}
-                    )
-            except Exception as e:
-                continue  # Skip malformed messages
+    return {
+        "chat_name": chat_name,
+        "message_count": len(messages),
+        "participant_count": len(participants),
+        "messages": messages,
+        "participants": list(participants),
+    }
 
-        if not messages:
-            return None
 
-        # Count unique participants
-        participants = set(msg["sender"] for msg in messages)
+def build_chat_result(
+    chat_dir: str, parsed_files: List[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Assemble the full chat result from the parsed files of a chat directory"""
+    chat_messages = []
+    chat_participants = set()
+    chat_name = chat_dir  # Use directory name as base identifier
+
+    for parsed in parsed_files:
+        # Extract chat name from page header if available
+        header_text = parsed["header_text"]
+        if header_text and header_text != "Exported Data":
+            chat_name = header_text.replace(" ", "-").lower()
+
+        for message in parsed["messages"]:
+            chat_messages.append(message)
+
+            # Add to participants if it's a regular message or service message with a person
+            if not message.is_service or message.author != "System":
+                chat_participants.add(message.author)
+
+        # Try to extract actual chat name from participants or first message
+        if not chat_messages:
+            # Look for participant names in userpics
+            for initials in parsed["userpic_initials"]:
+                if initials and len(initials) > 1:
+                    chat_participants.add(f"User_{initials}")
+
+    # Create a more meaningful chat name if possible
+    # Only override chat_name if we didn't extract a company name from page header
+    original_chat_name = chat_name
+    if chat_participants and not any(
+        indicator in original_chat_name.lower() for indicator in CHAT_NAME_INDICATORS
+    ):
+        participant_list = list(chat_participants)
 
-        return {
-            "chat_name": chat_name,
-            "message_count": len(messages),
-            "participant_count": len(participants),
-            "messages": messages,
-            "participants": list(participants),
-        }
+        if len(participant_list) == 1:
+            chat_name = f"{participant_list[0]}-telegram"
+        elif len(participant_list) <= 5:
+            # For small groups, use participant names
+            chat_name = f"{'-'.join(participant_list[:3])}-telegram"
+        else:
+            # For larger groups, use directory name
+            chat_name = f"{chat_dir}-telegram"
+    elif not any(
+        indicator in original_chat_name.lower() for indicator in CHAT_NAME_INDICATORS
+    ):
+        chat_name = f"{chat_dir}-telegram"
 
-    except Exception as e:
+    # Store the chat data if it has messages
+    if not chat_messages:
         return None
 
+    # Calculate additional statistics
+    regular_messages = [m for m in chat_messages if not m.is_service]
+    service_messages = [m for m in chat_messages if m.is_service]
+
+    # Extract unique authors
+    unique_authors = list(set(m.author for m in chat_messages if m.author != "System"))
+
+    return {
+        "messages": chat_messages,
+        "message_count": len(chat_messages),
+        "regular_message_count": len(regular_messages),
+        "service_message_count": len(service_messages),
+        "participants": list(chat_participants),
+        "participant_count": len(chat_participants),
+        "unique_authors": unique_authors,
+        "directory": chat_dir,
+        "chat_name": chat_name,
+        "last_message_time": max(
+            [m.timestamp for m in chat_messages if m.timestamp],
+            default="",
+        ),
+        "first_message_time": min(
+            [m.timestamp for m in chat_messages if m.timestamp],
+            default="",
+        ),
+    }
+
 
 # Add a custom handler for real-time progress
 class ProgressHandler(logging.StreamHandler):
@@ -125,6 +280,8 @@ class DataETL:
         batch_size: int = 100,
         quick_mode: bool = False,
         use_multiprocessing: bool = True,
+        parser_backend: str = "auto",
+        use_cache: bool = True,
     ):
         # Generate output filename - main file for easy access, timestamped copy for archive
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -133,6 +290,8 @@ class DataETL:
         )
         self.archive_file = f"output/notebooklm/archive/etl_output_{timestamp}.txt"  # Timestamped archive
         self.db_path = "data/slack/repsplit.db"
+        # Manifest of parsed Telegram export files, for incremental runs
+        self.telegram_cache_path = "data/telegram/etl_parse_cache.db"
         self.company_mapping_file = "data/company_mapping.csv"
 
         # Companies to exclude from analysis (internal companies)
@@ -161,6 +320,9 @@ class DataETL:
         self.batch_size = batch_size
         self.quick_mode = quick_mode
         self.use_multiprocessing = use_multiprocessing
+        # Telegram HTML parser: "lxml", "html.parser" (streaming) or "bs4" (full DOM)
+        self.parser_backend = resolve_backend(parser_backend)
+        self.use_cache = use_cache
 
         # Load environment variables
         load_dotenv()
@@ -531,40 +693,39 @@ class DataETL:
             )
             conversations = cursor.fetchall()
 
+            # Resolve author names from a dict instead of joining every message row
+            cursor.execute("SELECT id, real_name FROM users")
+            real_names = dict(cursor.fetchall())
+
+            # Stream every message in one ordered pass instead of one query per
+            # conversation, grouping consecutive rows by conv_id
+            messages_by_conv = {}
+            cursor.execute(
+                """
+                SELECT conv_id, author, text, timestamp
+                FROM messages
+                ORDER BY conv_id, timestamp
+            """
+            )
+            for conv_id, rows in groupby(cursor, key=itemgetter(0)):
+                messages_by_conv[conv_id] = [
+                    SlackMessageRecord(author, text, timestamp, real_names.get(author))
+                    for _, author, text, timestamp in rows
+                ]
+
             for conv_id, name, conv_type, created, purpose, topic in conversations:
-                # Get messages for this conversation
-                cursor.execute(
-                    """
-                    SELECT m.author, m.text, m.timestamp, u.real_name
-                    FROM messages m
-                    LEFT JOIN users u ON m.author = u.id
-                    WHERE m.conv_id = ?
-                    ORDER BY m.timestamp
-                """,
-                    (conv_id,),
-                )
-                messages = cursor.fetchall()
+                messages = messages_by_conv.pop(conv_id, [])
 
                 # Count unique members from messages
-                member_count = len(set(msg[0] for msg in messages if msg[0]))
-
-                # Skip stage detections for now (table doesn't exist)
-                stage_detections = []
+                member_count = len(set(msg.author for msg in messages if msg.author))
 
                 slack_data[conv_id] = {
                     "name": name,
                     "member_count": member_count,
                     "creation_date": created,
                     "is_bitsafe": name.endswith("-bitsafe"),
-                    "messages": [
-                        {
-                            "author": author,
-                            "text": text,
-                            "timestamp": timestamp,
-                            "display_name": real_name if real_name else author,
-                        }
-                        for author, text, timestamp, real_name in messages
-                    ],
+                    "messages": messages,
+                    # Skip stage detections for now (table doesn't exist)
                     "stage_detections": [],
                 }
 
@@ -577,6 +738,21 @@ class DataETL:
 
         return slack_data
 
+    def _list_chat_files(self, chat_path: str, file_format: str) -> List[str]:
+        """HTML export files a chat directory contributes for the given format"""
+        if file_format == WORKER_FORMAT:
+            if os.path.exists(os.path.join(chat_path, "messages.html")):
+                return ["messages.html"]
+            return []
+        return [f for f in os.listdir(chat_path) if f.endswith(".html")]
+
+    def _build_chat(
+        self, chat_dir: str, file_format: str, parsed_files: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        if file_format == WORKER_FORMAT:
+            return build_worker_chat_result(chat_dir, parsed_files[0])
+        return build_chat_result(chat_dir, parsed_files)
+
     def _process_single_chat(
         self, chat_dir: str, chats_dir: str
     ) -> Optional[Dict[str, Any]]:
@@ -586,7 +762,7 @@ class DataETL:
 
             # Look for HTML files in the chat directory
             try:
-                html_files = [f for f in os.listdir(chat_path) if f.endswith(".html")]
+                html_files = self._list_chat_files(chat_path, CHAT_FORMAT)
             except (OSError, PermissionError) as e:
                 logger.warning(f"Cannot access directory {chat_dir}: {e}")
                 return None
@@ -595,153 +771,49 @@ class DataETL:
                 return None
 
             # Process all HTML files in this chat directory
-            chat_messages = []
-            chat_participants = set()
-            chat_name = chat_dir  # Use directory name as base identifier
-
+            parsed_files = []
             for html_file in html_files:
                 html_path = os.path.join(chat_path, html_file)
-                content = self._safe_file_read(html_path)
-
-                if not content:
-                    continue
-
                 try:
-                    soup = BeautifulSoup(content, "html.parser")
+                    parsed_files.append(
+                        parse_telegram_file(html_path, CHAT_FORMAT, self.parser_backend)
+                    )
                 except Exception as e:
                     logger.warning(f"Failed to parse HTML in {html_path}: {e}")
-                    continue
-
-                # Extract messages from this HTML file
-                message_divs = soup.find_all("div", class_="message")
-
-                # Extract chat name from page header if available
-                page_header = soup.find("div", class_="page_header")
-                if page_header:
-                    header_text = page_header.get_text(strip=True)
-                    if header_text and header_text != "Exported Data":
-                        chat_name = header_text.replace(" ", "-").lower()
-
-                for msg_div in message_divs:
-                    try:
-                        # Determine message type
-                        message_classes = msg_div.get("class", [])
-                        is_service = "service" in message_classes
-
-                        # Extract author
-                        author_elem = msg_div.find("div", class_="from_name")
-                        author = author_elem.text.strip() if author_elem else "System"
-
-                        # Extract text
-                        text_elem = msg_div.find("div", class_="text")
-                        text = text_elem.text.strip() if text_elem else ""
-
-                        # For service messages, try to get text from body details
-                        if is_service and not text:
-                            body_details = msg_div.find("div", class_="body details")
-                            if body_details:
-                                text = body_details.text.strip()
-
-                        # Extract timestamp
-                        date_elem = msg_div.find("div", class_="date")
-                        timestamp = date_elem.get("title", "") if date_elem else ""
-
-                        # Extract message ID
-                        message_id = msg_div.get("id", "")
-
-                        # Only include messages with meaningful content
-                        if text and text not in ["", " "]:
-                            chat_messages.append(
-                                {
-                                    "author": author,
-                                    "text": text,
-                                    "timestamp": timestamp,
-                                    "message_id": message_id,
-                                    "message_type": (
-                                        "service" if is_service else "regular"
-                                    ),
-                                    "is_service": is_service,
-                                }
-                            )
-
-                            # Add to participants if it's a regular message or service message with a person
-                            if not is_service or (is_service and author != "System"):
-                                chat_participants.add(author)
-                    except Exception as e:
-                        logger.debug(f"Error processing message in {html_path}: {e}")
-                        continue
 
-                # Try to extract actual chat name from participants or first message
-                if not chat_messages:
-                    # Look for participant names in userpics
-                    userpics = soup.find_all("div", class_="userpic")
-                    for userpic in userpics:
-                        initials_elem = userpic.find("div", class_="initials")
-                        if initials_elem:
-                            initials = initials_elem.text.strip()
-                            if initials and len(initials) > 1:
-                                chat_participants.add(f"User_{initials}")
-
-            # Create a more meaningful chat name if possible
-            # Only override chat_name if we didn't extract a company name from page header
-            original_chat_name = chat_name
-            if chat_participants and not any(
-                indicator in original_chat_name.lower()
-                for indicator in ["company", "team", "group", "channel"]
-            ):
-                participant_list = list(chat_participants)
-
-                if len(participant_list) == 1:
-                    chat_name = f"{participant_list[0]}-telegram"
-                elif len(participant_list) <= 5:
-                    # For small groups, use participant names
-                    chat_name = f"{'-'.join(participant_list[:3])}-telegram"
-                else:
-                    # For larger groups, use directory name
-                    chat_name = f"{chat_dir}-telegram"
-            elif not any(
-                indicator in original_chat_name.lower()
-                for indicator in ["company", "team", "group", "channel"]
-            ):
-                chat_name = f"{chat_dir}-telegram"
-
-            # Store the chat data if it has messages
-            if chat_messages:
-                # Calculate additional statistics
-                regular_messages = [m for m in chat_messages if not m["is_service"]]
-                service_messages = [m for m in chat_messages if m["is_service"]]
-
-                # Extract unique authors
-                unique_authors = list(
-                    set(m["author"] for m in chat_messages if m["author"] != "System")
-                )
-
-                return {
-                    "messages": chat_messages,
-                    "message_count": len(chat_messages),
-                    "regular_message_count": len(regular_messages),
-                    "service_message_count": len(service_messages),
-                    "participants": list(chat_participants),
-                    "participant_count": len(chat_participants),
-                    "unique_authors": unique_authors,
-                    "directory": chat_dir,
-                    "chat_name": chat_name,
-                    "last_message_time": max(
-                        [m["timestamp"] for m in chat_messages if m["timestamp"]],
-                        default="",
-                    ),
-                    "first_message_time": min(
-                        [m["timestamp"] for m in chat_messages if m["timestamp"]],
-                        default="",
-                    ),
-                }
-
-            return None
+            return build_chat_result(chat_dir, parsed_files)
 
         except Exception as e:
             self._log_error(e, f"processing chat {chat_dir}")
             return None
 
+    def _open_telegram_cache(self, file_format: str) -> Optional[TelegramChatCache]:
+        """Open the Telegram parse cache, or run uncached if it is unavailable"""
+        if not self.use_cache:
+            return None
+        try:
+            return TelegramChatCache(
+                self.telegram_cache_path, file_format, RECORD_TYPES[file_format]
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Telegram parse cache unavailable, parsing everything: {e}")
+            return None
+
+    def _sort_chats_by_size(self, chats_dir: str, chat_dirs: List[str]) -> List[str]:
+        """Order chat directories by total HTML size, largest first"""
+        sizes = {}
+        for chat_dir in chat_dirs:
+            size = 0
+            try:
+                with os.scandir(os.path.join(chats_dir, chat_dir)) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".html") and entry.is_file():
+                            size += entry.stat().st_size
+            except OSError:
+                pass
+            sizes[chat_dir] = size
+        return sorted(chat_dirs, key=lambda d: sizes[d], reverse=True)
+
     def ingest_telegram_data(self) -> Dict[str, Any]:
         """Ingest Telegram data from HTML export with parallel processing"""
         logger.info("Ingesting Telegram data...")
@@ -778,86 +850,124 @@ class DataETL:
         else:
             logger.info(f"Found {len(chat_dirs)} chat directories to process")
 
+        # Single work queue, biggest chats first, so the slowest chats start
+        # early instead of stalling the tail of the run
+        chat_dirs = self._sort_chats_by_size(chats_dir, chat_dirs)
+
         processed_count = 0
         error_count = 0
+        completed_count = 0
+        total_chats = len(chat_dirs)
 
-        # Process in batches for better memory management
-        total_batches = (len(chat_dirs) + self.batch_size - 1) // self.batch_size
+        print(f"\n🚀 Starting Telegram processing: {total_chats} chats")
         print(
-            f"\n🚀 Starting Telegram processing: {len(chat_dirs)} chats in {total_batches} batches"
+            f"⚙️  Using {self.max_workers} workers "
+            f"({'processes' if self.use_multiprocessing else 'threads'}), "
+            f"parser: {self.parser_backend}"
         )
-        print(f"⚙️  Using {self.max_workers} workers, batch size: {self.batch_size}")
 
-        for i in range(0, len(chat_dirs), self.batch_size):
-            batch = chat_dirs[i : i + self.batch_size]
-            batch_num = i // self.batch_size + 1
-            print(
-                f"\n📦 Processing batch {batch_num}/{total_batches} ({len(batch)} chats)"
-            )
+        file_format = WORKER_FORMAT if self.use_multiprocessing else CHAT_FORMAT
+        cache = self._open_telegram_cache(file_format)
+
+        def finish_chat(chat_dir: str, result: Optional[Dict[str, Any]]):
+            nonlocal processed_count, completed_count
+            completed_count += 1
+            if result:
+                telegram_data[result["chat_name"]] = result
+                processed_count += 1
+
+            if completed_count % self.batch_size == 0:
+                if cache:
+                    cache.commit()
+                print(
+                    f"\r🔄 Processed {completed_count}/{total_chats} chats "
+                    f"({processed_count} with messages, {error_count} errors)",
+                    end="",
+                    flush=True,
+                )
 
-            # Use ProcessPoolExecutor for multiprocessing or ThreadPoolExecutor for threading
-            if self.use_multiprocessing:
-                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                    # Submit all tasks in the batch
-                    future_to_chat = {
-                        executor.submit(
-                            process_telegram_chat_worker, chat_dir, chats_dir
-                        ): chat_dir
-                        for chat_dir in batch
-                    }
+        # One pool for the whole run instead of one per batch
+        if self.use_multiprocessing:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
 
-                    # Process completed tasks
-                    for future in as_completed(future_to_chat):
-                        chat_dir = future_to_chat[future]
-                        try:
-                            result = future.result()
-                            if result:
-                                chat_name = result["chat_name"]
-                                telegram_data[chat_name] = result
-                                processed_count += 1
-
-                                if processed_count % 50 == 0:
-                                    print(
-                                        f"\r🔄 Processed {processed_count} chats so far...",
-                                        end="",
-                                        flush=True,
-                                    )
-                        except Exception as e:
-                            error_count += 1
-                            logger.error(f"Error processing chat {chat_dir}: {e}")
-            else:
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    # Submit all tasks in the batch
-                    future_to_chat = {
-                        executor.submit(
-                            self._process_single_chat, chat_dir, chats_dir
-                        ): chat_dir
-                        for chat_dir in batch
-                    }
+        try:
+            with executor:
+                future_to_chat = {}
+                for chat_dir in chat_dirs:
+                    chat_path = os.path.join(chats_dir, chat_dir)
+                    try:
+                        file_names = self._list_chat_files(chat_path, file_format)
+                        if cache:
+                            cached, stale = cache.lookup(
+                                chat_dir, chat_path, file_names
+                            )
+                        else:
+                            cached, stale = {}, [
+                                FileState(f, 0, 0, "") for f in file_names
+                            ]
+                    except Exception as e:
+                        error_count += 1
+                        self._log_error(e, f"processing chat {chat_dir}")
+                        finish_chat(chat_dir, None)
+                        continue
 
-                    # Process completed tasks
-                    for future in as_completed(future_to_chat):
-                        chat_dir = future_to_chat[future]
-                        try:
-                            result = future.result()
-                            if result:
-                                chat_name = result["chat_name"]
-                                telegram_data[chat_name] = result
-                                processed_count += 1
-
-                                if processed_count % 50 == 0:
-                                    print(
-                                        f"\r🔄 Processed {processed_count} chats so far...",
-                                        end="",
-                                        flush=True,
-                                    )
-                        except Exception as e:
-                            error_count += 1
-                            self._log_error(e, f"processing chat {chat_dir}")
-
-            # Log progress
+                    if not stale:
+                        # Unchanged since the last run: no parsing needed
+                        parsed_files = [cached[f] for f in file_names]
+                        finish_chat(
+                            chat_dir,
+                            self._build_chat(chat_dir, file_format, parsed_files)
+                            if parsed_files
+                            else None,
+                        )
+                        continue
+
+                    future = executor.submit(
+                        parse_telegram_files_worker,
+                        chat_path,
+                        [state.file_name for state in stale],
+                        file_format,
+                        self.parser_backend,
+                    )
+                    future_to_chat[future] = (chat_dir, file_names, cached, stale)
+
+                for future in as_completed(future_to_chat):
+                    chat_dir, file_names, cached, stale = future_to_chat[future]
+                    try:
+                        states = {state.file_name: state for state in stale}
+                        for file_name, parsed, error in future.result():
+                            if error is not None:
+                                logger.warning(
+                                    f"Failed to parse HTML in "
+                                    f"{os.path.join(chats_dir, chat_dir, file_name)}: {error}"
+                                )
+                                continue
+                            cached[file_name] = parsed
+                            if cache:
+                                cache.store(chat_dir, states[file_name], parsed)
+
+                        parsed_files = [cached[f] for f in file_names if f in cached]
+                        result = (
+                            self._build_chat(chat_dir, file_format, parsed_files)
+                            if parsed_files
+                            else None
+                        )
+                    except Exception as e:
+                        error_count += 1
+                        self._log_error(e, f"processing chat {chat_dir}")
+                        result = None
+                    finish_chat(chat_dir, result)
+        finally:
+            if cache:
+                self.stats["telegram_cache"] = dict(cache.stats)
+                cache.close()
+
+        if cache:
             print(
-                f"✅ Completed batch {batch_num}. Processed: {processed_count}, Errors: {error_count}"
+                f"\n💾 Parse cache: {cache.stats['cached_files']} files reused, "
+                f"{cache.stats['stale_files']} files parsed"
             )
 
         print(f"\n🎉 Telegram processing complete!")
@@ -872,15 +982,17 @@ class DataETL:
         try:
             # Try real Google Calendar integration first
             try:
-                from .integrations.google_calendar_integration import \
-                    GoogleCalendarIntegration
+                from .integrations.google_calendar_integration import (
+                    GoogleCalendarIntegration,
+                )
 
                 calendar = GoogleCalendarIntegration()
                 use_mock = False
             except ImportError:
                 # Fall back to mock integration for testing
-                from .integrations.mock_calendar_integration import \
-                    MockCalendarIntegration
+                from .integrations.mock_calendar_integration import (
+                    MockCalendarIntegration,
+                )
 
                 calendar = MockCalendarIntegration()
                 use_mock = True
@@ -894,6 +1006,10 @@ class DataETL:
                 # Get all meetings
                 meetings = calendar.get_meetings(start_date, end_date)
 
+                # Compile every company's text needles once for all meetings
+                calendar_text_index = CalendarTextIndex(self.matcher, self.companies)
+                domain_index = DomainIndex(self.companies)
+
                 # Match meetings to companies using attendee domain matching
                 for meeting in meetings:
                     summary = meeting.get("summary", "")
@@ -919,22 +1035,16 @@ class DataETL:
                     # Primary matching strategy: Attendee domain matching (if external attendees)
                     matched_company = None
                     if attendee_domains:
-                        for company_name, company_info in self.companies.items():
-                            if self._match_calendar_by_attendee_domains(
-                                company_name, company_info, attendee_domains
-                            ):
-                                matched_company = company_name
-                                break
+                        domain_matches = domain_index.match(attendee_domains)
+                        if domain_matches:
+                            matched_company = domain_matches[0]
 
                     # Fallback: Text-based matching for meetings with company names in title
                     if not matched_company:
                         meeting_text = f"{summary} {description} {' '.join(attendee_emails)}".lower()
-                        for company_name, company_info in self.companies.items():
-                            if self.matcher.match_company_to_channel(
-                                company_name, company_info, meeting_text, "calendar"
-                            ):
-                                matched_company = company_name
-                                break
+                        text_matches = calendar_text_index.match(meeting_text)
+                        if text_matches:
+                            matched_company = text_matches[0]
 
                     # Add meeting to matched company
                     if matched_company:
@@ -974,8 +1084,9 @@ class DataETL:
         hubspot_data = {}
 
         try:
-            from .integrations.hubspot_export_integration import \
-                HubSpotExportIntegration
+            from .integrations.hubspot_export_integration import (
+                HubSpotExportIntegration,
+            )
 
             # Initialize HubSpot export integration
             hubspot = HubSpotExportIntegration()
@@ -1018,6 +1129,23 @@ class DataETL:
         matched_data = {}
         excluded_count = 0
 
+        # Build the match index once and run every source through it in one pass
+        included_companies = {
+            company_name: company_info
+            for company_name, company_info in self.companies.items()
+            if company_name.lower() not in self.excluded_companies
+        }
+        match_index = CompanyMatchIndex(self.matcher, included_companies)
+        slack_matches_by_company = match_index.find_best_matches(
+            self.slack_data, "slack"
+        )
+        telegram_matches_by_company = match_index.find_best_matches(
+            self.telegram_data, "telegram"
+        )
+        hubspot_matches_by_company = match_index.match_names(
+            self.hubspot_data, "hubspot"
+        )
+
         for company_name, company_info in self.companies.items():
             # Skip excluded companies (internal companies)
             if company_name.lower() in self.excluded_companies:
@@ -1033,9 +1161,7 @@ class DataETL:
             }
 
             # Match Slack channels using enhanced matcher
-            slack_matches = self.matcher.find_best_matches(
-                company_name, company_info, self.slack_data, "slack"
-            )
+            slack_matches = slack_matches_by_company.get(company_name, [])
 
             for conv_id, confidence in slack_matches:
                 slack_info = self.slack_data[conv_id]
@@ -1051,9 +1177,7 @@ class DataETL:
                 )
 
             # Match Telegram chats using enhanced matcher
-            telegram_matches = self.matcher.find_best_matches(
-                company_name, company_info, self.telegram_data, "telegram"
-            )
+            telegram_matches = telegram_matches_by_company.get(company_name, [])
 
             for chat_name, confidence in telegram_matches:
                 telegram_info = self.telegram_data[chat_name]
@@ -1073,15 +1197,14 @@ class DataETL:
                 )
 
             # Match HubSpot deals using enhanced fuzzy matching
-            for deal_company, deal_info in self.hubspot_data.items():
-                # Use the enhanced company matcher for better HubSpot matching
-                if self.matcher.match_company_to_channel(
-                    company_name, company_info, deal_company, "hubspot"
-                ):
-                    matched_data[company_name]["hubspot_deals"].append(deal_info)
+            for deal_company in hubspot_matches_by_company.get(company_name, []):
+                matched_data[company_name]["hubspot_deals"].append(
+                    self.hubspot_data[deal_company]
+                )
 
         logger.info(f"Matched data for {len(matched_data)} companies")
         logger.info(f"Excluded {excluded_count} internal companies")
+        logger.debug(f"Name cache stats: {self.matcher.cache_stats()}")
         return matched_data
 
     def generate_summary_stats(self, matched_data: Dict[str, Any]) -> Dict[str, Any]:
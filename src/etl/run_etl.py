@@ -69,6 +69,8 @@ Examples:
   python src/etl/run_etl.py --output custom.json  # Custom output file
   python src/etl/run_etl.py --validate-only    # Only validate existing output
   python src/etl/run_etl.py --verbose          # Verbose logging
+  python src/etl/run_etl.py --parser bs4       # Use the BeautifulSoup parser
+  python src/etl/run_etl.py --no-cache         # Re-parse every Telegram export file
         """,
     )
 
@@ -83,7 +85,7 @@ Examples:
         "--batch-size",
         type=int,
         default=100,
-        help="Batch size for processing (default: 100)",
+        help="Telegram progress reporting interval, in chats (default: 100)",
     )
 
     parser.add_argument(
@@ -119,6 +121,19 @@ Examples:
         help="Disable multiprocessing and use threading instead",
     )
 
+    parser.add_argument(
+        "--parser",
+        choices=["auto", "lxml", "html.parser", "bs4"],
+        default="auto",
+        help="Telegram HTML parser backend (default: auto, lxml if installed)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the Telegram parse cache and re-parse every export file",
+    )
+
     args = parser.parse_args()
 
     # Setup logging
@@ -131,6 +146,8 @@ Examples:
         batch_size=args.batch_size,
         quick_mode=args.quick,
         use_multiprocessing=not args.no_multiprocessing,
+        parser_backend=args.parser,
+        use_cache=not args.no_cache,
     )
 
     # Use auto-generated filename if not specified
@@ -162,6 +179,8 @@ Examples:
             batch_size=args.batch_size,
             quick_mode=args.quick,
             use_multiprocessing=not args.no_multiprocessing,
+            parser_backend=args.parser,
+            use_cache=not args.no_cache,
         )
 
         # Set custom output file
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick Multi-Pattern Matcher
+Finds every one of many literal patterns in a text with a single scan, so the
+cost of matching grows with the text length rather than the pattern count.
+"""
+
+from typing import Dict, Iterable, List, Set
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton reporting every pattern that occurs in a text"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each state to its longest proper suffix"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def find(self, text: str) -> Set[int]:
+        """Ids (indexes into ``patterns``) of every pattern found in ``text``"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
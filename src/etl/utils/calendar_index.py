@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Calendar Meeting Match Index
+Precompiled lookup structures that match calendar meetings against the whole
+company mapping at once, instead of running CompanyMatcher's per-company
+substring checks and regexes for every meeting.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set
+
+from .aho_corasick import AhoCorasick
+from .company_matcher import CompanyMatcher
+
+# Suffixes DataETL._match_calendar_by_attendee_domains strips from a domain
+ATTENDEE_DOMAIN_SUFFIXES = (".com", ".org", ".net", ".io", ".co")
+
+# Suffixes DataETL._match_calendar_by_email_domain strips from a domain
+EMAIL_DOMAIN_SUFFIXES = (".com", ".org", ".net", ".io")
+
+# Length of the company-name fragments the partial domain rule looks for
+DOMAIN_GRAM_SIZE = 4
+
+
+def clean_company_name(name: str) -> str:
+    """Lowercased name without spaces, hyphens and underscores"""
+    return name.lower().replace(" ", "").replace("-", "").replace("_", "")
+
+
+def _substrings(text: str) -> Set[str]:
+    """Every distinct substring of ``text``, including the empty string"""
+    return {
+        text[start:end]
+        for start in range(len(text) + 1)
+        for end in range(start, len(text) + 1)
+    }
+
+
+class CalendarTextIndex:
+    """All companies ``CompanyMatcher._match_calendar_meeting`` would accept for a
+    meeting text, found with one automaton scan.
+
+    Every check in ``_match_calendar_meeting`` is a substring test, or a regex
+    that holds exactly when the cleaned company name occurs in the text (once
+    that name has 3+ characters). Those literal needles are compiled into one
+    automaton. Companies whose cleaned name is shorter still go through the
+    original regex checks.
+    """
+
+    MEETING_PATTERNS = [
+        "meeting with {}",
+        "call with {}",
+        "{} meeting",
+        "{} call",
+        "discussion with {}",
+    ]
+
+    def __init__(self, matcher: CompanyMatcher, companies: Dict[str, Dict]):
+        self.matcher = matcher
+        self.companies = companies
+        self._priority = {name: rank for rank, name in enumerate(companies)}
+        self._regex_companies: List[str] = []
+
+        needles = defaultdict(set)
+        for company_name, company_info in companies.items():
+            if not company_name:
+                continue
+            for needle in self._company_needles(company_name, company_info):
+                needles[needle].add(company_name)
+
+        self._scanner = AhoCorasick(needles)
+        self._needle_companies = [needles[p] for p in self._scanner.patterns]
+
+    def _company_needles(self, company_name: str, company_info: Dict) -> Set[str]:
+        generate = self.matcher.generate_name_variants
+        needles = {variant.lower() for variant in generate(company_name)}
+
+        if company_info.get("base_company"):
+            needles.update(v.lower() for v in generate(company_info["base_company"]))
+
+        calendar_domain = company_info.get("calendar_domain", "")
+        if calendar_domain:
+            needles.update(v.lower() for v in generate(calendar_domain))
+            needles.add(f"@{calendar_domain}")
+
+        if company_info.get("variant_type"):
+            for variant in company_info["variant_type"].split(","):
+                needles.update(v.lower() for v in generate(variant.strip()))
+
+        name_lower = company_name.lower()
+        needles.update(pattern.format(name_lower) for pattern in self.MEETING_PATTERNS)
+
+        name_clean = company_name.replace("-", "").replace("_", "").lower()
+        if len(name_clean) >= 3:
+            needles.add(name_clean)
+        else:
+            self._regex_companies.append(company_name)
+
+        return needles
+
+    def match(self, meeting_text: str) -> List[str]:
+        """Matching companies, in company mapping order (first match first)"""
+        if not meeting_text:
+            return []
+
+        matched = set()
+        for pattern_id in self._scanner.find(meeting_text):
+            matched |= self._needle_companies[pattern_id]
+
+        for company_name in self._regex_companies:
+            if company_name not in matched and self.matcher._match_calendar_meeting(
+                company_name, self.companies[company_name], meeting_text
+            ):
+                matched.add(company_name)
+
+        return sorted(matched, key=self._priority.__getitem__)
+
+
+class DomainIndex:
+    """All companies the attendee-domain rules accept for a set of email domains.
+
+    Each rule of ``DataETL._match_calendar_by_attendee_domains`` becomes a hash
+    lookup: exact ``calendar_domain`` values, cleaned names/base names/variants
+    contained in the cleaned domain (via the domain's substrings), the cleaned
+    domain contained in one of those stems (via the stems' substrings), and the
+    partial rule through an index of every 4-character fragment of the cleaned
+    company names.
+    """
+
+    def __init__(
+        self,
+        companies: Dict[str, Dict],
+        domain_suffixes: Sequence[str] = ATTENDEE_DOMAIN_SUFFIXES,
+    ):
+        self.domain_suffixes = domain_suffixes
+        self._priority = {name: rank for rank, name in enumerate(companies)}
+
+        self._exact_domains: Dict[str, Set[str]] = defaultdict(set)
+        self._stems: Dict[str, Set[str]] = defaultdict(set)
+        self._stem_parts: Dict[str, Set[str]] = defaultdict(set)
+        self._name_grams: Dict[str, Set[str]] = defaultdict(set)
+
+        for company_name, company_info in companies.items():
+            if company_info.get("calendar_domain"):
+                self._exact_domains[company_info["calendar_domain"].lower()].add(
+                    company_name
+                )
+
+            name_clean = clean_company_name(company_name)
+            stems = [name_clean]
+            if company_info.get("base_company"):
+                stems.append(clean_company_name(company_info["base_company"]))
+            if company_info.get("variant_type"):
+                stems.extend(
+                    clean_company_name(variant.strip())
+                    for variant in company_info["variant_type"].split(",")
+                )
+
+            for stem in stems:
+                self._stems[stem].add(company_name)
+                for part in _substrings(stem):
+                    self._stem_parts[part].add(company_name)
+
+            if len(name_clean) > DOMAIN_GRAM_SIZE - 1:
+                for i in range(len(name_clean) - DOMAIN_GRAM_SIZE + 1):
+                    self._name_grams[name_clean[i : i + DOMAIN_GRAM_SIZE]].add(
+                        company_name
+                    )
+
+    def clean_domain(self, domain: str) -> str:
+        """Domain with the configured suffixes removed"""
+        for suffix in self.domain_suffixes:
+            domain = domain.replace(suffix, "")
+        return domain
+
+    def match_domain(self, domain: str) -> Set[str]:
+        """Companies matching a single (lowercased) attendee domain"""
+        matched = set(self._exact_domains.get(domain, ()))
+        domain_clean = self.clean_domain(domain)
+
+        # A company stem contained in the domain, or the domain in a stem
+        for part in _substrings(domain_clean):
+            matched |= self._stems.get(part, set())
+        matched |= self._stem_parts.get(domain_clean, set())
+
+        # Partial rule: any 4-character piece of the company name in the domain
+        if len(domain_clean) > DOMAIN_GRAM_SIZE - 1:
+            for i in range(len(domain_clean) - DOMAIN_GRAM_SIZE + 1):
+                matched |= self._name_grams.get(
+                    domain_clean[i : i + DOMAIN_GRAM_SIZE], set()
+                )
+
+        return matched
+
+    def match(self, attendee_domains: Iterable[str]) -> List[str]:
+        """Matching companies, in company mapping order (first match first)"""
+        matched = set()
+        for domain in attendee_domains:
+            matched |= self.match_domain(domain)
+        return sorted(matched, key=self._priority.__getitem__)
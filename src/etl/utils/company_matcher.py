@@ -6,14 +6,54 @@ Provides improved fuzzy matching and name normalization for better data coverage
 
 import re
 import string
-from difflib import SequenceMatcher
-from typing import Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .name_similarity import bounded_ratio, ratio_matrix
+
+# Distinct names memoized by normalize_name / generate_name_variants
+NAME_CACHE_SIZE = 65536
+
+# fuzzy_match similarity threshold on normalized names
+FUZZY_MATCH_THRESHOLD = 0.85
+
+# calculate_confidence only counts fuzzy similarities above this
+CONFIDENCE_SIMILARITY_THRESHOLD = 0.8
+
+# fuzzy_match only accepts substring matches between normalized names this long
+MIN_CONTAINMENT_LENGTH = 6
+
+# Avoid matching on common suffixes like "-bit", "-safe", etc.
+CONTAINMENT_EXCLUDED_PARTS = [
+    "-bit",
+    "-safe",
+    "-minter",
+    "-mainnet",
+    "-bitsafe",
+    "bit",
+    "safe",
+]
+
+# Suffixes HubSpot company names often carry ("Company Inc.", "Company LLC", ...)
+HUBSPOT_BUSINESS_SUFFIXES = [
+    "inc",
+    "llc",
+    "corp",
+    "ltd",
+    "limited",
+    "company",
+    "co",
+    "group",
+    "holdings",
+    "enterprises",
+]
 
 
 class CompanyMatcher:
     """Enhanced company matching with fuzzy logic and name normalization"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = NAME_CACHE_SIZE):
         # Common suffixes to remove for better matching
         self.company_suffixes = [
             "inc",
@@ -56,8 +96,33 @@ class CompanyMatcher:
         # Common separators to normalize
         self.separators = ["-", "_", ".", " ", "+", "&", "and"]
 
+        # Prefixes are stripped in list order, each at most once, which is what a
+        # chain of optional groups matched from the start does. Suffixes are
+        # stripped from the end the same way, so that pass runs on the reversed name.
+        self._prefix_pattern = re.compile(
+            "".join(f"(?:{re.escape(prefix)} )?" for prefix in self.company_prefixes)
+        )
+        self._reversed_suffix_pattern = re.compile(
+            "".join(
+                f"(?:{re.escape(suffix[::-1])} ?)?" for suffix in self.company_suffixes
+            )
+        )
+        # Runs of separators collapse into a single hyphen
+        self._separator_pattern = re.compile(
+            "(?:" + "|".join(re.escape(sep) for sep in self.separators) + ")+"
+        )
+
+        # Both are pure functions of the name, so memoize them per matcher
+        self._normalize_cached = lru_cache(maxsize=cache_size)(self._normalize_name)
+        self._variants_cached = lru_cache(maxsize=cache_size)(
+            self._generate_name_variants
+        )
+
     def normalize_name(self, name: str) -> str:
         """Normalize company name for better matching"""
+        return self._normalize_cached(name)
+
+    def _normalize_name(self, name: str) -> str:
         if not name:
             return ""
 
@@ -65,23 +130,15 @@ class CompanyMatcher:
         normalized = name.lower().strip()
 
         # Remove common prefixes
-        for prefix in self.company_prefixes:
-            if normalized.startswith(prefix + " "):
-                normalized = normalized[len(prefix) + 1 :]
+        normalized = normalized[self._prefix_pattern.match(normalized).end() :]
 
         # Remove common suffixes
-        for suffix in self.company_suffixes:
-            if normalized.endswith(" " + suffix):
-                normalized = normalized[: -len(suffix) - 1]
-            elif normalized.endswith(suffix):
-                normalized = normalized[: -len(suffix)]
-
-        # Normalize separators to hyphens
-        for sep in self.separators:
-            normalized = normalized.replace(sep, "-")
+        reversed_name = normalized[::-1]
+        end = self._reversed_suffix_pattern.match(reversed_name).end()
+        normalized = reversed_name[end:][::-1]
 
-        # Remove multiple consecutive hyphens
-        normalized = re.sub(r"-+", "-", normalized)
+        # Normalize separators to single hyphens
+        normalized = self._separator_pattern.sub("-", normalized)
 
         # Remove leading/trailing hyphens
         normalized = normalized.strip("-")
@@ -90,10 +147,13 @@ class CompanyMatcher:
 
     def generate_name_variants(self, name: str) -> List[str]:
         """Generate various name variants for matching"""
+        return list(self._variants_cached(name))
+
+    def _generate_name_variants(self, name: str) -> Tuple[str, ...]:
         variants = set()
 
         if not name:
-            return list(variants)
+            return ()
 
         # Original name
         variants.add(name)
@@ -152,9 +212,32 @@ class CompanyMatcher:
             if v and len(v) > 2 and v not in generic_terms:
                 filtered_variants.append(v)
 
-        return filtered_variants
+        return tuple(filtered_variants)
 
-    def fuzzy_match(self, name1: str, name2: str, threshold: float = 0.85) -> bool:
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters of the name normalization caches"""
+        stats = {}
+        for label, cached in (
+            ("normalize_name", self._normalize_cached),
+            ("generate_name_variants", self._variants_cached),
+        ):
+            info = cached.cache_info()
+            stats[label] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "max_size": info.maxsize,
+            }
+        return stats
+
+    def clear_caches(self):
+        """Drop memoized names and reset the hit/miss counters"""
+        self._normalize_cached.cache_clear()
+        self._variants_cached.cache_clear()
+
+    def fuzzy_match(
+        self, name1: str, name2: str, threshold: float = FUZZY_MATCH_THRESHOLD
+    ) -> bool:
         """Check if two names are similar using fuzzy matching"""
         if not name1 or not name2:
             return False
@@ -170,25 +253,19 @@ class CompanyMatcher:
             return True
 
         # Fuzzy similarity
-        similarity = SequenceMatcher(None, norm1, norm2).ratio()
+        similarity = bounded_ratio(norm1, norm2, threshold)
         if similarity >= threshold:
             return True
 
         # Check if one name contains the other (but only if it's a significant portion)
         # Require at least 6 characters and avoid common suffixes/prefixes
-        if len(norm1) >= 6 and len(norm2) >= 6:
-            # Avoid matching on common suffixes like "-bit", "-safe", etc.
-            common_suffixes = [
-                "-bit",
-                "-safe",
-                "-minter",
-                "-mainnet",
-                "-bitsafe",
-                "bit",
-                "safe",
-            ]
+        if (
+            len(norm1) >= MIN_CONTAINMENT_LENGTH
+            and len(norm2) >= MIN_CONTAINMENT_LENGTH
+        ):
             has_common_suffix = any(
-                suffix in norm1 or suffix in norm2 for suffix in common_suffixes
+                suffix in norm1 or suffix in norm2
+                for suffix in CONTAINMENT_EXCLUDED_PARTS
             )
 
             if not has_common_suffix and (norm1 in norm2 or norm2 in norm1):
@@ -332,6 +409,31 @@ class CompanyMatcher:
         company_variants = self.generate_name_variants(company_name)
         channel_variants = self.generate_name_variants(channel_name)
 
+        base_variants = []
+        if company_info.get("base_company"):
+            base_variants = self.generate_name_variants(company_info["base_company"])
+
+        group_variants = []
+        groups_field = f"{channel_type}_groups"
+        if company_info.get(groups_field):
+            groups_str = company_info[groups_field]
+            if groups_str:
+                groups = [g.strip() for g in groups_str.split(",")]
+                for group in groups:
+                    group_variants.extend(self.generate_name_variants(group))
+
+        return self.score_variants(
+            company_variants, base_variants, group_variants, channel_variants
+        )
+
+    def score_variants(
+        self,
+        company_variants: List[str],
+        base_variants: List[str],
+        group_variants: List[str],
+        channel_variants: List[str],
+    ) -> float:
+        """Confidence score for already generated company and channel variants"""
         max_confidence = 0.0
 
         # Check direct matches (highest confidence)
@@ -342,37 +444,28 @@ class CompanyMatcher:
                 elif company_var in channel_var or channel_var in company_var:
                     max_confidence = max(max_confidence, 0.9)
 
-        # Check fuzzy matches
-        for company_var in company_variants:
-            for channel_var in channel_variants:
-                similarity = SequenceMatcher(None, company_var, channel_var).ratio()
-                if similarity > 0.8:
-                    max_confidence = max(max_confidence, similarity)
+        # Check fuzzy matches, scoring all pairs in one batch
+        for _, _, similarity in ratio_matrix(
+            company_variants, channel_variants, CONFIDENCE_SIMILARITY_THRESHOLD
+        ):
+            if similarity > CONFIDENCE_SIMILARITY_THRESHOLD:
+                max_confidence = max(max_confidence, similarity)
 
         # Check against base company
-        if company_info.get("base_company"):
-            base_variants = self.generate_name_variants(company_info["base_company"])
-            for base_var in base_variants:
-                for channel_var in channel_variants:
-                    if base_var == channel_var:
-                        return 0.95
-                    elif base_var in channel_var or channel_var in base_var:
-                        max_confidence = max(max_confidence, 0.85)
+        for base_var in base_variants:
+            for channel_var in channel_variants:
+                if base_var == channel_var:
+                    return 0.95
+                elif base_var in channel_var or channel_var in base_var:
+                    max_confidence = max(max_confidence, 0.85)
 
         # Check against groups field
-        groups_field = f"{channel_type}_groups"
-        if company_info.get(groups_field):
-            groups_str = company_info[groups_field]
-            if groups_str:
-                groups = [g.strip() for g in groups_str.split(",")]
-                for group in groups:
-                    group_variants = self.generate_name_variants(group)
-                    for group_var in group_variants:
-                        for channel_var in channel_variants:
-                            if group_var == channel_var:
-                                return 0.9
-                            elif group_var in channel_var or channel_var in group_var:
-                                max_confidence = max(max_confidence, 0.8)
+        for group_var in group_variants:
+            for channel_var in channel_variants:
+                if group_var == channel_var:
+                    return 0.9
+                elif group_var in channel_var or channel_var in group_var:
+                    max_confidence = max(max_confidence, 0.8)
 
         return max_confidence
 
@@ -601,31 +694,9 @@ class CompanyMatcher:
         if company_name_clean in hubspot_clean or hubspot_clean in company_name_clean:
             return True
 
-        # 6. Check for common business suffixes and prefixes
-        business_suffixes = [
-            "inc",
-            "llc",
-            "corp",
-            "ltd",
-            "limited",
-            "company",
-            "co",
-            "group",
-            "holdings",
-            "enterprises",
-        ]
-        business_prefixes = [
-            "the",
-            "a",
-            "an",
-            "new",
-            "advanced",
-            "global",
-            "international",
-        ]
-
+        # 6. Check for common business suffixes
         # Remove business suffixes from both names and compare
-        for suffix in business_suffixes:
+        for suffix in HUBSPOT_BUSINESS_SUFFIXES:
             if hubspot_company_lower.endswith(suffix):
                 hubspot_no_suffix = hubspot_company_lower[: -len(suffix)].strip()
                 if (
@@ -643,7 +714,7 @@ class CompanyMatcher:
                 .replace(" ", "")
                 .lower()
             )
-            for suffix in business_suffixes:
+            for suffix in HUBSPOT_BUSINESS_SUFFIXES:
                 if hubspot_company_lower.endswith(suffix):
                     hubspot_no_suffix = hubspot_company_lower[: -len(suffix)].strip()
                     if (
@@ -721,3 +792,355 @@ class CompanyMatcher:
                         return True
 
         return False
+
+
+def _bigram_counts(text: str) -> Counter:
+    """Multiset of overlapping character bigrams"""
+    return Counter(text[i : i + 2] for i in range(len(text) - 1))
+
+
+def _substrings(text: str, min_length: int = 0) -> Set[str]:
+    """Every distinct substring of ``text`` at least ``min_length`` long"""
+    found = {""} if min_length == 0 else set()
+    length = len(text)
+    for start in range(length):
+        for end in range(start + max(min_length, 1), length + 1):
+            found.add(text[start:end])
+    return found
+
+
+class CompanyMatchIndex:
+    """Company mapping precompiled for matching many channel names at once.
+
+    Company-side name variants are generated once and their normalized forms are
+    stored in an exact-hit hash map plus a bigram inverted index. A channel name
+    then only runs ``fuzzy_match`` logic against the shortlisted candidates
+    instead of every company's variants. The shortlist bound follows the q-gram
+    lemma (two strings within edit distance k share at least
+    ``max(len) - 1 - 2k`` bigrams), so no pair ``CompanyMatcher`` would accept is
+    ever filtered out and results are identical to the per-pair methods.
+    """
+
+    # Company-side variant roles ``match_company_to_channel`` compares against
+    COMPANY_ROLE = "company"
+    BASE_ROLE = "base"
+    VARIANT_ROLE = "variant"
+    DOMAIN_ROLE = "domain"
+
+    def __init__(self, matcher: CompanyMatcher, companies: Dict[str, Dict]):
+        self.matcher = matcher
+        self.companies = companies
+
+        # company -> role -> list of name variants
+        self.variants: Dict[str, Dict[str, List[str]]] = {}
+
+        # Normalized variant terms, their owners and the bigram inverted index
+        self._term_ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._term_owners: List[List[Tuple[str, str]]] = []
+        self._bigram_index: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._short_term_ids: List[int] = []
+        self._query_cache: Dict[str, Set[int]] = {}
+
+        # HubSpot needles: substring lookups in either direction
+        self._hubspot_needles: Dict[str, Set[str]] = defaultdict(set)
+        self._clean_names: Dict[str, Set[str]] = defaultdict(set)
+        self._clean_bases: Dict[str, Set[str]] = defaultdict(set)
+        self._clean_name_parts: Dict[str, Set[str]] = defaultdict(set)
+        self._clean_base_parts: Dict[str, Set[str]] = defaultdict(set)
+
+        for company_name, company_info in companies.items():
+            if company_name:
+                self._add_company(company_name, company_info)
+
+    def _add_company(self, company_name: str, company_info: Dict):
+        """Generate and index every variant of one company"""
+        matcher = self.matcher
+        roles = {self.COMPANY_ROLE: matcher.generate_name_variants(company_name)}
+
+        if company_info.get("base_company"):
+            roles[self.BASE_ROLE] = matcher.generate_name_variants(
+                company_info["base_company"]
+            )
+
+        if company_info.get("variant_type"):
+            roles[self.VARIANT_ROLE] = self._split_variants(
+                company_info["variant_type"]
+            )
+
+        for field, value in company_info.items():
+            if field.endswith("_groups") and value:
+                roles[field] = self._split_variants(value)
+
+        if company_info.get("calendar_domain"):
+            roles[self.DOMAIN_ROLE] = matcher.generate_name_variants(
+                company_info["calendar_domain"]
+            )
+
+        self.variants[company_name] = roles
+
+        for role, role_variants in roles.items():
+            if role == self.DOMAIN_ROLE:
+                continue
+            for variant in role_variants:
+                self._add_term(matcher.normalize_name(variant), company_name, role)
+
+        # HubSpot matching works on lowercased / separator-free names instead
+        for role in (
+            self.COMPANY_ROLE,
+            self.BASE_ROLE,
+            self.DOMAIN_ROLE,
+            self.VARIANT_ROLE,
+        ):
+            for variant in roles.get(role, []):
+                self._hubspot_needles[variant.lower()].add(company_name)
+
+        name_clean = (
+            company_name.replace("-", "").replace("_", "").replace(" ", "").lower()
+        )
+        self._clean_names[name_clean].add(company_name)
+        for part in _substrings(name_clean):
+            self._clean_name_parts[part].add(company_name)
+
+        if company_info.get("base_company"):
+            base_clean = (
+                company_info["base_company"]
+                .replace("-", "")
+                .replace("_", "")
+                .replace(" ", "")
+                .lower()
+            )
+            self._clean_bases[base_clean].add(company_name)
+            for part in _substrings(base_clean):
+                self._clean_base_parts[part].add(company_name)
+
+    def _split_variants(self, value: str) -> List[str]:
+        """Variants of every comma-separated name in a mapping field"""
+        variants = []
+        for name in value.split(","):
+            variants.extend(self.matcher.generate_name_variants(name.strip()))
+        return variants
+
+    def _add_term(self, term: str, company_name: str, role: str):
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._term_ids[term] = term_id
+            self._terms.append(term)
+            self._term_owners.append([])
+            for bigram, count in _bigram_counts(term).items():
+                self._bigram_index[bigram].append((term_id, count))
+            if len(term) < 2:
+                self._short_term_ids.append(term_id)
+        self._term_owners[term_id].append((company_name, role))
+
+    def _fuzzy_terms(self, query: str) -> Set[int]:
+        """Ids of indexed terms ``t`` for which ``fuzzy_match(t, query)`` holds"""
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            return cached
+
+        matches = set()
+        exact_id = self._term_ids.get(query)
+        if exact_id is not None:
+            matches.add(exact_id)
+
+        query_length = len(query)
+        query_contains = query_length >= MIN_CONTAINMENT_LENGTH and not any(
+            part in query for part in CONTAINMENT_EXCLUDED_PARTS
+        )
+
+        # Indexed terms that are substrings of the query
+        if query_contains:
+            for part in _substrings(query, MIN_CONTAINMENT_LENGTH):
+                term_id = self._term_ids.get(part)
+                if term_id is not None:
+                    matches.add(term_id)
+
+        shared = defaultdict(int)
+        for bigram, query_count in _bigram_counts(query).items():
+            for term_id, term_count in self._bigram_index.get(bigram, ()):
+                shared[term_id] += min(query_count, term_count)
+
+        # Terms too short to carry bigrams can only be compared by brute force
+        if query_length < 2:
+            for term_id in self._short_term_ids:
+                shared.setdefault(term_id, 0)
+
+        fuzzy_candidates = []
+        for term_id, shared_count in shared.items():
+            if term_id in matches:
+                continue
+            term = self._terms[term_id]
+            term_length = len(term)
+
+            # Query contained in the term: every query bigram must be shared
+            if (
+                query_contains
+                and term_length > query_length
+                and shared_count >= query_length - 1
+                and query in term
+                and not any(part in term for part in CONTAINMENT_EXCLUDED_PARTS)
+            ):
+                matches.add(term_id)
+                continue
+
+            total_length = term_length + query_length
+            if 2.0 * min(term_length, query_length) < (
+                FUZZY_MATCH_THRESHOLD * total_length - 1e-9
+            ):
+                continue
+            max_edits = int((1 - FUZZY_MATCH_THRESHOLD) * total_length + 1e-9)
+            if shared_count < max(term_length, query_length) - 1 - 2 * max_edits:
+                continue
+            fuzzy_candidates.append(term_id)
+
+        # Score the shortlisted terms against the query in one batch
+        candidate_terms = [self._terms[term_id] for term_id in fuzzy_candidates]
+        for index, _, similarity in ratio_matrix(
+            candidate_terms, [query], FUZZY_MATCH_THRESHOLD
+        ):
+            if similarity >= FUZZY_MATCH_THRESHOLD:
+                matches.add(fuzzy_candidates[index])
+
+        self._query_cache[query] = matches
+        return matches
+
+    def _fuzzy_companies(
+        self, channel_variants: Iterable[str], roles: Set[str]
+    ) -> Set[str]:
+        """Companies with a variant in ``roles`` that fuzzy-matches a channel variant"""
+        companies = set()
+        for channel_var in channel_variants:
+            query = self.matcher.normalize_name(channel_var)
+            for term_id in self._fuzzy_terms(query):
+                for company_name, role in self._term_owners[term_id]:
+                    if role in roles:
+                        companies.add(company_name)
+        return companies
+
+    def match_channel(self, channel_name: str, channel_type: str = "slack") -> Set[str]:
+        """Companies ``match_company_to_channel`` would accept for this channel"""
+        if not channel_name:
+            return set()
+
+        if channel_type == "telegram":
+            return self._match_telegram_chat(channel_name)
+
+        if channel_type == "hubspot":
+            return self._match_hubspot_company(channel_name)
+
+        if channel_type == "calendar":
+            raise ValueError("Calendar meetings are matched by text search, not name")
+
+        generate = self.matcher.generate_name_variants
+        company_roles = {self.COMPANY_ROLE, self.BASE_ROLE}
+
+        companies = self._fuzzy_companies(
+            generate(channel_name),
+            company_roles | {self.VARIANT_ROLE, f"{channel_type}_groups"},
+        )
+
+        # Special handling for bitsafe channels
+        if channel_name.lower().endswith("-bitsafe"):
+            bitsafe_base = channel_name.lower().replace("-bitsafe", "")
+            companies |= self._fuzzy_companies(generate(bitsafe_base), company_roles)
+
+        return companies
+
+    def _match_telegram_chat(self, chat_name: str) -> Set[str]:
+        generate = self.matcher.generate_name_variants
+        companies = set()
+
+        chat_parts = chat_name.replace("-telegram", "").split("-")
+        for part in chat_parts:
+            part = part.strip()
+            if len(part) < 3:
+                continue
+            companies |= self._fuzzy_companies(
+                generate(part), {self.COMPANY_ROLE, self.BASE_ROLE}
+            )
+
+        full_chat_name = chat_name.replace("-telegram", "").strip()
+        if full_chat_name:
+            companies |= self._fuzzy_companies(
+                generate(full_chat_name), {self.COMPANY_ROLE}
+            )
+
+        return companies
+
+    def _match_hubspot_company(self, hubspot_company: str) -> Set[str]:
+        hubspot_lower = hubspot_company.lower()
+        companies = set()
+
+        # Company, base, domain and variant names contained in the HubSpot name
+        for part in _substrings(hubspot_lower):
+            companies |= self._hubspot_needles.get(part, set())
+
+        hubspot_clean = hubspot_lower
+        for token in ("inc", "llc", "corp", "ltd", "limited", "company", "co"):
+            hubspot_clean = hubspot_clean.replace(token, "")
+        hubspot_clean = hubspot_clean.replace(" ", "").replace("-", "").replace("_", "")
+
+        # Cleaned company name and cleaned HubSpot name contain each other
+        for part in _substrings(hubspot_clean):
+            companies |= self._clean_names.get(part, set())
+        companies |= self._clean_name_parts.get(hubspot_clean, set())
+
+        # Same comparison with business suffixes stripped from the HubSpot name
+        for suffix in HUBSPOT_BUSINESS_SUFFIXES:
+            if hubspot_lower.endswith(suffix):
+                hubspot_no_suffix = hubspot_lower[: -len(suffix)].strip()
+                for part in _substrings(hubspot_no_suffix):
+                    companies |= self._clean_names.get(part, set())
+                    companies |= self._clean_bases.get(part, set())
+                companies |= self._clean_name_parts.get(hubspot_no_suffix, set())
+                companies |= self._clean_base_parts.get(hubspot_no_suffix, set())
+
+        return companies
+
+    def confidence(
+        self, company_name: str, channel_name: str, channel_type: str = "slack"
+    ) -> float:
+        """``calculate_confidence`` using the precomputed company variants"""
+        if not company_name or not channel_name:
+            return 0.0
+
+        roles = self.variants[company_name]
+        return self.matcher.score_variants(
+            roles[self.COMPANY_ROLE],
+            roles.get(self.BASE_ROLE, []),
+            roles.get(f"{channel_type}_groups", []),
+            self.matcher.generate_name_variants(channel_name),
+        )
+
+    def find_best_matches(
+        self, channels: Dict[str, Dict], channel_type: str = "slack"
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """``find_best_matches`` for every indexed company in one pass over channels"""
+        matches = defaultdict(list)
+
+        for channel_id, channel_data in channels.items():
+            if channel_type == "telegram":
+                channel_name = channel_data.get("chat_name", "")
+            else:  # slack, calendar, etc.
+                channel_name = channel_data.get("name", "")
+
+            for company_name in self.match_channel(channel_name, channel_type):
+                confidence = self.confidence(company_name, channel_name, channel_type)
+                matches[company_name].append((channel_id, confidence))
+
+        # Sort by confidence score (highest first)
+        for company_matches in matches.values():
+            company_matches.sort(key=lambda x: x[1], reverse=True)
+        return dict(matches)
+
+    def match_names(
+        self, names: Iterable[str], channel_type: str
+    ) -> Dict[str, List[str]]:
+        """Names matched per company, in input order"""
+        matches = defaultdict(list)
+        for name in names:
+            for company_name in self.match_channel(name, channel_type):
+                matches[company_name].append(name)
+        return dict(matches)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compact Message Records
+Tuple-backed message records shared by the ETL ingesters. They keep one small
+tuple per message instead of a dict while still answering the ``msg["text"]`` /
+``msg.get("author")`` lookups the matcher and text formatter use.
+"""
+
+from collections import namedtuple
+
+
+class _RecordAccess:
+    """Read-only dict-style access (``record["text"]``, ``record.get()``) for
+    compact tuple records, so existing consumers of message dicts keep working"""
+
+    __slots__ = ()
+    _keys = frozenset()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._keys:
+                raise KeyError(key)
+            return getattr(self, key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._keys else default
+
+    def keys(self):
+        return list(self._fields)
+
+
+class ChatMessageRecord(
+    _RecordAccess,
+    namedtuple(
+        "ChatMessageRecord", ["author", "text", "timestamp", "message_id", "is_service"]
+    ),
+):
+    """Compact Telegram chat message produced by ``DataETL._process_single_chat``"""
+
+    __slots__ = ()
+    _keys = frozenset(
+        ("author", "text", "timestamp", "message_id", "is_service", "message_type")
+    )
+
+    @property
+    def message_type(self) -> str:
+        return "service" if self.is_service else "regular"
+
+
+class WorkerMessageRecord(
+    _RecordAccess, namedtuple("WorkerMessageRecord", ["sender", "timestamp", "text"])
+):
+    """Compact Telegram message returned by ``process_telegram_chat_worker``"""
+
+    __slots__ = ()
+    _keys = frozenset(("sender", "timestamp", "text"))
+
+
+class SlackMessageRecord(
+    _RecordAccess,
+    namedtuple("SlackMessageRecord", ["author", "text", "timestamp", "real_name"]),
+):
+    """Compact Slack message produced by ``DataETL.ingest_slack_data``"""
+
+    __slots__ = ()
+    _keys = frozenset(("author", "text", "timestamp", "real_name", "display_name"))
+
+    @property
+    def display_name(self) -> str:
+        return self.real_name if self.real_name else self.author
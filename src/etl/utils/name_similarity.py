@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Batched Name Similarity
+Scores one name against many candidates for CompanyMatcher. With rapidfuzz
+installed, a single ``process.cdist`` call computes the Indel similarity
+(2 * LCS / total length) of every pair. That value is an upper bound of
+difflib's ``SequenceMatcher.ratio()``, so it only discards pairs that cannot
+reach the threshold, and the survivors are scored with SequenceMatcher. Match
+decisions and confidence values are therefore identical to the difflib-only
+path, which uses SequenceMatcher's own quick upper bounds instead.
+"""
+
+from difflib import SequenceMatcher
+from typing import List, Sequence, Tuple
+
+try:
+    from rapidfuzz import process
+    from rapidfuzz.distance import Indel
+except ImportError:  # rapidfuzz is optional, fall back to difflib's upper bounds
+    process = None
+    Indel = None
+
+BACKEND_RAPIDFUZZ = "rapidfuzz"
+BACKEND_DIFFLIB = "difflib"
+
+# Keep pairs whose bound is within float rounding of the threshold
+BOUND_TOLERANCE = 1e-9
+
+
+def similarity_backend() -> str:
+    """Name of the backend used to shortlist pairs"""
+    return BACKEND_RAPIDFUZZ if process is not None else BACKEND_DIFFLIB
+
+
+def bounded_ratio(a: str, b: str, threshold: float) -> float:
+    """``SequenceMatcher(None, a, b).ratio()``, or 0.0 when an upper bound
+    already shows it is below ``threshold``"""
+    cutoff = threshold - BOUND_TOLERANCE
+
+    if Indel is not None:
+        if Indel.normalized_similarity(a, b) < cutoff:
+            return 0.0
+        return SequenceMatcher(None, a, b).ratio()
+
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+        return 0.0
+    return matcher.ratio()
+
+
+def ratio_matrix(
+    queries: Sequence[str], choices: Sequence[str], threshold: float
+) -> List[Tuple[int, int, float]]:
+    """``(query index, choice index, ratio)`` for every pair whose difflib ratio
+    may reach ``threshold``; pairs certainly below it are omitted"""
+    if not queries or not choices:
+        return []
+
+    if process is None:
+        scored = []
+        for i, query in enumerate(queries):
+            for j, choice in enumerate(choices):
+                ratio = bounded_ratio(query, choice, threshold)
+                if ratio:
+                    scored.append((i, j, ratio))
+        return scored
+
+    bounds = process.cdist(
+        queries,
+        choices,
+        scorer=Indel.normalized_similarity,
+        score_cutoff=threshold - BOUND_TOLERANCE,
+    )
+    rows, columns = bounds.nonzero()
+    return [
+        (int(i), int(j), SequenceMatcher(None, queries[i], choices[j]).ratio())
+        for i, j in zip(rows, columns)
+    ]
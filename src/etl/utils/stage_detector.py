@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Deal Stage Detector
+Compiles the keywords of every deal stage in the RepSplit config into one
+Aho-Corasick automaton, so a message is scanned once for all stages instead
+of once per keyword. Stages may also list regex patterns, which count as
+keyword matches.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from .aho_corasick import AhoCorasick
+
+
+@dataclass
+class StageConfig:
+    """Configuration for deal stages and their commission weights"""
+
+    name: str
+    weight: float
+    keywords: List[str]
+    regex_patterns: List[str] = field(default_factory=list)
+
+
+def stage_confidence(matches: int) -> float:
+    """Confidence of a stage detection with ``matches`` keyword hits"""
+    # Higher base confidence for multiple matches
+    return min(1.0, 0.3 + (matches * 0.4))
+
+
+class StageDetector:
+    """Keyword and regex stage detection for every configured stage at once.
+
+    A keyword matches when its lowercase form occurs in the lowercased text;
+    each listed keyword counts once per stage (duplicates count again), as
+    with the per-keyword ``in`` checks this replaces.
+    """
+
+    def __init__(self, stages: List[StageConfig]):
+        self.stages = stages
+
+        keyword_stages: Dict[str, List[int]] = {}
+        self._always_matches = [0] * len(stages)
+        self._stage_patterns: List[List[re.Pattern]] = []
+        for stage_index, stage in enumerate(stages):
+            for keyword in stage.keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    keyword_stages.setdefault(keyword, []).append(stage_index)
+                else:
+                    # The empty string is in every text
+                    self._always_matches[stage_index] += 1
+            self._stage_patterns.append(
+                [re.compile(pattern, re.IGNORECASE) for pattern in stage.regex_patterns]
+            )
+
+        self._scanner = AhoCorasick(keyword_stages)
+        self._pattern_stages = [
+            keyword_stages[keyword] for keyword in self._scanner.patterns
+        ]
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "StageDetector":
+        """Detector for the ``stages`` list of a RepSplit config dict"""
+        return cls(
+            [
+                StageConfig(
+                    name=stage["name"],
+                    weight=stage.get("weight", 0.0),
+                    keywords=stage.get("keywords", []),
+                    regex_patterns=stage.get("regex_patterns", []),
+                )
+                for stage in config.get("stages", [])
+            ]
+        )
+
+    @property
+    def version(self) -> str:
+        """Hash of everything that affects detections (stage names, keywords
+        and patterns, not weights), for invalidating stored detections"""
+        detection_config = [
+            [stage.name, stage.keywords, stage.regex_patterns] for stage in self.stages
+        ]
+        return hashlib.sha256(
+            json.dumps(detection_config, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def stage_match_counts(self, text: str) -> List[int]:
+        """Number of matching keywords and patterns per stage, in stage order"""
+        counts = list(self._always_matches)
+        for pattern_id in self._scanner.find(text.lower()):
+            for stage_index in self._pattern_stages[pattern_id]:
+                counts[stage_index] += 1
+
+        for stage_index, patterns in enumerate(self._stage_patterns):
+            for pattern in patterns:
+                if pattern.search(text):
+                    counts[stage_index] += 1
+
+        return counts
+
+    def detect(self, text: str) -> List[Tuple[str, float]]:
+        """(stage name, confidence) for every stage detected in ``text``"""
+        return [
+            (stage.name, stage_confidence(matches))
+            for stage, matches in zip(self.stages, self.stage_match_counts(text))
+            if matches > 0
+        ]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Telegram Export Parse Cache
+SQLite manifest of every parsed ``messages*.html`` file (mtime, size, content hash)
+together with its parsed records, so unchanged chats are loaded instead of re-parsed
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+# Bump when the parsed record layout or extraction rules change
+CACHE_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class FileState(NamedTuple):
+    """On-disk state of one export file"""
+
+    file_name: str
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file's content in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TelegramChatCache:
+    """Manifest and parsed-record cache for one Telegram file format"""
+
+    def __init__(self, db_path: str, file_format: str, record_type: type):
+        self.db_path = db_path
+        self.file_format = file_format
+        self.record_type = record_type
+        self.stats = {"cached_files": 0, "rehashed_files": 0, "stale_files": 0}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.init_database()
+        self._manifest = self._load_manifest()
+
+    def init_database(self):
+        """Create the manifest table if needed"""
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS telegram_file_manifest (
+                chat_dir TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                file_format TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                cache_version INTEGER NOT NULL,
+                parsed_json TEXT NOT NULL,
+                updated_at TEXT,
+                PRIMARY KEY (chat_dir, file_name, file_format)
+            )
+            """
+        )
+        self.conn.commit()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, FileState]]:
+        """Load file states (without records) for this format in one query"""
+        cursor = self.conn.execute(
+            """
+            SELECT chat_dir, file_name, mtime_ns, size, sha256
+            FROM telegram_file_manifest
+            WHERE file_format = ? AND cache_version = ?
+            """,
+            (self.file_format, CACHE_VERSION),
+        )
+        manifest = {}
+        for chat_dir, file_name, mtime_ns, size, sha256 in cursor:
+            manifest.setdefault(chat_dir, {})[file_name] = FileState(
+                file_name, mtime_ns, size, sha256
+            )
+        return manifest
+
+    def lookup(
+        self, chat_dir: str, chat_path: str, file_names: List[str]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[FileState]]:
+        """Split a chat's files into cached parse results and files to re-parse.
+
+        Files whose mtime and size match the manifest are trusted as-is; files
+        whose stat changed are hashed and only re-parsed if the content changed.
+        """
+        known_files = self._manifest.get(chat_dir, {})
+        cached_names = []
+        stale = []
+
+        for file_name in file_names:
+            path = os.path.join(chat_path, file_name)
+            stat = os.stat(path)
+            known = known_files.get(file_name)
+
+            if known and (known.mtime_ns, known.size) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                cached_names.append(file_name)
+                continue
+
+            sha256 = file_sha256(path)
+            if known and known.size == stat.st_size and known.sha256 == sha256:
+                # Touched or re-exported but identical: refresh the stat only
+                self._touch(chat_dir, file_name, stat.st_mtime_ns)
+                self.stats["rehashed_files"] += 1
+                cached_names.append(file_name)
+                continue
+
+            stale.append(FileState(file_name, stat.st_mtime_ns, stat.st_size, sha256))
+
+        removed = [name for name in known_files if name not in file_names]
+        if removed:
+            self._forget(chat_dir, removed)
+
+        cached = self._load_records(chat_dir, cached_names)
+        # Anything that vanished from the table between manifest load and now
+        for file_name in cached_names:
+            if file_name not in cached:
+                path = os.path.join(chat_path, file_name)
+                stat = os.stat(path)
+                stale.append(
+                    FileState(
+                        file_name, stat.st_mtime_ns, stat.st_size, file_sha256(path)
+                    )
+                )
+
+        self.stats["cached_files"] += len(cached)
+        self.stats["stale_files"] += len(stale)
+        return cached, stale
+
+    def _load_records(
+        self, chat_dir: str, file_names: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        if not file_names:
+            return {}
+
+        placeholders = ",".join("?" for _ in file_names)
+        cursor = self.conn.execute(
+            f"""
+            SELECT file_name, parsed_json
+            FROM telegram_file_manifest
+            WHERE chat_dir = ? AND file_format = ? AND file_name IN ({placeholders})
+            """,
+            (chat_dir, self.file_format, *file_names),
+        )
+
+        records = {}
+        for file_name, parsed_json in cursor:
+            parsed = json.loads(parsed_json)
+            parsed["messages"] = [
+                self.record_type(*message) for message in parsed["messages"]
+            ]
+            records[file_name] = parsed
+        return records
+
+    def _touch(self, chat_dir: str, file_name: str, mtime_ns: int):
+        self.conn.execute(
+            """
+            UPDATE telegram_file_manifest
+            SET mtime_ns = ?, updated_at = ?
+            WHERE chat_dir = ? AND file_name = ? AND file_format = ?
+            """,
+            (
+                mtime_ns,
+                datetime.now().isoformat(),
+                chat_dir,
+                file_name,
+                self.file_format,
+            ),
+        )
+
+    def _forget(self, chat_dir: str, file_names: List[str]):
+        """Drop files that are no longer part of the chat"""
+        self.conn.executemany(
+            """
+            DELETE FROM telegram_file_manifest
+            WHERE chat_dir = ? AND file_name = ? AND file_format = ?
+            """,
+            [(chat_dir, name, self.file_format) for name in file_names],
+        )
+
+    def store(self, chat_dir: str, state: FileState, parsed: Dict[str, Any]):
+        """Record a freshly parsed file"""
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO telegram_file_manifest
+            (chat_dir, file_name, file_format, mtime_ns, size, sha256,
+             cache_version, parsed_json, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                chat_dir,
+                state.file_name,
+                self.file_format,
+                state.mtime_ns,
+                state.size,
+                state.sha256,
+                CACHE_VERSION,
+                json.dumps(parsed, ensure_ascii=False, separators=(",", ":")),
+                datetime.now().isoformat(),
+            ),
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
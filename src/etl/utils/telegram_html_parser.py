@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Streaming Telegram HTML Export Parser
+Extracts message records from Telegram Desktop ``messages*.html`` exports without
+building a full DOM. Supports lxml (iterparse) and stdlib (html.parser) streaming
+backends, plus the original BeautifulSoup path as a reference implementation.
+"""
+
+from html.parser import HTMLParser
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional, fall back to the stdlib streaming parser
+    etree = None
+
+BACKEND_LXML = "lxml"
+BACKEND_HTML_PARSER = "html.parser"
+BACKEND_BS4 = "bs4"
+AVAILABLE_BACKENDS = (BACKEND_LXML, BACKEND_HTML_PARSER, BACKEND_BS4)
+
+# Elements html.parser never sees a closing tag for
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+# Elements inside which BeautifulSoup keeps whitespace-only strings verbatim
+PRESERVE_WHITESPACE_ELEMENTS = {"pre", "textarea"}
+
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# A text field is the tuple of raw text nodes under an element, or None if the
+# element is missing from the message.
+TextFragments = Optional[Tuple[str, ...]]
+
+
+class TelegramMessage(NamedTuple):
+    """Raw fields of a single ``div.message`` element"""
+
+    message_id: str
+    is_service: bool
+    from_name: TextFragments
+    text: TextFragments
+    details: TextFragments  # first ``div.body.details`` (service message body)
+    date_title: Optional[str]
+    date_text: TextFragments
+
+
+def element_text(fragments: TextFragments) -> str:
+    """Equivalent of BeautifulSoup ``element.text.strip()``"""
+    if not fragments:
+        return ""
+    return "".join(fragments).strip()
+
+
+def stripped_text(fragments: TextFragments) -> str:
+    """Equivalent of BeautifulSoup ``element.get_text(strip=True)``"""
+    if not fragments:
+        return ""
+    return "".join(f.strip() for f in fragments if f.strip())
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    """Resolve the parser backend name, preferring lxml when installed"""
+    if backend in (None, "", "auto"):
+        return BACKEND_LXML if etree is not None else BACKEND_HTML_PARSER
+    if backend not in AVAILABLE_BACKENDS:
+        raise ValueError(
+            f"Unknown Telegram parser backend '{backend}'. "
+            f"Choose one of: auto, {', '.join(AVAILABLE_BACKENDS)}"
+        )
+    if backend == BACKEND_LXML and etree is None:
+        raise ValueError("lxml parser backend requested but lxml is not installed")
+    return backend
+
+
+def _normalize_string(data: str, preserve_whitespace: bool) -> str:
+    """Collapse whitespace-only strings the way BeautifulSoup's tree builder does"""
+    if preserve_whitespace or data.strip(ASCII_SPACES):
+        return data
+    return "\n" if "\n" in data else " "
+
+
+def _class_tokens(class_attr: Optional[str]) -> List[str]:
+    return class_attr.split() if class_attr else []
+
+
+class _MessageBuilder:
+    """Accumulates the fields of one message while its element is open"""
+
+    __slots__ = (
+        "message_id",
+        "is_service",
+        "from_name",
+        "text",
+        "details",
+        "date_title",
+        "date_text",
+    )
+
+    def __init__(self, message_id: str, is_service: bool):
+        self.message_id = message_id
+        self.is_service = is_service
+        self.from_name = None
+        self.text = None
+        self.details = None
+        self.date_title = None
+        self.date_text = None
+
+    def build(self) -> TelegramMessage:
+        return TelegramMessage(
+            self.message_id,
+            self.is_service,
+            tuple(self.from_name) if self.from_name is not None else None,
+            tuple(self.text) if self.text is not None else None,
+            tuple(self.details) if self.details is not None else None,
+            self.date_title,
+            tuple(self.date_text) if self.date_text is not None else None,
+        )
+
+
+class _StreamingExportParser(HTMLParser):
+    """Event-driven html.parser handler that mirrors BeautifulSoup ``find`` semantics"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # Each frame: (tag, sinks opened by this element, builder, userpic)
+        self._stack = []
+        self._active_sinks = []
+        self._pending_data = []
+        self._preserve_depth = 0
+        self._open_messages = []
+        self._open_userpics = []
+        self.header = None
+        self.userpic_initials = []
+        self.completed = []
+
+    def _open_sink(self, sinks: list) -> list:
+        sink = []
+        sinks.append(sink)
+        self._active_sinks.append(sink)
+        return sink
+
+    def _flush_data(self):
+        """End the current string, like BeautifulSoup's ``endData``"""
+        if not self._pending_data:
+            return
+        data = _normalize_string("".join(self._pending_data), self._preserve_depth > 0)
+        self._pending_data = []
+        for sink in self._active_sinks:
+            sink.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_data()
+        sinks = []
+        builder = None
+        userpic = None
+
+        if tag == "div":
+            attr_map = dict(attrs)
+            classes = _class_tokens(attr_map.get("class"))
+
+            if classes:
+                if "message" in classes:
+                    builder = _MessageBuilder(
+                        attr_map.get("id") or "", "service" in classes
+                    )
+
+                for open_builder in self._open_messages:
+                    if "from_name" in classes and open_builder.from_name is None:
+                        open_builder.from_name = self._open_sink(sinks)
+                    if "text" in classes and open_builder.text is None:
+                        open_builder.text = self._open_sink(sinks)
+                    if (
+                        " ".join(classes) == "body details"
+                        and open_builder.details is None
+                    ):
+                        open_builder.details = self._open_sink(sinks)
+                    if "date" in classes and open_builder.date_text is None:
+                        open_builder.date_title = attr_map.get("title") or ""
+                        open_builder.date_text = self._open_sink(sinks)
+
+                if "page_header" in classes and self.header is None:
+                    self.header = self._open_sink(sinks)
+
+                if "initials" in classes:
+                    for open_userpic in self._open_userpics:
+                        if open_userpic[0] is None:
+                            open_userpic[0] = self._open_sink(sinks)
+
+                if "userpic" in classes:
+                    userpic = [None]
+                    self.userpic_initials.append(userpic)
+                    self._open_userpics.append(userpic)
+
+            if builder is not None:
+                self._open_messages.append(builder)
+
+        if tag not in VOID_ELEMENTS:
+            self._stack.append((tag, sinks, builder, userpic))
+            if tag in PRESERVE_WHITESPACE_ELEMENTS:
+                self._preserve_depth += 1
+        elif sinks:
+            # A void element never closes, so it can't own text
+            for sink in sinks:
+                self._active_sinks.remove(sink)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush_data()
+        # Close up to the most recent matching open element, ignore strays
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                break
+        else:
+            return
+
+        while len(self._stack) > index:
+            closed_tag, sinks, builder, userpic = self._stack.pop()
+            if closed_tag in PRESERVE_WHITESPACE_ELEMENTS:
+                self._preserve_depth -= 1
+            for sink in sinks:
+                self._active_sinks.remove(sink)
+            if userpic is not None:
+                self._open_userpics.remove(userpic)
+            if builder is not None:
+                self._open_messages.remove(builder)
+                self.completed.append(builder.build())
+
+    def handle_data(self, data):
+        self._pending_data.append(data)
+
+    def handle_comment(self, data):
+        self._flush_data()
+
+    def handle_decl(self, decl):
+        self._flush_data()
+
+    def handle_pi(self, data):
+        self._flush_data()
+
+    def unknown_decl(self, data):
+        self._flush_data()
+
+    def close(self):
+        super().close()
+        self._flush_data()
+        # Flush elements left open at EOF, as BeautifulSoup would
+        while self._stack:
+            self.handle_endtag(self._stack[-1][0])
+
+
+def _lxml_fragments(node) -> TextFragments:
+    """Text nodes under an lxml element, normalized like BeautifulSoup strings"""
+    if node is None:
+        return None
+    fragments = []
+
+    def walk(element, preserve):
+        preserve = preserve or element.tag in PRESERVE_WHITESPACE_ELEMENTS
+        if element.text:
+            fragments.append(_normalize_string(element.text, preserve))
+        for child in element:
+            # Comments and processing instructions have non-string tags
+            if isinstance(child.tag, str):
+                walk(child, preserve)
+            if child.tail:
+                fragments.append(_normalize_string(child.tail, preserve))
+
+    walk(node, False)
+    return tuple(fragments)
+
+
+class TelegramExportPage:
+    """A single Telegram ``messages*.html`` export file.
+
+    Messages are yielded incrementally by ``iter_messages``. The page header text
+    and userpic initials are available once iteration has finished.
+    """
+
+    def __init__(self, path: str, backend: str = "auto"):
+        self.path = path
+        self.backend = resolve_backend(backend)
+        self.header: TextFragments = None
+        self.userpic_initials: List[str] = []
+
+    @property
+    def header_text(self) -> str:
+        """Page header text, as ``get_text(strip=True)``"""
+        return stripped_text(self.header)
+
+    def iter_messages(self) -> Iterator[TelegramMessage]:
+        """Yield messages in document order"""
+        if self.backend == BACKEND_LXML:
+            return self._iter_lxml()
+        if self.backend == BACKEND_BS4:
+            return self._iter_bs4()
+        return self._iter_html_parser()
+
+    def _iter_html_parser(self) -> Iterator[TelegramMessage]:
+        parser = _StreamingExportParser()
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                if parser.completed:
+                    completed, parser.completed = parser.completed, []
+                    yield from completed
+        parser.close()
+        yield from parser.completed
+
+        self.header = tuple(parser.header) if parser.header is not None else None
+        self.userpic_initials = [
+            "".join(initials[0]).strip()
+            for initials in parser.userpic_initials
+            if initials[0] is not None
+        ]
+
+    def _iter_lxml(self) -> Iterator[TelegramMessage]:
+        open_messages = 0
+        context = etree.iterparse(
+            self.path, events=("start", "end"), tag="div", html=True
+        )
+        for event, elem in context:
+            classes = _class_tokens(elem.get("class"))
+            is_message = "message" in classes
+
+            if event == "start":
+                if is_message:
+                    open_messages += 1
+                continue
+
+            if "page_header" in classes and self.header is None:
+                self.header = _lxml_fragments(elem)
+            elif "userpic" in classes:
+                initials = self._lxml_find(elem, lambda c: "initials" in c)
+                if initials is not None:
+                    self.userpic_initials.append(
+                        element_text(_lxml_fragments(initials))
+                    )
+
+            if is_message:
+                open_messages -= 1
+                yield self._lxml_message(elem, classes)
+                if open_messages == 0:
+                    # Drop the processed subtree to keep memory flat
+                    elem.clear()
+                    parent = elem.getparent()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
+
+    @staticmethod
+    def _lxml_find(elem, predicate):
+        for child in elem.iterdescendants("div"):
+            if predicate(_class_tokens(child.get("class"))):
+                return child
+        return None
+
+    def _lxml_message(self, elem, classes: List[str]) -> TelegramMessage:
+        from_name = text = details = date = None
+        for child in elem.iterdescendants("div"):
+            child_classes = _class_tokens(child.get("class"))
+            if not child_classes:
+                continue
+            if from_name is None and "from_name" in child_classes:
+                from_name = child
+            if text is None and "text" in child_classes:
+                text = child
+            if details is None and " ".join(child_classes) == "body details":
+                details = child
+            if date is None and "date" in child_classes:
+                date = child
+
+        return TelegramMessage(
+            elem.get("id") or "",
+            "service" in classes,
+            _lxml_fragments(from_name),
+            _lxml_fragments(text),
+            _lxml_fragments(details),
+            (date.get("title") or "") if date is not None else None,
+            _lxml_fragments(date),
+        )
+
+    def _iter_bs4(self) -> Iterator[TelegramMessage]:
+        from bs4 import BeautifulSoup
+
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+
+        def fragments(node) -> TextFragments:
+            return tuple(node.strings) if node is not None else None
+
+        page_header = soup.find("div", class_="page_header")
+        self.header = fragments(page_header)
+        for userpic in soup.find_all("div", class_="userpic"):
+            initials = userpic.find("div", class_="initials")
+            if initials:
+                self.userpic_initials.append(initials.text.strip())
+
+        for msg_div in soup.find_all("div", class_="message"):
+            date_elem = msg_div.find("div", class_="date")
+            yield TelegramMessage(
+                msg_div.get("id", ""),
+                "service" in msg_div.get("class", []),
+                fragments(msg_div.find("div", class_="from_name")),
+                fragments(msg_div.find("div", class_="text")),
+                fragments(msg_div.find("div", class_="body details")),
+                date_elem.get("title", "") if date_elem else None,
+                fragments(date_elem),
+            )
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Audit Snapshots for the Customer Group Audit
+
+Each audit records a snapshot of every group it covers: the markers that
+change when a group's membership may have changed (title, member count, a
+last-activity marker and the tracked team) and when the group was last
+probed. The next audit loads these snapshots from the last completed
+audit_runs.results_json and carries forward the previous result of every
+group whose markers are unchanged and whose probe is younger than the TTL,
+so only changed or stale groups are probed again.
+"""
+
+import copy
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BASELINE_TTL_HOURS = 72
+
+# Result fields compared for the "changed since last audit" diff
+DIFF_FIELDS = (
+    "Group Name",
+    "Total Members",
+    "Required Present",
+    "Required Missing",
+    "Optional Present",
+    "Optional Missing",
+    "Privacy Status",
+    "History Visibility",
+    "Admin Status",
+)
+
+# results_json lists holding each platform's results
+RESULT_LISTS = {"Slack": "slack_channels", "Telegram": "telegram_groups"}
+
+
+@dataclass(frozen=True)
+class GroupSnapshot:
+    """Change markers of a group, and when its members were last probed"""
+
+    platform: str
+    group_id: str
+    title: str
+    member_count: Optional[int]
+    last_activity: Optional[str]
+    # Fingerprint of the team members the group was checked for
+    team: Optional[str]
+    audited_at: str
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.platform, self.group_id
+
+    def markers(self) -> Tuple:
+        return self.title, self.member_count, self.last_activity, self.team
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GroupSnapshot":
+        return cls(**{field: data.get(field) for field in cls.__dataclass_fields__})
+
+
+def team_fingerprint(*members) -> str:
+    """Short hash of the tracked team, so results are re-probed when the
+    members an audit checks for change"""
+    encoded = json.dumps(members, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+class AuditBaseline:
+    """Snapshots and results of previous audits, by platform and group ID"""
+
+    def __init__(
+        self,
+        snapshots: Dict[Tuple[str, str], GroupSnapshot],
+        results: Dict[Tuple[str, str], Dict],
+        audit_ids: Dict[str, int],
+        ttl_hours: float = DEFAULT_BASELINE_TTL_HOURS,
+    ):
+        self.snapshots = snapshots
+        self.results = results
+        # Audit run each platform's baseline comes from
+        self.audit_ids = audit_ids
+        self.ttl = timedelta(hours=ttl_hours)
+
+    @classmethod
+    def empty(cls) -> "AuditBaseline":
+        return cls({}, {}, {})
+
+    @classmethod
+    def from_audit_runs(
+        cls,
+        runs: Iterable[Tuple[int, Dict]],
+        ttl_hours: float = DEFAULT_BASELINE_TTL_HOURS,
+    ) -> "AuditBaseline":
+        """Baseline from (audit ID, results_json) pairs, newest first.
+
+        Each platform comes from the newest run that audited it, as scheduled
+        runs skip Telegram.
+        """
+        snapshots = {}
+        results = {}
+        audit_ids = {}
+        for audit_id, data in runs:
+            run_snapshots = [
+                GroupSnapshot.from_dict(snapshot)
+                for snapshot in data.get("group_snapshots", [])
+            ]
+            for platform, result_list in RESULT_LISTS.items():
+                if platform in audit_ids:
+                    continue
+                platform_snapshots = [
+                    snapshot
+                    for snapshot in run_snapshots
+                    if snapshot.platform == platform
+                ]
+                if not platform_snapshots:
+                    continue
+
+                audit_ids[platform] = audit_id
+                for snapshot in platform_snapshots:
+                    snapshots[snapshot.key] = snapshot
+                for result in data.get(result_list, []):
+                    if result.get("Group ID"):
+                        results[(platform, str(result["Group ID"]))] = result
+
+        return cls(snapshots, results, audit_ids, ttl_hours)
+
+    def carry_forward(
+        self, snapshot: GroupSnapshot, now: Optional[datetime] = None
+    ) -> Optional[Tuple[Dict, GroupSnapshot]]:
+        """Previous result and snapshot of a group that needs no new probe:
+        its markers are unchanged and its last probe is within the TTL"""
+        previous = self.snapshots.get(snapshot.key)
+        result = self.results.get(snapshot.key)
+        if previous is None or result is None:
+            return None
+        if previous.markers() != snapshot.markers():
+            return None
+
+        now = now or datetime.now()
+        if now - datetime.fromisoformat(previous.audited_at) > self.ttl:
+            return None
+        return copy.deepcopy(result), previous
+
+
+def diff_results(
+    baseline: AuditBaseline,
+    platforms: Iterable[str],
+    results: List[Dict],
+    unavailable: Iterable[GroupSnapshot] = (),
+) -> List[Dict]:
+    """Per-group changes of an audit's results against the baseline, for
+    the platforms the audit covered. Groups listed but not probed this run
+    (``unavailable``) are reported as such rather than as removed."""
+    platforms = set(platforms)
+    changes = []
+    seen = set()
+    for result in results:
+        platform = result["Platform"]
+        key = (platform, str(result.get("Group ID", "")))
+        seen.add(key)
+        previous = baseline.results.get(key)
+
+        if previous is None:
+            status, fields = "new", {}
+        else:
+            fields = {
+                field: {"before": previous.get(field), "after": result.get(field)}
+                for field in DIFF_FIELDS
+                if previous.get(field) != result.get(field)
+            }
+            status = "changed" if fields else "unchanged"
+
+        changes.append(
+            {
+                "platform": platform,
+                "id": key[1],
+                "name": result.get("Group Name", ""),
+                "status": status,
+                "changes": fields,
+            }
+        )
+
+    for snapshot in unavailable:
+        if snapshot.key in seen:
+            continue
+        seen.add(snapshot.key)
+        changes.append(
+            {
+                "platform": snapshot.platform,
+                "id": snapshot.group_id,
+                "name": snapshot.title,
+                "status": "unavailable",
+                "changes": {},
+            }
+        )
+
+    for key, previous in baseline.results.items():
+        if key[0] in platforms and key not in seen:
+            changes.append(
+                {
+                    "platform": key[0],
+                    "id": key[1],
+                    "name": previous.get("Group Name", ""),
+                    "status": "removed",
+                    "changes": {},
+                }
+            )
+
+    return changes
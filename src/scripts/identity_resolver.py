@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Participant Identity Resolver
+
+Indexes the participants of a RepSplit config by Slack ID, name and display
+name so identity lookups are dict lookups instead of scans of the config, and
+keeps the users table's display names in memory so name lookups need no
+database connection.
+"""
+
+import sqlite3
+from typing import Dict, List, Optional, Set
+
+
+class IdentityResolver:
+    """Identity lookups over the participants of a RepSplit config"""
+
+    def __init__(
+        self,
+        participants: List[Dict],
+        user_display_names: Optional[Dict[str, Optional[str]]] = None,
+    ):
+        self.user_display_names = user_display_names or {}
+
+        # Config name by Slack ID, the first participant's on duplicates
+        self._slack_names: Dict[str, str] = {}
+        # Slack ID by display name, the last participant's on duplicates
+        self._display_name_slack_ids: Dict[str, str] = {}
+        # Config name by name and display name, the names Telegram messages
+        # are authored under; names win over display names on collisions
+        self._name_reps: Dict[str, str] = {}
+        # Slack IDs of each rep, and the one their activity is credited to
+        self._rep_slack_ids: Dict[str, Set[str]] = {}
+        self._primary_slack_ids: Dict[str, str] = {}
+        self.internal_slack_ids: Set[str] = set()
+        # Names Telegram messages are authored under
+        self.internal_names: Set[str] = set()
+
+        for p in participants:
+            name = p["name"]
+            self._rep_slack_ids.setdefault(name, set()).add(p["slack_id"])
+            if not self._primary_slack_ids.get(name):
+                self._primary_slack_ids[name] = p["slack_id"]
+            if p["slack_id"]:
+                self.internal_slack_ids.add(p["slack_id"])
+                self._slack_names.setdefault(p["slack_id"], name)
+            if p.get("display_name"):
+                self.internal_names.add(p["display_name"])
+                self._display_name_slack_ids[p["display_name"]] = p["slack_id"]
+            if p.get("name"):
+                self.internal_names.add(p["name"])
+
+        for key in ("name", "display_name"):
+            for p in participants:
+                if p.get(key):
+                    self._name_reps.setdefault(p[key], p["name"])
+
+    @classmethod
+    def load(cls, participants: List[Dict], db_path: str) -> "IdentityResolver":
+        """Resolver with the display names of the users table in ``db_path``"""
+        conn = sqlite3.connect(db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, display_name FROM users")
+            user_display_names = dict(cursor.fetchall())
+        finally:
+            conn.close()
+        return cls(participants, user_display_names)
+
+    def rep_name(self, slack_id: str) -> Optional[str]:
+        """Config name of the rep with Slack ID ``slack_id``, if any"""
+        return self._slack_names.get(slack_id)
+
+    def slack_id(self, team_member: str) -> Optional[str]:
+        """Slack ID of the rep a calendar team member is, by display name or
+        name ("" for reps without one), or None for anyone else"""
+        slack_id = self._display_name_slack_ids.get(team_member)
+        if slack_id is None and team_member in self._name_reps:
+            slack_id = self._primary_slack_ids[self._name_reps[team_member]]
+        return slack_id
+
+    def is_rep_author(self, rep_name: str, author: str) -> bool:
+        """Whether ``author`` is a Slack ID of the rep named ``rep_name``"""
+        return author in self._rep_slack_ids.get(rep_name, ())
+
+    def user_display_name(self, user_id: str, default=None) -> Optional[str]:
+        """display_name of a users row, or ``default`` without one"""
+        return self.user_display_names.get(user_id, default)
+
+    def split_name(self, participant_id: str) -> str:
+        """Name a participant's share is recorded under in deal_splits.csv:
+        the rep's config name for their Slack ID and the names they post
+        under on Telegram"""
+        rep_name = self.rep_name(participant_id) or self._name_reps.get(participant_id)
+        if rep_name:
+            return rep_name
+        return self.user_display_names.get(participant_id) or participant_id
+
+    def display_name(self, participant_id: str) -> str:
+        """Name shown for a participant in stage breakdowns"""
+        rep_name = self.rep_name(participant_id)
+        if rep_name:
+            return rep_name
+
+        display_name = self.user_display_names.get(participant_id)
+        if display_name:
+            return display_name
+        else:
+            # For unknown users, return a more descriptive label
+            return f"External-{participant_id[-4:]}"
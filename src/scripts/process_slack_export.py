@@ -9,11 +9,17 @@ for the ETL pipeline to use.
 import json
 import logging
 import os
-import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List
 
+# Add the project root to the Python path for the shared database helpers
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.scripts.bulk_writer import BulkWriter, connect
+from src.scripts.schema_migrations import apply_index_migrations
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,16 +31,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MESSAGE_COLUMNS = ("id", "conv_id", "timestamp", "author", "text", "stage_hits")
+
+
+def message_rows(messages_data: List[Dict[str, Any]], conv_id: str):
+    """messages rows for the plain user messages of an export file"""
+    for message in messages_data:
+        if message.get("type") == "message" and not message.get("subtype"):
+            yield (
+                message.get("ts", ""),
+                conv_id,
+                float(message.get("ts", 0)),
+                message.get("user", ""),
+                message.get("text", ""),
+                "",
+            )
+
 
 class SlackExportProcessor:
     def __init__(self, export_path: str, db_path: str):
         self.export_path = Path(export_path)
         self.db_path = db_path
         self.conn = None
+        self.writer = None
 
     def setup_database(self):
         """Setup the database with required tables"""
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = connect(self.db_path)
+        self.writer = BulkWriter(self.db_path, conn=self.conn)
         cursor = self.conn.cursor()
 
         # Create conversations table
@@ -89,6 +113,7 @@ class SlackExportProcessor:
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (timestamp)"
         )
+        apply_index_migrations(cursor)
 
         self.conn.commit()
         logger.info("Database setup complete")
@@ -103,22 +128,19 @@ class SlackExportProcessor:
         with open(users_file, "r", encoding="utf-8") as f:
             users_data = json.load(f)
 
-        cursor = self.conn.cursor()
-        for user in users_data:
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO users (id, name, real_name, email)
-                VALUES (?, ?, ?, ?)
-            """,
+        self.writer.write(
+            "users",
+            ("id", "name", "real_name", "email"),
+            (
                 (
                     user.get("id", ""),
                     user.get("name", ""),
                     user.get("real_name", ""),
                     user.get("profile", {}).get("email", ""),
-                ),
-            )
-
-        self.conn.commit()
+                )
+                for user in users_data
+            ),
+        )
         logger.info(f"Loaded {len(users_data)} users")
 
     def process_channel(self, channel_file: Path, channel_info: Dict[str, Any]):
@@ -145,24 +167,11 @@ class SlackExportProcessor:
             with open(channel_file, "r", encoding="utf-8") as f:
                 messages_data = json.load(f)
 
-            message_count = 0
-            for message in messages_data:
-                if message.get("type") == "message" and not message.get("subtype"):
-                    message_id = message.get("ts", "")
-                    timestamp = float(message.get("ts", 0))
-                    author = message.get("user", "")
-                    text = message.get("text", "")
-
-                    # Insert message
-                    cursor.execute(
-                        """
-                        INSERT OR REPLACE INTO messages (id, conv_id, timestamp, author, text, stage_hits)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                        (message_id, channel_id, timestamp, author, text, ""),
-                    )
-
-                    message_count += 1
+            message_count = self.writer.write(
+                "messages",
+                MESSAGE_COLUMNS,
+                message_rows(messages_data, channel_id),
+            )
 
             logger.info(f"Processed {message_count} messages from {channel_name}")
         else:
@@ -240,24 +249,9 @@ class SlackExportProcessor:
                 with open(messages_file, "r", encoding="utf-8") as f:
                     messages_data = json.load(f)
 
-                message_count = 0
-                for message in messages_data:
-                    if message.get("type") == "message" and not message.get("subtype"):
-                        message_id = message.get("ts", "")
-                        timestamp = float(message.get("ts", 0))
-                        author = message.get("user", "")
-                        text = message.get("text", "")
-
-                        # Insert message
-                        cursor.execute(
-                            """
-                            INSERT OR REPLACE INTO messages (id, conv_id, timestamp, author, text, stage_hits)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                            (message_id, conv_id, timestamp, author, text, ""),
-                        )
-
-                        message_count += 1
+                message_count = self.writer.write(
+                    "messages", MESSAGE_COLUMNS, message_rows(messages_data, conv_id)
+                )
 
                 logger.info(f"Processed {message_count} messages from DM {dm_dir.name}")
 
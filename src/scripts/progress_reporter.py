@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Audit Progress Reporter
+
+Keeps one connection to the admin panel database open for a whole audit,
+coalesces progress updates to at most one write per interval, and on Postgres
+publishes each write with NOTIFY so the admin panel can push progress to the
+browser instead of polling audit_runs. Local runs without DATABASE_URL write
+to the admin panel's SQLite database.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Channel the admin panel LISTENs on for audit progress
+PROGRESS_CHANNEL = "audit_progress"
+# Seconds between progress writes; updates in between are coalesced
+PROGRESS_INTERVAL = 2.0
+
+DEFAULT_SQLITE_PATH = Path(__file__).parent.parent.parent / "data" / "admin_panel.db"
+
+PROGRESS_COLUMNS = {
+    "slack_current": "slack_progress_current",
+    "telegram_current": "telegram_progress_current",
+}
+
+
+class ProgressReporter:
+    """Coalesced audit_runs progress writes over one persistent connection"""
+
+    def __init__(
+        self,
+        audit_id: Optional[int],
+        database_url: Optional[str] = None,
+        sqlite_path: Path = DEFAULT_SQLITE_PATH,
+        interval: float = PROGRESS_INTERVAL,
+    ):
+        self.audit_id = audit_id
+        self.database_url = database_url or os.getenv("DATABASE_URL")
+        self.sqlite_path = Path(sqlite_path)
+        self.interval = interval
+        self.conn = None
+        self.pending: Dict[str, int] = {}
+        self.flushed_at = 0.0
+        self.writes = 0
+
+    @property
+    def is_postgres(self) -> bool:
+        return bool(self.database_url)
+
+    def _connect(self):
+        if self.is_postgres:
+            import psycopg2
+
+            return psycopg2.connect(self.database_url)
+        if not self.sqlite_path.exists():
+            return None
+        return sqlite3.connect(str(self.sqlite_path))
+
+    def update(self, slack_current=None, telegram_current=None):
+        """Record progress, writing it once the interval has passed"""
+        if not self.audit_id:
+            return
+
+        if slack_current is not None:
+            self.pending["slack_current"] = slack_current
+        if telegram_current is not None:
+            self.pending["telegram_current"] = telegram_current
+
+        if time.monotonic() - self.flushed_at >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Write and publish pending progress"""
+        if not self.audit_id or not self.pending:
+            return
+
+        self.flushed_at = time.monotonic()
+        progress, self.pending = self.pending, {}
+        placeholder = "%s" if self.is_postgres else "?"
+        assignments = ", ".join(
+            f"{PROGRESS_COLUMNS[key]} = {placeholder}" for key in progress
+        )
+
+        try:
+            if self.conn is None:
+                self.conn = self._connect()
+                if self.conn is None:
+                    return
+
+            cursor = self.conn.cursor()
+            cursor.execute(
+                f"UPDATE audit_runs SET {assignments} WHERE id = {placeholder}",
+                (*progress.values(), self.audit_id),
+            )
+            if self.is_postgres:
+                payload = json.dumps({"audit_id": self.audit_id, **progress})
+                cursor.execute("SELECT pg_notify(%s, %s)", (PROGRESS_CHANNEL, payload))
+            self.conn.commit()
+            cursor.close()
+            self.writes += 1
+        except Exception as e:
+            print(f"Warning: Could not update progress: {e}")
+            # Keep the progress for the next write, over a new connection
+            self.pending = {**progress, **self.pending}
+            self.close_connection()
+
+    def close_connection(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+    def close(self):
+        """Write the last progress and close the connection"""
+        self.flush()
+        self.close_connection()
+
+    def __enter__(self) -> "ProgressReporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
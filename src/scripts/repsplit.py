@@ -9,28 +9,55 @@ based on deal stage participation for Aki, Addie, Amy, Mayank, Prateek, Will, an
 import csv
 import json
 import logging
+import multiprocessing
 import os
-import re
 import sqlite3
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 # Import enhanced logging system
-from logging_config import (DatabaseMonitor, DataFreshnessMonitor,
-                            PerformanceMonitor, setup_logging)
-
-
-@dataclass
-class StageConfig:
-    """Configuration for deal stages and their commission weights"""
-
-    name: str
-    weight: float
-    keywords: List[str]
-    regex_patterns: List[str]
+from logging_config import (
+    DatabaseMonitor,
+    DataFreshnessMonitor,
+    PerformanceMonitor,
+    setup_logging,
+)
+
+# Add the project root to the Python path for the shared src.etl utilities
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.etl.utils.stage_detector import StageDetector
+from src.scripts.identity_resolver import IdentityResolver
+from src.scripts.repsplit_outputs import (
+    RATIONALE_FIELDNAMES,
+    DealCalendar,
+    DealRenderData,
+    RenderContext,
+    calendar_summary,
+    full_node_address,
+    init_render_worker,
+    justification_path,
+    rationale_row,
+    render_deal_outputs,
+    render_deal_worker,
+    render_justification,
+    short_rationale,
+    stage_breakdown,
+)
+from src.scripts.schema_migrations import apply_index_migrations
+from src.scripts.telegram_stage_detections import refresh_telegram_stage_detections
+
+# Module logger for helpers without access to self.logger (configured by
+# setup_logging under the same name)
+logger = logging.getLogger("repsplit")
 
 
 @dataclass
@@ -62,12 +89,37 @@ def round_to_nearest_25(percentage: float) -> float:
 
 
 class RepSplit:
-    def __init__(self, config_file: str = "data/slack/config.json"):
+    def __init__(
+        self,
+        config_file: str = "data/slack/config.json",
+        max_workers: int = None,
+        use_multiprocessing: bool = True,
+    ):
         self.config_file = config_file
         self.config = self.load_config()
+        self.stage_detector = StageDetector.from_config(self.config)
         self.db_path = "data/slack/repsplit.db"
         self.output_dir = Path("output")
         self.justifications_dir = self.output_dir / "justifications"
+        self.calendar_snapshot_file = "data/slack/calendar_snapshot.json"
+
+        # Run-scoped calendar state, see _get_calendar_analysis
+        self._calendar_analysis = None
+        self._calendar_analysis_loaded = False
+        self._company_meeting_data: Dict[str, Dict] = {}
+
+        # Set once stored Telegram detections match the stage config
+        self._telegram_detections_current = False
+
+        # Run-scoped participant identities, see get_identity_resolver
+        self._identities: Optional[IdentityResolver] = None
+
+        # Worker pool rendering justifications and rationale rows
+        if max_workers is None:
+            self.max_workers = min(multiprocessing.cpu_count(), 16)
+        else:
+            self.max_workers = max_workers
+        self.use_multiprocessing = use_multiprocessing
 
         # Create output directories
         self.output_dir.mkdir(exist_ok=True)
@@ -327,6 +379,9 @@ class RepSplit:
         """
         )
 
+        # Indexes for the per-conversation analysis queries
+        apply_index_migrations(cursor)
+
         conn.commit()
         conn.close()
 
@@ -342,25 +397,7 @@ class RepSplit:
 
     def detect_stages_in_message(self, text: str) -> List[Tuple[str, float]]:
         """Detect deal stages in a message based on keyword patterns"""
-        detected_stages = []
-        text_lower = text.lower()
-
-        for stage_config in self.config["stages"]:
-            stage_name = stage_config["name"]
-            keywords = stage_config["keywords"]
-
-            matches = 0
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    matches += 1
-
-            if matches > 0:
-                # Calculate confidence based on number of keyword matches
-                # Higher base confidence for multiple matches
-                confidence = min(1.0, 0.3 + (matches * 0.4))
-                detected_stages.append((stage_name, confidence))
-
-        return detected_stages
+        return self.stage_detector.detect(text)
 
     def _increment_stage_contribution(self, participant_stats: Dict, stage: str):
         """Increment stage contribution count for a participant"""
@@ -368,10 +405,27 @@ class RepSplit:
             participant_stats["stage_contributions"][stage] = 0
         participant_stats["stage_contributions"][stage] += 1
 
+    def refresh_telegram_stage_detections(self):
+        """Detect stages for Telegram messages stored without detections for
+        the current stage config (once per RepSplit instance)"""
+        if self._telegram_detections_current:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            refreshed = refresh_telegram_stage_detections(conn, self.stage_detector)
+        finally:
+            conn.close()
+        if refreshed:
+            self.logger.info(f"Detected stages for {refreshed} Telegram messages")
+        self._telegram_detections_current = True
+
     def _process_telegram_stage_detections(
         self, conv_id: str, internal_names: set, cursor=None
     ) -> List[Tuple[str, str, float, str]]:
-        """Process Telegram messages for stage detection"""
+        """Stored stage detections of a conversation's Telegram messages"""
+        self.refresh_telegram_stage_detections()
+
         # Use existing cursor if provided, otherwise create new connection
         if cursor is None:
             conn = sqlite3.connect(self.db_path)
@@ -381,64 +435,66 @@ class RepSplit:
             should_close = False
 
         try:
-            # Get Telegram messages for internal team members
+            # Get Telegram detections for internal team members
             if internal_names:
                 placeholders = ",".join(["?" for _ in internal_names])
                 cursor.execute(
                     f"""
-                    SELECT author, text, timestamp
-                    FROM telegram_messages 
-                    WHERE conv_id = ? AND author IN ({placeholders})
-                    ORDER BY timestamp
+                    SELECT stage_name, author, confidence, timestamp
+                    FROM telegram_stage_detections
+                    WHERE conv_id = ? AND config_version = ?
+                    AND author IN ({placeholders})
+                    ORDER BY timestamp, id
                 """,
-                    [conv_id] + list(internal_names),
+                    [conv_id, self.stage_detector.version] + list(internal_names),
                 )
             else:
                 cursor.execute(
                     """
-                    SELECT author, text, timestamp
-                    FROM telegram_messages 
-                    WHERE conv_id = ?
-                    ORDER BY timestamp
+                    SELECT stage_name, author, confidence, timestamp
+                    FROM telegram_stage_detections
+                    WHERE conv_id = ? AND config_version = ?
+                    ORDER BY timestamp, id
                 """,
-                    [conv_id],
+                    [conv_id, self.stage_detector.version],
                 )
 
-            telegram_messages = cursor.fetchall()
-
-            # Process messages for stage detection
-            telegram_stage_detections = []
-            for author, text, timestamp in telegram_messages:
-                if text:  # Only process messages with text
-                    detected_stages = self.detect_stages_in_message(text)
-                    # Use current timestamp if Telegram timestamp is missing
-                    ts = timestamp if timestamp else 0
-                    for stage_name, confidence in detected_stages:
-                        telegram_stage_detections.append(
-                            (stage_name, author, confidence, ts)
-                        )
-
-            return telegram_stage_detections
+            return self._telegram_detection_rows(cursor.fetchall())
         finally:
             if should_close:
                 conn.close()
 
+    def _telegram_detection_rows(
+        self, detections: List[Tuple]
+    ) -> List[Tuple[str, str, float, str]]:
+        """(stage_name, author, confidence, timestamp) Telegram detections"""
+        # Use 0 if Telegram timestamp is missing
+        return [
+            (stage_name, author, confidence, timestamp if timestamp else 0)
+            for stage_name, author, confidence, timestamp in detections
+        ]
+
+    def get_identity_resolver(self) -> IdentityResolver:
+        """Participant identities shared by the whole run, with the users
+        table's display names loaded once"""
+        if self._identities is None:
+            self._identities = IdentityResolver.load(
+                self.config["participants"], self.db_path
+            )
+        return self._identities
+
+    def _internal_participant_filters(self) -> Tuple[set, set]:
+        """Slack IDs and names (for Telegram) of the internal team"""
+        identities = self.get_identity_resolver()
+        return identities.internal_slack_ids, identities.internal_names
+
     def calculate_commission_splits(self, conv_id: str) -> Dict[str, float]:
         """Calculate commission splits for a specific conversation"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         # Get internal team Slack IDs and names for filtering
-        internal_slack_ids = {
-            p["slack_id"] for p in self.config["participants"] if p["slack_id"]
-        }
-        # Include both name and display_name for Telegram matching
-        internal_names = set()
-        for p in self.config["participants"]:
-            if p.get("display_name"):
-                internal_names.add(p["display_name"])
-            if p.get("name"):
-                internal_names.add(p["name"])
+        internal_slack_ids, internal_names = self._internal_participant_filters()
 
         # Get stage detections for internal team members only
         if internal_slack_ids:
@@ -532,6 +588,127 @@ class RepSplit:
         conv_name = conv_data[0] if conv_data else "unknown"
         conn.close()
 
+        return self._compute_commission_splits(
+            conv_name, all_stage_detections, messages
+        )
+
+    def _fetch_rows_by_conv(
+        self, cursor, query: str, params: List, conv_ids: set
+    ) -> Dict[str, List[Tuple]]:
+        """Run a query whose rows start with conv_id (ordered by conv_id) and
+        group the remaining columns by conversation"""
+        cursor.execute(query, params)
+        return {
+            conv_id: [row[1:] for row in rows]
+            for conv_id, rows in groupby(cursor, key=itemgetter(0))
+            if conv_id in conv_ids
+        }
+
+    def calculate_all_commission_splits(
+        self, conv_ids: List[str]
+    ) -> Dict[str, Dict[str, float]]:
+        """Calculate commission splits for many conversations at once.
+
+        Loads stage detections, Slack messages, Telegram detections and
+        Telegram messages for every conversation with one grouped query per
+        table instead of calculate_commission_splits' queries per
+        conversation. Each conversation gets the same splits
+        calculate_commission_splits returns.
+        """
+        self.refresh_telegram_stage_detections()
+
+        targets = set(conv_ids)
+        internal_slack_ids, internal_names = self._internal_participant_filters()
+
+        slack_filter, slack_params = "", []
+        if internal_slack_ids:
+            slack_filter = "WHERE author IN ({})".format(
+                ",".join(["?" for _ in internal_slack_ids])
+            )
+            slack_params = list(internal_slack_ids)
+
+        telegram_filter, telegram_params = "", []
+        detection_filter = "WHERE config_version = ?"
+        if internal_names:
+            telegram_filter = "WHERE author IN ({})".format(
+                ",".join(["?" for _ in internal_names])
+            )
+            detection_filter += " AND author IN ({})".format(
+                ",".join(["?" for _ in internal_names])
+            )
+            telegram_params = list(internal_names)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        stage_detections = self._fetch_rows_by_conv(
+            cursor,
+            f"""
+            SELECT conv_id, stage_name, author, confidence, timestamp
+            FROM stage_detections
+            {slack_filter}
+            ORDER BY conv_id, timestamp
+        """,
+            slack_params,
+            targets,
+        )
+        slack_messages = self._fetch_rows_by_conv(
+            cursor,
+            f"""
+            SELECT conv_id, author, timestamp
+            FROM messages
+            {slack_filter}
+            ORDER BY conv_id, timestamp
+        """,
+            slack_params,
+            targets,
+        )
+        telegram_detections = self._fetch_rows_by_conv(
+            cursor,
+            f"""
+            SELECT conv_id, stage_name, author, confidence, timestamp
+            FROM telegram_stage_detections
+            {detection_filter}
+            ORDER BY conv_id, timestamp, id
+        """,
+            [self.stage_detector.version] + telegram_params,
+            targets,
+        )
+        telegram_messages = self._fetch_rows_by_conv(
+            cursor,
+            f"""
+            SELECT conv_id, author, timestamp
+            FROM telegram_messages
+            {telegram_filter}
+            ORDER BY conv_id, timestamp
+        """,
+            telegram_params,
+            targets,
+        )
+
+        cursor.execute("SELECT conv_id, name FROM conversations")
+        conv_names = dict(cursor.fetchall())
+        conn.close()
+
+        all_commissions = {}
+        for conv_id in conv_ids:
+            all_commissions[conv_id] = self._compute_commission_splits(
+                conv_names.get(conv_id, "unknown"),
+                stage_detections.get(conv_id, [])
+                + self._telegram_detection_rows(telegram_detections.get(conv_id, [])),
+                slack_messages.get(conv_id, []) + telegram_messages.get(conv_id, []),
+            )
+
+        return all_commissions
+
+    def _compute_commission_splits(
+        self,
+        conv_name: str,
+        all_stage_detections: List[Tuple],
+        messages: List[Tuple],
+    ) -> Dict[str, float]:
+        """Commission splits from a conversation's (stage_name, author,
+        confidence, timestamp) detections and (author, timestamp) messages"""
         if not all_stage_detections and not messages:
             return {}
 
@@ -697,14 +874,49 @@ class RepSplit:
 
         return rounded_commissions
 
-    def _add_calendar_contributions(self, conv_name: str, participant_stats: dict):
-        """Add calendar meeting contributions for in-person interactions"""
-        try:
+    def _get_calendar_analysis(self):
+        """CalendarCommissionAnalysis shared by the whole run, or None when
+        Google Calendar authentication failed.
+
+        It authenticates once and loads a snapshot of the team calendars (from
+        the on-disk cache while it is fresh), so every later meeting lookup is
+        answered from memory.
+        """
+        if not self._calendar_analysis_loaded:
             from calendar_commission_analysis import CalendarCommissionAnalysis
 
-            # Initialize calendar analysis
             calendar_analysis = CalendarCommissionAnalysis()
-            if not calendar_analysis.authenticate():
+            if calendar_analysis.authenticate():
+                calendar_analysis.load_snapshot(
+                    days_back=180, cache_file=self.calendar_snapshot_file
+                )
+            else:
+                calendar_analysis = None
+
+            self._calendar_analysis = calendar_analysis
+            self._calendar_analysis_loaded = True
+
+        return self._calendar_analysis
+
+    def _get_company_meeting_data(self, calendar_analysis, company_name: str) -> Dict:
+        """Meeting data for a company, computed once per run"""
+        if company_name not in self._company_meeting_data:
+            self._company_meeting_data[
+                company_name
+            ] = calendar_analysis.get_company_meeting_data(company_name, days_back=180)
+        return self._company_meeting_data[company_name]
+
+    def reset_calendar_cache(self):
+        """Forget the run-scoped calendar analysis and meeting data"""
+        self._calendar_analysis = None
+        self._calendar_analysis_loaded = False
+        self._company_meeting_data = {}
+
+    def _add_calendar_contributions(self, conv_name: str, participant_stats: dict):
+        """Add calendar meeting contributions for in-person interactions"""
+        try:
+            calendar_analysis = self._get_calendar_analysis()
+            if calendar_analysis is None:
                 logger.warning(
                     "Could not authenticate with Google Calendar - skipping calendar contributions"
                 )
@@ -714,18 +926,14 @@ class RepSplit:
             company_name = conv_name.replace("-bitsafe", "").replace("_", " ").title()
 
             # Get meeting data for this company
-            meeting_data = calendar_analysis.get_company_meeting_data(
-                company_name, days_back=180
+            meeting_data = self._get_company_meeting_data(
+                calendar_analysis, company_name
             )
 
             if not meeting_data or not meeting_data.get("overlapping_meetings"):
                 return
 
-            # Map team member names to participant IDs
-            name_to_id = {}
-            for participant in self.config["participants"]:
-                if participant["display_name"]:
-                    name_to_id[participant["display_name"]] = participant["slack_id"]
+            identities = self.get_identity_resolver()
 
             # Add calendar contributions
             for overlap in meeting_data["overlapping_meetings"]:
@@ -734,8 +942,8 @@ class RepSplit:
 
                 # Find the participant ID for each team member
                 for team_member in team_participants:
-                    if team_member in name_to_id:
-                        participant_id = name_to_id[team_member]
+                    participant_id = identities.slack_id(team_member)
+                    if participant_id is not None:
                         if participant_id in participant_stats:
                             # Add meeting contribution (weighted by duration)
                             duration_hours = meeting.get("duration_minutes", 60) / 60.0
@@ -756,37 +964,42 @@ class RepSplit:
 
     def get_calendar_summary(self, deal_id: str) -> str:
         """Get summary of calendar meetings for a deal"""
-        try:
-            from calendar_commission_analysis import CalendarCommissionAnalysis
+        return calendar_summary(self._get_deal_calendar(deal_id))
 
-            calendar_analysis = CalendarCommissionAnalysis()
-            if not calendar_analysis.authenticate():
-                return "Calendar not accessible"
+    def _get_deal_calendar(self, conv_name: str) -> DealCalendar:
+        """Calendar meetings of a deal's company for rendering its outputs"""
+        company_name = conv_name.replace("-bitsafe", "").replace("_", " ").title()
+        try:
+            calendar_analysis = self._get_calendar_analysis()
+            if calendar_analysis is None:
+                return DealCalendar(company_name)
 
-            company_name = deal_id.replace("-bitsafe", "").replace("_", " ").title()
-            meeting_data = calendar_analysis.get_company_meeting_data(
-                company_name, days_back=180
+            meeting_data = self._get_company_meeting_data(
+                calendar_analysis, company_name
             )
+            return DealCalendar(company_name, True, meeting_data)
+        except Exception as e:
+            return DealCalendar(company_name, error=str(e))
 
-            if not meeting_data or not meeting_data.get("overlapping_meetings"):
-                return "No meetings found"
-
-            # Summarize meetings
-            meeting_summary = []
-            for overlap in meeting_data["overlapping_meetings"]:
-                meeting = overlap["meeting"]
-                team_participants = overlap["team_participants"]
-                duration = meeting.get("duration_minutes", 60)
-
-                meeting_summary.append(f"{', '.join(team_participants)} ({duration}m)")
-
-            return "; ".join(meeting_summary)
+    def _get_render_context(self) -> RenderContext:
+        """Data shared by the renderers of every deal"""
+        return RenderContext(
+            identities=self.get_identity_resolver(),
+            justifications_dir=self.justifications_dir,
+        )
 
-        except Exception as e:
-            return f"Calendar error: {str(e)}"
+    def generate_justification(
+        self,
+        conv_id: str,
+        conv_name: str,
+        commissions: Optional[Dict[str, float]] = None,
+    ):
+        """Generate detailed justification for commission splits
 
-    def generate_justification(self, conv_id: str, conv_name: str):
-        """Generate detailed justification for commission splits"""
+        ``commissions`` takes splits already computed for this conversation
+        (e.g. by calculate_all_commission_splits); they are calculated here
+        when omitted.
+        """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
@@ -814,105 +1027,143 @@ class RepSplit:
         )
 
         stage_detections = cursor.fetchall()
+        conn.close()
 
         # Get commission splits
-        commissions = self.calculate_commission_splits(conv_id)
+        if commissions is None:
+            commissions = self.calculate_commission_splits(conv_id)
 
-        # Round percentages to nearest 25%
-        rounded_commissions = {
-            p: round_to_nearest_25(v) for p, v in commissions.items()
-        }
+        deal = DealRenderData(
+            conv_id=conv_id,
+            conv_name=conv_name,
+            conversation=conv_data,
+            rounded_commissions=tuple(
+                (p, round_to_nearest_25(v)) for p, v in commissions.items()
+            ),
+            justification_detections=tuple(stage_detections),
+            split={},
+            stage_detections=(),
+            calendar=self._get_deal_calendar(conv_name),
+        )
+        context = self._get_render_context()
 
         # Generate markdown file
-        justification_file = self.justifications_dir / f"{conv_name}_justification.md"
-
-        with open(justification_file, "w") as f:
-            f.write(f"# Commission Split Justification: {conv_name}\n\n")
-            f.write(f"**Channel ID:** {conv_id}\n")
-            f.write(
-                f"**Created:** {datetime.fromtimestamp(conv_data[3]).strftime('%Y-%m-%d %H:%M:%S') if conv_data[3] else 'Unknown'}\n"
-            )
-            f.write(f"**Members:** {conv_data[2]}\n\n")
+        with open(justification_path(context, conv_name), "w") as f:
+            f.write(render_justification(deal, context))
 
-            f.write("## Commission Splits\n\n")
-            for participant_id, percentage in rounded_commissions.items():
-                cursor.execute(
-                    "SELECT display_name FROM users WHERE id = ?", (participant_id,)
-                )
-                display_name = cursor.fetchone()
-                name = display_name[0] if display_name else participant_id
-                f.write(f"- **{name}:** {percentage:.1f}%\n")
-
-            # Add calendar meeting information
-            f.write("\n## Calendar Meetings (In-Person Interactions)\n\n")
-            try:
-                from calendar_commission_analysis import \
-                    CalendarCommissionAnalysis
-
-                calendar_analysis = CalendarCommissionAnalysis()
-                if calendar_analysis.authenticate():
-                    company_name = (
-                        conv_name.replace("-bitsafe", "").replace("_", " ").title()
-                    )
-                    meeting_data = calendar_analysis.get_company_meeting_data(
-                        company_name, days_back=180
-                    )
+        self.logger.info(f"Generated justification for {conv_name}")
 
-                    if meeting_data and meeting_data.get("overlapping_meetings"):
-                        f.write(f"**Company:** {company_name}\n\n")
-                        f.write("**Meetings Found:**\n\n")
+    def collect_render_data(
+        self,
+        channels: List[Tuple[str, str]],
+        all_commissions: Dict[str, Dict[str, float]],
+        all_splits: List[Dict],
+    ) -> List[DealRenderData]:
+        """Load what the outputs of every (conv_id, conv_name) channel are
+        rendered from, with one query per table.
+
+        ``all_splits`` holds the deal_splits.csv record of each channel, in
+        the same order.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
 
-                        for overlap in meeting_data["overlapping_meetings"]:
-                            meeting = overlap["meeting"]
-                            team_participants = overlap["team_participants"]
+        # Conversation details, and the first conversation of each name for
+        # the stage breakdown and rationale of a deal
+        cursor.execute("SELECT * FROM conversations ORDER BY rowid")
+        conversations = {}
+        conv_ids_by_name = {}
+        for row in cursor.fetchall():
+            conversations[row[0]] = row
+            conv_ids_by_name.setdefault(row[1], row[0])
+
+        channel_conv_ids = {conv_id for conv_id, _ in channels}
+        justification_detections = self._fetch_rows_by_conv(
+            cursor,
+            """
+            SELECT sd.conv_id, sd.stage_name, sd.author, sd.timestamp,
+                   sd.confidence, u.display_name, m.text
+            FROM stage_detections sd
+            JOIN users u ON sd.author = u.id
+            JOIN messages m ON sd.message_id = m.id
+            ORDER BY sd.conv_id, sd.timestamp
+        """,
+            [],
+            channel_conv_ids,
+        )
+        stage_detections = self._fetch_rows_by_conv(
+            cursor,
+            """
+            SELECT conv_id, stage_name, author, confidence
+            FROM stage_detections
+            ORDER BY conv_id, timestamp
+        """,
+            [],
+            {conv_ids_by_name.get(split["deal_id"]) for split in all_splits},
+        )
+        conn.close()
 
-                            f.write(f"- **{meeting.get('summary', 'No Title')}**\n")
-                            f.write(
-                                f"  - Date: {meeting.get('start_time', 'Unknown')}\n"
-                            )
-                            f.write(
-                                f"  - Duration: {meeting.get('duration_minutes', 0)} minutes\n"
-                            )
-                            f.write(
-                                f"  - Team Participants: {', '.join(team_participants)}\n"
-                            )
-                            f.write(
-                                f"  - Description: {meeting.get('description', 'No description')[:200]}...\n\n"
-                            )
-                    else:
-                        f.write("No in-person meetings found in calendar data.\n\n")
-                else:
-                    f.write("Could not authenticate with Google Calendar.\n\n")
-            except Exception as e:
-                f.write(f"Calendar integration error: {str(e)}\n\n")
-
-            f.write("## Stage Analysis\n\n")
-
-            current_stage = None
-            for (
-                stage_name,
-                author_id,
-                timestamp,
-                confidence,
-                display_name,
-                message_text,
-            ) in stage_detections:
-                if stage_name != current_stage:
-                    current_stage = stage_name
-                    f.write(f"### {stage_name.replace('_', ' ').title()}\n\n")
-
-                timestamp_str = datetime.fromtimestamp(timestamp).strftime(
-                    "%Y-%m-%d %H:%M:%S"
-                )
-                f.write(
-                    f"- **{timestamp_str}** - {display_name} (confidence: {confidence:.2f})\n"
+        # A name shared by several channels keeps the last one's justification
+        last_index = {conv_name: i for i, (_, conv_name) in enumerate(channels)}
+
+        deals = []
+        for index, ((conv_id, conv_name), split) in enumerate(
+            zip(channels, all_splits)
+        ):
+            deals.append(
+                DealRenderData(
+                    conv_id=conv_id,
+                    conv_name=conv_name,
+                    # Telegram channels are not in the conversations table
+                    conversation=conversations.get(conv_id)
+                    or (conv_id, conv_name, "Unknown (Telegram)", None),
+                    rounded_commissions=tuple(
+                        (p, round_to_nearest_25(v))
+                        for p, v in all_commissions[conv_id].items()
+                    ),
+                    justification_detections=tuple(
+                        justification_detections.get(conv_id, [])
+                    ),
+                    split=split,
+                    stage_detections=tuple(
+                        stage_detections.get(conv_ids_by_name.get(split["deal_id"]), [])
+                    ),
+                    calendar=self._get_deal_calendar(conv_name),
+                    write_justification=last_index[conv_name] == index,
                 )
-                f.write(
-                    f"  > {message_text[:200]}{'...' if len(message_text) > 200 else ''}\n\n"
+            )
+
+        return deals
+
+    def render_outputs(
+        self, context: RenderContext, deals: List[DealRenderData]
+    ) -> List[Dict[str, str]]:
+        """Write every deal's justification file on a worker pool and return
+        their rationale CSV rows in deal order"""
+        if self.max_workers <= 1 or len(deals) <= 1:
+            rationale_rows = [render_deal_outputs(deal, context) for deal in deals]
+        else:
+            if self.use_multiprocessing:
+                # Workers receive the shared context once, not with every deal
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=init_render_worker,
+                    initargs=(context,),
                 )
+                render = render_deal_worker
+            else:
+                executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                render = partial(render_deal_outputs, context=context)
 
-        conn.close()
-        self.logger.info(f"Generated justification for {conv_name}")
+            chunksize = max(1, len(deals) // (self.max_workers * 4))
+            with executor:
+                rationale_rows = list(executor.map(render, deals, chunksize=chunksize))
+
+        for deal in deals:
+            if deal.write_justification:
+                self.logger.info(f"Generated justification for {deal.conv_name}")
+
+        return rationale_rows
 
     def run_analysis(self):
         """Run the complete commission analysis"""
@@ -921,6 +1172,11 @@ class RepSplit:
         # Start performance monitoring
         start_time = time.time()
 
+        # Calendar data and participant identities are loaded once per run
+        self.reset_calendar_cache()
+        self._telegram_detections_current = False
+        self._identities = None
+
         # Use single database connection for better performance
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -940,6 +1196,7 @@ class RepSplit:
             SELECT DISTINCT company_name as conv_id, company_name as name
             FROM telegram_messages 
             WHERE author IN (?, ?, ?, ?, ?)
+            ORDER BY company_name
         """,
             ("Aki", "Addie", "Mayank", "Amy", "Kadeem Clarke"),
         )
@@ -958,10 +1215,7 @@ class RepSplit:
             f"Found {len(slack_channels)} Slack channels and {len(telegram_channels)} Telegram conversations to analyze"
         )
 
-        # Pre-cache participant mappings for better performance
-        participant_cache = {}
-        cursor.execute("SELECT id, display_name FROM users")
-        user_display_names = {row[0]: row[1] for row in cursor.fetchall()}
+        identities = self.get_identity_resolver()
 
         # Calculate commission splits for each channel
         all_splits = []
@@ -975,35 +1229,26 @@ class RepSplit:
             "Kadeem": 0.0,
         }
 
+        # Calculate splits for every channel from one pass over the database
+        all_commissions = self.calculate_all_commission_splits(
+            [conv_id for conv_id, _ in all_channels]
+        )
+
         for conv_id, conv_name in all_channels:
             self.logger.info(f"Analyzing {conv_name}...")
 
-            # Calculate splits
-            commissions = self.calculate_commission_splits(conv_id)
+            commissions = all_commissions[conv_id]
 
             # Round percentages to nearest 25%
             rounded_commissions = {
                 p: round_to_nearest_25(v) for p, v in commissions.items()
             }
 
-            # Map to participant names using cached data
-            participant_names = {}
-            for participant_id, percentage in rounded_commissions.items():
-                # Try to match with configured participants using Slack ID first
-                matched = False
-                for p in self.config["participants"]:
-                    if p["slack_id"] and p["slack_id"] == participant_id:
-                        participant_names[participant_id] = p["name"]
-                        matched = True
-                        break
-
-                if not matched:
-                    # Use cached display name lookup
-                    display_name = user_display_names.get(participant_id)
-                    if display_name:
-                        participant_names[participant_id] = display_name
-                    else:
-                        participant_names[participant_id] = participant_id
+            # Map Slack IDs and Telegram names to participant names
+            participant_names = {
+                participant_id: identities.split_name(participant_id)
+                for participant_id in rounded_commissions
+            }
 
             # Record splits
             split_record = {
@@ -1019,17 +1264,19 @@ class RepSplit:
 
             for participant_id, percentage in rounded_commissions.items():
                 participant_name = participant_names[participant_id]
+                # A rep's Slack and Telegram identities share one column
                 if participant_name in split_record:
-                    split_record[participant_name] = percentage
+                    split_record[participant_name] += percentage
                     person_totals[participant_name] += percentage
 
             all_splits.append(split_record)
 
-            # Generate justification
-            self.generate_justification(conv_id, conv_name)
+        # Render justifications and rationale rows from the results above
+        deals = self.collect_render_data(all_channels, all_commissions, all_splits)
+        rationale_rows = self.render_outputs(self._get_render_context(), deals)
 
         # Generate output files
-        self.generate_output_files(all_splits, person_totals)
+        self.generate_output_files(all_splits, person_totals, rationale_rows)
 
         # Close database connection
         conn.close()
@@ -1099,132 +1346,33 @@ class RepSplit:
 
         return health_report
 
-    def generate_rationale_csv(self, all_splits: List[Dict]):
+    def generate_rationale_csv(
+        self,
+        all_splits: List[Dict],
+        rationale_rows: Optional[List[Dict[str, str]]] = None,
+    ):
         """Generate rationale CSV with contestation level and reasoning
 
-        CONSTRAINT: The "Most Likely Owner" column must ALWAYS contain a sales rep's name
-        (Aki, Addie, Mayank, or Amy) and NEVER "Split". This ensures that every deal
-        has a clear, identifiable owner for commission purposes, even in highly contested
-        scenarios where percentages are low.
-
-        The system will:
-        1. Always pick the person with the highest percentage as the most likely owner
-        2. If no clear winner, pick the first person with any percentage > 0
-        3. Default to Aki if no one has any percentage (edge case)
+        ``rationale_rows`` takes rows already rendered for ``all_splits`` (see
+        render_outputs); they are built deal by deal when omitted. See
+        repsplit_outputs.rationale_row for the "Most Likely Owner" constraint.
         """
-
-        rationale_data = []
-
-        for split in all_splits:
-            deal_id = split["deal_id"]
-
-            # Get commission percentages
-            aki_pct = split.get("Aki", 0.0)
-            addie_pct = split.get("Addie", 0.0)
-            mayank_pct = split.get("Mayank", 0.0)
-            amy_pct = split.get("Amy", 0.0)
-
-            # Determine contestation level - more aggressive logic
-            max_pct = max(aki_pct, addie_pct, mayank_pct, amy_pct)
-            total_participants = sum(
-                1 for p in [aki_pct, addie_pct, mayank_pct, amy_pct] if p > 0
-            )
-
-            # More aggressive contestation logic
-            if max_pct >= 60.0:
-                contestation_level = "CLEAR OWNERSHIP"
-            elif max_pct >= 40.0 and total_participants <= 2:
-                contestation_level = "CLEAR OWNERSHIP"
-            elif total_participants >= 3 or (
-                max_pct < 40.0 and total_participants >= 2
-            ):
-                contestation_level = "HIGH CONTESTATION"
-            else:
-                contestation_level = "MODERATE CONTESTATION"
-
-            # Determine most likely owner - ALWAYS pick the person with highest percentage
-            # This ensures we never output "Split" - constraint: Most Likely Owner must be a sales rep
-            if aki_pct == max_pct:
-                most_likely_owner = "Aki"
-            elif addie_pct == max_pct:
-                most_likely_owner = "Addie"
-            elif mayank_pct == max_pct:
-                most_likely_owner = "Mayank"
-            elif amy_pct == max_pct:
-                most_likely_owner = "Amy"
-            else:
-                # Fallback: find the first person with any percentage > 0
-                if aki_pct > 0:
-                    most_likely_owner = "Aki"
-                elif addie_pct > 0:
-                    most_likely_owner = "Addie"
-                elif mayank_pct > 0:
-                    most_likely_owner = "Mayank"
-                elif amy_pct > 0:
-                    most_likely_owner = "Amy"
-                else:
-                    # This should never happen, but if it does, default to Aki
-                    most_likely_owner = "Aki"
-
-            # Get stage-by-stage breakdown
-            stage_breakdown = self.get_stage_breakdown(deal_id)
-
-            # Get calendar meeting information
-            calendar_info = self.get_calendar_summary(deal_id)
-
-            # Generate short rationale
-            rationale = self.generate_short_rationale(deal_id, split)
-
-            rationale_data.append(
-                {
-                    "Full Node Address": self.get_full_node_address(deal_id),
-                    "Aki %": f"{aki_pct:.0f}%",
-                    "Addie %": f"{addie_pct:.0f}%",
-                    "Mayank %": f"{mayank_pct:.0f}%",
-                    "Amy %": f"{amy_pct:.0f}%",
-                    "Contestation Level": contestation_level,
-                    "Most Likely Owner": most_likely_owner,
-                    "Calendar Meetings": calendar_info,
-                    "Sourcing/Intro": stage_breakdown.get("sourcing_intro", "None"),
-                    "Discovery/Qual": stage_breakdown.get("discovery_qual", "None"),
-                    "Solution": stage_breakdown.get("solution_presentation", "None"),
-                    "Objection": stage_breakdown.get("objection_handling", "None"),
-                    "Technical": stage_breakdown.get("technical_discussion", "None"),
-                    "Pricing": stage_breakdown.get("pricing_terms", "None"),
-                    "Contract": stage_breakdown.get("contract_legal", "None"),
-                    "Scheduling": stage_breakdown.get(
-                        "scheduling_coordination", "None"
-                    ),
-                    "Closing": stage_breakdown.get("closing_onboarding", "None"),
-                    "Rationale": rationale,
-                }
-            )
+        if rationale_rows is None:
+            rationale_rows = [
+                rationale_row(
+                    split,
+                    self.get_stage_breakdown(split["deal_id"]),
+                    self.get_calendar_summary(split["deal_id"]),
+                    self.generate_short_rationale(split["deal_id"], split),
+                )
+                for split in all_splits
+            ]
 
         # Write rationale CSV
         with open(self.output_dir / "deal_rationale.csv", "w", newline="") as f:
-            fieldnames = [
-                "Full Node Address",
-                "Aki %",
-                "Addie %",
-                "Mayank %",
-                "Amy %",
-                "Contestation Level",
-                "Most Likely Owner",
-                "Calendar Meetings",
-                "Sourcing/Intro",
-                "Discovery/Qual",
-                "Solution",
-                "Objection",
-                "Technical",
-                "Pricing",
-                "Contract",
-                "Scheduling",
-                "Closing",
-                "Rationale",
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=RATIONALE_FIELDNAMES)
             writer.writeheader()
-            for row in rationale_data:
+            for row in rationale_rows:
                 writer.writerow(row)
 
         self.logger.info(
@@ -1237,9 +1385,7 @@ class RepSplit:
         cursor = conn.cursor()
 
         # Get stage detections for internal team members only
-        internal_slack_ids = {
-            p["slack_id"] for p in self.config["participants"] if p["slack_id"]
-        }
+        internal_slack_ids = self.get_identity_resolver().internal_slack_ids
 
         cursor.execute(
             """
@@ -1257,100 +1403,19 @@ class RepSplit:
         stage_data = cursor.fetchall()
         conn.close()
 
-        # Group by stage and find primary participant
-        stage_contributions = {}
-        for stage_name, author, confidence in stage_data:
-            if stage_name not in stage_contributions:
-                stage_contributions[stage_name] = {}
-
-            if author not in stage_contributions[stage_name]:
-                stage_contributions[stage_name][author] = 0
-
-            stage_contributions[stage_name][author] += confidence
-
-        # Map stage names to display names
-        stage_display_names = {
-            "sourcing_intro": "Sourcing/Intro",
-            "discovery_qual": "Discovery/Qual",
-            "solution_presentation": "Solution",
-            "objection_handling": "Objection",
-            "technical_discussion": "Technical",
-            "pricing_terms": "Pricing",
-            "contract_legal": "Contract",
-            "scheduling_coordination": "Scheduling",
-            "closing_onboarding": "Closing",
-        }
-
-        # Get participant names for each stage
-        stage_breakdown = {}
-        for stage_name, contributions in stage_contributions.items():
-            if stage_name in stage_display_names:
-                # Find the participant with highest contribution
-                if contributions:
-                    primary_participant = max(
-                        contributions.items(), key=lambda x: x[1]
-                    )[0]
-                    # Map to display name
-                    participant_name = self.get_participant_display_name(
-                        primary_participant
-                    )
-                    stage_breakdown[stage_name] = participant_name
-                else:
-                    stage_breakdown[stage_name] = "None"
-
-        return stage_breakdown
+        return stage_breakdown(stage_data, self._get_render_context())
 
     def get_participant_display_name(self, participant_id: str) -> str:
         """Get display name for a participant ID"""
-        # Try to match with configured participants using Slack ID first
-        for p in self.config["participants"]:
-            if p["slack_id"] and p["slack_id"] == participant_id:
-                return p["name"]
-
-        # Fallback: get display name from database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT display_name FROM users WHERE id = ?", (participant_id,))
-        display_name = cursor.fetchone()
-        conn.close()
-
-        if display_name and display_name[0]:
-            return display_name[0]
-        else:
-            # For unknown users, return a more descriptive label
-            return f"External-{participant_id[-4:]}"
+        return self.get_identity_resolver().display_name(participant_id)
 
     def get_full_node_address(self, company_name: str) -> str:
         """Convert company name to full node address format"""
-        # Base node address (common for all companies)
-        base_address = (
-            "1220409a9fcc5ff6422e29ab978c22c004dde33202546b4bcbde24b25b85353366c2"
-        )
-
-        # Clean company name (remove -bitsafe suffix if present)
-        clean_name = company_name.replace("-bitsafe", "")
-
-        # Convert to lowercase and replace spaces/hyphens with single hyphens
-        clean_name = re.sub(r"[-\s]+", "-", clean_name.lower())
-
-        # Return full node address format
-        return f"{clean_name}::{base_address}"
+        return full_node_address(company_name)
 
     def generate_short_rationale(self, deal_id: str, split: Dict) -> str:
         """Generate short rationale based on commission split and stage analysis"""
 
-        # Get participant percentages
-        participants = []
-        for name, pct in split.items():
-            if name in ["Aki", "Addie", "Mayank", "Amy"] and pct > 0:
-                participants.append((name, pct))
-
-        # Sort by percentage (highest first)
-        participants.sort(key=lambda x: x[1], reverse=True)
-
-        if len(participants) == 0:
-            return "No team involvement recorded."
-
         # Get stage-level details for this deal
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -1369,86 +1434,13 @@ class RepSplit:
         stage_data = cursor.fetchall()
         conn.close()
 
-        # Group stages by participant
-        stage_participation = {}
-        for stage_name, author, confidence in stage_data:
-            # Map author to participant name
-            participant_name = None
-            for name, pct in participants:
-                if name in ["Aki", "Addie", "Mayank", "Amy"]:
-                    # Find the Slack ID for this participant
-                    for p in self.config["participants"]:
-                        if p["name"] == name:
-                            if p["slack_id"] == author:
-                                participant_name = name
-                                break
-                    if participant_name:
-                        break
-
-            if participant_name:
-                if participant_name not in stage_participation:
-                    stage_participation[participant_name] = []
-                stage_participation[participant_name].append(stage_name)
-
-        # Generate rationale with stage details
-        if len(participants) == 1:
-            name, pct = participants[0]
-            stages = stage_participation.get(name, [])
-            if stages:
-                stage_list = ", ".join(sorted(set(stages)))
-                return f"{name} handled {len(set(stages))} sales stages ({stage_list}) with {pct:.0f}% ownership."
-            else:
-                return f"{name} handled all sales stages with {pct:.0f}% ownership. No other team involvement."
-
-        elif len(participants) == 2:
-            name1, pct1 = participants[0]
-            name2, pct2 = participants[1]
-            stages1 = stage_participation.get(name1, [])
-            stages2 = stage_participation.get(name2, [])
-
-            if pct1 >= 75:
-                stage_list1 = (
-                    ", ".join(sorted(set(stages1))) if stages1 else "multiple stages"
-                )
-                stage_list2 = (
-                    ", ".join(sorted(set(stages2))) if stages2 else "supporting stages"
-                )
-                return f"{name1} owns business relationship ({pct1:.0f}%) handling {stage_list1}. {name2} supported sales process ({pct2:.0f}%) in {stage_list2}."
-            else:
-                stage_list1 = (
-                    ", ".join(sorted(set(stages1))) if stages1 else "multiple stages"
-                )
-                stage_list2 = (
-                    ", ".join(sorted(set(stages2))) if stages2 else "multiple stages"
-                )
-                return f"Two-way split. {name1} ({pct1:.0f}%) handled {stage_list1}, {name2} ({pct2:.0f}%) handled {stage_list2}."
-
-        else:
-            # Multiple participants
-            primary = participants[0]
-            others = participants[1:]
-
-            # Build stage details for primary
-            primary_stages = stage_participation.get(primary[0], [])
-            primary_stage_list = (
-                ", ".join(sorted(set(primary_stages)))
-                if primary_stages
-                else "multiple stages"
-            )
-
-            # Build stage details for others
-            other_details = []
-            for name, pct in others:
-                stages = stage_participation.get(name, [])
-                stage_list = (
-                    ", ".join(sorted(set(stages))) if stages else "supporting stages"
-                )
-                other_details.append(f"{name} ({pct:.0f}%) in {stage_list}")
-
-            return f"{primary[0]} owns business relationship ({primary[1]:.0f}%) handling {primary_stage_list}. {', '.join(other_details)} supported sales process."
+        return short_rationale(split, stage_data, self._get_render_context())
 
     def generate_output_files(
-        self, all_splits: List[Dict], person_totals: Dict[str, float]
+        self,
+        all_splits: List[Dict],
+        person_totals: Dict[str, float],
+        rationale_rows: Optional[List[Dict[str, str]]] = None,
     ):
         """Generate output CSV files and summary"""
 
@@ -1497,7 +1489,7 @@ class RepSplit:
                 f.write(f"  Keywords: {', '.join(stage['keywords'])}\n\n")
 
         # Generate rationale CSV with contestation level and reasoning
-        self.generate_rationale_csv(all_splits)
+        self.generate_rationale_csv(all_splits, rationale_rows)
 
         self.logger.info(f"Output files generated in {self.output_dir}")
 
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+RepSplit Output Rendering
+
+Renders the per-deal justification markdown files and deal_rationale.csv rows
+from data RepSplit has already loaded. Renderers only read their arguments
+(no database or calendar access), so deals can be rendered on a process pool.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.scripts.identity_resolver import IdentityResolver
+
+# Columns of deal_rationale.csv
+RATIONALE_FIELDNAMES = [
+    "Full Node Address",
+    "Aki %",
+    "Addie %",
+    "Mayank %",
+    "Amy %",
+    "Contestation Level",
+    "Most Likely Owner",
+    "Calendar Meetings",
+    "Sourcing/Intro",
+    "Discovery/Qual",
+    "Solution",
+    "Objection",
+    "Technical",
+    "Pricing",
+    "Contract",
+    "Scheduling",
+    "Closing",
+    "Rationale",
+]
+
+# Map stage names to display names
+STAGE_DISPLAY_NAMES = {
+    "sourcing_intro": "Sourcing/Intro",
+    "discovery_qual": "Discovery/Qual",
+    "solution_presentation": "Solution",
+    "objection_handling": "Objection",
+    "technical_discussion": "Technical",
+    "pricing_terms": "Pricing",
+    "contract_legal": "Contract",
+    "scheduling_coordination": "Scheduling",
+    "closing_onboarding": "Closing",
+}
+
+# Sales reps listed in the rationale
+SALES_REPS = ["Aki", "Addie", "Mayank", "Amy"]
+
+
+@dataclass(frozen=True)
+class RenderContext:
+    """Run-wide data shared by every deal's renderers (never mutated)"""
+
+    # Participant names and users display names, loaded once per run
+    identities: IdentityResolver
+    justifications_dir: Path
+
+
+@dataclass(frozen=True)
+class DealCalendar:
+    """Calendar meetings of a deal's company, looked up before rendering"""
+
+    company_name: str
+    authenticated: bool = False
+    meeting_data: Optional[Dict] = None
+    # Message of the exception raised while looking the meetings up
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DealRenderData:
+    """Everything the justification and rationale of one deal are made from"""
+
+    conv_id: str
+    conv_name: str
+    # conversations row (conv_id, name, member_count, creation_date, ...)
+    conversation: Tuple
+    # Splits rounded to the nearest 25%, in calculation order
+    rounded_commissions: Tuple[Tuple[str, float], ...]
+    # (stage_name, author, timestamp, confidence, display_name, text)
+    justification_detections: Tuple[Tuple, ...]
+    # deal_splits.csv record of the deal
+    split: Dict[str, Any]
+    # (stage_name, author, confidence) of the conversation named like the
+    # deal, ordered by timestamp
+    stage_detections: Tuple[Tuple[str, str, float], ...]
+    calendar: DealCalendar
+    write_justification: bool = True
+
+
+def stage_breakdown(
+    stage_detections: Tuple[Tuple[str, str, float], ...], context: RenderContext
+) -> Dict[str, str]:
+    """Stage-by-stage breakdown showing who handled each stage"""
+    internal_slack_ids = context.identities.internal_slack_ids
+
+    # Group by stage and find primary participant
+    stage_contributions = {}
+    for stage_name, author, confidence in stage_detections:
+        if author not in internal_slack_ids:
+            continue
+        if stage_name not in stage_contributions:
+            stage_contributions[stage_name] = {}
+
+        if author not in stage_contributions[stage_name]:
+            stage_contributions[stage_name][author] = 0
+
+        stage_contributions[stage_name][author] += confidence
+
+    # Get participant names for each stage
+    breakdown = {}
+    for stage_name, contributions in stage_contributions.items():
+        if stage_name in STAGE_DISPLAY_NAMES:
+            # Find the participant with highest contribution
+            if contributions:
+                primary_participant = max(contributions.items(), key=lambda x: x[1])[0]
+                breakdown[stage_name] = context.identities.display_name(
+                    primary_participant
+                )
+            else:
+                breakdown[stage_name] = "None"
+
+    return breakdown
+
+
+def calendar_summary(calendar: DealCalendar) -> str:
+    """Summary of calendar meetings for a deal"""
+    try:
+        if calendar.error is not None:
+            return f"Calendar error: {calendar.error}"
+        if not calendar.authenticated:
+            return "Calendar not accessible"
+
+        meeting_data = calendar.meeting_data
+        if not meeting_data or not meeting_data.get("overlapping_meetings"):
+            return "No meetings found"
+
+        # Summarize meetings
+        meeting_summary = []
+        for overlap in meeting_data["overlapping_meetings"]:
+            meeting = overlap["meeting"]
+            team_participants = overlap["team_participants"]
+            duration = meeting.get("duration_minutes", 60)
+
+            meeting_summary.append(f"{', '.join(team_participants)} ({duration}m)")
+
+        return "; ".join(meeting_summary)
+
+    except Exception as e:
+        return f"Calendar error: {str(e)}"
+
+
+def short_rationale(
+    split: Dict,
+    stage_detections: Tuple[Tuple[str, str, float], ...],
+    context: RenderContext,
+) -> str:
+    """Short rationale based on commission split and stage analysis"""
+
+    # Get participant percentages
+    participants = []
+    for name, pct in split.items():
+        if name in SALES_REPS and pct > 0:
+            participants.append((name, pct))
+
+    # Sort by percentage (highest first)
+    participants.sort(key=lambda x: x[1], reverse=True)
+
+    if len(participants) == 0:
+        return "No team involvement recorded."
+
+    # Group stages by participant
+    stage_participation = {}
+    for stage_name, author, confidence in stage_detections:
+        # Map author to participant name
+        participant_name = None
+        for name, pct in participants:
+            if context.identities.is_rep_author(name, author):
+                participant_name = name
+                break
+
+        if participant_name:
+            if participant_name not in stage_participation:
+                stage_participation[participant_name] = []
+            stage_participation[participant_name].append(stage_name)
+
+    # Generate rationale with stage details
+    if len(participants) == 1:
+        name, pct = participants[0]
+        stages = stage_participation.get(name, [])
+        if stages:
+            stage_list = ", ".join(sorted(set(stages)))
+            return f"{name} handled {len(set(stages))} sales stages ({stage_list}) with {pct:.0f}% ownership."
+        else:
+            return f"{name} handled all sales stages with {pct:.0f}% ownership. No other team involvement."
+
+    elif len(participants) == 2:
+        name1, pct1 = participants[0]
+        name2, pct2 = participants[1]
+        stages1 = stage_participation.get(name1, [])
+        stages2 = stage_participation.get(name2, [])
+
+        if pct1 >= 75:
+            stage_list1 = (
+                ", ".join(sorted(set(stages1))) if stages1 else "multiple stages"
+            )
+            stage_list2 = (
+                ", ".join(sorted(set(stages2))) if stages2 else "supporting stages"
+            )
+            return f"{name1} owns business relationship ({pct1:.0f}%) handling {stage_list1}. {name2} supported sales process ({pct2:.0f}%) in {stage_list2}."
+        else:
+            stage_list1 = (
+                ", ".join(sorted(set(stages1))) if stages1 else "multiple stages"
+            )
+            stage_list2 = (
+                ", ".join(sorted(set(stages2))) if stages2 else "multiple stages"
+            )
+            return f"Two-way split. {name1} ({pct1:.0f}%) handled {stage_list1}, {name2} ({pct2:.0f}%) handled {stage_list2}."
+
+    else:
+        # Multiple participants
+        primary = participants[0]
+        others = participants[1:]
+
+        # Build stage details for primary
+        primary_stages = stage_participation.get(primary[0], [])
+        primary_stage_list = (
+            ", ".join(sorted(set(primary_stages)))
+            if primary_stages
+            else "multiple stages"
+        )
+
+        # Build stage details for others
+        other_details = []
+        for name, pct in others:
+            stages = stage_participation.get(name, [])
+            stage_list = (
+                ", ".join(sorted(set(stages))) if stages else "supporting stages"
+            )
+            other_details.append(f"{name} ({pct:.0f}%) in {stage_list}")
+
+        return f"{primary[0]} owns business relationship ({primary[1]:.0f}%) handling {primary_stage_list}. {', '.join(other_details)} supported sales process."
+
+
+def full_node_address(company_name: str) -> str:
+    """Convert company name to full node address format"""
+    # Base node address (common for all companies)
+    base_address = (
+        "1220409a9fcc5ff6422e29ab978c22c004dde33202546b4bcbde24b25b85353366c2"
+    )
+
+    # Clean company name (remove -bitsafe suffix if present)
+    clean_name = company_name.replace("-bitsafe", "")
+
+    # Convert to lowercase and replace spaces/hyphens with single hyphens
+    clean_name = re.sub(r"[-\s]+", "-", clean_name.lower())
+
+    # Return full node address format
+    return f"{clean_name}::{base_address}"
+
+
+def rationale_row(
+    split: Dict, breakdown: Dict[str, str], calendar_info: str, rationale: str
+) -> Dict[str, str]:
+    """deal_rationale.csv row of a deal with its contestation level and owner
+
+    CONSTRAINT: The "Most Likely Owner" column must ALWAYS contain a sales rep's name
+    (Aki, Addie, Mayank, or Amy) and NEVER "Split". This ensures that every deal
+    has a clear, identifiable owner for commission purposes, even in highly contested
+    scenarios where percentages are low.
+
+    The system will:
+    1. Always pick the person with the highest percentage as the most likely owner
+    2. If no clear winner, pick the first person with any percentage > 0
+    3. Default to Aki if no one has any percentage (edge case)
+    """
+    # Get commission percentages
+    aki_pct = split.get("Aki", 0.0)
+    addie_pct = split.get("Addie", 0.0)
+    mayank_pct = split.get("Mayank", 0.0)
+    amy_pct = split.get("Amy", 0.0)
+
+    # Determine contestation level - more aggressive logic
+    max_pct = max(aki_pct, addie_pct, mayank_pct, amy_pct)
+    total_participants = sum(
+        1 for p in [aki_pct, addie_pct, mayank_pct, amy_pct] if p > 0
+    )
+
+    # More aggressive contestation logic
+    if max_pct >= 60.0:
+        contestation_level = "CLEAR OWNERSHIP"
+    elif max_pct >= 40.0 and total_participants <= 2:
+        contestation_level = "CLEAR OWNERSHIP"
+    elif total_participants >= 3 or (max_pct < 40.0 and total_participants >= 2):
+        contestation_level = "HIGH CONTESTATION"
+    else:
+        contestation_level = "MODERATE CONTESTATION"
+
+    # Determine most likely owner - ALWAYS pick the person with highest percentage
+    # This ensures we never output "Split" - constraint: Most Likely Owner must be a sales rep
+    if aki_pct == max_pct:
+        most_likely_owner = "Aki"
+    elif addie_pct == max_pct:
+        most_likely_owner = "Addie"
+    elif mayank_pct == max_pct:
+        most_likely_owner = "Mayank"
+    elif amy_pct == max_pct:
+        most_likely_owner = "Amy"
+    else:
+        # Fallback: find the first person with any percentage > 0
+        if aki_pct > 0:
+            most_likely_owner = "Aki"
+        elif addie_pct > 0:
+            most_likely_owner = "Addie"
+        elif mayank_pct > 0:
+            most_likely_owner = "Mayank"
+        elif amy_pct > 0:
+            most_likely_owner = "Amy"
+        else:
+            # This should never happen, but if it does, default to Aki
+            most_likely_owner = "Aki"
+
+    return {
+        "Full Node Address": full_node_address(split["deal_id"]),
+        "Aki %": f"{aki_pct:.0f}%",
+        "Addie %": f"{addie_pct:.0f}%",
+        "Mayank %": f"{mayank_pct:.0f}%",
+        "Amy %": f"{amy_pct:.0f}%",
+        "Contestation Level": contestation_level,
+        "Most Likely Owner": most_likely_owner,
+        "Calendar Meetings": calendar_info,
+        "Sourcing/Intro": breakdown.get("sourcing_intro", "None"),
+        "Discovery/Qual": breakdown.get("discovery_qual", "None"),
+        "Solution": breakdown.get("solution_presentation", "None"),
+        "Objection": breakdown.get("objection_handling", "None"),
+        "Technical": breakdown.get("technical_discussion", "None"),
+        "Pricing": breakdown.get("pricing_terms", "None"),
+        "Contract": breakdown.get("contract_legal", "None"),
+        "Scheduling": breakdown.get("scheduling_coordination", "None"),
+        "Closing": breakdown.get("closing_onboarding", "None"),
+        "Rationale": rationale,
+    }
+
+
+def render_justification(deal: DealRenderData, context: RenderContext) -> str:
+    """Markdown justification of a deal's commission splits"""
+    conv_data = deal.conversation
+    lines: List[str] = []
+    write = lines.append
+
+    write(f"# Commission Split Justification: {deal.conv_name}\n\n")
+    write(f"**Channel ID:** {deal.conv_id}\n")
+    write(
+        f"**Created:** {datetime.fromtimestamp(conv_data[3]).strftime('%Y-%m-%d %H:%M:%S') if conv_data[3] else 'Unknown'}\n"
+    )
+    write(f"**Members:** {conv_data[2]}\n\n")
+
+    write("## Commission Splits\n\n")
+    for participant_id, percentage in deal.rounded_commissions:
+        name = context.identities.user_display_name(participant_id, participant_id)
+        write(f"- **{name}:** {percentage:.1f}%\n")
+
+    # Add calendar meeting information
+    write("\n## Calendar Meetings (In-Person Interactions)\n\n")
+    calendar = deal.calendar
+    try:
+        if calendar.error is not None:
+            write(f"Calendar integration error: {calendar.error}\n\n")
+        elif calendar.authenticated:
+            meeting_data = calendar.meeting_data
+            if meeting_data and meeting_data.get("overlapping_meetings"):
+                write(f"**Company:** {calendar.company_name}\n\n")
+                write("**Meetings Found:**\n\n")
+
+                for overlap in meeting_data["overlapping_meetings"]:
+                    meeting = overlap["meeting"]
+                    team_participants = overlap["team_participants"]
+
+                    write(f"- **{meeting.get('summary', 'No Title')}**\n")
+                    write(f"  - Date: {meeting.get('start_time', 'Unknown')}\n")
+                    write(
+                        f"  - Duration: {meeting.get('duration_minutes', 0)} minutes\n"
+                    )
+                    write(f"  - Team Participants: {', '.join(team_participants)}\n")
+                    write(
+                        f"  - Description: {meeting.get('description', 'No description')[:200]}...\n\n"
+                    )
+            else:
+                write("No in-person meetings found in calendar data.\n\n")
+        else:
+            write("Could not authenticate with Google Calendar.\n\n")
+    except Exception as e:
+        write(f"Calendar integration error: {str(e)}\n\n")
+
+    write("## Stage Analysis\n\n")
+
+    current_stage = None
+    for (
+        stage_name,
+        author_id,
+        timestamp,
+        confidence,
+        display_name,
+        message_text,
+    ) in deal.justification_detections:
+        if stage_name != current_stage:
+            current_stage = stage_name
+            write(f"### {stage_name.replace('_', ' ').title()}\n\n")
+
+        timestamp_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        write(
+            f"- **{timestamp_str}** - {display_name} (confidence: {confidence:.2f})\n"
+        )
+        write(f"  > {message_text[:200]}{'...' if len(message_text) > 200 else ''}\n\n")
+
+    return "".join(lines)
+
+
+def justification_path(context: RenderContext, conv_name: str) -> Path:
+    """Path of a deal's justification markdown file"""
+    return context.justifications_dir / f"{conv_name}_justification.md"
+
+
+def render_deal_outputs(deal: DealRenderData, context: RenderContext) -> Dict[str, str]:
+    """Write a deal's justification file and return its rationale CSV row"""
+    if deal.write_justification:
+        with open(justification_path(context, deal.conv_name), "w") as f:
+            f.write(render_justification(deal, context))
+
+    return rationale_row(
+        deal.split,
+        stage_breakdown(deal.stage_detections, context),
+        calendar_summary(deal.calendar),
+        short_rationale(deal.split, deal.stage_detections, context),
+    )
+
+
+# Context of the deals rendered by this worker process, see init_render_worker
+_worker_context: Optional[RenderContext] = None
+
+
+def init_render_worker(context: RenderContext):
+    """Pool initializer: send the shared context once per worker"""
+    global _worker_context
+    _worker_context = context
+
+
+def render_deal_worker(deal: DealRenderData) -> Dict[str, str]:
+    """render_deal_outputs with the worker's context (pool compatible)"""
+    return render_deal_outputs(deal, _worker_context)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations for repsplit.db
+
+Secondary indexes for the commission analysis queries, applied by every code
+path that creates the database. Each index covers the columns its queries
+read, so per-conversation lookups search the index instead of scanning the
+table. Indexes are created with IF NOT EXISTS, so applying them to an
+existing database migrates it in place.
+"""
+
+from typing import List, Tuple
+
+# (index name, table, columns)
+INDEXES: List[Tuple[str, str, Tuple[str, ...]]] = [
+    # Per-conversation internal-team lookups in RepSplit
+    (
+        "idx_messages_conv_author_timestamp",
+        "messages",
+        ("conv_id", "author", "timestamp"),
+    ),
+    # Ordered pass over all messages in ingest_slack_data
+    ("idx_messages_conv_timestamp", "messages", ("conv_id", "timestamp")),
+    (
+        "idx_stage_detections_conv_author_timestamp",
+        "stage_detections",
+        ("conv_id", "author", "timestamp", "stage_name", "confidence"),
+    ),
+    # Replacing the detections of reprocessed messages
+    ("idx_stage_detections_message", "stage_detections", ("message_id",)),
+    (
+        "idx_telegram_messages_conv_author_timestamp",
+        "telegram_messages",
+        ("conv_id", "author", "timestamp"),
+    ),
+    # Listing the Telegram conversations the internal team took part in
+    (
+        "idx_telegram_messages_author_company",
+        "telegram_messages",
+        ("author", "company_name"),
+    ),
+    (
+        "idx_telegram_stage_detections_conv_version_author",
+        "telegram_stage_detections",
+        (
+            "conv_id",
+            "config_version",
+            "author",
+            "timestamp",
+            "stage_name",
+            "confidence",
+        ),
+    ),
+    (
+        "idx_telegram_stage_detections_message",
+        "telegram_stage_detections",
+        ("message_id",),
+    ),
+    # Deal name lookups in get_stage_breakdown and the stage summaries
+    ("idx_conversations_name", "conversations", ("name",)),
+]
+
+
+def apply_index_migrations(cursor) -> List[str]:
+    """Create the missing indexes on the tables that exist in the database.
+
+    Tables are created by different tools (Slack ingestion, the export
+    processor, the Telegram parser), so indexes on missing tables or columns
+    are skipped and created by a later call. Returns the names of the
+    indexes created.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing_indexes = {row[0] for row in cursor.fetchall()}
+
+    table_columns = {}
+    created = []
+    for index_name, table, columns in INDEXES:
+        if index_name in existing_indexes:
+            continue
+
+        if table not in table_columns:
+            cursor.execute(f"PRAGMA table_info({table})")
+            table_columns[table] = {row[1] for row in cursor.fetchall()}
+        if not set(columns) <= table_columns[table]:
+            continue
+
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({', '.join(columns)})"
+        )
+        created.append(index_name)
+
+    return created
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Slack Web API Client for RepSplit
+
+One pooled aiohttp session for a whole ingestion run, cursor pagination, and
+a token bucket per Slack rate-limit tier, so channels can be fetched
+concurrently without tripping the API limits. Rate-limited (429) responses
+pause the method's bucket for the Retry-After the API asks for and are
+retried.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Documented requests per minute of each Slack rate-limit tier
+TIER_REQUESTS_PER_MINUTE = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Rate-limit tier of the Web API methods the ingestion calls
+METHOD_TIERS = {
+    "conversations.list": 2,
+    "users.list": 2,
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "conversations.members": 4,
+}
+
+DEFAULT_TIER = 3
+MAX_RETRIES = 5
+
+
+class SlackAPIError(Exception):
+    """A Slack Web API call that failed or returned ok: false"""
+
+
+class TokenBucket:
+    """Asyncio token bucket allowing ``rate_per_minute`` requests with bursts
+    of up to ``burst``"""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Hold all requests for ``seconds``, as asked by a Retry-After"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class SlackClient:
+    """Rate-limited Slack Web API calls over one pooled session"""
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = "https://slack.com/api",
+        max_connections: int = 16,
+        rate_limits: Optional[Dict[int, float]] = None,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.base_url = base_url
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # One bucket per tier, as Slack limits each method per tier
+        rate_limits = {**TIER_REQUESTS_PER_MINUTE, **(rate_limits or {})}
+        self.buckets = {
+            tier: TokenBucket(rate, burst=max(1, int(rate // 6)))
+            for tier, rate in rate_limits.items()
+        }
+
+        # Requests sent and rate-limited responses, per method
+        self.request_counts: Dict[str, int] = {}
+        self.rate_limited_counts: Dict[str, int] = {}
+
+    async def __aenter__(self) -> "SlackClient":
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.session.close()
+        self.session = None
+
+    def _bucket(self, method: str) -> TokenBucket:
+        return self.buckets[METHOD_TIERS.get(method, DEFAULT_TIER)]
+
+    async def call(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Call a Web API method, waiting out rate limits"""
+        bucket = self._bucket(method)
+        url = f"{self.base_url}/{method}"
+
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            self.request_counts[method] = self.request_counts.get(method, 0) + 1
+
+            async with self.session.get(url, params=params) as response:
+                if response.status == 429:
+                    retry_after = float(response.headers.get("Retry-After", 1))
+                    self.rate_limited_counts[method] = (
+                        self.rate_limited_counts.get(method, 0) + 1
+                    )
+                    logger.warning(
+                        f"Rate limited on {method}, retrying in {retry_after}s"
+                    )
+                    bucket.pause(retry_after)
+                    continue
+                if response.status >= 500:
+                    logger.warning(f"HTTP error {response.status} on {method}")
+                    await asyncio.sleep(2**attempt)
+                    continue
+                if response.status != 200:
+                    raise SlackAPIError(f"HTTP error: {response.status}")
+
+                data = await response.json()
+
+            if not data.get("ok"):
+                raise SlackAPIError(f"Slack API error: {data.get('error')}")
+            return data
+
+        raise SlackAPIError(f"{method} failed after {self.max_retries} retries")
+
+    async def paginate(
+        self, method: str, key: str, params: Optional[Dict] = None
+    ) -> List[Dict]:
+        """All ``key`` items of a method, following next_cursor pages"""
+        params = dict(params or {})
+        items = []
+        while True:
+            data = await self.call(method, params)
+            items.extend(data.get(key, []))
+
+            cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return items
+            params["cursor"] = cursor
@@ -11,13 +11,22 @@ import json
 import logging
 import os
 import sqlite3
+import sys
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import aiohttp
 from dotenv import load_dotenv
 
+# Add the project root to the Python path for the shared database helpers
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.scripts.bulk_writer import BulkWriter, connect
+from src.scripts.schema_migrations import apply_index_migrations
+from src.scripts.slack_client import SlackAPIError, SlackClient
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,9 +35,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Days of channel history listed on every sync; the threads started in this
+# window are re-fetched when their parent's latest_reply has moved
+THREAD_ACTIVITY_DAYS = 30
+
 
 class SlackIngest:
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(
+        self,
+        config_file: str = "config.json",
+        max_concurrent_channels: int = 8,
+        rate_limits: Optional[Dict[int, float]] = None,
+    ):
         self.config_file = config_file
         self.config = self.load_config()
         self.db_path = "repsplit.db"
@@ -44,11 +62,21 @@ class SlackIngest:
                 "SLACK_TOKEN not found in .env file. Please add your Slack token to .env file"
             )
 
+        self.slack_token = slack_token
         self.headers = {
             "Authorization": f"Bearer {slack_token}",
             "Content-Type": "application/json",
         }
 
+        # Channels whose history is downloaded at the same time
+        self.max_concurrent_channels = max_concurrent_channels
+        # Requests per minute overriding the Slack tier limits, by tier
+        self.rate_limits = rate_limits
+        # Shared Slack client of the running ingestion, see slack_client
+        self.client: Optional[SlackClient] = None
+        # Shared database writer of the running ingestion, see bulk_writer
+        self.writer: Optional[BulkWriter] = None
+
     def load_config(self) -> Dict:
         """Load configuration from JSON file"""
         if os.path.exists(self.config_file):
@@ -57,29 +85,51 @@ class SlackIngest:
         else:
             raise FileNotFoundError(f"Config file {self.config_file} not found")
 
-    def is_data_fresh(self) -> bool:
-        """Check if data is less than 30 days old"""
+    def load_sync_state(self) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+        """Latest message ts synced per channel, and the latest reply ts
+        synced per thread of each channel"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        cursor.execute("SELECT MAX(timestamp) FROM messages")
-        result = cursor.fetchone()
-        conn.close()
-
-        if not result or not result[0]:
-            return False
+        cursor.execute("SELECT conv_id, latest_ts FROM slack_sync_state")
+        watermarks = dict(cursor.fetchall())
 
-        # Check if most recent message is less than 30 days old
-        latest_timestamp = result[0]
-        if isinstance(latest_timestamp, str):
-            latest_timestamp = float(latest_timestamp)
+        threads: Dict[str, Dict[str, str]] = {}
+        cursor.execute(
+            "SELECT conv_id, thread_ts, latest_reply_ts FROM slack_thread_state"
+        )
+        for conv_id, thread_ts, latest_reply_ts in cursor.fetchall():
+            threads.setdefault(conv_id, {})[thread_ts] = latest_reply_ts
 
-        days_old = (datetime.now().timestamp() - latest_timestamp) / (24 * 3600)
-        return days_old < 30
+        conn.close()
+        return watermarks, threads
+
+    def save_sync_state(
+        self,
+        channel_id: str,
+        latest_ts: Optional[str],
+        thread_replies: Dict[str, str],
+    ):
+        """Record how far a channel and its threads have been synced"""
+        with self.bulk_writer() as writer:
+            if latest_ts:
+                writer.write(
+                    "slack_sync_state",
+                    ("conv_id", "latest_ts", "synced_at"),
+                    [(channel_id, latest_ts, datetime.now().timestamp())],
+                )
+            writer.write(
+                "slack_thread_state",
+                ("conv_id", "thread_ts", "latest_reply_ts"),
+                (
+                    (channel_id, thread_ts, latest_reply_ts)
+                    for thread_ts, latest_reply_ts in thread_replies.items()
+                ),
+            )
 
     def init_database(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         cursor = conn.cursor()
 
         # Create tables
@@ -138,176 +188,307 @@ class SlackIngest:
         """
         )
 
+        # Newest message ts downloaded per channel, so each run only asks
+        # Slack for what is newer
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS slack_sync_state (
+                conv_id TEXT PRIMARY KEY,
+                latest_ts TEXT,
+                synced_at REAL,
+                FOREIGN KEY (conv_id) REFERENCES conversations (conv_id)
+            )
+        """
+        )
+
+        # Newest reply ts downloaded per thread
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS slack_thread_state (
+                conv_id TEXT,
+                thread_ts TEXT,
+                latest_reply_ts TEXT,
+                PRIMARY KEY (conv_id, thread_ts),
+                FOREIGN KEY (conv_id) REFERENCES conversations (conv_id)
+            )
+        """
+        )
+
+        # Indexes for the per-conversation analysis queries
+        apply_index_migrations(cursor)
+
         conn.commit()
         conn.close()
         logger.info("Database initialized successfully")
 
+    @asynccontextmanager
+    async def slack_client(self):
+        """The shared client of the running ingestion, or a new one"""
+        if self.client is not None:
+            yield self.client
+        else:
+            async with SlackClient(
+                self.slack_token, self.base_url, rate_limits=self.rate_limits
+            ) as client:
+                yield client
+
+    @contextmanager
+    def bulk_writer(self):
+        """The shared writer of the running ingestion, or a new one"""
+        if self.writer is not None:
+            yield self.writer
+        else:
+            with BulkWriter(self.db_path) as writer:
+                yield writer
+
     async def get_private_channels(self) -> List[Dict]:
         """Get all private channels from Slack"""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/conversations.list"
-            params = {"types": "private_channel", "limit": 1000}
-
-            async with session.get(
-                url, headers=self.headers, params=params
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("ok"):
-                        channels = data.get("channels", [])
-                        logger.info(f"Found {len(channels)} private channels")
-                        return channels
-                    else:
-                        logger.error(f"Slack API error: {data.get('error')}")
-                        return []
-                else:
-                    logger.error(f"HTTP error: {response.status}")
-                    return []
+        try:
+            async with self.slack_client() as client:
+                channels = await client.paginate(
+                    "conversations.list",
+                    "channels",
+                    {"types": "private_channel", "limit": 1000},
+                )
+        except (SlackAPIError, aiohttp.ClientError) as e:
+            logger.error(f"Error listing private channels: {e}")
+            return []
+
+        logger.info(f"Found {len(channels)} private channels")
+        return channels
 
     async def get_users(self) -> List[Dict]:
         """Get all users from Slack"""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/users.list"
-
-            async with session.get(url, headers=self.headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("ok"):
-                        users = data.get("members", [])
-                        logger.info(f"Found {len(users)} users")
-                        return users
-                    else:
-                        logger.error(f"Slack API error: {data.get('error')}")
-                        return []
-                else:
-                    logger.error(f"HTTP error: {response.status}")
-                    return []
+        try:
+            async with self.slack_client() as client:
+                users = await client.paginate("users.list", "members", {"limit": 1000})
+        except (SlackAPIError, aiohttp.ClientError) as e:
+            logger.error(f"Error listing users: {e}")
+            return []
+
+        logger.info(f"Found {len(users)} users")
+        return users
 
     async def get_channel_history(
-        self, channel_id: str, limit: int = 1000
+        self, channel_id: str, limit: int = 1000, oldest: Optional[str] = None
     ) -> List[Dict]:
-        """Get message history from a specific channel"""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/conversations.history"
-            params = {"channel": channel_id, "limit": limit}
-
-            async with session.get(
-                url, headers=self.headers, params=params
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("ok"):
-                        messages = data.get("messages", [])
-                        logger.info(
-                            f"Found {len(messages)} messages in channel {channel_id}"
-                        )
-                        return messages
-                    else:
-                        logger.error(f"Slack API error: {data.get('error')}")
-                        return []
-                else:
-                    logger.error(f"HTTP error: {response.status}")
-                    return []
+        """Get the message history of a channel page by page, only the
+        messages after ``oldest`` when given"""
+        params = {"channel": channel_id, "limit": limit}
+        if oldest:
+            params["oldest"] = oldest
+
+        try:
+            async with self.slack_client() as client:
+                messages = await client.paginate(
+                    "conversations.history", "messages", params
+                )
+        except (SlackAPIError, aiohttp.ClientError) as e:
+            logger.error(f"Error downloading channel {channel_id}: {e}")
+            return []
+
+        logger.info(f"Found {len(messages)} messages in channel {channel_id}")
+        return messages
+
+    async def get_thread_replies(
+        self,
+        channel_id: str,
+        thread_ts: str,
+        oldest: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[Dict]:
+        """Get the replies of a thread, only the ones after ``oldest`` when
+        given"""
+        params = {"channel": channel_id, "ts": thread_ts, "limit": limit}
+        if oldest:
+            params["oldest"] = oldest
+
+        try:
+            async with self.slack_client() as client:
+                messages = await client.paginate(
+                    "conversations.replies", "messages", params
+                )
+        except (SlackAPIError, aiohttp.ClientError) as e:
+            logger.error(f"Error downloading thread {thread_ts} in {channel_id}: {e}")
+            return []
+
+        # The parent message is returned with every page of replies
+        return [
+            message
+            for message in messages
+            if message.get("ts") != thread_ts
+            and (not oldest or float(message["ts"]) > float(oldest))
+        ]
+
+    async def sync_channel(
+        self,
+        channel: Dict,
+        latest_ts: Optional[str] = None,
+        threads: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """Download and save a channel's messages and thread replies newer
+        than its sync state. Returns the number of messages downloaded."""
+        channel_id = channel["id"]
+        threads = threads or {}
+
+        # Besides the messages after the watermark, list the recent history
+        # so the thread parents in it report their latest replies
+        oldest = latest_ts
+        if latest_ts:
+            active_since = datetime.now().timestamp() - THREAD_ACTIVITY_DAYS * 24 * 3600
+            oldest = f"{min(float(latest_ts), active_since):.6f}"
+        history = await self.get_channel_history(channel_id, oldest=oldest)
+        messages = [
+            message
+            for message in history
+            if not latest_ts or float(message["ts"]) > float(latest_ts)
+        ]
+
+        # Replies are fetched only for new threads and threads whose latest
+        # reply is newer than the one synced
+        thread_oldest = {}
+        for message in history:
+            if not message.get("reply_count"):
+                continue
+            synced = threads.get(message["ts"])
+            latest_reply = message.get("latest_reply")
+            if synced and latest_reply and float(latest_reply) <= float(synced):
+                continue
+            thread_oldest[message["ts"]] = synced
+
+        thread_replies = await asyncio.gather(
+            *(
+                self.get_thread_replies(channel_id, thread_ts, oldest)
+                for thread_ts, oldest in thread_oldest.items()
+            )
+        )
+
+        replies = [reply for batch in thread_replies for reply in batch]
+        if messages or replies:
+            self.save_messages(channel_id, messages + replies)
+
+        # Only advance the sync state past what was saved
+        new_latest_ts = latest_ts
+        if messages:
+            new_latest_ts = max(
+                [message["ts"] for message in messages]
+                + ([latest_ts] if latest_ts else []),
+                key=float,
+            )
+        thread_state = {}
+        for thread_ts, batch in zip(thread_oldest, thread_replies):
+            seen = [reply["ts"] for reply in batch]
+            seen.append(thread_oldest[thread_ts] or thread_ts)
+            thread_state[thread_ts] = max(seen, key=float)
+        self.save_sync_state(channel_id, new_latest_ts, thread_state)
+
+        return len(messages) + len(replies)
+
+    async def ingest_channels(self, channels: List[Dict], force_refresh: bool = False):
+        """Sync channels, up to max_concurrent_channels at a time. Channels
+        are downloaded in full on their first sync or with ``force_refresh``,
+        and from their sync state otherwise."""
+        if force_refresh:
+            watermarks, threads = {}, {}
+        else:
+            watermarks, threads = self.load_sync_state()
+        semaphore = asyncio.Semaphore(self.max_concurrent_channels)
+
+        async def ingest_channel(channel: Dict):
+            async with semaphore:
+                logger.info(f"Downloading messages for {channel['name']}...")
+                await self.sync_channel(
+                    channel,
+                    watermarks.get(channel["id"]),
+                    threads.get(channel["id"]),
+                )
+
+        await asyncio.gather(*(ingest_channel(channel) for channel in channels))
 
     def save_conversations(self, channels: List[Dict]):
         """Save conversation data to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        for channel in channels:
-            name = channel.get("name", "")
-            is_bitsafe = name.endswith("-bitsafe")
-
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO conversations 
-                (conv_id, name, member_count, creation_date, is_bitsafe)
-                VALUES (?, ?, ?, ?, ?)
-            """,
+        with self.bulk_writer() as writer:
+            writer.write(
+                "conversations",
+                ("conv_id", "name", "member_count", "creation_date", "is_bitsafe"),
                 (
-                    channel.get("id"),
-                    name,
-                    channel.get("num_members", 0),
-                    channel.get("created", 0),
-                    is_bitsafe,
+                    (
+                        channel.get("id"),
+                        channel.get("name", ""),
+                        channel.get("num_members", 0),
+                        channel.get("created", 0),
+                        channel.get("name", "").endswith("-bitsafe"),
+                    )
+                    for channel in channels
                 ),
             )
-
-        conn.commit()
-        conn.close()
         logger.info(f"Saved {len(channels)} conversations to database")
 
     def save_users(self, users: List[Dict]):
         """Save user data to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        for user in users:
-            if not user.get("is_bot", False) and not user.get("deleted", False):
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO users 
-                    (id, display_name, real_name, email)
-                    VALUES (?, ?, ?, ?)
-                """,
+        with self.bulk_writer() as writer:
+            writer.write(
+                "users",
+                ("id", "display_name", "real_name", "email"),
+                (
                     (
                         user.get("id"),
                         user.get("profile", {}).get("display_name", ""),
                         user.get("profile", {}).get("real_name", ""),
                         user.get("profile", {}).get("email", ""),
-                    ),
-                )
-
-        conn.commit()
-        conn.close()
+                    )
+                    for user in users
+                    if not user.get("is_bot", False) and not user.get("deleted", False)
+                ),
+            )
         logger.info(f"Saved users to database")
 
     def save_messages(self, channel_id: str, messages: List[Dict]):
         """Save message data to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        for message in messages:
-            # Skip bot messages and messages without text
-            if message.get("bot_id") or not message.get("text"):
-                continue
-
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO messages 
-                (id, conv_id, timestamp, author, text, stage_hits)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
+        with self.bulk_writer() as writer:
+            writer.write(
+                "messages",
+                ("id", "conv_id", "timestamp", "author", "text", "stage_hits"),
                 (
-                    message.get("ts"),
-                    channel_id,
-                    float(message.get("ts", 0)),
-                    message.get("user", ""),
-                    message.get("text", ""),
-                    "",  # stage_hits will be populated by RepSplit analysis
+                    (
+                        message.get("ts"),
+                        channel_id,
+                        float(message.get("ts", 0)),
+                        message.get("user", ""),
+                        message.get("text", ""),
+                        "",  # stage_hits will be populated by RepSplit analysis
+                    )
+                    for message in messages
+                    # Skip bot messages and messages without text
+                    if not message.get("bot_id") and message.get("text")
                 ),
             )
-
-        conn.commit()
-        conn.close()
         logger.info(f"Saved {len(messages)} messages for channel {channel_id}")
 
     async def ingest_data(self, test_mode: bool = True, force_refresh: bool = False):
         """Main ingestion function"""
+        # One pooled, rate-limited client for every request of the run, and
+        # one database connection for every write
+        async with SlackClient(
+            self.slack_token, self.base_url, rate_limits=self.rate_limits
+        ) as client:
+            self.client = client
+            try:
+                with BulkWriter(self.db_path) as writer:
+                    self.writer = writer
+                    await self._ingest_data(test_mode, force_refresh)
+            finally:
+                self.client = None
+                self.writer = None
+
+    async def _ingest_data(self, test_mode: bool, force_refresh: bool):
         logger.info("Starting Slack data ingestion...")
 
         # Initialize database
         self.init_database()
 
-        # Check data freshness
-        if not force_refresh and self.is_data_fresh():
-            logger.info("✅ Data is fresh! Using existing data.")
-            print("📊 Data is up-to-date (less than 30 days old)")
-            print("💡 Use --force-refresh to re-download anyway")
-            return
-
         if not force_refresh:
-            print("🔄 Data is older than 30 days, downloading fresh logs...")
+            print("🔄 Syncing messages since the last run...")
         else:
             print("🔄 Force refreshing data...")
 
@@ -355,15 +536,8 @@ class SlackIngest:
         users = await self.get_users()
         self.save_users(users)
 
-        # Get and save messages for target channels
-        for channel in target_channels:
-            logger.info(f"Downloading messages for {channel['name']}...")
-            messages = await self.get_channel_history(channel["id"])
-            if messages:
-                self.save_messages(channel["id"], messages)
-
-            # Add small delay to avoid rate limiting
-            await asyncio.sleep(1)
+        # Get and save new messages for target channels
+        await self.ingest_channels(target_channels, force_refresh)
 
         logger.info("Data ingestion complete!")
 
@@ -11,12 +11,24 @@ import logging
 import os
 import re
 import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from bs4 import BeautifulSoup
 
+# Add the project root to the Python path for the shared src utilities
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.etl.utils.stage_detector import StageDetector
+from src.scripts.bulk_writer import BulkWriter, connect
+from src.scripts.schema_migrations import apply_index_migrations
+from src.scripts.telegram_stage_detections import (
+    ensure_telegram_stage_tables,
+    store_telegram_stage_detections,
+)
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,7 +36,10 @@ logger = logging.getLogger(__name__)
 
 class TelegramParser:
     def __init__(
-        self, telegram_export_path: str, db_path: str = "data/slack/repsplit.db"
+        self,
+        telegram_export_path: str,
+        db_path: str = "data/slack/repsplit.db",
+        config_file: str = "data/slack/config.json",
     ):
         """
         Initialize the Telegram parser
@@ -32,9 +47,12 @@ class TelegramParser:
         Args:
             telegram_export_path: Path to the Telegram export directory
             db_path: Path to the SQLite database
+            config_file: RepSplit config with the deal stages to detect
         """
         self.telegram_export_path = Path(telegram_export_path)
         self.db_path = db_path
+        self.config_file = config_file
+        self._stage_detector = None
         self.chats_index_path = self.telegram_export_path / "lists" / "chats.html"
 
         # User mapping from Telegram to internal team
@@ -72,6 +90,19 @@ class TelegramParser:
         except Exception as e:
             logger.error(f"Error loading internal team IDs: {e}")
 
+    def load_stage_detector(self) -> Optional[StageDetector]:
+        """Load the stage detector from the RepSplit config (once)"""
+        if self._stage_detector is None:
+            if not os.path.exists(self.config_file):
+                logger.warning(
+                    f"Config not found at {self.config_file}, stages will be "
+                    "detected when RepSplit next runs"
+                )
+                return None
+            with open(self.config_file, "r") as f:
+                self._stage_detector = StageDetector.from_config(json.load(f))
+        return self._stage_detector
+
     def find_chat_by_company(self, company_name: str) -> Optional[str]:
         """
         Find a Telegram chat directory by company name
@@ -224,7 +255,7 @@ class TelegramParser:
             company_name: Name of the company for this conversation
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = connect(self.db_path)
             cursor = conn.cursor()
 
             # Create telegram_messages table if it doesn't exist
@@ -242,6 +273,8 @@ class TelegramParser:
                 )
             """
             )
+            ensure_telegram_stage_tables(cursor)
+            apply_index_migrations(cursor)
 
             # Create conversation entry if it doesn't exist
             conv_id = f"{company_name.lower().replace(' ', '-')}-telegram"
@@ -254,14 +287,20 @@ class TelegramParser:
                 (conv_id, company_name, int(datetime.now().timestamp())),
             )
 
-            # Insert messages
-            for msg in messages:
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO telegram_messages 
-                    (id, author, original_author, text, timestamp, source, company_name, conv_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            # Insert messages in batched transactions
+            BulkWriter(self.db_path, conn=conn).write(
+                "telegram_messages",
+                (
+                    "id",
+                    "author",
+                    "original_author",
+                    "text",
+                    "timestamp",
+                    "source",
+                    "company_name",
+                    "conv_id",
+                ),
+                (
                     (
                         msg["id"],
                         msg["author"],
@@ -271,14 +310,37 @@ class TelegramParser:
                         msg["source"],
                         company_name,
                         conv_id,
-                    ),
+                    )
+                    for msg in messages
+                ),
+            )
+
+            # Store stage detections with the messages, so commission splits
+            # read them instead of scanning message text on every run
+            stage_detector = self.load_stage_detector()
+            detection_count = 0
+            if stage_detector:
+                detection_count = store_telegram_stage_detections(
+                    cursor,
+                    stage_detector,
+                    [
+                        (
+                            msg["id"],
+                            conv_id,
+                            msg["author"],
+                            msg["text"],
+                            msg["timestamp"],
+                        )
+                        for msg in messages
+                    ],
                 )
 
             conn.commit()
             conn.close()
 
             logger.info(
-                f"Saved {len(messages)} Telegram messages to database for {company_name}"
+                f"Saved {len(messages)} Telegram messages and {detection_count} "
+                f"stage detections to database for {company_name}"
             )
 
         except Exception as e:
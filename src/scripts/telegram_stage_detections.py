@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Telegram Stage Detections
+
+Stores the deal stages detected in each Telegram message, so commission
+analysis reads them instead of re-scanning every message's text. Each
+telegram_messages row records the stage config version its detections were
+made with, and rows saved with another version (or none) are re-detected.
+"""
+
+import sqlite3
+from typing import Iterable, Tuple
+
+from src.scripts.schema_migrations import apply_index_migrations
+
+# Messages read and detections written per round trip
+BATCH_SIZE = 1000
+
+
+def ensure_telegram_stage_tables(cursor):
+    """Create the detections table, the telegram_messages version column and
+    their indexes"""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS telegram_stage_detections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message_id TEXT,
+            conv_id TEXT,
+            stage_name TEXT,
+            author TEXT,
+            timestamp TEXT,
+            confidence REAL,
+            config_version TEXT
+        )
+    """
+    )
+    cursor.execute("PRAGMA table_info(telegram_messages)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if columns and "stage_config_version" not in columns:
+        cursor.execute(
+            "ALTER TABLE telegram_messages ADD COLUMN stage_config_version TEXT"
+        )
+    apply_index_migrations(cursor)
+
+
+def store_telegram_stage_detections(
+    cursor, stage_detector, messages: Iterable[Tuple]
+) -> int:
+    """Replace the detections of (id, conv_id, author, text, timestamp)
+    messages with ones from ``stage_detector`` and mark the messages with its
+    version. Returns the number of detections written."""
+    version = stage_detector.version
+    message_ids = []
+    detections = []
+    for message_id, conv_id, author, text, timestamp in messages:
+        message_ids.append((message_id,))
+        if not text:  # Only messages with text have stages
+            continue
+        for stage_name, confidence in stage_detector.detect(text):
+            detections.append(
+                (
+                    message_id,
+                    conv_id,
+                    stage_name,
+                    author,
+                    timestamp,
+                    confidence,
+                    version,
+                )
+            )
+
+    cursor.executemany(
+        "DELETE FROM telegram_stage_detections WHERE message_id = ?", message_ids
+    )
+    cursor.executemany(
+        """
+        INSERT INTO telegram_stage_detections
+        (message_id, conv_id, stage_name, author, timestamp, confidence, config_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+        detections,
+    )
+    cursor.executemany(
+        "UPDATE telegram_messages SET stage_config_version = ? WHERE id = ?",
+        [(version, message_id) for (message_id,) in message_ids],
+    )
+    return len(detections)
+
+
+def refresh_telegram_stage_detections(conn: sqlite3.Connection, stage_detector) -> int:
+    """Detect stages for every Telegram message not yet detected with the
+    current stage config. Returns the number of messages processed."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='telegram_messages'"
+    )
+    if not cursor.fetchone():
+        return 0
+
+    ensure_telegram_stage_tables(cursor)
+
+    # Read all stale rows first: storing updates the column being filtered on
+    cursor.execute(
+        """
+        SELECT id, conv_id, author, text, timestamp
+        FROM telegram_messages
+        WHERE stage_config_version IS NOT ?
+        ORDER BY rowid
+    """,
+        (stage_detector.version,),
+    )
+    stale_messages = cursor.fetchall()
+
+    for start in range(0, len(stale_messages), BATCH_SIZE):
+        store_telegram_stage_detections(
+            cursor, stage_detector, stale_messages[start : start + BATCH_SIZE]
+        )
+    conn.commit()
+    return len(stale_messages)
@@ -8,9 +8,15 @@ This script should be run after slack_ingest.py to enable proper commission calc
 import json
 import logging
 import sqlite3
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+# Add the project root to the Python path for the shared src.etl utilities
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.etl.utils.stage_detector import StageDetector
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +31,7 @@ class StageDetectionPopulator:
         self.db_path = db_path
         self.config_file = config_file
         self.config = self.load_config()
+        self.stage_detector = StageDetector.from_config(self.config)
 
     def load_config(self) -> Dict:
         """Load configuration from config.json"""
@@ -40,25 +47,7 @@ class StageDetectionPopulator:
 
     def detect_stages_in_message(self, text: str) -> List[Tuple[str, float]]:
         """Detect deal stages in a message based on keyword patterns"""
-        detected_stages = []
-        text_lower = text.lower()
-
-        for stage_config in self.config.get("stages", []):
-            stage_name = stage_config["name"]
-            keywords = stage_config["keywords"]
-
-            matches = 0
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    matches += 1
-
-            if matches > 0:
-                # Calculate confidence based on number of keyword matches
-                # Higher base confidence for multiple matches
-                confidence = min(1.0, 0.3 + (matches * 0.4))
-                detected_stages.append((stage_name, confidence))
-
-        return detected_stages
+        return self.stage_detector.detect(text)
 
     def populate_stage_detections(self):
         """Process all messages and populate stage_detections table"""
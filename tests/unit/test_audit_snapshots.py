@@ -0,0 +1,136 @@
+"""
+Unit tests for the audit baseline and the changed-since-last-audit diff
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from src.scripts.audit_snapshots import AuditBaseline, GroupSnapshot, diff_results
+
+
+def snapshot(platform, group_id, title, audited_at="2026-10-01T12:00:00"):
+    return GroupSnapshot(
+        platform=platform,
+        group_id=group_id,
+        title=title,
+        member_count=5,
+        last_activity="100",
+        team="abc",
+        audited_at=audited_at,
+    )
+
+
+def result(platform, group_id, name, missing="-"):
+    return {
+        "Platform": platform,
+        "Group ID": group_id,
+        "Group Name": name,
+        "Required Missing": missing,
+    }
+
+
+def run(platform, group_id, name, audited_at="2026-10-01T12:00:00", **kwargs):
+    """results_json of an audit that covered one group"""
+    result_list = "slack_channels" if platform == "Slack" else "telegram_groups"
+    return {
+        result_list: [result(platform, group_id, name, **kwargs)],
+        "group_snapshots": [snapshot(platform, group_id, name, audited_at).to_dict()],
+    }
+
+
+class TestAuditBaseline:
+    """Test which groups the baseline carries forward"""
+
+    def test_platforms_come_from_their_newest_audit(self):
+        """Test a Slack-only run doesn't hide the last Telegram audit"""
+        baseline = AuditBaseline.from_audit_runs(
+            [
+                (3, run("Slack", "C1", "acme-bitsafe")),
+                (2, run("Slack", "C1", "old-name")),
+                (1, run("Telegram", "7", "Acme <> BitSafe")),
+            ]
+        )
+
+        assert baseline.audit_ids == {"Slack": 3, "Telegram": 1}
+        assert baseline.snapshots[("Slack", "C1")].title == "acme-bitsafe"
+        assert ("Telegram", "7") in baseline.results
+
+    def test_carry_forward(self):
+        """Test only unchanged groups probed within the TTL are reused"""
+        baseline = AuditBaseline.from_audit_runs(
+            [(1, run("Slack", "C1", "acme-bitsafe"))], ttl_hours=24
+        )
+        now = datetime(2026, 10, 2, 6, 0)
+        current = snapshot("Slack", "C1", "acme-bitsafe", now.isoformat())
+
+        carried, previous = baseline.carry_forward(current, now)
+        assert carried == result("Slack", "C1", "acme-bitsafe")
+        assert previous.audited_at == "2026-10-01T12:00:00"
+
+        renamed = snapshot("Slack", "C1", "acme-bitsafe-2", now.isoformat())
+        assert baseline.carry_forward(renamed, now) is None
+        assert baseline.carry_forward(current, now + timedelta(days=1)) is None
+        unknown = snapshot("Slack", "C2", "beta-bitsafe", now.isoformat())
+        assert baseline.carry_forward(unknown, now) is None
+
+
+class TestDiffResults:
+    """Test the per-group changed-since-last-audit diff"""
+
+    def test_statuses(self):
+        """Test new, changed, unchanged and removed groups"""
+        previous = run("Slack", "C1", "acme-bitsafe", missing="Aki")
+        previous["slack_channels"] += [
+            result("Slack", "C2", "beta-bitsafe"),
+            result("Slack", "C3", "gone-bitsafe"),
+        ]
+        previous["telegram_groups"] = [result("Telegram", "7", "Acme <> BitSafe")]
+        baseline = AuditBaseline.from_audit_runs([(1, previous)])
+
+        changes = diff_results(
+            baseline,
+            {"Slack"},
+            [
+                result("Slack", "C1", "acme-bitsafe"),
+                result("Slack", "C2", "beta-bitsafe"),
+                result("Slack", "C4", "new-bitsafe"),
+            ],
+        )
+
+        assert {c["id"]: c["status"] for c in changes} == {
+            "C1": "changed",
+            "C2": "unchanged",
+            "C4": "new",
+            "C3": "removed",
+        }
+        assert changes[0]["changes"] == {
+            "Required Missing": {"before": "Aki", "after": "-"}
+        }
+
+    def test_unprobed_groups_are_unavailable(self):
+        """Test groups listed but not probed aren't reported as removed"""
+        previous = run("Slack", "C1", "acme-bitsafe")
+        previous["slack_channels"].append(result("Slack", "C2", "beta-bitsafe"))
+        baseline = AuditBaseline.from_audit_runs([(1, previous)])
+
+        changes = diff_results(
+            baseline,
+            {"Slack"},
+            [result("Slack", "C1", "acme-bitsafe")],
+            [snapshot("Slack", "C2", "beta-bitsafe")],
+        )
+
+        assert {c["id"]: c["status"] for c in changes} == {
+            "C1": "unchanged",
+            "C2": "unavailable",
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,186 @@
+"""
+Unit tests for the batched repsplit.db writer
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add the project root and logging config to the Python path
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "../..")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "config"))
+
+# Mock logging setup before importing modules that log to files
+with patch("logging.FileHandler"), patch("logging.basicConfig"), patch("os.makedirs"):
+    from src.scripts.process_slack_export import SlackExportProcessor
+    from src.scripts.slack_ingest import SlackIngest
+
+from src.scripts.bulk_writer import CONFIG_DIR, BulkWriter, connect
+
+
+def traced_statements(conn):
+    """Statements run on a connection, recorded as they execute"""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    return statements
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "repsplit.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id TEXT PRIMARY KEY, display_name TEXT)")
+    conn.close()
+    return path
+
+
+class TestBulkWriter:
+    """Test rows are written in batched transactions"""
+
+    def test_connections_use_wal(self, db_path):
+        """Test writer connections are tuned for bulk writes"""
+        conn = connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # NORMAL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        conn.close()
+
+    def test_one_transaction_per_batch(self, db_path):
+        """Test each batch is one executemany committed once"""
+        monitor = MagicMock()
+        with BulkWriter(db_path, monitor=monitor, batch_size=2) as writer:
+            statements = traced_statements(writer.conn)
+            rows = ((f"U{i}", f"user {i}") for i in range(5))
+
+            assert writer.write("users", ("id", "display_name"), rows) == 5
+
+        assert statements.count("COMMIT") == 3
+        assert writer.batches_written == 3
+        assert writer.rows_written == {"users": 5}
+        monitor.log_database_operation.assert_called_once()
+        assert monitor.log_database_operation.call_args.kwargs["rows_affected"] == 5
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 5
+        conn.close()
+
+    def test_rows_are_replaced(self, db_path):
+        """Test rows with existing keys replace the stored ones"""
+        with BulkWriter(db_path) as writer:
+            writer.write("users", ("id", "display_name"), [("U1", "old")])
+            writer.write("users", ("id", "display_name"), [("U1", "new")])
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT * FROM users").fetchall() == [("U1", "new")]
+        conn.close()
+
+    def test_config_dir_added_to_path_once(self, db_path):
+        """Test creating writers doesn't grow sys.path"""
+        BulkWriter(db_path).close()
+        path_length = len(sys.path)
+        for _ in range(3):
+            BulkWriter(db_path).close()
+
+        assert len(sys.path) == path_length
+        assert str(CONFIG_DIR) in sys.path
+
+
+class TestIngestWrites:
+    """Test the ingestion paths write through the bulk writer"""
+
+    def test_slack_ingest_filters_rows(self, tmp_path, monkeypatch):
+        """Test SlackIngest skips bots, bot messages and empty messages"""
+        monkeypatch.setenv("SLACK_TOKEN", "xoxp-test")
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        ingest = SlackIngest(config_file=str(config_file))
+        ingest.db_path = str(tmp_path / "repsplit.db")
+        ingest.init_database()
+
+        ingest.save_users(
+            [
+                {"id": "U1", "profile": {"display_name": "aki"}},
+                {"id": "B1", "is_bot": True},
+            ]
+        )
+        ingest.save_messages(
+            "C1",
+            [
+                {"ts": "1.5", "user": "U1", "text": "intro"},
+                {"ts": "2.5", "bot_id": "B1", "text": "bot"},
+                {"ts": "3.5", "user": "U1", "text": ""},
+            ],
+        )
+
+        conn = sqlite3.connect(ingest.db_path)
+        assert conn.execute("SELECT id FROM users").fetchall() == [("U1",)]
+        assert conn.execute(
+            "SELECT id, conv_id, timestamp FROM messages"
+        ).fetchall() == [("1.5", "C1", 1.5)]
+        conn.close()
+
+    def test_slack_ingest_shares_the_run_writer(self, tmp_path, monkeypatch):
+        """Test saves during an ingestion run reuse its one writer"""
+        monkeypatch.setenv("SLACK_TOKEN", "xoxp-test")
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        ingest = SlackIngest(config_file=str(config_file))
+        ingest.db_path = str(tmp_path / "repsplit.db")
+        ingest.init_database()
+
+        with BulkWriter(ingest.db_path) as writer:
+            ingest.writer = writer
+            with patch(
+                "src.scripts.slack_ingest.BulkWriter", side_effect=AssertionError
+            ):
+                ingest.save_conversations([{"id": "C1", "name": "acme-bitsafe"}])
+                ingest.save_users([{"id": "U1", "profile": {"display_name": "aki"}}])
+                ingest.save_messages("C1", [{"ts": "1.5", "user": "U1", "text": "hi"}])
+                ingest.save_sync_state("C1", "1.5", {})
+
+        assert writer.rows_written == {
+            "conversations": 1,
+            "users": 1,
+            "messages": 1,
+            "slack_sync_state": 1,
+            "slack_thread_state": 0,
+        }
+
+    def test_process_channel_writes_plain_messages(self, tmp_path):
+        """Test export channels store only plain user messages"""
+        channel_file = tmp_path / "acme-bitsafe_messages.json"
+        channel_file.write_text(
+            json.dumps(
+                [
+                    {"type": "message", "ts": "1.0", "user": "U1", "text": "hi"},
+                    {"type": "message", "subtype": "channel_join", "ts": "2.0"},
+                    {"type": "message", "ts": "3.0", "user": "U2", "text": "yo"},
+                ]
+            )
+        )
+        processor = SlackExportProcessor(str(tmp_path), str(tmp_path / "export.db"))
+        processor.setup_database()
+
+        processor.process_channel(channel_file, {"id": "C1", "name": "acme-bitsafe"})
+        processor.conn.close()
+
+        conn = sqlite3.connect(str(tmp_path / "export.db"))
+        assert conn.execute(
+            "SELECT id, author FROM messages ORDER BY id"
+        ).fetchall() == [
+            ("1.0", "U1"),
+            ("3.0", "U2"),
+        ]
+        assert conn.execute("SELECT name FROM conversations").fetchall() == [
+            ("acme-bitsafe",)
+        ]
+        conn.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
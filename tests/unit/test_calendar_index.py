@@ -0,0 +1,196 @@
+"""
+Unit tests for the calendar meeting match index
+"""
+
+import os
+import random
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+# Mock logging setup before importing ETL module
+with patch("logging.FileHandler"), patch("logging.basicConfig"), patch("os.makedirs"):
+    from src.etl.etl_data_ingestion import DataETL
+
+from src.etl.utils.calendar_index import (
+    EMAIL_DOMAIN_SUFFIXES,
+    AhoCorasick,
+    CalendarTextIndex,
+    DomainIndex,
+)
+from src.etl.utils.company_matcher import CompanyMatcher
+
+COMPANIES = {
+    "Allnodes": {"base_company": "", "variant_type": "", "calendar_domain": ""},
+    "BitGo": {
+        "base_company": "",
+        "variant_type": "BitGo Trust, BitGo-Custody",
+        "calendar_domain": "bitgo.com",
+    },
+    "HexTrust": {
+        "base_company": "Hex Trust",
+        "variant_type": "",
+        "calendar_domain": "hextrust.com",
+    },
+    "Copper Co": {"base_company": "", "variant_type": "", "calendar_domain": ""},
+    "P2P": {"base_company": "", "variant_type": "", "calendar_domain": "p2p.org"},
+    "GM": {"base_company": "", "variant_type": "", "calendar_domain": ""},
+    "X-Y": {"base_company": "", "variant_type": "", "calendar_domain": ""},
+}
+
+TEXT_FRAGMENTS = [
+    "weekly sync",
+    "meeting with gm",
+    "call with x-y",
+    "allnodes validator review",
+    "bitgo trust onboarding",
+    "hex trust advisory",
+    "copper call",
+    "xy standup",
+    "alice@p2p.org",
+    "bob@example.com",
+    "p2p.org",
+    "tokenomics strategy",
+    "gm call",
+    "demo",
+    "bitgocustody",
+]
+
+DOMAINS = [
+    "bitgo.com",
+    "hextrust.com",
+    "hex.io",
+    "p2p.org",
+    "gmail.com",
+    "allnodes.co",
+    "mail.allnodes.com",
+    "copperco.net",
+    "bitgotrust.co",
+    "trust.io",
+    "xy.com",
+    "example.org",
+    "node.co",
+    "acme.io",
+]
+
+
+def _first_match(matcher, meeting_text):
+    for company_name, company_info in COMPANIES.items():
+        if matcher.match_company_to_channel(
+            company_name, company_info, meeting_text, "calendar"
+        ):
+            return company_name
+    return None
+
+
+class TestAhoCorasick:
+    """Test the multi-pattern automaton"""
+
+    def test_finds_overlapping_patterns(self):
+        """Test nested and overlapping patterns are all reported"""
+        scanner = AhoCorasick(["he", "she", "his", "hers", "x"])
+
+        found = {scanner.patterns[i] for i in scanner.find("ushers")}
+
+        assert found == {"he", "she", "hers"}
+        assert scanner.find("") == set()
+
+
+class TestCalendarTextIndex:
+    """Test the index agrees with per-company calendar matching"""
+
+    @pytest.fixture
+    def matcher(self):
+        return CompanyMatcher()
+
+    def test_matches_follow_company_order(self, matcher):
+        """Test all candidates are returned with the first-match priority"""
+        index = CalendarTextIndex(matcher, COMPANIES)
+
+        assert index.match("hextrust x bitgo sync") == ["BitGo", "HexTrust"]
+        assert index.match("meeting with gm") == ["GM"]
+        assert index.match("lunch") == []
+        assert index.match("") == []
+
+    def test_random_meetings_match_pairwise_results(self, matcher):
+        """Test every meeting resolves to the company the loop picked"""
+        index = CalendarTextIndex(matcher, COMPANIES)
+        rng = random.Random(3)
+
+        matched = 0
+        for _ in range(300):
+            meeting_text = " ".join(
+                rng.choice(TEXT_FRAGMENTS) for _ in range(rng.randint(1, 4))
+            )
+            candidates = index.match(meeting_text)
+            expected = [
+                company_name
+                for company_name, company_info in COMPANIES.items()
+                if matcher._match_calendar_meeting(
+                    company_name, company_info, meeting_text
+                )
+            ]
+
+            assert candidates == expected
+            assert (candidates[0] if candidates else None) == _first_match(
+                matcher, meeting_text
+            )
+            matched += bool(candidates)
+
+        assert matched
+
+
+class TestDomainIndex:
+    """Test the index agrees with per-company attendee domain matching"""
+
+    def test_matches_follow_company_order(self):
+        """Test exact, contained and partial domains in mapping order"""
+        index = DomainIndex(COMPANIES)
+
+        assert index.match({"p2p.org"}) == ["P2P"]
+        assert index.match({"hextrust.com", "bitgo.com"}) == ["BitGo", "HexTrust"]
+        assert index.match({"mynodes.io"}) == ["Allnodes"]
+        assert index.match({"example.org"}) == []
+        assert index.match(set()) == []
+
+    def test_empty_variant_matches_every_domain(self):
+        """Test a trailing comma in the variants keeps its catch-all match"""
+        companies = dict(COMPANIES)
+        companies["Loose"] = {
+            "base_company": "",
+            "variant_type": "Loose Labs,",
+            "calendar_domain": "",
+        }
+
+        assert DomainIndex(companies).match({"example.org"}) == ["Loose"]
+
+    def test_random_domains_match_pairwise_results(self):
+        """Test every domain set resolves like the per-company rules"""
+        rng = random.Random(5)
+
+        for suffixes, rule in (
+            (None, DataETL._match_calendar_by_attendee_domains),
+            (EMAIL_DOMAIN_SUFFIXES, DataETL._match_calendar_by_email_domain),
+        ):
+            index = (
+                DomainIndex(COMPANIES)
+                if suffixes is None
+                else DomainIndex(COMPANIES, domain_suffixes=suffixes)
+            )
+            for _ in range(300):
+                domains = set(rng.sample(DOMAINS, rng.randint(1, 3)))
+                expected = [
+                    company_name
+                    for company_name, company_info in COMPANIES.items()
+                    if rule(None, company_name, company_info, domains)
+                ]
+
+                assert index.match(domains) == expected, domains
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,149 @@
+"""
+Unit tests for the run-scoped calendar snapshot
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add the project root and analysis scripts to the Python path
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "../..")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "analysis"))
+
+from src.analysis.calendar_snapshot import CalendarSnapshot, text_tokens
+
+
+def _event(event_id, summary, attendees, description=""):
+    return {
+        "id": event_id,
+        "summary": summary,
+        "description": description,
+        "start": {"dateTime": "2024-05-01T10:00:00Z"},
+        "end": {"dateTime": "2024-05-01T10:30:00Z"},
+        "attendees": [{"email": email} for email in attendees],
+    }
+
+
+CALENDARS = {
+    "aki@dlc.link": [
+        _event("1", "Black Manta sync", ["aki@dlc.link", "finn@blackmanta.io"]),
+        _event("2", "Weekly standup", ["aki@dlc.link", "amy@dlc.link"]),
+        _event("3", "Intro", ["aki@dlc.link"], description="Call with Oscar"),
+        _event("4", "Launchnodes review", ["aki@dlc.link", "amy@dlc.link"]),
+        _event("5", "Launchnodes onboarding", ["aki@dlc.link"]),
+    ],
+    "amy@dlc.link": [
+        _event("2", "Weekly standup", ["aki@dlc.link", "amy@dlc.link"]),
+    ],
+}
+
+
+class FakeCalendarService:
+    """Minimal events().list().execute() client serving pages of events"""
+
+    def __init__(self, calendars, page_size=2, failing=()):
+        self.calendars = calendars
+        self.page_size = page_size
+        self.failing = set(failing)
+        self.requests = []
+
+    def events(self):
+        return self
+
+    def list(self, calendarId, pageToken=None, **kwargs):
+        self.requests.append((calendarId, pageToken))
+        if calendarId in self.failing:
+            raise RuntimeError("calendar unavailable")
+
+        start = int(pageToken or 0)
+        items = self.calendars.get(calendarId, [])
+        page = {"items": items[start : start + self.page_size]}
+        if start + self.page_size < len(items):
+            page["nextPageToken"] = str(start + self.page_size)
+        self._response = page
+        return self
+
+    def execute(self):
+        return self._response
+
+
+class TestCalendarSnapshot:
+    """Test fetching, indexing and caching calendar event windows"""
+
+    def test_fetch_follows_pages(self):
+        """Test each calendar is listed page by page, once"""
+        service = FakeCalendarService(CALENDARS)
+
+        snapshot = CalendarSnapshot.fetch(service, list(CALENDARS))
+
+        assert snapshot.events_by_calendar == CALENDARS
+        assert [r for r in service.requests if r[0] == "aki@dlc.link"] == [
+            ("aki@dlc.link", None),
+            ("aki@dlc.link", "2"),
+            ("aki@dlc.link", "4"),
+        ]
+
+    def test_attendee_and_text_lookups(self):
+        """Test lookups return matching events in start order"""
+        snapshot = CalendarSnapshot(CALENDARS)
+
+        def ids(events):
+            return [event["id"] for event in events]
+
+        assert ids(snapshot.events_with_attendee("aki@dlc.link", "amy@dlc.link")) == [
+            "2",
+            "4",
+        ]
+        assert ids(snapshot.search("aki@dlc.link", "Launchnodes")) == ["4", "5"]
+        assert ids(snapshot.search("aki@dlc.link", "black manta")) == ["1"]
+        assert ids(snapshot.search("aki@dlc.link", "oscar")) == ["3"]
+        assert ids(snapshot.search("aki@dlc.link", "finn")) == ["1"]
+        assert snapshot.search("aki@dlc.link", "bron") == []
+        assert snapshot.search("unknown@dlc.link", "launchnodes") == []
+        assert text_tokens("Black-Manta, Inc.") == {"black", "manta", "inc"}
+
+    def test_cache_is_reused_until_stale(self, tmp_path):
+        """Test the on-disk snapshot replaces fetches while within its TTL"""
+        cache_file = str(tmp_path / "calendar" / "snapshot.json")
+        service = FakeCalendarService(CALENDARS)
+
+        first = CalendarSnapshot.load_or_fetch(
+            service, list(CALENDARS), cache_file=cache_file, ttl_seconds=60
+        )
+        fetches = len(service.requests)
+        second = CalendarSnapshot.load_or_fetch(
+            service, list(CALENDARS), cache_file=cache_file, ttl_seconds=60
+        )
+
+        assert fetches > 0
+        assert len(service.requests) == fetches
+        assert second.events_by_calendar == first.events_by_calendar
+
+        # A different window or an expired snapshot is fetched again
+        CalendarSnapshot.load_or_fetch(
+            service, list(CALENDARS), days_back=30, cache_file=cache_file
+        )
+        assert len(service.requests) > fetches
+
+        stale = CalendarSnapshot(CALENDARS, fetched_at=time.time() - 120)
+        assert not stale.is_valid_for(list(CALENDARS), 180, ttl_seconds=60)
+
+    def test_partial_fetch_is_not_cached(self, tmp_path):
+        """Test a snapshot missing a failed calendar is not written to disk"""
+        cache_file = str(tmp_path / "snapshot.json")
+        service = FakeCalendarService(CALENDARS, failing={"amy@dlc.link"})
+
+        snapshot = CalendarSnapshot.load_or_fetch(
+            service, list(CALENDARS), cache_file=cache_file
+        )
+
+        assert snapshot.has_calendar("aki@dlc.link")
+        assert not snapshot.has_calendar("amy@dlc.link")
+        assert not os.path.exists(cache_file)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,164 @@
+"""
+Unit tests for the precompiled company match index
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from src.etl.utils.company_matcher import CompanyMatcher, CompanyMatchIndex
+
+WORDS = [
+    "acme",
+    "bitsafe",
+    "chain",
+    "labs",
+    "node",
+    "global",
+    "the",
+    "probit",
+    "kraken",
+    "coin",
+    "validator",
+    "finance",
+    "capital",
+    "wallet",
+    "minter",
+    "co",
+    "inc",
+    "group",
+    "io",
+    "blocks",
+    "staking",
+    "alpha",
+]
+SEPARATORS = [" ", "-", "_", ".", "", " & "]
+
+
+def _random_name(rng, words=None):
+    words = words or rng.randint(1, 3)
+    name = rng.choice(SEPARATORS).join(rng.choice(WORDS) for _ in range(words))
+    if rng.random() < 0.3:
+        # Typo: insert a character somewhere
+        position = rng.randint(0, len(name))
+        name = name[:position] + rng.choice("abxyz") + name[position:]
+    return name.title() if rng.random() < 0.5 else name
+
+
+def _random_companies(rng, count):
+    companies = {}
+    for _ in range(count):
+        companies[_random_name(rng)] = {
+            "full_node_address": "",
+            "slack_groups": ", ".join(
+                _random_name(rng) for _ in range(rng.randint(0, 2))
+            ),
+            "telegram_groups": _random_name(rng) if rng.random() < 0.3 else "",
+            "calendar_domain": (
+                _random_name(rng, 1).lower() + ".com" if rng.random() < 0.5 else ""
+            ),
+            "variant_type": ", ".join(
+                _random_name(rng) for _ in range(rng.randint(0, 2))
+            ),
+            "base_company": _random_name(rng) if rng.random() < 0.4 else "",
+        }
+    return companies
+
+
+class TestCompanyMatchIndex:
+    """Test the index returns exactly what the per-pair matcher returns"""
+
+    @pytest.fixture
+    def matcher(self):
+        return CompanyMatcher()
+
+    @pytest.fixture
+    def dataset(self):
+        rng = random.Random(7)
+        companies = _random_companies(rng, 15)
+        slack = {
+            f"C{i}": {
+                "name": (
+                    _random_name(rng) + ("-bitsafe" if rng.random() < 0.4 else "")
+                ).lower()
+            }
+            for i in range(25)
+        }
+        telegram = {
+            f"chat_{i}": {
+                "chat_name": f"System-{_random_name(rng, 1)} - {_random_name(rng)}-telegram"
+            }
+            for i in range(20)
+        }
+        hubspot = [
+            _random_name(rng) + rng.choice(["", " Inc", " LLC", " Group", "co"])
+            for _ in range(25)
+        ]
+        return companies, slack, telegram, hubspot
+
+    def test_slack_and_telegram_match_pairwise_results(self, matcher, dataset):
+        """Test find_best_matches agrees with the per-company matcher"""
+        companies, slack, telegram, _ = dataset
+        index = CompanyMatchIndex(matcher, companies)
+
+        slack_matches = index.find_best_matches(slack, "slack")
+        telegram_matches = index.find_best_matches(telegram, "telegram")
+
+        assert slack_matches and telegram_matches
+        for company_name, company_info in companies.items():
+            assert slack_matches.get(company_name, []) == matcher.find_best_matches(
+                company_name, company_info, slack, "slack"
+            )
+            assert telegram_matches.get(company_name, []) == matcher.find_best_matches(
+                company_name, company_info, telegram, "telegram"
+            )
+
+    def test_hubspot_matches_pairwise_results(self, matcher, dataset):
+        """Test HubSpot substring matching agrees with the per-pair matcher"""
+        companies, _, _, hubspot = dataset
+        index = CompanyMatchIndex(matcher, companies)
+
+        hubspot_matches = index.match_names(hubspot, "hubspot")
+
+        assert hubspot_matches
+        for company_name, company_info in companies.items():
+            expected = [
+                deal
+                for deal in hubspot
+                if matcher.match_company_to_channel(
+                    company_name, company_info, deal, "hubspot"
+                )
+            ]
+            assert hubspot_matches.get(company_name, []) == expected
+
+    def test_exact_and_fuzzy_hits(self, matcher):
+        """Test exact, typo and containment matches are all found"""
+        companies = {
+            "ProBit Global": {"base_company": "ProBit", "slack_groups": "probit-ops"},
+            "Kraken Staking": {"base_company": "", "slack_groups": ""},
+        }
+        index = CompanyMatchIndex(matcher, companies)
+
+        assert index.match_channel("probit-bitsafe") == {"ProBit Global"}
+        assert index.match_channel("krakken-staking") == {"Kraken Staking"}
+        assert index.match_channel("probit-ops") == {"ProBit Global"}
+        assert index.match_channel("unrelated") == set()
+        assert index.match_channel("") == set()
+        assert index.match_channel(
+            "System-Shirin - ProBit Global-telegram", "telegram"
+        ) == {"ProBit Global"}
+
+    def test_calendar_is_rejected(self, matcher):
+        """Test calendar text search is not routed through the name index"""
+        index = CompanyMatchIndex(matcher, {})
+        with pytest.raises(ValueError):
+            index.match_channel("Weekly sync with Acme", "calendar")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
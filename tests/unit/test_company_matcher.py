@@ -0,0 +1,245 @@
+"""
+Unit tests for CompanyMatcher name normalization and similarity scoring
+"""
+
+import csv
+import os
+import random
+import re
+import sys
+from difflib import SequenceMatcher
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from src.etl.utils import name_similarity
+from src.etl.utils.company_matcher import CompanyMatcher
+from src.etl.utils.name_similarity import bounded_ratio, ratio_matrix
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "../..")
+COMPANY_MAPPING_FILE = os.path.join(PROJECT_ROOT, "data", "company_mapping.csv")
+
+GENERIC_TERMS = {
+    "gm",
+    "om",
+    "em",
+    "al",
+    "tr",
+    "ac",
+    "sc",
+    "rm",
+    "am",
+    "im",
+    "pt",
+    "ui",
+    "bc",
+    "fm",
+    "tm",
+    "a0",
+    "ig",
+}
+
+
+def reference_normalize_name(matcher, name):
+    """Loop-based normalize_name as it was before the regex/cache rewrite"""
+    if not name:
+        return ""
+
+    normalized = name.lower().strip()
+
+    for prefix in matcher.company_prefixes:
+        if normalized.startswith(prefix + " "):
+            normalized = normalized[len(prefix) + 1 :]
+
+    for suffix in matcher.company_suffixes:
+        if normalized.endswith(" " + suffix):
+            normalized = normalized[: -len(suffix) - 1]
+        elif normalized.endswith(suffix):
+            normalized = normalized[: -len(suffix)]
+
+    for sep in matcher.separators:
+        normalized = normalized.replace(sep, "-")
+
+    normalized = re.sub(r"-+", "-", normalized)
+    return normalized.strip("-")
+
+
+def reference_name_variants(matcher, name):
+    """Uncached generate_name_variants built on the reference normalizer"""
+    variants = set()
+    if not name:
+        return []
+
+    variants.add(name)
+    variants.add(name.lower())
+    variants.add(reference_normalize_name(matcher, name))
+    variants.add(re.sub(r"[-_\s.]+", "", name.lower()))
+
+    for suffix in matcher.company_suffixes:
+        if name.lower().endswith(suffix):
+            base = name.lower()[: -len(suffix)].strip()
+            variants.add(base)
+            variants.add(reference_normalize_name(matcher, base))
+
+    base_name = reference_normalize_name(matcher, name)
+    for sep in ["-", "_", " ", "."]:
+        variants.add(base_name.replace("-", sep))
+
+    words = re.split(r"[-_\s.]+", name)
+    if len(words) > 1 and len(name) > 6:
+        acronym = "".join(word[0] for word in words if word)
+        if len(acronym) >= 3:
+            variants.add(acronym.lower())
+
+    return [v for v in variants if v and len(v) > 2 and v not in GENERIC_TERMS]
+
+
+def _synthetic_names():
+    """Edge cases plus random combinations of affixes and separators"""
+    names = [
+        "",
+        "The New Global Acme Labs Inc",
+        "global the acme",
+        "a an acme",
+        "Acme Inc Labs",
+        "xcompanyco",
+        "Brand and Co",
+        "Sand & Land + Co.",
+        "  Padded   Name  ",
+        "bitsafe",
+        "BitSafe-Minter",
+        "ProBit Global",
+        "inc",
+        "tab\tseparated",
+    ]
+    matcher = CompanyMatcher()
+    parts = (
+        matcher.company_prefixes
+        + matcher.company_suffixes
+        + [
+            "acme",
+            "probit",
+            "kraken",
+            "and",
+            "band",
+            "x",
+        ]
+    )
+    rng = random.Random(11)
+    for _ in range(3000):
+        separator = rng.choice(matcher.separators + [" - ", "  ", ""])
+        words = [rng.choice(parts) for _ in range(rng.randint(1, 4))]
+        name = separator.join(words)
+        names.append(name.upper() if rng.random() < 0.2 else name)
+    return names
+
+
+def _company_mapping_names():
+    """Every name-like field of the real company mapping"""
+    names = []
+    with open(COMPANY_MAPPING_FILE, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            names.append(row["Company Name"])
+            names.append(row.get("Base Company", ""))
+            names.append(row.get("Calendar Search Domain", ""))
+            for field in ("Slack Groups", "Telegram Groups", "Variants"):
+                names.extend(v.strip() for v in (row.get(field) or "").split(","))
+    return names
+
+
+class TestCompanyMatcherCaching:
+    """Test cached, regex-based normalization keeps the old results"""
+
+    def _assert_unchanged(self, names):
+        matcher = CompanyMatcher()
+        for name in names:
+            assert matcher.normalize_name(name) == reference_normalize_name(
+                matcher, name
+            ), name
+            assert sorted(matcher.generate_name_variants(name)) == sorted(
+                reference_name_variants(matcher, name)
+            ), name
+
+    def test_synthetic_names_unchanged(self):
+        """Test normalization of affix/separator combinations is unchanged"""
+        self._assert_unchanged(_synthetic_names())
+
+    @pytest.mark.skipif(
+        not os.path.exists(COMPANY_MAPPING_FILE),
+        reason="data/company_mapping.csv not available",
+    )
+    def test_company_mapping_unchanged(self):
+        """Test normalization of the real company mapping is unchanged"""
+        self._assert_unchanged(_company_mapping_names())
+
+    def test_cache_counters(self):
+        """Test hit/miss counters and returned lists are independent copies"""
+        matcher = CompanyMatcher()
+
+        first = matcher.generate_name_variants("ProBit Global")
+        first.append("mutated")
+        second = matcher.generate_name_variants("ProBit Global")
+
+        assert "mutated" not in second
+        stats = matcher.cache_stats()
+        assert stats["generate_name_variants"]["hits"] == 1
+        assert stats["generate_name_variants"]["misses"] == 1
+        assert stats["normalize_name"]["misses"] >= 1
+
+        matcher.clear_caches()
+        assert matcher.cache_stats()["normalize_name"]["size"] == 0
+
+
+class TestNameSimilarity:
+    """Test batched similarity scoring keeps difflib's decisions"""
+
+    @pytest.fixture(params=["rapidfuzz", "difflib"])
+    def backend(self, request, monkeypatch):
+        if request.param == "rapidfuzz":
+            pytest.importorskip("rapidfuzz")
+        else:
+            monkeypatch.setattr(name_similarity, "process", None)
+            monkeypatch.setattr(name_similarity, "Indel", None)
+        assert name_similarity.similarity_backend() == request.param
+        return request.param
+
+    @pytest.fixture
+    def names(self):
+        matcher = CompanyMatcher()
+        return [matcher.normalize_name(name) for name in _synthetic_names()[:300]]
+
+    def test_bounded_ratio_matches_difflib(self, backend, names):
+        """Test bounded_ratio only drops pairs below the threshold"""
+        for a, b in zip(names, reversed(names)):
+            expected = SequenceMatcher(None, a, b).ratio()
+            ratio = bounded_ratio(a, b, 0.85)
+            if expected >= 0.85:
+                assert ratio == expected
+            else:
+                assert ratio in (0.0, expected)
+
+    def test_ratio_matrix_matches_pairwise(self, backend, names):
+        """Test batch scoring finds exactly the pairs above the threshold"""
+        queries, choices = names[:40], names[40:120]
+
+        scored = {
+            (i, j): ratio
+            for i, j, ratio in ratio_matrix(queries, choices, 0.8)
+            if ratio > 0.8
+        }
+        expected = {
+            (i, j): SequenceMatcher(None, query, choice).ratio()
+            for i, query in enumerate(queries)
+            for j, choice in enumerate(choices)
+            if SequenceMatcher(None, query, choice).ratio() > 0.8
+        }
+
+        assert expected
+        assert scored == expected
+        assert ratio_matrix([], choices, 0.8) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
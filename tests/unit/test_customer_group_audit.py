@@ -0,0 +1,460 @@
+"""
+Unit tests for the Slack and Telegram audits in customer_group_audit.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from telethon.errors import FloodWaitError, UserNotParticipantError
+from telethon.tl.functions.channels import GetFullChannelRequest, GetParticipantRequest
+from telethon.tl.functions.messages import GetCommonChatsRequest, GetFullChatRequest
+from telethon.tl.types import Channel, Chat
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+with patch.dict(os.environ, {"SLACK_USER_TOKEN": "xoxp-test"}):
+    from scripts.customer_group_audit import (
+        OPTIONAL_MEMBERS,
+        PARTICIPANT_LIST_LIMIT,
+        REQUIRED_SLACK_MEMBERS,
+        REQUIRED_TELEGRAM_MEMBERS,
+        CustomerGroupAuditor,
+        TelegramRequestLimiter,
+    )
+
+from src.scripts.audit_snapshots import AuditBaseline, diff_results
+from src.scripts.slack_client import SlackClient
+
+FAST_LIMITS = {tier: 60000 for tier in (1, 2, 3, 4)}
+
+
+class StubSlack:
+    """Local Slack Web API with paginated channel and member lists"""
+
+    def __init__(self, channels, members, page_size=2, delay=0.02):
+        self.channels = channels
+        self.members = members
+        self.page_size = page_size
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _page(self, request, key, items):
+        start = int(request.query.get("cursor", 0))
+        end = start + self.page_size
+        next_cursor = str(end) if end < len(items) else ""
+        return web.json_response(
+            {
+                "ok": True,
+                key: items[start:end],
+                "response_metadata": {"next_cursor": next_cursor},
+            }
+        )
+
+    async def handle(self, request):
+        method = request.match_info["method"]
+        self.requests.append((method, dict(request.query)))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if method == "conversations.list":
+            return self._page(request, "channels", self.channels)
+        channel = request.query["channel"]
+        if channel not in self.members:
+            return web.json_response({"ok": False, "error": "not_in_channel"})
+        return self._page(request, "members", self.members[channel])
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/api/{method}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/api"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
+
+
+def baseline_of(auditor, audit_id=1):
+    """Baseline of the next audit from an auditor's results_json"""
+    results_json = {
+        "slack_channels": [
+            r for r in auditor.audit_results if r["Platform"] == "Slack"
+        ],
+        "telegram_groups": [
+            r for r in auditor.audit_results if r["Platform"] == "Telegram"
+        ],
+        "group_snapshots": [s.to_dict() for s in auditor.group_snapshots],
+    }
+    return AuditBaseline.from_audit_runs(
+        [(audit_id, json.loads(json.dumps(results_json)))]
+    )
+
+
+class TestSlackChannelAudit:
+    """Test the Slack audit covers every channel and member page"""
+
+    @pytest.mark.asyncio
+    async def test_audits_all_pages_concurrently(self):
+        """Test channels past the first page and members past the first
+        page are audited, with bounded concurrency"""
+        channels = [
+            {"id": f"C{i}", "name": f"acme{i}-bitsafe", "is_private": True}
+            for i in range(7)
+        ]
+        channels.insert(3, {"id": "CX", "name": "random"})
+        channels.insert(5, {"id": "CI", "name": "bitsafe-ieu-alerts"})
+        # The required members sit on the second and third member pages
+        members = {
+            channel["id"]: ["U_EXT1", "U_EXT2", "U_AKI", "U_EXT3", "U_GABI"]
+            for channel in channels
+        }
+        del members["C6"]
+
+        auditor = CustomerGroupAuditor(max_concurrent_channels=3)
+        auditor.required_slack_ids = {"akibalogh": "U_AKI", "gabitui": "U_GABI"}
+
+        async with StubSlack(channels, members) as stub:
+            async with SlackClient(
+                "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+            ) as auditor.slack:
+                await auditor.audit_slack_channels()
+
+        assert [r["Group Name"] for r in auditor.audit_results] == [
+            f"acme{i}-bitsafe" for i in range(6)
+        ]
+        for result in auditor.audit_results:
+            assert result["Total Members"] == 5
+            assert result["Required Present"] == ", ".join(
+                [REQUIRED_SLACK_MEMBERS["akibalogh"], REQUIRED_SLACK_MEMBERS["gabitui"]]
+            )
+
+        # Member lists are fetched in parallel, up to the concurrency limit
+        assert 1 < stub.max_in_flight <= 3
+        list_cursors = [
+            query.get("cursor")
+            for method, query in stub.requests
+            if method == "conversations.list"
+        ]
+        assert list_cursors == [None, "2", "4", "6", "8"]
+
+    async def _audit(self, channels, members, baseline=None):
+        auditor = CustomerGroupAuditor(baseline=baseline)
+        auditor.required_slack_ids = {"akibalogh": "U_AKI", "gabitui": "U_GABI"}
+        async with StubSlack(channels, members) as stub:
+            async with SlackClient(
+                "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+            ) as auditor.slack:
+                await auditor.audit_slack_channels()
+        probed = [
+            query["channel"]
+            for method, query in stub.requests
+            if method == "conversations.members"
+        ]
+        return auditor, probed
+
+    @pytest.mark.asyncio
+    async def test_reprobes_only_changed_channels(self):
+        """Test channels with unchanged markers are carried forward"""
+        channels = [
+            {"id": f"C{i}", "name": f"acme{i}-bitsafe", "num_members": 2}
+            for i in range(4)
+        ]
+        members = {channel["id"]: ["U_AKI", "U_GABI"] for channel in channels}
+        first, probed = await self._audit(channels, members)
+        assert probed == ["C0", "C1", "C2", "C3"]
+
+        channels[1]["num_members"] = 1
+        members["C1"] = ["U_AKI"]
+        channels[2]["name"] = "acme2-bitsafe-renamed"
+        second, probed = await self._audit(channels, members, baseline_of(first))
+
+        assert probed == ["C1", "C2"]
+        assert second.carried_forward == {"Slack": 2}
+        assert [r["Group ID"] for r in second.audit_results] == [
+            "C0",
+            "C1",
+            "C2",
+            "C3",
+        ]
+        assert second.audit_results[1]["Required Missing"] == (
+            REQUIRED_SLACK_MEMBERS["gabitui"]
+        )
+        # Carried-forward channels keep the time they were last probed
+        assert second.group_snapshots[0] == first.group_snapshots[0]
+
+    @pytest.mark.asyncio
+    async def test_inaccessible_channels_are_unavailable(self):
+        """Test a channel whose members can't be listed isn't diffed as
+        removed"""
+        channels = [
+            {"id": f"C{i}", "name": f"acme{i}-bitsafe", "num_members": 2}
+            for i in range(2)
+        ]
+        members = {channel["id"]: ["U_AKI", "U_GABI"] for channel in channels}
+        first, _ = await self._audit(channels, members)
+
+        channels[1]["num_members"] = 3
+        del members["C1"]
+        baseline = baseline_of(first)
+        second, probed = await self._audit(channels, members, baseline)
+
+        assert probed == ["C1"]
+        assert [r["Group ID"] for r in second.audit_results] == ["C0"]
+        assert [s.group_id for s in second.unavailable_groups] == ["C1"]
+        changes = diff_results(
+            baseline,
+            second.audited_platforms,
+            second.audit_results,
+            second.unavailable_groups,
+        )
+        assert {c["id"]: c["status"] for c in changes} == {
+            "C0": "unchanged",
+            "C1": "unavailable",
+        }
+
+    @pytest.mark.asyncio
+    async def test_stale_and_retargeted_channels_are_reprobed(self):
+        """Test the TTL and a changed team force new probes"""
+        channels = [{"id": "C0", "name": "acme-bitsafe", "num_members": 2}]
+        members = {"C0": ["U_AKI", "U_GABI"]}
+        first, _ = await self._audit(channels, members)
+
+        baseline = baseline_of(first)
+        baseline.ttl = timedelta(0)
+        _, probed = await self._audit(channels, members, baseline)
+        assert probed == ["C0"]
+
+        auditor = CustomerGroupAuditor(baseline=baseline_of(first))
+        auditor.required_slack_ids = {"akibalogh": "U_AKI"}
+        async with StubSlack(channels, members) as stub:
+            async with SlackClient(
+                "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+            ) as auditor.slack:
+                await auditor.audit_slack_channels()
+        assert auditor.carried_forward == {}
+
+
+def telegram_chat(chat_type, chat_id, title):
+    """Channel or Chat with only the fields the audit reads"""
+    chat = chat_type.__new__(chat_type)
+    chat.id = chat_id
+    chat.title = title
+    chat.participants_count = None
+    return chat
+
+
+class FakeTelegramClient:
+    """Telethon client stand-in answering the audit's requests locally"""
+
+    def __init__(self, chats, members, flood_waits=None):
+        self.chats = chats
+        # Member user IDs by chat ID
+        self.members = members
+        # Member counts reported by GetFullChannel, by chat ID, where they
+        # differ from the members listed
+        self.member_counts = {}
+        # Seconds of FloodWaitError raised once per request type
+        self.flood_waits = flood_waits or {}
+        self.users = {
+            username: SimpleNamespace(
+                id=1000 + i, username=username, first_name=username
+            )
+            for i, username in enumerate(
+                ["mojo_onchain", *REQUIRED_TELEGRAM_MEMBERS, *OPTIONAL_MEMBERS]
+            )
+        }
+        self.requests = []
+        self.get_me_calls = 0
+        # Top message ID by chat ID, the groups' last activity
+        self.top_messages = {}
+
+    async def get_entity(self, username):
+        return self.users[username]
+
+    async def get_me(self):
+        self.get_me_calls += 1
+        return SimpleNamespace(id=1)
+
+    async def get_dialogs(self):
+        return [
+            SimpleNamespace(entity=chat, message=SimpleNamespace(id=message_id))
+            for chat in self.chats
+            if (message_id := self.top_messages.get(chat.id)) is not None
+        ]
+
+    async def get_permissions(self, chat, user):
+        return SimpleNamespace(is_creator=chat.id == 1, is_admin=False)
+
+    async def get_participants(self, chat):
+        self.requests.append("get_participants")
+        return [SimpleNamespace(id=user_id) for user_id in self.members[chat.id]]
+
+    async def disconnect(self):
+        pass
+
+    async def __call__(self, request):
+        name = type(request).__name__
+        self.requests.append(name)
+        if name in self.flood_waits:
+            raise FloodWaitError(request, capture=self.flood_waits.pop(name))
+
+        if isinstance(request, GetCommonChatsRequest):
+            return SimpleNamespace(chats=self.chats)
+        if isinstance(request, GetFullChannelRequest):
+            return SimpleNamespace(
+                full_chat=SimpleNamespace(
+                    hidden_prehistory=request.channel.id == 2,
+                    participants_count=self.member_counts.get(
+                        request.channel.id, len(self.members[request.channel.id])
+                    ),
+                )
+            )
+        if isinstance(request, GetFullChatRequest):
+            participants = [
+                SimpleNamespace(user_id=user_id)
+                for user_id in self.members[request.chat_id]
+            ]
+            return SimpleNamespace(
+                full_chat=SimpleNamespace(
+                    participants=SimpleNamespace(participants=participants)
+                )
+            )
+        if isinstance(request, GetParticipantRequest):
+            if request.participant.id not in self.members[request.channel.id]:
+                raise UserNotParticipantError(request)
+            return SimpleNamespace()
+        raise AssertionError(f"Unexpected request {name}")
+
+
+class TestTelegramGroupAudit:
+    """Test the concurrent Telegram audit against a fake Telethon client"""
+
+    @pytest.mark.asyncio
+    async def test_flood_wait_holds_only_its_request_class(self):
+        """Test other request classes run during a flood wait"""
+        limiter = TelegramRequestLimiter(max_concurrent=4)
+        flooded = []
+
+        async def flood_once():
+            if not flooded:
+                flooded.append(time.monotonic())
+                raise FloodWaitError(None, capture=1)
+            return time.monotonic()
+
+        async def other():
+            await asyncio.sleep(0.1)
+            return await limiter.request(
+                "full_chat", lambda: asyncio.sleep(0, time.monotonic())
+            )
+
+        retried_at, other_at = await asyncio.gather(
+            limiter.request("participant", flood_once), other()
+        )
+
+        assert retried_at - flooded[0] >= 1
+        assert other_at - flooded[0] < 0.5
+        assert limiter.flood_waits == {"participant": 1}
+
+    @pytest.mark.asyncio
+    async def test_audits_groups_by_size(self):
+        """Test membership comes from one member list for small groups,
+        GetParticipant for large ones and basic group details, with get_me
+        called once"""
+        client = FakeTelegramClient(chats=[], members={})
+        aki = client.users["akibalogh"].id
+        gabi = client.users["gabitui"].id
+        client.chats = [
+            telegram_chat(Channel, 1, "Acme <> BitSafe"),
+            telegram_chat(Channel, 2, "Beta <> BitSafe"),
+            telegram_chat(Chat, 3, "Gamma <> BitSafe"),
+            telegram_chat(Channel, 4, "Old <> BitSafe - archived"),
+        ]
+        client.members = {1: {aki, gabi, 7}, 2: {aki}, 3: {gabi, 8, 9}}
+        client.member_counts = {1: PARTICIPANT_LIST_LIMIT}
+        client.flood_waits = {"GetParticipantRequest": 0}
+
+        auditor = CustomerGroupAuditor(max_concurrent_groups=4)
+        await auditor.audit_telegram_groups(client)
+
+        results = {r["Group Name"]: r for r in auditor.audit_results}
+        assert list(results) == [
+            "Acme <> BitSafe",
+            "Beta <> BitSafe",
+            "Gamma <> BitSafe",
+        ]
+        assert results["Acme <> BitSafe"]["Required Present"] == ", ".join(
+            [
+                REQUIRED_TELEGRAM_MEMBERS["akibalogh"],
+                REQUIRED_TELEGRAM_MEMBERS["gabitui"],
+            ]
+        )
+        assert results["Acme <> BitSafe"]["Admin Status"] == "✅ Owner"
+        assert results["Acme <> BitSafe"]["Total Members"] == PARTICIPANT_LIST_LIMIT
+        assert results["Beta <> BitSafe"]["History Visibility"] == "⚠️ HIDDEN"
+        assert results["Beta <> BitSafe"]["Required Present"] == (
+            REQUIRED_TELEGRAM_MEMBERS["akibalogh"]
+        )
+        assert results["Gamma <> BitSafe"]["Required Present"] == (
+            REQUIRED_TELEGRAM_MEMBERS["gabitui"]
+        )
+        assert results["Gamma <> BitSafe"]["Total Members"] == 3
+
+        assert client.get_me_calls == 1
+        # Only the large group is checked member by member; basic groups
+        # list their members in the full chat already
+        tracked = len({**REQUIRED_TELEGRAM_MEMBERS, **OPTIONAL_MEMBERS})
+        assert client.requests.count("GetParticipantRequest") == tracked + 1
+        assert client.requests.count("get_participants") == 1
+
+    @pytest.mark.asyncio
+    async def test_reprobes_only_active_groups(self):
+        """Test groups with new messages are probed again and the rest are
+        carried forward"""
+        client = FakeTelegramClient(chats=[], members={})
+        aki = client.users["akibalogh"].id
+        client.chats = [
+            telegram_chat(Channel, 1, "Acme <> BitSafe"),
+            telegram_chat(Channel, 2, "Beta <> BitSafe"),
+        ]
+        client.members = {1: {aki}, 2: {aki}}
+        client.top_messages = {1: 10, 2: 20}
+        first = CustomerGroupAuditor()
+        await first.audit_telegram_groups(client)
+
+        # Someone joined Beta, posting a service message
+        client.members[2].add(client.users["gabitui"].id)
+        client.top_messages[2] = 21
+        client.requests.clear()
+        second = CustomerGroupAuditor(baseline=baseline_of(first))
+        await second.audit_telegram_groups(client)
+
+        assert client.requests.count("GetFullChannelRequest") == 1
+        assert second.carried_forward == {"Telegram": 1}
+        assert [r["Group Name"] for r in second.audit_results] == [
+            "Acme <> BitSafe",
+            "Beta <> BitSafe",
+        ]
+        assert second.audit_results[1]["Total Members"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -4,6 +4,7 @@ Unit tests for ETL data ingestion functionality
 
 import os
 import shutil
+import sqlite3
 import sys
 import tempfile
 from pathlib import Path
@@ -156,6 +157,81 @@ def mock_open(content=""):
     return MagicMock(return_value=MagicMock(read=MagicMock(return_value=content)))
 
 
+class TestSlackIngestion:
+    """Test the bulk Slack loader against a small repsplit database"""
+
+    @pytest.fixture
+    def slack_etl(self, temp_dir):
+        db_path = os.path.join(temp_dir, "repsplit.db")
+        conn = sqlite3.connect(db_path)
+        conn.executescript(
+            """
+            CREATE TABLE conversations (conv_id TEXT PRIMARY KEY, name TEXT,
+                type TEXT, created REAL, purpose TEXT, topic TEXT);
+            CREATE TABLE users (id TEXT PRIMARY KEY, name TEXT, real_name TEXT,
+                email TEXT);
+            CREATE TABLE messages (id TEXT PRIMARY KEY, conv_id TEXT,
+                timestamp REAL, author TEXT, text TEXT, stage_hits TEXT);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO conversations VALUES (?, ?, 'private', ?, '', '')",
+            [
+                ("C2", "acme-bitsafe", 1.0),
+                ("C1", "beta-corp", 2.0),
+                ("C3", "empty", 3.0),
+            ],
+        )
+        conn.execute("INSERT INTO users VALUES ('U1', 'alice', 'Alice A', '')")
+        conn.executemany(
+            "INSERT INTO messages VALUES (?, ?, ?, ?, ?, NULL)",
+            [
+                ("m3", "C2", 30.0, "U2", "third"),
+                ("m1", "C2", 10.0, "U1", "first"),
+                ("m2", "C1", 20.0, "U1", "beta"),
+                ("m4", "C2", 20.0, "U1", "second"),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        etl = DataETL(max_workers=1)
+        etl.db_path = db_path
+        return etl
+
+    def test_bulk_loader_groups_messages(self, slack_etl):
+        """Test messages are grouped per conversation in timestamp order"""
+        slack_data = slack_etl.ingest_slack_data()
+
+        assert list(slack_data) == ["C2", "C1", "C3"]
+        acme = slack_data["C2"]
+        assert acme["is_bitsafe"]
+        assert acme["member_count"] == 2
+        assert acme["creation_date"] == 1.0
+        assert [msg["text"] for msg in acme["messages"]] == ["first", "second", "third"]
+        assert acme["messages"][0]["display_name"] == "Alice A"
+        assert acme["messages"][2].get("display_name") == "U2"
+        assert acme["messages"][2].get("author") == "U2"
+        assert slack_data["C1"]["messages"][0]["timestamp"] == 20.0
+        assert slack_data["C3"]["messages"] == []
+        assert slack_data["C3"]["member_count"] == 0
+
+    def test_bulk_loader_single_message_query(self, slack_etl):
+        """Test messages are read with one query rather than one per conversation"""
+        statements = []
+        real_connect = sqlite3.connect
+
+        def traced_connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch("src.etl.etl_data_ingestion.sqlite3.connect", traced_connect):
+            slack_etl.ingest_slack_data()
+
+        assert sum("FROM messages" in sql for sql in statements) == 1
+
+
 class TestETLUtilities:
     """Test ETL utility functions"""
 
@@ -0,0 +1,99 @@
+"""
+Unit tests for the participant identity resolver
+"""
+
+import os
+import sqlite3
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from src.scripts.identity_resolver import IdentityResolver
+
+PARTICIPANTS = [
+    {
+        "name": "Aki",
+        "slack_id": "U05FZBDQ4RJ",
+        "display_name": "Aki Balogh",
+        "email": "Aki@dlc.link",
+    },
+    {
+        "name": "Mayank",
+        "slack_id": "U05GJ6H5BTN",
+        "display_name": "Mayank",
+        "email": "",
+    },
+    {"name": "Prateek", "slack_id": "", "display_name": "", "email": ""},
+    {"name": "Kadeem", "slack_id": "", "display_name": "Kadeem Clarke", "email": ""},
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "repsplit.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id TEXT PRIMARY KEY, display_name TEXT)")
+    conn.executemany(
+        "INSERT INTO users VALUES (?, ?)",
+        [("U05FZBDQ4RJ", "aki"), ("U_EXT1234", "Finn"), ("U_NONAME", None)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestIdentityResolver:
+    """Test identities resolve with the config's matching rules"""
+
+    def test_identifiers_resolve_to_rep_names(self):
+        """Test Slack IDs map to rep names and calendar names to Slack IDs"""
+        identities = IdentityResolver(PARTICIPANTS)
+
+        assert identities.rep_name("U05FZBDQ4RJ") == "Aki"
+        assert identities.rep_name("Aki") is None
+        assert identities.rep_name("Kadeem Clarke") is None
+        assert identities.rep_name("") is None
+
+        assert identities.slack_id("Aki Balogh") == "U05FZBDQ4RJ"
+        assert identities.slack_id("Mayank") == "U05GJ6H5BTN"
+        assert identities.slack_id("Kadeem Clarke") == ""
+        assert identities.slack_id("Aki") == "U05FZBDQ4RJ"
+        assert identities.slack_id("Prateek") == ""
+        assert identities.slack_id("Bob") is None
+        assert identities.is_rep_author("Mayank", "U05GJ6H5BTN")
+        assert not identities.is_rep_author("Mayank", "U05FZBDQ4RJ")
+
+        assert identities.internal_slack_ids == {"U05FZBDQ4RJ", "U05GJ6H5BTN"}
+        assert identities.internal_names == {
+            "Aki",
+            "Aki Balogh",
+            "Mayank",
+            "Prateek",
+            "Kadeem",
+            "Kadeem Clarke",
+        }
+
+    def test_users_table_names_need_no_connection(self, db_path):
+        """Test fallback names come from the display names loaded once"""
+        identities = IdentityResolver.load(PARTICIPANTS, db_path)
+
+        with patch("sqlite3.connect", side_effect=AssertionError):
+            assert identities.display_name("U05FZBDQ4RJ") == "Aki"
+            assert identities.display_name("U_EXT1234") == "Finn"
+            assert identities.display_name("U_NONAME") == "External-NAME"
+            assert identities.split_name("Kadeem Clarke") == "Kadeem"
+            assert identities.split_name("Kadeem") == "Kadeem"
+            assert identities.split_name("U_EXT1234") == "Finn"
+            assert identities.split_name("U_UNKNOWN") == "U_UNKNOWN"
+            assert identities.user_display_name("U_NONAME", "U_NONAME") is None
+            assert identities.user_display_name("U_UNKNOWN", "U_UNKNOWN") == (
+                "U_UNKNOWN"
+            )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
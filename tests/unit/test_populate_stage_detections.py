@@ -0,0 +1,176 @@
+"""
+Unit tests for populate_stage_detections.py
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+# Mock logging setup before importing the script
+with patch("logging.FileHandler"), patch("logging.basicConfig"):
+    from scripts.populate_stage_detections import StageDetectionPopulator
+
+from src.etl.utils.stage_detector import StageDetector
+
+CONFIG = {
+    "stages": [
+        {"name": "sourcing_intro", "weight": 8.0, "keywords": ["intro"]},
+        {"name": "pricing_terms", "weight": 8.0, "keywords": ["pricing", "cost"]},
+        {"name": "contract_legal", "weight": 15.0, "keywords": ["contract"]},
+    ]
+}
+
+
+@pytest.fixture
+def db_files(tmp_path):
+    """Config file and a database with the RepSplit message tables"""
+    db_path = str(tmp_path / "repsplit.db")
+    config_path = str(tmp_path / "config.json")
+    with open(config_path, "w") as f:
+        json.dump(CONFIG, f)
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE users (id TEXT PRIMARY KEY, display_name TEXT);
+        CREATE TABLE messages (
+            id TEXT PRIMARY KEY, conv_id TEXT, timestamp REAL,
+            author TEXT, text TEXT, stage_hits TEXT
+        );
+        CREATE TABLE stage_detections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, conv_id TEXT, stage_name TEXT,
+            message_id TEXT, author TEXT, timestamp REAL, confidence REAL
+        );
+    """
+    )
+    conn.commit()
+    conn.close()
+    return db_path, config_path
+
+
+def _add_messages(db_path, messages):
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, NULL)", messages
+    )
+    conn.commit()
+    conn.close()
+
+
+def _detections(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        """
+        SELECT message_id, stage_name, confidence FROM stage_detections
+        ORDER BY message_id, stage_name
+    """
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def _reference_detections(db_path, config):
+    """Detections a from-scratch run over every message produces"""
+    detector = StageDetector.from_config(config)
+
+    conn = sqlite3.connect(db_path)
+    rows = []
+    for message_id, text in conn.execute("SELECT id, text FROM messages"):
+        if not text or len(text.strip()) < 3:
+            continue
+        for stage_name, confidence in detector.detect(text):
+            rows.append((message_id, stage_name, confidence))
+    conn.close()
+    return sorted(rows)
+
+
+class TestIncrementalPopulation:
+    """Test only new messages are processed between runs"""
+
+    def test_incremental_runs_match_full_rebuild(self, db_files):
+        """Test new and replaced messages end up as if rebuilt from scratch"""
+        db_path, config_path = db_files
+        _add_messages(
+            db_path,
+            [
+                ("m1", "C1", 1.0, "U1", "quick intro"),
+                ("m2", "C1", 2.0, "U2", "pricing and cost"),
+                ("m3", "C2", 3.0, "U1", "ok"),
+            ],
+        )
+        populator = StageDetectionPopulator(db_path, config_path)
+        populator.populate_stage_detections()
+        assert _detections(db_path) == _reference_detections(db_path, CONFIG)
+
+        # New message plus an edited one
+        _add_messages(
+            db_path,
+            [
+                ("m4", "C2", 4.0, "U2", "contract attached"),
+                ("m1", "C1", 1.0, "U1", "pricing question"),
+            ],
+        )
+        with patch.object(
+            populator,
+            "detect_stages_in_message",
+            wraps=populator.detect_stages_in_message,
+        ) as detect:
+            populator.populate_stage_detections()
+
+        assert detect.call_count == 2
+        assert _detections(db_path) == _reference_detections(db_path, CONFIG)
+
+        # Nothing new: nothing is scanned
+        with patch.object(populator, "detect_stages_in_message") as detect:
+            populator.populate_stage_detections()
+        assert detect.call_count == 0
+
+    def test_config_change_rebuilds(self, db_files):
+        """Test a changed stage config reprocesses every message"""
+        db_path, config_path = db_files
+        _add_messages(
+            db_path,
+            [
+                ("m1", "C1", 1.0, "U1", "quick intro"),
+                ("m2", "C1", 2.0, "U2", "contract and cost"),
+            ],
+        )
+        StageDetectionPopulator(db_path, config_path).populate_stage_detections()
+
+        changed = {"stages": CONFIG["stages"][:1]}
+        with open(config_path, "w") as f:
+            json.dump(changed, f)
+        StageDetectionPopulator(db_path, config_path).populate_stage_detections()
+
+        assert _detections(db_path) == [("m1", "sourcing_intro", 0.7)]
+
+    def test_weight_change_keeps_detections(self, db_files):
+        """Test only detection-relevant config changes trigger a rebuild"""
+        db_path, config_path = db_files
+        _add_messages(db_path, [("m1", "C1", 1.0, "U1", "quick intro")])
+        StageDetectionPopulator(db_path, config_path).populate_stage_detections()
+
+        reweighted = json.loads(json.dumps(CONFIG))
+        reweighted["stages"][0]["weight"] = 99.0
+        with open(config_path, "w") as f:
+            json.dump(reweighted, f)
+        populator = StageDetectionPopulator(db_path, config_path)
+        with patch.object(populator, "detect_stages_in_message") as detect:
+            populator.populate_stage_detections()
+
+        assert detect.call_count == 0
+        assert _detections(db_path) == [("m1", "sourcing_intro", 0.7)]
+
+        populator.populate_stage_detections(full_rebuild=True)
+        assert _detections(db_path) == [("m1", "sourcing_intro", 0.7)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,118 @@
+"""
+Unit tests for the coalescing audit progress reporter
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from src.scripts.progress_reporter import PROGRESS_CHANNEL, ProgressReporter
+
+
+@pytest.fixture
+def sqlite_path(tmp_path, monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    path = tmp_path / "admin_panel.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        """
+        CREATE TABLE audit_runs (
+            id INTEGER PRIMARY KEY,
+            slack_progress_current INTEGER DEFAULT 0,
+            telegram_progress_current INTEGER DEFAULT 0
+        )
+        """
+    )
+    conn.execute("INSERT INTO audit_runs (id) VALUES (7)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def progress(path):
+    conn = sqlite3.connect(str(path))
+    row = conn.execute(
+        "SELECT slack_progress_current, telegram_progress_current "
+        "FROM audit_runs WHERE id = 7"
+    ).fetchone()
+    conn.close()
+    return row
+
+
+class RecordingConnection:
+    """Postgres connection stand-in recording the statements run"""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params):
+        self.statements.append((query, params))
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        pass
+
+
+class TestProgressReporter:
+    """Test progress is coalesced over one connection"""
+
+    def test_updates_are_coalesced(self, sqlite_path):
+        """Test updates within the interval share one write"""
+        reporter = ProgressReporter(7, sqlite_path=sqlite_path, interval=3600)
+        for scanned in range(1, 6):
+            reporter.update(telegram_current=scanned)
+        conn = reporter.conn
+
+        assert reporter.writes == 1
+        assert progress(sqlite_path) == (0, 1)
+
+        reporter.update(slack_current=40)
+        reporter.close()
+
+        assert reporter.writes == 2
+        assert progress(sqlite_path) == (40, 5)
+        # The first connection served every write
+        assert reporter.conn is None and conn is not None
+
+    def test_without_audit_id_nothing_is_written(self, sqlite_path):
+        """Test runs outside the admin panel don't connect"""
+        with ProgressReporter(None, sqlite_path=sqlite_path) as reporter:
+            reporter.update(slack_current=3)
+
+        assert reporter.conn is None and reporter.writes == 0
+        assert progress(sqlite_path) == (0, 0)
+
+    def test_postgres_writes_notify(self):
+        """Test each Postgres write publishes the progress"""
+        reporter = ProgressReporter(7, database_url="postgresql://test")
+        reporter.conn = RecordingConnection()
+        conn = reporter.conn
+
+        reporter.update(slack_current=12)
+        reporter.close()
+
+        (update, update_params), (notify, notify_params) = conn.statements
+        assert update == (
+            "UPDATE audit_runs SET slack_progress_current = %s WHERE id = %s"
+        )
+        assert update_params == (12, 7)
+        assert notify == "SELECT pg_notify(%s, %s)"
+        assert notify_params[0] == PROGRESS_CHANNEL
+        assert json.loads(notify_params[1]) == {"audit_id": 7, "slack_current": 12}
+        assert conn.commits == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
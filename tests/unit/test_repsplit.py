@@ -0,0 +1,532 @@
+"""
+Unit tests for RepSplit commission analysis
+"""
+
+import csv
+import json
+import os
+import random
+import sqlite3
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root, scripts and logging config to the Python path
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "../..")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "config"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "scripts"))
+
+from src.etl.utils.stage_detector import StageDetector
+from src.scripts.repsplit import RepSplit, round_to_nearest_25
+from src.scripts.telegram_parser import TelegramParser
+
+ADD_CALENDAR_CONTRIBUTIONS = RepSplit._add_calendar_contributions
+
+PARTICIPANTS = [
+    ("Aki", "U_AKI"),
+    ("Addie", "U_ADDIE"),
+    ("Amy", "U_AMY"),
+    ("Mayank", "U_MAYANK"),
+    ("Prateek", ""),
+    ("Will", ""),
+    ("Kadeem", "U_KADEEM"),
+]
+
+STAGES = [
+    {"name": "sourcing_intro", "weight": 8.0, "keywords": ["intro", "connect"]},
+    {"name": "discovery_qual", "weight": 12.0, "keywords": ["requirements"]},
+    {"name": "solution_presentation", "weight": 32.0, "keywords": ["CBTC", "overview"]},
+    {"name": "pricing_terms", "weight": 8.0, "keywords": ["pricing", "billing"]},
+    {"name": "contract_legal", "weight": 15.0, "keywords": ["MSA", "contract"]},
+    {"name": "scheduling_coordination", "weight": 8.0, "keywords": ["demo", "call"]},
+    {"name": "closing_onboarding", "weight": 12.0, "keywords": ["signed", "onboard"]},
+]
+
+MESSAGE_TEXTS = [
+    "quick intro to the team",
+    "what are your requirements and timeline?",
+    "here is an overview of CBTC rewards",
+    "API integration details",
+    "pricing and billing terms",
+    "MSA contract is in docusign",
+    "schedule a demo call",
+    "signed, let's onboard",
+    "thanks!",
+    "",
+]
+
+
+@pytest.fixture
+def repsplit(tmp_path, monkeypatch):
+    """RepSplit working in a temporary directory with a small database"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/slack")
+
+    config = {
+        "stages": STAGES,
+        "participants": [
+            {
+                "name": name,
+                "slack_id": slack_id,
+                "display_name": name,
+                "email": "",
+                "founder_cap": False,
+                "earns_commission": True,
+            }
+            for name, slack_id in PARTICIPANTS
+        ],
+        "diminishing_returns": 0.8,
+        "presence_floor": 5.0,
+        "closer_bonus": 2.0,
+    }
+    with open("data/slack/config.json", "w") as f:
+        json.dump(config, f)
+
+    instance = RepSplit()
+
+    conn = sqlite3.connect(instance.db_path)
+    conn.execute(
+        """
+        CREATE TABLE telegram_messages (
+            id TEXT PRIMARY KEY,
+            author TEXT,
+            original_author TEXT,
+            text TEXT,
+            timestamp TEXT,
+            source TEXT,
+            company_name TEXT,
+            conv_id TEXT
+        )
+    """
+    )
+    conn.commit()
+    conn.close()
+
+    with patch.object(RepSplit, "_add_calendar_contributions"):
+        yield instance
+
+
+def _populate(db_path, seed=0):
+    """Random Slack channels, messages, detections and Telegram chats"""
+    rng = random.Random(seed)
+    authors = [slack_id for _, slack_id in PARTICIPANTS if slack_id] + ["U_EXT"]
+    telegram_authors = [name for name, _ in PARTICIPANTS] + ["Kadeem Clarke", "Bob"]
+
+    conn = sqlite3.connect(db_path)
+    for author in authors:
+        conn.execute(
+            "INSERT INTO users (id, display_name) VALUES (?, ?)",
+            (author, author.lower()),
+        )
+
+    for c in range(12):
+        conv_id = f"C{c:03d}"
+        conn.execute(
+            "INSERT INTO conversations VALUES (?, ?, ?, ?, ?)",
+            (conv_id, f"deal{c}-bitsafe", 5, 1700000000 + c, True),
+        )
+        for m in range(rng.randint(0, 25)):
+            message_id = f"{conv_id}-{m}"
+            author = rng.choice(authors)
+            timestamp = 1700000000 + rng.random() * 1e6
+            text = rng.choice(MESSAGE_TEXTS)
+            conn.execute(
+                "INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?)",
+                (message_id, conv_id, timestamp, author, text, None),
+            )
+            if text and rng.random() < 0.7:
+                conn.execute(
+                    """
+                    INSERT INTO stage_detections
+                        (conv_id, stage_name, message_id, author, timestamp, confidence)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        conv_id,
+                        rng.choice([stage["name"] for stage in STAGES]),
+                        message_id,
+                        author,
+                        timestamp,
+                        rng.choice([0.7, 1.0]),
+                    ),
+                )
+
+    for t in range(8):
+        company = f"Chat {t}"
+        for m in range(rng.randint(0, 20)):
+            conn.execute(
+                "INSERT INTO telegram_messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    f"tg-{t}-{m}",
+                    rng.choice(telegram_authors),
+                    None,
+                    rng.choice(MESSAGE_TEXTS),
+                    f"2024-01-{rng.randint(10, 28)}T{rng.randint(10, 23)}:00:{m:02d}",
+                    "telegram",
+                    company,
+                    company,
+                ),
+            )
+    conn.commit()
+    conn.close()
+
+
+class TestBatchCommissionSplits:
+    """Test the one-pass analysis matches per-channel split calculation"""
+
+    def test_batch_matches_per_channel(self, repsplit):
+        """Test every channel gets the splits calculate_commission_splits returns"""
+        _populate(repsplit.db_path)
+        conv_ids = [f"C{c:03d}" for c in range(12)]
+        conv_ids += [f"Chat {t}" for t in range(8)] + ["missing"]
+
+        batch = repsplit.calculate_all_commission_splits(conv_ids)
+
+        assert list(batch) == conv_ids
+        for conv_id in conv_ids:
+            assert batch[conv_id] == repsplit.calculate_commission_splits(conv_id)
+        assert batch["missing"] == {}
+        assert any(batch.values())
+
+    def test_batch_issues_constant_queries(self, repsplit):
+        """Test the number of statements does not grow with channel count"""
+        _populate(repsplit.db_path)
+        repsplit.refresh_telegram_stage_detections()
+        repsplit.get_identity_resolver()
+        statements = []
+        connect = sqlite3.connect
+
+        def traced_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch("src.scripts.repsplit.sqlite3.connect", traced_connect):
+            repsplit.calculate_all_commission_splits([f"C{c:03d}" for c in range(12)])
+
+        assert len(statements) == 5
+
+    def test_run_analysis_reuses_splits(self, repsplit):
+        """Test justifications are written without recalculating splits"""
+        _populate(repsplit.db_path)
+
+        with patch.object(
+            RepSplit, "calculate_commission_splits", side_effect=AssertionError
+        ), patch.object(RepSplit, "generate_rationale_csv"):
+            repsplit.run_analysis()
+
+        justifications = os.listdir(repsplit.justifications_dir)
+        assert "deal0-bitsafe_justification.md" in justifications
+        assert os.path.exists(repsplit.output_dir / "deal_splits.csv")
+
+
+def _read_outputs(repsplit):
+    """Justification files and rationale CSV a run wrote"""
+    outputs = {
+        name: (repsplit.justifications_dir / name).read_text()
+        for name in os.listdir(repsplit.justifications_dir)
+    }
+    outputs["deal_rationale.csv"] = (
+        repsplit.output_dir / "deal_rationale.csv"
+    ).read_text()
+    return outputs
+
+
+class TestParallelRendering:
+    """Test justifications and rationale rows rendered on a worker pool"""
+
+    @pytest.mark.parametrize("use_multiprocessing", [True, False])
+    def test_pool_matches_per_deal_rendering(self, repsplit, use_multiprocessing):
+        """Test pooled rendering writes what the per-deal methods write"""
+        _populate(repsplit.db_path)
+        repsplit.max_workers = 3
+        repsplit.use_multiprocessing = use_multiprocessing
+        statements = []
+        connect = sqlite3.connect
+
+        def traced_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch("src.scripts.repsplit.sqlite3.connect", traced_connect):
+            repsplit.run_analysis()
+        pooled = _read_outputs(repsplit)
+
+        # Display names are loaded once, not per participant and deal
+        assert not [s for s in statements if "FROM users WHERE id" in s]
+
+        with open(repsplit.output_dir / "deal_splits.csv") as f:
+            all_splits = [
+                {k: float(v) if k != "deal_id" else v for k, v in row.items()}
+                for row in csv.DictReader(f)
+            ]
+        # Telegram deals are named and identified by their company name
+        conn = sqlite3.connect(repsplit.db_path)
+        conv_ids = {
+            name: conv_id
+            for conv_id, name, *_ in conn.execute("SELECT * FROM conversations")
+        }
+        conn.close()
+        channels = [
+            (conv_ids.get(split["deal_id"], split["deal_id"]), split["deal_id"])
+            for split in all_splits
+        ]
+        all_commissions = repsplit.calculate_all_commission_splits(
+            [conv_id for conv_id, _ in channels]
+        )
+        for name in os.listdir(repsplit.justifications_dir):
+            os.remove(repsplit.justifications_dir / name)
+        for conv_id, conv_name in channels:
+            repsplit.generate_justification(
+                conv_id, conv_name, all_commissions[conv_id]
+            )
+        repsplit.generate_rationale_csv(all_splits)
+
+        assert _read_outputs(repsplit) == pooled
+        assert len(pooled) == len(all_splits) + 1 > 13
+
+
+class TestIdentityResolution:
+    """Test participant lookups share one resolver per run"""
+
+    def test_lookups_open_no_connections(self, repsplit):
+        """Test display names are resolved without per-lookup queries"""
+        _populate(repsplit.db_path)
+        repsplit.get_identity_resolver()
+
+        with patch("src.scripts.repsplit.sqlite3.connect", side_effect=AssertionError):
+            assert repsplit.get_participant_display_name("U_AKI") == "Aki"
+            assert repsplit.get_participant_display_name("U_EXT") == "u_ext"
+            assert repsplit.get_participant_display_name("U_GONE") == "External-GONE"
+
+
+class TestRepCrediting:
+    """Test reps are credited for the names they post under on Telegram"""
+
+    def test_telegram_display_name_is_credited_to_the_rep(self, repsplit):
+        """Test shares of a rep's Telegram display name land in their
+        deal_splits column instead of being dropped"""
+        for participant in repsplit.config["participants"]:
+            if participant["name"] == "Kadeem":
+                participant["display_name"] = "Kadeem Clarke"
+        conn = sqlite3.connect(repsplit.db_path)
+        conn.executemany(
+            "INSERT INTO telegram_messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    f"tg-{m}",
+                    author,
+                    None,
+                    text,
+                    f"2024-01-10T12:00:{m:02d}",
+                    "telegram",
+                    "Acme",
+                    "Acme",
+                )
+                for m, (author, text) in enumerate(
+                    [
+                        ("Aki", "quick intro to the team"),
+                        ("Kadeem Clarke", "here is an overview of CBTC rewards"),
+                        ("Kadeem Clarke", "MSA contract is in docusign"),
+                    ]
+                )
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        repsplit.run_analysis()
+
+        with open(repsplit.output_dir / "deal_splits.csv") as f:
+            (split,) = [row for row in csv.DictReader(f) if row["deal_id"] == "Acme"]
+        commissions = repsplit.calculate_commission_splits("Acme")
+        kadeem = round_to_nearest_25(commissions["Kadeem Clarke"])
+        assert kadeem > 0
+        # Before, only the "Aki" share had a column and Kadeem's was dropped
+        old_split = {"Aki": round_to_nearest_25(commissions["Aki"]), "Kadeem": 0.0}
+        new_split = {"Aki": old_split["Aki"], "Kadeem": kadeem}
+        assert {name: float(split[name]) for name in new_split} == new_split
+
+
+def _reference_telegram_detections(repsplit, conv_id):
+    """Telegram detections as scanned from message text on every calculation"""
+    _, internal_names = repsplit._internal_participant_filters()
+    conn = sqlite3.connect(repsplit.db_path)
+    rows = conn.execute(
+        "SELECT author, text, timestamp FROM telegram_messages "
+        "WHERE conv_id = ? ORDER BY timestamp",
+        (conv_id,),
+    ).fetchall()
+    conn.close()
+
+    detections = []
+    for author, text, timestamp in rows:
+        if text and author in internal_names:
+            for stage_name, confidence in repsplit.detect_stages_in_message(text):
+                detections.append((stage_name, author, confidence, timestamp or 0))
+    return detections
+
+
+class TestTelegramStageDetections:
+    """Test Telegram stages are detected once and read back"""
+
+    def test_stored_detections_match_text_scan(self, repsplit):
+        """Test stored detections equal detecting from message text"""
+        _populate(repsplit.db_path)
+
+        for t in range(8):
+            conv_id = f"Chat {t}"
+            stored = repsplit._process_telegram_stage_detections(
+                conv_id, repsplit._internal_participant_filters()[1]
+            )
+            assert sorted(stored) == sorted(
+                _reference_telegram_detections(repsplit, conv_id)
+            )
+
+    def test_detections_reused_until_config_changes(self, repsplit):
+        """Test later runs skip detection unless the stage config changes"""
+        _populate(repsplit.db_path)
+        conv_ids = [f"Chat {t}" for t in range(8)]
+        first = repsplit.calculate_all_commission_splits(conv_ids)
+
+        with patch.object(StageDetector, "detect", side_effect=AssertionError):
+            assert RepSplit().calculate_all_commission_splits(conv_ids) == first
+
+        # Dropping a stage invalidates every stored detection
+        with open("data/slack/config.json") as f:
+            config = json.load(f)
+        config["stages"] = config["stages"][1:]
+        with open("data/slack/config.json", "w") as f:
+            json.dump(config, f)
+        changed = RepSplit()
+        with patch.object(
+            StageDetector, "detect", autospec=True, side_effect=StageDetector.detect
+        ) as detect:
+            changed.calculate_all_commission_splits(conv_ids)
+        assert detect.call_count > 0
+        for conv_id in conv_ids:
+            assert all(
+                stage != "sourcing_intro"
+                for stage, *_ in changed._process_telegram_stage_detections(
+                    conv_id, set()
+                )
+            )
+
+    def test_parser_stores_detections(self, repsplit, tmp_path):
+        """Test saved Telegram messages need no detection during analysis"""
+        parser = TelegramParser(str(tmp_path / "export"), repsplit.db_path)
+        parser.save_messages_to_db(
+            [
+                {
+                    "id": "1",
+                    "author": "Aki",
+                    "original_author": "Aki Balogh",
+                    "text": "quick intro, then the MSA contract",
+                    "timestamp": "2024-06-10T12:31:11",
+                    "source": "telegram",
+                },
+                {
+                    "id": "2",
+                    "author": "Amy",
+                    "original_author": "Amy Wu",
+                    "text": "thanks!",
+                    "timestamp": "2024-06-10T12:35:00",
+                    "source": "telegram",
+                },
+            ],
+            "Acme Corp",
+        )
+
+        with patch.object(StageDetector, "detect", side_effect=AssertionError):
+            detections = repsplit._process_telegram_stage_detections(
+                "acme-corp-telegram", {"Aki", "Amy"}
+            )
+
+        assert detections == [
+            ("sourcing_intro", "Aki", 0.7, "2024-06-10T12:31:11"),
+            ("contract_legal", "Aki", 1.0, "2024-06-10T12:31:11"),
+        ]
+
+
+class FakeCalendarCommissionAnalysis:
+    """Records how often the calendar is authenticated and searched"""
+
+    instances = []
+
+    def __init__(self):
+        self.calls = []
+        FakeCalendarCommissionAnalysis.instances.append(self)
+
+    def authenticate(self):
+        self.calls.append("authenticate")
+        return True
+
+    def load_snapshot(self, days_back=180, cache_file=None):
+        self.calls.append("load_snapshot")
+
+    def get_company_meeting_data(self, company_name, days_back=180):
+        self.calls.append(company_name)
+        return {
+            "overlapping_meetings": [
+                {
+                    "meeting": {"summary": "Kickoff", "duration_minutes": 90},
+                    "team_participants": ["Aki"],
+                }
+            ]
+        }
+
+
+class TestCalendarCache:
+    """Test calendar data is fetched once per run"""
+
+    @pytest.fixture
+    def calendar_module(self):
+        FakeCalendarCommissionAnalysis.instances = []
+        module = type(sys)("calendar_commission_analysis")
+        module.CalendarCommissionAnalysis = FakeCalendarCommissionAnalysis
+        with patch.dict(sys.modules, {"calendar_commission_analysis": module}):
+            yield module
+
+    def test_call_sites_share_one_analysis(self, repsplit, calendar_module):
+        """Test contributions, summaries and justifications reuse meeting data"""
+        stats = {
+            "U_AKI": {"calendar_meetings": 0},
+        }
+
+        ADD_CALENDAR_CONTRIBUTIONS(repsplit, "deal0-bitsafe", stats)
+        ADD_CALENDAR_CONTRIBUTIONS(repsplit, "deal0-bitsafe", stats)
+        summary = repsplit.get_calendar_summary("deal0-bitsafe")
+        repsplit.generate_justification("C000", "deal0-bitsafe", {"U_AKI": 100.0})
+        repsplit.get_calendar_summary("deal1-bitsafe")
+
+        (analysis,) = FakeCalendarCommissionAnalysis.instances
+        assert analysis.calls == ["authenticate", "load_snapshot", "Deal0", "Deal1"]
+        assert stats["U_AKI"]["calendar_meetings"] == 3.0
+        assert summary == "Aki (90m)"
+        justification = repsplit.justifications_dir / "deal0-bitsafe_justification.md"
+        assert "Kickoff" in justification.read_text()
+
+        # A new run starts with a fresh calendar analysis
+        repsplit.reset_calendar_cache()
+        repsplit.get_calendar_summary("deal0-bitsafe")
+        assert len(FakeCalendarCommissionAnalysis.instances) == 2
+
+    def test_team_members_match_by_name(self, repsplit, calendar_module):
+        """Test calendar team members, reported by name, are credited to reps
+        whose display name differs; before, only display names matched"""
+        for participant in repsplit.config["participants"]:
+            if participant["name"] == "Aki":
+                participant["display_name"] = "Aki Balogh"
+        stats = {"U_AKI": {"calendar_meetings": 0}}
+
+        ADD_CALENDAR_CONTRIBUTIONS(repsplit, "deal0-bitsafe", stats)
+
+        # The old display-name-only matching left this at 0
+        assert stats["U_AKI"]["calendar_meetings"] == 1.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
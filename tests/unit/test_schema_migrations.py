@@ -0,0 +1,236 @@
+"""
+Query-plan regression tests for the repsplit.db schema indexes
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root, scripts and logging config to the Python path
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "../..")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "config"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "scripts"))
+
+# Mock logging setup before importing modules that log to files
+with patch("logging.FileHandler"), patch("logging.basicConfig"), patch("os.makedirs"):
+    from src.etl.etl_data_ingestion import DataETL
+    from src.scripts.process_slack_export import SlackExportProcessor
+    from src.scripts.slack_ingest import SlackIngest
+
+from src.scripts.repsplit import RepSplit
+from src.scripts.schema_migrations import INDEXES, apply_index_migrations
+from src.scripts.telegram_parser import TelegramParser
+
+# "SCAN messages" (or "SCAN TABLE messages" before SQLite 3.36) without an
+# index reads every row of the table
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?(\w+)$")
+
+PARTICIPANTS = [("Aki", "U_AKI"), ("Amy", "U_AMY"), ("Prateek", "")]
+
+
+def full_scans(conn, statement):
+    """Tables a statement reads with a full table scan"""
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+    return [
+        match.group(2) for _, _, _, detail in plan if (match := FULL_SCAN.match(detail))
+    ]
+
+
+def traced_selects(call):
+    """SELECT statements (with bound values) a call runs on any connection"""
+    statements = []
+    connect = sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    with patch("sqlite3.connect", traced_connect):
+        call()
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.fixture
+def repsplit(tmp_path, monkeypatch):
+    """RepSplit database with Slack and Telegram tables"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/slack")
+    config = {
+        "stages": [
+            {"name": "sourcing_intro", "weight": 8.0, "keywords": ["intro"]},
+            {"name": "contract_legal", "weight": 15.0, "keywords": ["contract"]},
+        ],
+        "participants": [
+            {
+                "name": name,
+                "slack_id": slack_id,
+                "display_name": name,
+                "email": "",
+                "founder_cap": False,
+                "earns_commission": True,
+            }
+            for name, slack_id in PARTICIPANTS
+        ],
+        "diminishing_returns": 0.8,
+        "presence_floor": 5.0,
+        "closer_bonus": 2.0,
+    }
+    with open("data/slack/config.json", "w") as f:
+        json.dump(config, f)
+
+    instance = RepSplit()
+    TelegramParser("export", instance.db_path).save_messages_to_db(
+        [
+            {
+                "id": "1",
+                "author": "Aki",
+                "original_author": "Aki Balogh",
+                "text": "intro and contract",
+                "timestamp": "2024-06-10T12:31:11",
+                "source": "telegram",
+            }
+        ],
+        "Acme",
+    )
+
+    conn = sqlite3.connect(instance.db_path)
+    conn.execute("INSERT INTO users VALUES ('U_AKI', 'Aki', 'Aki Balogh', '')")
+    conn.execute("INSERT INTO conversations VALUES ('C1', 'acme-bitsafe', 3, 0, 1)")
+    conn.execute(
+        "INSERT INTO messages VALUES ('m1', 'C1', 1.0, 'U_AKI', 'intro', NULL)"
+    )
+    conn.execute(
+        """
+        INSERT INTO stage_detections
+            (conv_id, stage_name, message_id, author, timestamp, confidence)
+        VALUES ('C1', 'sourcing_intro', 'm1', 'U_AKI', 1.0, 0.7)
+    """
+    )
+    conn.commit()
+    conn.close()
+
+    with patch.object(RepSplit, "_add_calendar_contributions"), patch.object(
+        RepSplit, "get_calendar_summary", return_value=""
+    ):
+        yield instance
+
+
+class TestIndexMigrations:
+    """Test every database-creating path gets the indexes"""
+
+    def _index_names(self, db_path):
+        conn = sqlite3.connect(db_path)
+        names = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+        conn.close()
+        return names
+
+    def test_repsplit_and_telegram_paths_create_all_indexes(self, repsplit):
+        """Test RepSplit plus the Telegram parser create every index"""
+        assert {name for name, _, _ in INDEXES} <= self._index_names(repsplit.db_path)
+
+    def test_slack_ingest_creates_indexes(self, tmp_path, monkeypatch):
+        """Test SlackIngest.init_database indexes the tables it creates"""
+        monkeypatch.setenv("SLACK_TOKEN", "xoxp-test")
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        ingest = SlackIngest(config_file=str(config_file))
+        ingest.db_path = str(tmp_path / "repsplit.db")
+
+        ingest.init_database()
+
+        indexes = self._index_names(ingest.db_path)
+        assert "idx_messages_conv_author_timestamp" in indexes
+        assert "idx_stage_detections_conv_author_timestamp" in indexes
+
+    def test_existing_database_is_migrated_once(self, tmp_path):
+        """Test indexes are added to an existing database and not recreated"""
+        conn = sqlite3.connect(str(tmp_path / "old.db"))
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE TABLE messages (id TEXT, conv_id TEXT, timestamp REAL, author TEXT)"
+        )
+
+        assert apply_index_migrations(cursor) == [
+            "idx_messages_conv_author_timestamp",
+            "idx_messages_conv_timestamp",
+        ]
+        assert apply_index_migrations(cursor) == []
+        conn.close()
+
+
+class TestQueryPlans:
+    """Test the hot analysis queries search indexes instead of scanning"""
+
+    def _assert_no_full_scans(self, db_path, statements, allowed=()):
+        assert statements
+        conn = sqlite3.connect(db_path)
+        for statement in statements:
+            scanned = [t for t in full_scans(conn, statement) if t not in allowed]
+            assert scanned == [], f"Full scan of {scanned} in: {statement}"
+        conn.close()
+
+    def test_per_conversation_queries(self, repsplit):
+        """Test split, breakdown and justification queries use indexes"""
+        repsplit.refresh_telegram_stage_detections()
+
+        statements = traced_selects(
+            lambda: (
+                repsplit.calculate_commission_splits("C1"),
+                repsplit.calculate_commission_splits("acme-telegram"),
+                repsplit.get_stage_breakdown("acme-bitsafe"),
+                repsplit.generate_justification("C1", "acme-bitsafe"),
+            )
+        )
+
+        # users is small and read whole to resolve display names
+        self._assert_no_full_scans(repsplit.db_path, statements, allowed={"users"})
+
+    def test_batch_queries(self, repsplit):
+        """Test the one-pass split queries read covering indexes"""
+        repsplit.refresh_telegram_stage_detections()
+        repsplit.get_identity_resolver()
+
+        statements = traced_selects(
+            lambda: repsplit.calculate_all_commission_splits(["C1", "acme-telegram"])
+        )
+
+        # The conversation names are read in full by design
+        self._assert_no_full_scans(
+            repsplit.db_path, statements, allowed={"conversations"}
+        )
+
+    def test_ingest_slack_data_query(self, tmp_path):
+        """Test the ordered message pass in ingest_slack_data needs no sort"""
+        db_path = str(tmp_path / "slack.db")
+        processor = SlackExportProcessor(str(tmp_path), db_path)
+        processor.setup_database()
+        processor.conn.close()
+
+        statements = traced_selects(
+            lambda: DataETL.ingest_slack_data(SimpleNamespace(db_path=db_path))
+        )
+
+        # Conversations and users are read in full by design
+        self._assert_no_full_scans(
+            db_path, statements, allowed={"conversations", "users"}
+        )
+        conn = sqlite3.connect(db_path)
+        (message_query,) = [s for s in statements if "FROM messages" in s]
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {message_query}").fetchall()
+        conn.close()
+        assert not any("TEMP B-TREE" in detail for *_, detail in plan)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,356 @@
+"""
+Unit tests for the rate-limited Slack client against a local stub Slack API
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+
+# Add the project root and logging config to the Python path
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "../..")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "config"))
+
+# Mock logging setup before importing modules that log to files
+with patch("logging.FileHandler"), patch("logging.basicConfig"), patch("os.makedirs"):
+    from src.scripts.slack_ingest import THREAD_ACTIVITY_DAYS, SlackIngest
+
+from src.scripts.slack_client import SlackAPIError, SlackClient, TokenBucket
+
+# Fast limits so tests only wait on what they exercise
+FAST_LIMITS = {tier: 60000 for tier in (1, 2, 3, 4)}
+
+
+class StubSlack:
+    """Local Slack Web API serving paginated channel histories"""
+
+    def __init__(self, histories, page_size=2, delay=0.0, threads=None):
+        self.histories = histories
+        # Replies by (channel, thread ts)
+        self.threads = threads or {}
+        self.page_size = page_size
+        self.delay = delay
+        # Responses answered with 429 before serving, per method
+        self.rate_limit_once = set()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.runner = None
+        self.base_url = None
+
+    async def history(self, request):
+        method = request.match_info["method"]
+        self.requests.append((method, dict(request.query)))
+        if method in self.rate_limit_once:
+            self.rate_limit_once.discard(method)
+            return web.json_response(
+                {"ok": False, "error": "ratelimited"},
+                status=429,
+                headers={"Retry-After": "0"},
+            )
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        channel = request.query["channel"]
+        if channel not in self.histories:
+            return web.json_response({"ok": False, "error": "channel_not_found"})
+        if method == "conversations.history":
+            messages = self.histories[channel]
+        elif method == "conversations.replies":
+            thread_ts = request.query["ts"]
+            (parent,) = [m for m in self.histories[channel] if m["ts"] == thread_ts]
+            messages = [parent] + self.threads.get((channel, thread_ts), [])
+        else:
+            return web.json_response({"ok": False, "error": "unknown_method"})
+
+        # Slack's oldest bound is exclusive; reply pages keep their parent
+        oldest = float(request.query.get("oldest", 0))
+        messages = [
+            m
+            for m in messages
+            if float(m["ts"]) > oldest or m["ts"] == request.query.get("ts")
+        ]
+        start = int(request.query.get("cursor", 0))
+        end = start + self.page_size
+        next_cursor = str(end) if end < len(messages) else ""
+        return web.json_response(
+            {
+                "ok": True,
+                "messages": messages[start:end],
+                "has_more": bool(next_cursor),
+                "response_metadata": {"next_cursor": next_cursor},
+            }
+        )
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/api/{method}", self.history)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/api"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
+
+
+def history(channel, count, first_ts=1):
+    # Message ids are Slack timestamps, so they must differ across channels
+    return [
+        {"ts": f"{first_ts + i}.0", "user": "U1", "text": f"{channel} message {i}"}
+        for i in range(count)
+    ]
+
+
+class TestSlackClient:
+    """Test pagination and rate limiting against the stub API"""
+
+    @pytest.mark.asyncio
+    async def test_paginates_full_history(self):
+        """Test every cursor page of a channel is fetched"""
+        async with StubSlack({"C1": history("C1", 5)}) as stub:
+            async with SlackClient(
+                "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+            ) as client:
+                messages = await client.paginate(
+                    "conversations.history", "messages", {"channel": "C1"}
+                )
+
+        assert [m["ts"] for m in messages] == ["1.0", "2.0", "3.0", "4.0", "5.0"]
+        assert [query.get("cursor") for _, query in stub.requests] == [
+            None,
+            "2",
+            "4",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_retries_after_rate_limit(self):
+        """Test a 429 is retried after its Retry-After"""
+        async with StubSlack({"C1": history("C1", 1)}) as stub:
+            stub.rate_limit_once.add("conversations.history")
+            async with SlackClient(
+                "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+            ) as client:
+                messages = await client.call("conversations.history", {"channel": "C1"})
+
+        assert len(messages["messages"]) == 1
+        assert client.request_counts == {"conversations.history": 2}
+        assert client.rate_limited_counts == {"conversations.history": 1}
+
+    @pytest.mark.asyncio
+    async def test_api_errors_raise(self):
+        """Test ok: false responses raise SlackAPIError"""
+        async with StubSlack({}) as stub:
+            async with SlackClient(
+                "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+            ) as client:
+                with pytest.raises(SlackAPIError, match="channel_not_found"):
+                    await client.call("conversations.history", {"channel": "C9"})
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_limits_rate(self):
+        """Test requests beyond the burst wait for refilled tokens"""
+        bucket = TokenBucket(rate_per_minute=600, burst=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+
+        # Two requests from the burst, then one per 0.1s
+        assert time.monotonic() - start >= 0.18
+
+
+class TestConcurrentIngest:
+    """Test SlackIngest fetches channels concurrently over one client"""
+
+    @pytest.mark.asyncio
+    async def test_channels_fetched_concurrently(self, tmp_path, monkeypatch):
+        """Test histories are complete and fetched up to the concurrency limit"""
+        monkeypatch.setenv("SLACK_TOKEN", "xoxp-test")
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        ingest = SlackIngest(
+            config_file=str(config_file),
+            max_concurrent_channels=3,
+            rate_limits=FAST_LIMITS,
+        )
+        ingest.db_path = str(tmp_path / "repsplit.db")
+        ingest.init_database()
+
+        channels = [{"id": f"C{i}", "name": f"acme{i}-bitsafe"} for i in range(6)]
+        histories = {
+            channel["id"]: history(channel["id"], 3, first_ts=10 * i + 1)
+            for i, channel in enumerate(channels)
+        }
+        async with StubSlack(histories, delay=0.05) as stub:
+            ingest.base_url = stub.base_url
+            async with SlackClient(
+                "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+            ) as client:
+                ingest.client = client
+                await ingest.ingest_channels(channels)
+
+        assert 1 < stub.max_in_flight <= 3
+        conn = sqlite3.connect(ingest.db_path)
+        counts = dict(
+            conn.execute("SELECT conv_id, COUNT(*) FROM messages GROUP BY conv_id")
+        )
+        conn.close()
+        assert counts == {channel["id"]: 3 for channel in channels}
+
+
+class TestIncrementalSync:
+    """Test channels are synced from their watermarks"""
+
+    @pytest.fixture
+    def ingest(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SLACK_TOKEN", "xoxp-test")
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        ingest = SlackIngest(config_file=str(config_file), rate_limits=FAST_LIMITS)
+        ingest.db_path = str(tmp_path / "repsplit.db")
+        ingest.init_database()
+        return ingest
+
+    async def _sync(self, ingest, stub):
+        async with SlackClient(
+            "xoxp-test", stub.base_url, rate_limits=FAST_LIMITS
+        ) as client:
+            ingest.client = client
+            await ingest.ingest_channels([{"id": "C1", "name": "acme-bitsafe"}])
+            ingest.client = None
+
+    def _message_ids(self, ingest):
+        conn = sqlite3.connect(ingest.db_path)
+        ids = [row[0] for row in conn.execute("SELECT id FROM messages ORDER BY id")]
+        conn.close()
+        return ids
+
+    @pytest.mark.asyncio
+    async def test_second_sync_requests_only_new_messages(self, ingest):
+        """Test the second run saves only messages after the stored watermark"""
+        now = int(time.time())
+        messages = history("C1", 2, first_ts=now - 100)
+        async with StubSlack({"C1": messages}) as stub:
+            await self._sync(ingest, stub)
+            assert ingest.load_sync_state()[0] == {"C1": f"{now - 99}.0"}
+
+            messages.append(
+                {"ts": f"{now - 50}.0", "user": "U1", "text": "new message"}
+            )
+            stub.requests.clear()
+            await self._sync(ingest, stub)
+
+        # The history is listed from the start of the thread activity window
+        assert {method for method, _ in stub.requests} == {"conversations.history"}
+        assert {query["oldest"] for _, query in stub.requests} == {
+            stub.requests[0][1]["oldest"]
+        }
+        assert float(stub.requests[0][1]["oldest"]) == pytest.approx(
+            now - THREAD_ACTIVITY_DAYS * 24 * 3600, abs=60
+        )
+        assert self._message_ids(ingest) == [
+            f"{now - 100}.0",
+            f"{now - 99}.0",
+            f"{now - 50}.0",
+        ]
+        assert ingest.load_sync_state()[0] == {"C1": f"{now - 50}.0"}
+
+    @pytest.mark.asyncio
+    async def test_new_replies_to_old_threads_are_synced(self, ingest):
+        """Test replies posted after the parent was synced are downloaded"""
+        now = int(time.time())
+        parent = {
+            "ts": f"{now - 100}.0",
+            "user": "U1",
+            "text": "thread",
+            "reply_count": 1,
+            "latest_reply": f"{now - 90}.0",
+        }
+        replies = [
+            {
+                "ts": f"{now - 90}.0",
+                "user": "U2",
+                "text": "reply",
+                "thread_ts": parent["ts"],
+            }
+        ]
+        threads = {("C1", parent["ts"]): replies}
+        async with StubSlack({"C1": [parent]}, threads=threads) as stub:
+            await self._sync(ingest, stub)
+            assert self._message_ids(ingest) == [parent["ts"], f"{now - 90}.0"]
+
+            replies.append(
+                {
+                    "ts": f"{now - 10}.0",
+                    "user": "U2",
+                    "text": "late",
+                    "thread_ts": parent["ts"],
+                }
+            )
+            parent["latest_reply"] = f"{now - 10}.0"
+            stub.requests.clear()
+            await self._sync(ingest, stub)
+
+        assert (
+            "conversations.replies",
+            {
+                "channel": "C1",
+                "ts": parent["ts"],
+                "limit": "1000",
+                "oldest": f"{now - 90}.0",
+            },
+        ) in stub.requests
+        assert self._message_ids(ingest) == [
+            parent["ts"],
+            f"{now - 90}.0",
+            f"{now - 10}.0",
+        ]
+        assert ingest.load_sync_state()[1] == {"C1": {parent["ts"]: f"{now - 10}.0"}}
+
+    @pytest.mark.asyncio
+    async def test_unchanged_threads_are_not_refetched(self, ingest):
+        """Test threads whose latest reply was synced skip conversations.replies"""
+        now = int(time.time())
+        parent = {
+            "ts": f"{now - 100}.0",
+            "user": "U1",
+            "text": "thread",
+            "reply_count": 1,
+            "latest_reply": f"{now - 90}.0",
+        }
+        replies = [
+            {
+                "ts": f"{now - 90}.0",
+                "user": "U2",
+                "text": "reply",
+                "thread_ts": parent["ts"],
+            }
+        ]
+        threads = {("C1", parent["ts"]): replies}
+        async with StubSlack({"C1": [parent]}, threads=threads) as stub:
+            await self._sync(ingest, stub)
+            stub.requests.clear()
+            await self._sync(ingest, stub)
+
+        assert [method for method, _ in stub.requests] == ["conversations.history"]
+        assert self._message_ids(ingest) == [parent["ts"], f"{now - 90}.0"]
+        assert ingest.load_sync_state()[1] == {"C1": {parent["ts"]: f"{now - 90}.0"}}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,122 @@
+"""
+Unit tests for the compiled deal stage detector
+"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from src.etl.utils.aho_corasick import AhoCorasick
+from src.etl.utils.stage_detector import StageConfig, StageDetector
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "../..")
+REPSPLIT_CONFIG_FILE = os.path.join(PROJECT_ROOT, "data", "slack", "config.json")
+
+STAGES = {
+    "stages": [
+        {"name": "sourcing_intro", "weight": 8.0, "keywords": ["intro", "connect"]},
+        {"name": "solution", "weight": 32.0, "keywords": ["CC", "CBTC", "cc"]},
+        {"name": "contract", "weight": 15.0, "keywords": ["MSA", "contract", "terms"]},
+        {"name": "closing", "weight": 12.0, "keywords": ["signed", "connect"]},
+    ]
+}
+
+
+def reference_detect_stages(config, text):
+    """Per-keyword detection as RepSplit.detect_stages_in_message did it"""
+    detected_stages = []
+    text_lower = text.lower()
+
+    for stage_config in config.get("stages", []):
+        matches = 0
+        for keyword in stage_config["keywords"]:
+            if keyword.lower() in text_lower:
+                matches += 1
+
+        if matches > 0:
+            confidence = min(1.0, 0.3 + (matches * 0.4))
+            detected_stages.append((stage_config["name"], confidence))
+
+    return detected_stages
+
+
+def _random_texts(config, count=2000):
+    """Texts stitched from keywords, keyword fragments and filler words"""
+    rng = random.Random(7)
+    keywords = [k for stage in config["stages"] for k in stage["keywords"]]
+    fragments = keywords + [k[: len(k) // 2] for k in keywords]
+    fragments += ["hello", "team", "thanks", "", "Ünïcode", "$", "\n"]
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(fragments) for _ in range(rng.randint(0, 12))]
+        text = rng.choice([" ", "", "-"]).join(words)
+        texts.append(text.upper() if rng.random() < 0.2 else text)
+    return texts
+
+
+class TestStageDetector:
+    """Test the compiled detector keeps the per-keyword results"""
+
+    def test_matches_reference(self):
+        """Test duplicate and shared keywords are counted like before"""
+        detector = StageDetector.from_config(STAGES)
+
+        assert detector.detect("Please connect on the CC terms") == [
+            ("sourcing_intro", 0.7),
+            ("solution", 1.0),
+            ("contract", 0.7),
+            ("closing", 0.7),
+        ]
+        for text in _random_texts(STAGES):
+            assert detector.detect(text) == reference_detect_stages(STAGES, text)
+
+    @pytest.mark.skipif(
+        not os.path.exists(REPSPLIT_CONFIG_FILE),
+        reason="data/slack/config.json not available",
+    )
+    def test_repsplit_config_matches_reference(self):
+        """Test detection with the real stage config is unchanged"""
+        with open(REPSPLIT_CONFIG_FILE) as f:
+            config = json.load(f)
+        detector = StageDetector.from_config(config)
+
+        for text in _random_texts(config):
+            assert detector.detect(text) == reference_detect_stages(config, text)
+
+    def test_regex_patterns_and_empty_keywords(self):
+        """Test regex patterns count as matches and empty keywords always match"""
+        detector = StageDetector(
+            [
+                StageConfig("pricing", 8.0, ["pricing"], [r"\$\d+k?\b"]),
+                StageConfig("catch_all", 1.0, [""]),
+            ]
+        )
+
+        assert detector.stage_match_counts("Pricing is $6000") == [2, 1]
+        assert detector.detect("") == [("catch_all", 0.7)]
+        assert StageDetector.from_config({}).detect("anything") == []
+
+
+class TestAhoCorasick:
+    """Test the shared multi-pattern automaton"""
+
+    def test_finds_same_patterns_as_substring_checks(self):
+        """Test every pattern found equals every pattern contained"""
+        patterns = ["a", "ab", "bab", "bc", "bca", "c", "caa", "abc"]
+        scanner = AhoCorasick(patterns)
+        rng = random.Random(1)
+
+        for _ in range(500):
+            text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 15)))
+            found = {scanner.patterns[i] for i in scanner.find(text)}
+            assert found == {p for p in patterns if p in text}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,354 @@
+"""
+Unit tests for the streaming Telegram HTML export parser
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from src.etl.utils.message_records import ChatMessageRecord, WorkerMessageRecord
+from src.etl.utils.telegram_chat_cache import TelegramChatCache
+from src.etl.utils.telegram_html_parser import (
+    AVAILABLE_BACKENDS,
+    BACKEND_BS4,
+    BACKEND_HTML_PARSER,
+    TelegramExportPage,
+    element_text,
+    etree,
+    resolve_backend,
+    stripped_text,
+)
+
+# Mock logging setup before importing ETL module
+with patch("logging.FileHandler"), patch("logging.basicConfig"), patch("os.makedirs"):
+    from src.etl.etl_data_ingestion import DataETL, process_telegram_chat_worker
+
+SAMPLE_EXPORT = """<!DOCTYPE html>
+<html>
+ <head>
+  <meta charset="utf-8"/>
+<title>Exported Data</title>
+ </head>
+ <body>
+  <div class="page_wrap">
+   <div class="page_header">
+    <a class="content block_link" href="../../lists/chats.html">
+     <div class="text bold">
+Acme &lt;&gt; BitSafe
+     </div>
+    </a>
+   </div>
+   <div class="page_body chat_page">
+    <div class="history">
+     <div class="message service" id="message-1">
+      <div class="body details">
+13 November 2021
+      </div>
+     </div>
+     <div class="message default clearfix" id="message2">
+      <div class="pull_left userpic_wrap">
+       <div class="userpic userpic7" style="width: 42px; height: 42px">
+        <div class="initials" style="line-height: 42px">
+AB
+        </div>
+       </div>
+      </div>
+      <div class="body">
+       <div class="pull_right date details" title="13.11.2021 14:37:11 UTC-05:00">
+14:37
+       </div>
+       <div class="from_name">
+Alice Builder
+       </div>
+       <div class="text">
+Welcome to the <strong>Acme</strong> &amp; BitSafe chat<br>
+<a href="https://example.com">https://example.com</a>
+       </div>
+      </div>
+     </div>
+     <div class="message default clearfix joined" id="message3">
+      <div class="body">
+       <div class="pull_right date details" title="13.11.2021 14:41:12 UTC-05:00">
+14:41
+       </div>
+       <div class="text">
+<pre>  indented
+    code</pre> <!-- comment --> after
+       </div>
+      </div>
+     </div>
+     <div class="message default clearfix" id="message4">
+      <div class="body">
+       <div class="pull_right date details" title="13.11.2021 15:00:00 UTC-05:00">
+15:00
+       </div>
+       <div class="from_name">
+Bob
+       </div>
+       <div class="forwarded body">
+        <div class="from_name">
+Carol<span class="date details"> 12.11.2021</span>
+        </div>
+        <div class="text">
+Forwarded &apos;quote&apos;
+        </div>
+       </div>
+      </div>
+     </div>
+     <div class="message default clearfix" id="message5">
+      <div class="body">
+       <div class="from_name">
+Dave
+       </div>
+      </div>
+     </div>
+    </div>
+   </div>
+  </div>
+ </body>
+</html>
+"""
+
+
+def _parse(path, backend):
+    page = TelegramExportPage(path, backend)
+    messages = list(page.iter_messages())
+    return messages, page.header, page.userpic_initials
+
+
+def _streaming_backends():
+    backends = [BACKEND_HTML_PARSER]
+    if etree is not None:
+        backends.append("lxml")
+    return backends
+
+
+class TestTelegramHtmlParser:
+    """Test streaming extraction of Telegram export messages"""
+
+    @pytest.fixture
+    def export_file(self, tmp_path):
+        path = tmp_path / "messages.html"
+        path.write_text(SAMPLE_EXPORT, encoding="utf-8")
+        return str(path)
+
+    def test_bs4_reference_fields(self, export_file):
+        """Test the reference backend extracts the expected message fields"""
+        messages, header, initials = _parse(export_file, BACKEND_BS4)
+
+        assert [m.message_id for m in messages] == [
+            "message-1",
+            "message2",
+            "message3",
+            "message4",
+            "message5",
+        ]
+        assert messages[0].is_service
+        assert element_text(messages[0].details) == "13 November 2021"
+        assert element_text(messages[1].from_name) == "Alice Builder"
+        assert messages[1].date_title == "13.11.2021 14:37:11 UTC-05:00"
+        assert stripped_text(messages[1].date_text) == "14:37"
+        assert messages[2].from_name is None
+        assert element_text(messages[3].from_name) == "Bob"
+        assert element_text(messages[3].text) == "Forwarded 'quote'"
+        assert messages[4].text is None
+        assert stripped_text(header) == "Acme <> BitSafe"
+        assert initials == ["AB"]
+
+    @pytest.mark.parametrize("backend", _streaming_backends())
+    def test_streaming_backend_matches_bs4(self, export_file, backend):
+        """Test streaming backends produce output identical to BeautifulSoup"""
+        assert _parse(export_file, backend) == _parse(export_file, BACKEND_BS4)
+
+    @pytest.mark.parametrize("backend", _streaming_backends())
+    def test_streaming_backend_small_chunks(self, export_file, backend):
+        """Test text split across read chunks is merged like BeautifulSoup"""
+        with patch("src.etl.utils.telegram_html_parser.READ_CHUNK_SIZE", 7):
+            assert _parse(export_file, backend) == _parse(export_file, BACKEND_BS4)
+
+    def test_resolve_backend(self):
+        """Test backend resolution and validation"""
+        assert resolve_backend("auto") in AVAILABLE_BACKENDS
+        assert resolve_backend(BACKEND_HTML_PARSER) == BACKEND_HTML_PARSER
+        with pytest.raises(ValueError):
+            resolve_backend("selectolax")
+
+    def test_text_helpers(self):
+        """Test BeautifulSoup text semantics helpers"""
+        fragments = ("\n", "Alice", "\n", " Bob ")
+        assert element_text(fragments) == "Alice\n Bob"
+        assert stripped_text(fragments) == "AliceBob"
+        assert element_text(None) == ""
+        assert stripped_text(None) == ""
+
+
+class TestTelegramChatProcessing:
+    """Test DataETL chat processing on top of the streaming parser"""
+
+    @pytest.fixture
+    def chats_dir(self, tmp_path):
+        chat_dir = tmp_path / "chat_0001"
+        chat_dir.mkdir()
+        (chat_dir / "messages.html").write_text(SAMPLE_EXPORT, encoding="utf-8")
+        return str(tmp_path)
+
+    @pytest.mark.parametrize("backend", list(AVAILABLE_BACKENDS))
+    def test_process_single_chat(self, chats_dir, backend):
+        """Test chat processing output for every parser backend"""
+        if backend == "lxml" and etree is None:
+            pytest.skip("lxml not installed")
+
+        etl = DataETL(max_workers=1, parser_backend=backend)
+        result = etl._process_single_chat("chat_0001", chats_dir)
+
+        assert result["message_count"] == 4
+        assert result["service_message_count"] == 1
+        assert result["first_message_time"] == "13.11.2021 14:37:11 UTC-05:00"
+        assert result["messages"][1]["author"] == "Alice Builder"
+        assert result["messages"][1]["text"] == (
+            "Welcome to the Acme & BitSafe chat\nhttps://example.com"
+        )
+        assert result["messages"][2]["author"] == "System"
+        assert result["messages"][2]["text"] == "indented\n    code  after"
+        assert sorted(result["participants"]) == ["Alice Builder", "Bob", "System"]
+
+    def test_worker_uses_page_header(self, chats_dir):
+        """Test the multiprocessing worker extracts messages and chat name"""
+        result = process_telegram_chat_worker("chat_0001", chats_dir)
+
+        assert result["chat_name"] == "acme-<>-bitsafe"
+        assert result["message_count"] == 3
+        assert result["messages"][0]["sender"] == "Alice Builder"
+        assert result["messages"][0]["timestamp"] == "14:37"
+        assert result["messages"][1]["sender"] == "Unknown"
+        assert result["messages"][2]["sender"] == "Bob"
+
+
+class TestTelegramIngestion:
+    """Test the single-pool Telegram ingestion queue and compact records"""
+
+    def test_message_record_dict_access(self):
+        """Test compact records still answer dict-style lookups"""
+        record = ChatMessageRecord("Alice", "hello", "13.11.2021", "message2", False)
+
+        assert record["author"] == "Alice"
+        assert record.get("message_type") == "regular"
+        assert record.get("sender", "Unknown") == "Unknown"
+        assert record[1] == "hello"
+        with pytest.raises(KeyError):
+            record["sender"]
+
+        worker_record = WorkerMessageRecord("Bob", "14:37", "hi")
+        assert worker_record.get("author", worker_record.get("sender")) == "Bob"
+
+    def test_sort_chats_by_size(self, tmp_path):
+        """Test chats are queued largest first by HTML size"""
+        for name, size in [("small", 10), ("large", 1000), ("medium", 100)]:
+            chat_dir = tmp_path / name
+            chat_dir.mkdir()
+            (chat_dir / "messages.html").write_text("x" * size)
+            (chat_dir / "photo.jpg").write_text("x" * 5000)
+
+        etl = DataETL(max_workers=1)
+        ordered = etl._sort_chats_by_size(
+            str(tmp_path), ["small", "large", "medium", "missing"]
+        )
+
+        assert ordered == ["large", "medium", "small", "missing"]
+
+    def test_ingest_uses_single_pool(self, tmp_path, monkeypatch):
+        """Test every chat is processed through one executor"""
+        chats_dir = tmp_path / "data" / "telegram" / "DataExport_2025-08-19" / "chats"
+        for index in range(3):
+            chat_dir = chats_dir / f"chat_000{index}"
+            chat_dir.mkdir(parents=True)
+            (chat_dir / "messages.html").write_text(
+                SAMPLE_EXPORT.replace("Bob", f"Bob{index}"), encoding="utf-8"
+            )
+        monkeypatch.chdir(tmp_path)
+
+        etl = DataETL(max_workers=2, batch_size=1, use_multiprocessing=False)
+        with patch(
+            "src.etl.etl_data_ingestion.ThreadPoolExecutor",
+            wraps=__import__("concurrent.futures").futures.ThreadPoolExecutor,
+        ) as executor_class:
+            telegram_data = etl.ingest_telegram_data()
+
+        assert executor_class.call_count == 1
+        assert len(telegram_data) == 3
+
+
+class TestTelegramParseCache:
+    """Test incremental Telegram ingestion through the parse manifest"""
+
+    @pytest.fixture
+    def chats_dir(self, tmp_path):
+        chats_dir = tmp_path / "data" / "telegram" / "DataExport_2025-08-19" / "chats"
+        chat_dir = chats_dir / "chat_0001"
+        chat_dir.mkdir(parents=True)
+        (chat_dir / "messages.html").write_text(SAMPLE_EXPORT, encoding="utf-8")
+        (chat_dir / "messages2.html").write_text(
+            SAMPLE_EXPORT.replace("Alice", "Erin"), encoding="utf-8"
+        )
+        return chats_dir
+
+    def _ingest(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        etl = DataETL(max_workers=1, use_multiprocessing=False)
+        return etl.ingest_telegram_data(), etl.stats["telegram_cache"]
+
+    def test_unchanged_chats_are_not_reparsed(self, tmp_path, chats_dir, monkeypatch):
+        """Test a second run loads every file from the manifest"""
+        first, first_stats = self._ingest(tmp_path, monkeypatch)
+        with patch("src.etl.etl_data_ingestion.parse_telegram_file") as parse:
+            second, second_stats = self._ingest(tmp_path, monkeypatch)
+
+        assert parse.call_count == 0
+        assert first_stats["stale_files"] == 2
+        assert second_stats["cached_files"] == 2
+        assert second == first
+
+    def test_touched_file_is_rehashed_not_reparsed(
+        self, tmp_path, chats_dir, monkeypatch
+    ):
+        """Test an mtime change with identical content only refreshes the stat"""
+        first, _ = self._ingest(tmp_path, monkeypatch)
+        path = chats_dir / "chat_0001" / "messages.html"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        second, stats = self._ingest(tmp_path, monkeypatch)
+
+        assert stats["rehashed_files"] == 1
+        assert stats["stale_files"] == 0
+        assert second == first
+
+    def test_changed_and_removed_files(self, tmp_path, chats_dir, monkeypatch):
+        """Test edited files are re-parsed and deleted files are forgotten"""
+        self._ingest(tmp_path, monkeypatch)
+        chat_dir = chats_dir / "chat_0001"
+        (chat_dir / "messages.html").write_text(
+            SAMPLE_EXPORT.replace("Bob", "Frank Updated"), encoding="utf-8"
+        )
+        (chat_dir / "messages2.html").unlink()
+
+        telegram_data, stats = self._ingest(tmp_path, monkeypatch)
+        chat = next(iter(telegram_data.values()))
+
+        assert stats["stale_files"] == 1
+        assert stats["cached_files"] == 0
+        assert "Frank Updated" in chat["participants"]
+        assert "Erin Builder" not in chat["participants"]
+
+        cache = TelegramChatCache(
+            str(tmp_path / "data" / "telegram" / "etl_parse_cache.db"),
+            "chat",
+            ChatMessageRecord,
+        )
+        assert list(cache._manifest["chat_0001"]) == ["messages.html"]
+        cache.close()
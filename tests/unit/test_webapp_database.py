@@ -0,0 +1,207 @@
+"""
+Unit tests for the admin panel's database connection reuse
+"""
+
+import gc
+import os
+import sys
+import threading
+
+import pytest
+
+# The admin panel's database module imports psycopg2 at module level
+pytest.importorskip("psycopg2")
+
+# Add the admin panel to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../webapp"))
+
+import database  # noqa: E402
+from database import Database, translate_query  # noqa: E402
+from psycopg2.extensions import (  # noqa: E402
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+)
+
+
+class FakePostgresConnection:
+    """psycopg2 connection stand-in tracking rollbacks"""
+
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.transaction_status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class FakePool:
+    """ThreadedConnectionPool stand-in that raises when exhausted, as
+    psycopg2's does"""
+
+    def __init__(self, minconn, maxconn, dsn):
+        self.maxconn = maxconn
+        self.idle = []
+        self.used = set()
+
+    def getconn(self):
+        if len(self.used) >= self.maxconn:
+            raise RuntimeError("connection pool exhausted")
+        conn = self.idle.pop() if self.idle else FakePostgresConnection()
+        self.used.add(conn)
+        return conn
+
+    def putconn(self, conn, close=False):
+        self.used.discard(conn)
+        if not close:
+            self.idle.append(conn)
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    return Database(f"file:{tmp_path / 'admin_panel.db'}")
+
+
+@pytest.fixture
+def postgres_db(monkeypatch):
+    """Database on a fake pool of two connections"""
+    monkeypatch.setattr(database, "POOL_MAX_CONNECTIONS", 2)
+    monkeypatch.setattr(database.psycopg2.pool, "ThreadedConnectionPool", FakePool)
+    monkeypatch.setattr(Database, "init_db", lambda self: None)
+    return Database("postgresql://admin@localhost/admin_panel")
+
+
+class TestSQLiteConnections:
+    """Test SQLite connections are reused within their thread"""
+
+    def test_connection_is_reused_within_a_thread(self, sqlite_db):
+        """Test a closed connection is handed out again to its thread"""
+        conn = sqlite_db.get_connection()
+        raw = conn._conn
+        conn.close()
+
+        with sqlite_db.connection() as again:
+            assert again._conn is raw
+
+    def test_threads_get_separate_connections(self, sqlite_db):
+        """Test another thread opens a connection of its own"""
+        with sqlite_db.connection() as conn:
+            raw = conn._conn
+        other = []
+
+        def checkout():
+            with sqlite_db.connection() as conn:
+                other.append(conn._conn)
+
+        thread = threading.Thread(target=checkout)
+        thread.start()
+        thread.join()
+
+        assert other[0] is not raw
+
+    def test_close_rolls_back_uncommitted_work(self, sqlite_db):
+        """Test work left uncommitted is discarded on close()"""
+        sqlite_db.safe_execute("CREATE TABLE notes (text TEXT)")
+        with sqlite_db.connection() as conn:
+            conn.execute("INSERT INTO notes VALUES ('draft')")
+
+        with sqlite_db.connection() as conn:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 0
+
+
+class TestPostgresPool:
+    """Test pooled Postgres checkouts against a fake pool"""
+
+    def test_checkout_waits_when_pool_is_exhausted(self, postgres_db):
+        """Test a checkout beyond the pool size waits for a connection to
+        come back instead of raising"""
+        first = postgres_db.get_connection()
+        second = postgres_db.get_connection()
+        raw = first._conn
+        checked_out = []
+
+        def checkout():
+            with postgres_db.connection() as conn:
+                checked_out.append(conn._conn)
+
+        thread = threading.Thread(target=checkout)
+        thread.start()
+        thread.join(timeout=0.2)
+        assert thread.is_alive()
+
+        first.close()
+        thread.join(timeout=5)
+        second.close()
+
+        assert checked_out == [raw]
+
+    def test_close_rolls_back_open_transaction(self, postgres_db):
+        """Test a connection left in a transaction is rolled back"""
+        conn = postgres_db.get_connection()
+        raw = conn._conn
+        raw.transaction_status = TRANSACTION_STATUS_INTRANS
+        conn.close()
+
+        assert raw.rollbacks == 1
+        assert postgres_db.pool.idle == [raw]
+
+    def test_connection_returns_after_handler_raises(self, postgres_db):
+        """Test a connection a handler never closed goes back to the pool
+        once garbage collected"""
+
+        def handler():
+            postgres_db.get_connection()
+            raise ValueError("handler failed")
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                handler()
+            gc.collect()
+
+        assert postgres_db.pool.used == set()
+        assert postgres_db.pool_slots.acquire(blocking=False)
+        postgres_db.pool_slots.release()
+
+
+class TestSharedDatabase:
+    """Test one Database is shared across the process"""
+
+    def test_get_database_returns_one_instance(self, tmp_path, monkeypatch):
+        """Test the app and scheduler get the same Database and pool"""
+        monkeypatch.setenv("DATABASE_URL", f"file:{tmp_path / 'admin_panel.db'}")
+        monkeypatch.setattr(database, "_shared_database", None)
+
+        shared = database.get_database()
+
+        assert database.get_database() is shared
+
+
+class TestTranslateQuery:
+    """Test the Postgres translation of queries"""
+
+    def test_translates_placeholders_and_timestamps(self):
+        """Test ? placeholders and CURRENT_TIMESTAMP become Postgres syntax"""
+        assert translate_query(
+            "UPDATE audit_runs SET completed_at = CURRENT_TIMESTAMP WHERE id = ?"
+        ) == ("UPDATE audit_runs SET completed_at = NOW() WHERE id = %s")
+
+    def test_translations_are_cached(self):
+        """Test a query string is translated once"""
+        translate_query.cache_clear()
+        query = "SELECT * FROM employees WHERE id = ?"
+
+        assert translate_query(query) is translate_query(query)
+        assert translate_query.cache_info().misses == 1
+        assert translate_query.cache_info().hits == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
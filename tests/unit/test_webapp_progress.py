@@ -0,0 +1,108 @@
+"""
+Unit tests for the admin panel's audit progress stream
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+# The admin panel's database module needs psycopg2 even on SQLite
+pytest.importorskip("psycopg2")
+
+# Add the admin panel to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../webapp"))
+
+
+@pytest.fixture(scope="module")
+def webapp(tmp_path_factory):
+    """The admin panel app on a SQLite database of its own"""
+    db_path = tmp_path_factory.mktemp("webapp") / "admin_panel.db"
+    with patch.dict(os.environ, {"DATABASE_URL": f"file:{db_path}"}):
+        import app
+    return app
+
+
+@pytest.fixture
+def audit_id(webapp):
+    with webapp.db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO audit_runs (run_type, status) VALUES ('manual', 'running')"
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+
+def stream_events(webapp, audit_id):
+    """Progress events of a stream, read until the server closes it"""
+    response = webapp.app.test_client().get(f"/api/audit/{audit_id}/progress")
+    assert response.mimetype == "text/event-stream"
+    return [
+        json.loads(line[len("data: ") :])
+        for line in response.get_data(as_text=True).splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+class TestAuditProgressStream:
+    """Test the server-sent audit progress on SQLite"""
+
+    def test_stream_ends_with_final_status(self, webapp, audit_id, monkeypatch):
+        """Test the stream sends the finished audit's status and closes"""
+        monkeypatch.setattr(webapp, "SQLITE_PROGRESS_POLL", 0.05)
+
+        def finish():
+            time.sleep(0.2)
+            webapp.db.safe_execute(
+                """
+                UPDATE audit_runs SET status = 'completed', slack_progress_current = 5
+                WHERE id = ?
+            """,
+                (audit_id,),
+            )
+
+        finisher = threading.Thread(target=finish)
+        finisher.start()
+        events = stream_events(webapp, audit_id)
+        finisher.join()
+
+        assert events[0]["status"] == "running"
+        assert events[-1] == {
+            "status": "completed",
+            "slack_progress_current": 5,
+            "telegram_progress_current": 0,
+        }
+
+    def test_stream_closes_after_its_lifetime(self, webapp, audit_id, monkeypatch):
+        """Test a running audit's stream closes for the browser to reconnect"""
+        monkeypatch.setattr(webapp, "SQLITE_PROGRESS_POLL", 0.05)
+        monkeypatch.setattr(webapp, "PROGRESS_STREAM_SECONDS", 0.2)
+
+        events = stream_events(webapp, audit_id)
+
+        assert [event["status"] for event in events] == ["running"]
+        # The stream gave its slot back
+        assert webapp.progress_stream_slots.acquire(blocking=False)
+        webapp.progress_stream_slots.release()
+
+    def test_streams_over_the_limit_ask_to_retry(self, webapp, audit_id, monkeypatch):
+        """Test a stream beyond PROGRESS_MAX_STREAMS closes straight away"""
+        monkeypatch.setattr(
+            webapp, "progress_stream_slots", threading.BoundedSemaphore(1)
+        )
+        webapp.progress_stream_slots.acquire()
+
+        response = webapp.app.test_client().get(f"/api/audit/{audit_id}/progress")
+
+        assert response.get_data(as_text=True) == (
+            f"retry: {webapp.PROGRESS_RETRY_MS}\n\n"
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
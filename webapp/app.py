@@ -4,13 +4,17 @@ Read-only dashboard - no authentication required
 """
 
 import asyncio
+import json
 import os
+import select
 import threading
+import time
 from datetime import datetime, timedelta
 
 import requests
-from database import Database
-from flask import Flask, jsonify, redirect, render_template, request, url_for
+from database import get_database
+from flask import (Flask, Response, jsonify, redirect, render_template,
+                   request, stream_with_context, url_for)
 from telethon import TelegramClient
 from telethon.errors import SessionPasswordNeededError
 from telethon.sessions import StringSession
@@ -20,8 +24,26 @@ app.config["SECRET_KEY"] = os.getenv(
     "FLASK_SECRET_KEY", "dev-secret-key-change-in-production"
 )
 
-# Initialize database
-db = Database()
+# Initialize database, shared with the scheduler
+db = get_database()
+
+# NOTIFY channel the audit script publishes progress on (see
+# src/scripts/progress_reporter.py)
+PROGRESS_CHANNEL = "audit_progress"
+# Seconds between status checks of a streamed audit without notifications
+PROGRESS_KEEPALIVE = 15
+# Seconds between progress reads on SQLite, which has no NOTIFY
+SQLITE_PROGRESS_POLL = 2
+# Progress streams open at once per process, leaving gunicorn threads free
+# for pages; streams over the limit ask the browser to retry later
+PROGRESS_MAX_STREAMS = 4
+# Seconds a progress stream stays open before the browser is asked to
+# reconnect (EventSource does so by itself), so open tabs take turns
+PROGRESS_STREAM_SECONDS = 120
+# Milliseconds the browser waits before reconnecting a closed stream
+PROGRESS_RETRY_MS = 5000
+
+progress_stream_slots = threading.BoundedSemaphore(PROGRESS_MAX_STREAMS)
 
 
 # Telegram audit session state helpers (database-backed for multi-worker support)
@@ -228,53 +250,51 @@ ensure_data_seeded()
 @app.route("/")
 def dashboard():
     """Main dashboard with overview stats"""
-    conn = db.get_connection()
-    cursor = db.get_cursor(conn)
-
-    # Get employee stats
-    db.execute_query(
-        cursor, "SELECT COUNT(*) as count FROM employees WHERE status = 'active'"
-    )
-    row = cursor.fetchone()
-    active_count = row["count"] if isinstance(row, dict) else row[0]
+    with db.connection() as conn:
+        cursor = db.get_cursor(conn)
 
-    db.execute_query(
-        cursor, "SELECT COUNT(*) as count FROM employees WHERE status = 'inactive'"
-    )
-    row = cursor.fetchone()
-    inactive_count = row["count"] if isinstance(row, dict) else row[0]
+        # Get employee stats
+        db.execute_query(
+            cursor, "SELECT COUNT(*) as count FROM employees WHERE status = 'active'"
+        )
+        row = cursor.fetchone()
+        active_count = row["count"] if isinstance(row, dict) else row[0]
 
-    db.execute_query(
-        cursor, "SELECT COUNT(*) as count FROM employees WHERE status = 'optional'"
-    )
-    row = cursor.fetchone()
-    optional_count = row["count"] if isinstance(row, dict) else row[0]
+        db.execute_query(
+            cursor, "SELECT COUNT(*) as count FROM employees WHERE status = 'inactive'"
+        )
+        row = cursor.fetchone()
+        inactive_count = row["count"] if isinstance(row, dict) else row[0]
 
-    # Get latest audit
-    db.execute_query(
-        cursor,
-        """
-        SELECT * FROM audit_runs
-        ORDER BY started_at DESC
-        LIMIT 1
-    """,
-    )
-    latest_audit = cursor.fetchone()
+        db.execute_query(
+            cursor, "SELECT COUNT(*) as count FROM employees WHERE status = 'optional'"
+        )
+        row = cursor.fetchone()
+        optional_count = row["count"] if isinstance(row, dict) else row[0]
 
-    # Get recent offboarding tasks
-    db.execute_query(
-        cursor,
-        """
-        SELECT ot.*, e.name as employee_name
-        FROM offboarding_tasks ot
-        JOIN employees e ON ot.employee_id = e.id
-        ORDER BY ot.created_at DESC
-        LIMIT 5
-    """,
-    )
-    recent_offboarding = cursor.fetchall()
+        # Get latest audit
+        db.execute_query(
+            cursor,
+            """
+            SELECT * FROM audit_runs
+            ORDER BY started_at DESC
+            LIMIT 1
+        """,
+        )
+        latest_audit = cursor.fetchone()
 
-    conn.close()
+        # Get recent offboarding tasks
+        db.execute_query(
+            cursor,
+            """
+            SELECT ot.*, e.name as employee_name
+            FROM offboarding_tasks ot
+            JOIN employees e ON ot.employee_id = e.id
+            ORDER BY ot.created_at DESC
+            LIMIT 5
+        """,
+        )
+        recent_offboarding = cursor.fetchall()
 
     return render_template(
         "dashboard.html",
@@ -294,22 +314,21 @@ def dashboard():
 @app.route("/employees")
 def employees():
     """List all employees"""
-    conn = db.get_connection()
-    cursor = db.get_cursor(conn)
+    with db.connection() as conn:
+        cursor = db.get_cursor(conn)
 
-    status_filter = request.args.get("status", "all")
+        status_filter = request.args.get("status", "all")
 
-    if status_filter == "all":
-        db.execute_query(cursor, "SELECT * FROM employees ORDER BY name")
-    else:
-        db.execute_query(
-            cursor,
-            "SELECT * FROM employees WHERE status = ? ORDER BY name",
-            (status_filter,),
-        )
+        if status_filter == "all":
+            db.execute_query(cursor, "SELECT * FROM employees ORDER BY name")
+        else:
+            db.execute_query(
+                cursor,
+                "SELECT * FROM employees WHERE status = ? ORDER BY name",
+                (status_filter,),
+            )
 
-    employees = cursor.fetchall()
-    conn.close()
+        employees = cursor.fetchall()
 
     return render_template(
         "employees.html", employees=employees, status_filter=status_filter
@@ -401,51 +420,49 @@ def edit_employee(employee_id):
 @app.route("/audits")
 def audits():
     """View audit history and results"""
-    conn = db.get_connection()
-    cursor = db.get_cursor(conn)
-
-    # Get scheduled audits (full Slack + Telegram audits)
-    db.execute_query(
-        cursor,
-        """
-        SELECT * FROM audit_runs
-        WHERE run_type = 'scheduled'
-        ORDER BY started_at DESC LIMIT 10
-    """,
-    )
-    scheduled_audits = cursor.fetchall()
+    with db.connection() as conn:
+        cursor = db.get_cursor(conn)
 
-    # Get manual audits (Telegram-only audits)
-    db.execute_query(
-        cursor,
-        """
-        SELECT * FROM audit_runs
-        WHERE run_type = 'manual'
-        ORDER BY started_at DESC LIMIT 10
-    """,
-    )
-    manual_audits = cursor.fetchall()
+        # Get scheduled audits (full Slack + Telegram audits)
+        db.execute_query(
+            cursor,
+            """
+            SELECT * FROM audit_runs
+            WHERE run_type = 'scheduled'
+            ORDER BY started_at DESC LIMIT 10
+        """,
+        )
+        scheduled_audits = cursor.fetchall()
 
-    # Get latest audit findings (from most recent audit of either type)
-    db.execute_query(
-        cursor, "SELECT * FROM audit_runs ORDER BY started_at DESC LIMIT 1"
-    )
-    latest_audit = cursor.fetchone()
-    if latest_audit:
+        # Get manual audits (Telegram-only audits)
         db.execute_query(
             cursor,
             """
-            SELECT * FROM audit_findings
-            WHERE audit_run_id = ? AND status = 'incomplete'
-            ORDER BY platform, channel_name
+            SELECT * FROM audit_runs
+            WHERE run_type = 'manual'
+            ORDER BY started_at DESC LIMIT 10
         """,
-            (latest_audit["id"],),
         )
-        findings = cursor.fetchall()
-    else:
-        findings = []
+        manual_audits = cursor.fetchall()
 
-    conn.close()
+        # Get latest audit findings (from most recent audit of either type)
+        db.execute_query(
+            cursor, "SELECT * FROM audit_runs ORDER BY started_at DESC LIMIT 1"
+        )
+        latest_audit = cursor.fetchone()
+        if latest_audit:
+            db.execute_query(
+                cursor,
+                """
+                SELECT * FROM audit_findings
+                WHERE audit_run_id = ? AND status = 'incomplete'
+                ORDER BY platform, channel_name
+            """,
+                (latest_audit["id"],),
+            )
+            findings = cursor.fetchall()
+        else:
+            findings = []
 
     return render_template(
         "audits.html",
@@ -635,6 +652,138 @@ def api_latest_audit():
     return jsonify(result)
 
 
+class ProgressListener:
+    """One LISTEN connection per process, shared by the progress streams.
+
+    A background thread waits on the connection and wakes the streams of
+    the audits it receives NOTIFYs about.
+    """
+
+    def __init__(self, database, channel):
+        self.database = database
+        self.channel = channel
+        self.condition = threading.Condition()
+        # Notifications received by audit ID
+        self.versions = {}
+        self.thread = None
+
+    def start(self):
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                listen_conn = self.database.listen(self.channel)
+                try:
+                    while True:
+                        ready, _, _ = select.select(
+                            [listen_conn], [], [], PROGRESS_KEEPALIVE
+                        )
+                        if not ready:
+                            continue
+                        listen_conn.poll()
+                        audit_ids = set()
+                        while listen_conn.notifies:
+                            notify = listen_conn.notifies.pop(0)
+                            try:
+                                payload = json.loads(notify.payload)
+                            except ValueError:
+                                continue
+                            audit_ids.add(payload.get("audit_id"))
+                        with self.condition:
+                            for audit_id in audit_ids:
+                                self.versions[audit_id] = (
+                                    self.versions.get(audit_id, 0) + 1
+                                )
+                            self.condition.notify_all()
+                finally:
+                    listen_conn.close()
+            except Exception as e:
+                print(f"Progress listener error: {e}")
+                # Streams fall back to their keepalive reads meanwhile
+                time.sleep(PROGRESS_KEEPALIVE)
+
+    def version(self, audit_id):
+        """Notifications received so far about an audit"""
+        with self.condition:
+            return self.versions.get(audit_id, 0)
+
+    def wait(self, audit_id, version, timeout):
+        """Wait until an audit gets a notification after ``version``"""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.versions.get(audit_id, 0) != version, timeout
+            )
+
+
+progress_listener = ProgressListener(db, PROGRESS_CHANNEL) if db.is_postgres else None
+
+
+def audit_progress_events(audit_id):
+    """Server-sent events with the progress of an audit until it finishes.
+
+    On Postgres the stream waits on NOTIFYs fanned out by the process's
+    progress listener and reads the audit row only when woken; on SQLite it
+    reads the row every few seconds. Streams close after
+    PROGRESS_STREAM_SECONDS, and at most PROGRESS_MAX_STREAMS are open at
+    once; the browser reconnects to closed streams.
+    """
+    yield f"retry: {PROGRESS_RETRY_MS}\n\n"
+    if not progress_stream_slots.acquire(blocking=False):
+        return
+    try:
+        if progress_listener is not None:
+            progress_listener.start()
+        closes_at = time.monotonic() + PROGRESS_STREAM_SECONDS
+        sent = None
+        while True:
+            version = (
+                progress_listener.version(audit_id) if progress_listener else None
+            )
+            audit = db.safe_execute(
+                """
+                SELECT status, slack_progress_current, telegram_progress_current
+                FROM audit_runs WHERE id = ?
+            """,
+                (audit_id,),
+                fetch_one=True,
+            )
+            if audit is None:
+                return
+
+            progress = dict(audit)
+            if progress != sent:
+                yield f"data: {json.dumps(progress)}\n\n"
+                sent = progress
+            else:
+                # Keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+            if progress["status"] != "running" or time.monotonic() >= closes_at:
+                return
+
+            # Wait for a notification about this audit
+            timeout = max(0, min(PROGRESS_KEEPALIVE, closes_at - time.monotonic()))
+            if progress_listener is None:
+                time.sleep(min(SQLITE_PROGRESS_POLL, timeout))
+            else:
+                progress_listener.wait(audit_id, version, timeout)
+    finally:
+        progress_stream_slots.release()
+
+
+@app.route("/api/audit/<int:audit_id>/progress", methods=["GET"])
+def api_audit_progress(audit_id):
+    """Stream audit progress as server-sent events"""
+    return Response(
+        stream_with_context(audit_progress_events(audit_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/api/audit/telegram/start", methods=["POST"])
 def api_start_telegram_audit():
     """Start Telegram audit - requests 2FA code"""
@@ -3,10 +3,57 @@ Database setup and models for Admin Panel
 """
 
 import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
+
+# Postgres connections kept by each process (Heroku plans cap connections)
+POOL_MAX_CONNECTIONS = int(os.environ.get("DB_POOL_MAX_CONNECTIONS", "10"))
+
+
+@lru_cache(maxsize=512)
+def translate_query(query):
+    """Postgres form of a query written with ? placeholders and
+    CURRENT_TIMESTAMP, translated once per distinct query string"""
+    return query.replace("?", "%s").replace("CURRENT_TIMESTAMP", "NOW()")
+
+
+class PooledConnection:
+    """A connection checked out of the Database pool; close() hands it back
+    instead of closing it"""
+
+    def __init__(self, database, conn, idle=None):
+        self._database = database
+        self._conn = conn
+        # Idle SQLite connections of the thread the connection belongs to
+        self._idle = idle
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._database.release_connection(conn, self._idle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # Connections of handlers that raised before close() go back too
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 class Database:
@@ -27,20 +74,72 @@ class Database:
 
         self.db_url = db_url
         self.is_postgres = db_url and db_url.startswith("postgresql://")
+
+        # Postgres connections are pooled across threads; SQLite connections
+        # are reused within the thread that opened them
+        self.pool = None
+        self.pool_slots = None
+        self.local = threading.local()
+        if self.is_postgres:
+            self.pool = psycopg2.pool.ThreadedConnectionPool(
+                1, POOL_MAX_CONNECTIONS, self.db_url
+            )
+            # ThreadedConnectionPool raises when exhausted; wait instead
+            self.pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
         self.init_db()
 
     def get_connection(self):
-        """Get database connection"""
+        """Check out a database connection; close() returns it"""
         if self.is_postgres:
-            conn = psycopg2.connect(self.db_url)
-            return conn
+            self.pool_slots.acquire()
+            try:
+                conn = self.pool.getconn()
+                if conn.closed:
+                    # Dropped by the server while idle in the pool
+                    self.pool.putconn(conn, close=True)
+                    conn = self.pool.getconn()
+            except Exception:
+                self.pool_slots.release()
+                raise
+            return PooledConnection(self, conn)
         else:
             # Fallback to sqlite for local dev
-            import sqlite3
+            if not hasattr(self.local, "idle"):
+                self.local.idle = []
+            if self.local.idle:
+                conn = self.local.idle.pop()
+            else:
+                conn = sqlite3.connect(self.db_url.replace("file:", ""))
+                conn.row_factory = sqlite3.Row
+            return PooledConnection(self, conn, self.local.idle)
 
-            conn = sqlite3.connect(self.db_url.replace("file:", ""))
-            conn.row_factory = sqlite3.Row
-            return conn
+    def release_connection(self, conn, idle=None):
+        """Take back a checked-out connection, discarding uncommitted work"""
+        if self.is_postgres:
+            idle_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            try:
+                if not conn.closed and conn.get_transaction_status() != idle_status:
+                    conn.rollback()
+            except psycopg2.Error:
+                # Broken connections are dropped from the pool below
+                conn.close()
+            try:
+                self.pool.putconn(conn, close=bool(conn.closed))
+            finally:
+                self.pool_slots.release()
+        else:
+            if conn.in_transaction:
+                conn.rollback()
+            idle.append(conn)
+
+    @contextmanager
+    def connection(self):
+        """A checked-out connection for the duration of a with block"""
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
 
     def get_cursor(self, conn):
         """Get a cursor with appropriate row factory"""
@@ -49,6 +148,15 @@ class Database:
         else:
             return conn.cursor()
 
+    def listen(self, channel):
+        """Postgres connection LISTENing on a NOTIFY channel"""
+        conn = psycopg2.connect(self.db_url)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        cursor = conn.cursor()
+        cursor.execute(f"LISTEN {channel}")
+        cursor.close()
+        return conn
+
     def param_placeholder(self):
         """Get the correct parameter placeholder for the database type"""
         return "%s" if self.is_postgres else "?"
@@ -56,10 +164,8 @@ class Database:
     def execute_query(self, cursor, query, params=None):
         """Execute a query with the correct parameter placeholder"""
         if self.is_postgres:
-            # Replace ? with %s for Postgres
-            query = query.replace("?", "%s")
-            # Replace CURRENT_TIMESTAMP with NOW() for Postgres
-            query = query.replace("CURRENT_TIMESTAMP", "NOW()")
+            # ? placeholders and CURRENT_TIMESTAMP in Postgres syntax
+            query = translate_query(query)
         if params:
             cursor.execute(query, params)
         else:
@@ -70,27 +176,22 @@ class Database:
         Execute a query with automatic transaction handling and error recovery.
         Returns: result of query if fetch_one or fetch_all is True, None otherwise
         """
-        conn = None
-        try:
-            conn = self.get_connection()
-            cursor = self.get_cursor(conn) if self.is_postgres else conn.cursor()
-            self.execute_query(cursor, query, params)
-
-            result = None
-            if fetch_one:
-                result = cursor.fetchone()
-            elif fetch_all:
-                result = cursor.fetchall()
-
-            conn.commit()
-            return result
-        except Exception as e:
-            if conn:
+        with self.connection() as conn:
+            try:
+                cursor = self.get_cursor(conn)
+                self.execute_query(cursor, query, params)
+
+                result = None
+                if fetch_one:
+                    result = cursor.fetchone()
+                elif fetch_all:
+                    result = cursor.fetchall()
+
+                conn.commit()
+                return result
+            except Exception as e:
                 conn.rollback()
-            raise e
-        finally:
-            if conn:
-                conn.close()
+                raise e
 
     def init_db(self):
         """Initialize database schema"""
@@ -485,6 +586,21 @@ class Database:
         print(f"✅ Seeded {len(team_members)} team members")
 
 
+# Database shared by the app and the scheduler within a process
+_shared_database = None
+_shared_database_lock = threading.Lock()
+
+
+def get_database():
+    """The process's shared Database, so every module draws on one pool
+    (and stays within POOL_MAX_CONNECTIONS)"""
+    global _shared_database
+    with _shared_database_lock:
+        if _shared_database is None:
+            _shared_database = Database()
+        return _shared_database
+
+
 if __name__ == "__main__":
     print("🗄️  Initializing database...")
     db = Database()
@@ -15,7 +15,7 @@ from apscheduler.triggers.cron import CronTrigger
 
 # Add parent directory to path to import database
 sys.path.insert(0, str(Path(__file__).parent))
-from database import Database
+from database import get_database
 
 # Setup logging
 logging.basicConfig(
@@ -23,8 +23,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize database
-db = Database()
+# Initialize database (the app's, when run from the web process)
+db = get_database()
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -44,47 +44,47 @@ def run_audit_job(audit_id=None, skip_telegram=False):
     """
     logger.info(f"🔍 Starting audit job (skip_telegram={skip_telegram})")
 
-    conn = None
-    cursor = None
-
     try:
-        conn = db.get_connection()
-        cursor = db.get_cursor(conn)
-
-        # Create audit run record if not provided
-        if audit_id is None:
-            if db.is_postgres:
-                db.execute_query(
-                    cursor,
-                    """
-                    INSERT INTO audit_runs (run_type, status)
-                    VALUES ('scheduled', 'running')
-                    RETURNING id
-                """,
-                )
-                audit_id = cursor.fetchone()["id"]
+        # The audit takes up to 30 minutes, so no pooled connection is held
+        # while the script runs
+        with db.connection() as conn:
+            cursor = db.get_cursor(conn)
+
+            # Create audit run record if not provided
+            if audit_id is None:
+                if db.is_postgres:
+                    db.execute_query(
+                        cursor,
+                        """
+                        INSERT INTO audit_runs (run_type, status)
+                        VALUES ('scheduled', 'running')
+                        RETURNING id
+                    """,
+                    )
+                    audit_id = cursor.fetchone()["id"]
+                else:
+                    db.execute_query(
+                        cursor,
+                        """
+                        INSERT INTO audit_runs (run_type, status)
+                        VALUES ('scheduled', 'running')
+                    """,
+                    )
+                    audit_id = cursor.lastrowid
+                conn.commit()
             else:
+                # Update existing audit to running
                 db.execute_query(
                     cursor,
                     """
-                    INSERT INTO audit_runs (run_type, status)
-                    VALUES ('scheduled', 'running')
+                    UPDATE audit_runs 
+                    SET status = 'running', started_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
                 """,
+                    (audit_id,),
                 )
-                audit_id = cursor.lastrowid
-            conn.commit()
-        else:
-            # Update existing audit to running
-            db.execute_query(
-                cursor,
-                """
-                UPDATE audit_runs 
-                SET status = 'running', started_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """,
-                (audit_id,),
-            )
-            conn.commit()
+                conn.commit()
+
         # Run the audit script
         script_path = PROJECT_ROOT / "scripts" / "customer_group_audit.py"
         output_dir = PROJECT_ROOT / "output" / "reports"
@@ -134,8 +134,7 @@ def run_audit_job(audit_id=None, skip_telegram=False):
         save_audit_results(audit_id, audit_results, str(report_path))
 
         # Update audit run status
-        db.execute_query(
-            cursor,
+        db.safe_execute(
             """
             UPDATE audit_runs 
             SET status = 'completed',
@@ -158,15 +157,13 @@ def run_audit_job(audit_id=None, skip_telegram=False):
                 audit_id,
             ),
         )
-        conn.commit()
 
         logger.info(f"✅ Audit completed successfully (ID: {audit_id})")
 
     except Exception as e:
         logger.error(f"❌ Audit failed: {str(e)}")
         try:
-            db.execute_query(
-                cursor,
+            db.safe_execute(
                 """
                 UPDATE audit_runs 
                 SET status = 'failed',
@@ -176,14 +173,8 @@ def run_audit_job(audit_id=None, skip_telegram=False):
             """,
                 (str(e), audit_id),
             )
-            conn.commit()
         except Exception as update_error:
             logger.error(f"Failed to update audit status: {update_error}")
-            conn.rollback()
-
-    finally:
-        if conn:
-            conn.close()
 
 
 def parse_audit_output(output):